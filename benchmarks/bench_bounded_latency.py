@@ -0,0 +1,142 @@
+"""
+Benchmark: frame latency through FrameDecoder under a transient overload.
+
+A writer thread stands in for FFmpeg: frames are "captured" on a fixed
+timeline, stamped with their capture time and written to a real pipe. While
+the reader is behind, the writer blocks and captured frames queue up behind
+it, the way they queue in FFmpeg and the network buffers before it. The
+reader's ``on_frame`` callback costs a fixed time per frame and more during
+a one-second overload; latency is publish time minus capture time.
+
+The decoder is run twice, reading every frame in order and with
+``max_queued_bytes=0``. In order, the backlog built during the overload
+only drains as fast as the callback has time to spare, so latency stays
+high long after the overload ended. Bounded, stale frames are read over
+and latency drops back within a frame or two.
+
+Usage:
+    python -m benchmarks.bench_bounded_latency
+    python -m benchmarks.bench_bounded_latency --cost-ms 25 --overload-ms 60
+"""
+
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from src.decoder import FrameDecoder  # noqa: E402
+
+# Phase boundaries in seconds since the first capture
+OVERLOAD_START = 2.0
+OVERLOAD_END = 3.0
+DURATION = 6.0
+PHASES = (
+    ("before", 0.0, OVERLOAD_START),
+    ("overload", OVERLOAD_START, OVERLOAD_END),
+    ("after", OVERLOAD_END, DURATION),
+)
+
+
+class _PipeProc:
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.stderr = io.BytesIO(b"")
+
+
+class _PipeAdapter:
+    def __init__(self, proc):
+        self._proc = proc
+
+    def get_stdout(self):
+        return self._proc
+
+
+def _write_frames(write_fd: int, frame: np.ndarray, fps: float, origin: float) -> None:
+    """Capture on a fixed timeline; write, blocking while the pipe is full."""
+    stamp = frame.reshape(-1)[:8].view(np.float64)
+    with os.fdopen(write_fd, "wb", buffering=0) as pipe:
+        index = 0
+        while True:
+            captured = origin + index / fps
+            if captured - origin >= DURATION:
+                return
+            delay = captured - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            stamp[0] = captured
+            view = memoryview(frame).cast("B")
+            while view:
+                view = view[pipe.write(view):]
+            index += 1
+
+
+def run(args, max_queued_bytes) -> dict:
+    """Stream for ``DURATION`` seconds; return latencies per phase."""
+    frame = np.zeros((args.height, args.width, 3), dtype=np.uint8)
+    latencies = {name: [] for name, _, _ in PHASES}
+    origin = time.perf_counter() + 0.2
+
+    def on_frame(decoded: np.ndarray) -> None:
+        now = time.perf_counter()
+        captured = decoded.reshape(-1)[:8].view(np.float64)[0]
+        for name, start, end in PHASES:
+            if start <= captured - origin < end:
+                latencies[name].append(now - captured)
+        overloaded = OVERLOAD_START <= now - origin < OVERLOAD_END
+        time.sleep((args.overload_ms if overloaded else args.cost_ms) / 1000)
+
+    read_fd, write_fd = os.pipe()
+    decoder = FrameDecoder(
+        width=args.width,
+        height=args.height,
+        on_frame=on_frame,
+        max_queued_bytes=max_queued_bytes,
+    )
+    writer = threading.Thread(
+        target=_write_frames, args=(write_fd, frame, args.fps, origin)
+    )
+    with os.fdopen(read_fd, "rb") as stdout:
+        decoder.start(_PipeAdapter(_PipeProc(stdout)))
+        writer.start()
+        writer.join()
+        decoder._reader_thread.join(timeout=DURATION)
+    stats = decoder.get_stats()
+    decoder.stop()
+    return {"latencies": latencies, "drained": stats["drained"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--cost-ms", type=float, default=25.0,
+                        help="on_frame cost per frame outside the overload")
+    parser.add_argument("--overload-ms", type=float, default=60.0,
+                        help="on_frame cost per frame during the overload")
+    args = parser.parse_args()
+
+    print(
+        f"{args.width}x{args.height} RGB24 at {args.fps:g} fps, on_frame "
+        f"{args.cost_ms:g} ms, {args.overload_ms:g} ms from "
+        f"{OVERLOAD_START:g} s to {OVERLOAD_END:g} s"
+    )
+    print(f"{'mode':<10}{'phase':<10}{'frames':>8}{'mean ms':>10}{'max ms':>10}")
+    for mode, max_queued_bytes in (("in order", None), ("bounded", 0)):
+        result = run(args, max_queued_bytes)
+        for name, _, _ in PHASES:
+            values = np.array(result["latencies"][name]) * 1000
+            mean = values.mean() if values.size else float("nan")
+            peak = values.max() if values.size else float("nan")
+            print(f"{mode:<10}{name:<10}{values.size:>8}{mean:>10.1f}{peak:>10.1f}")
+        print(f"{'':<10}{result['drained']} stale frames drained")
+
+
+if __name__ == "__main__":
+    main()
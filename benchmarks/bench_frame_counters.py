@@ -0,0 +1,170 @@
+"""
+Micro-benchmark: per-frame accounting with locks vs. per-thread counters.
+
+Publishes synthetic frames at 240 fps through the per-frame bookkeeping of
+FrameDecoder and ConnectionManager while reader threads - standing in for
+the tray, the /health endpoint and the connection monitor - poll the
+counters as fast as they can. Compares the previous lock-based accounting
+(reproduced here) with the current lock-free path, and reports the time the
+frame thread spends per frame and how many reads the readers completed.
+
+The tail is what matters: when the interpreter switches away from a reader
+that holds a lock, the frame thread blocks on that lock until the reader
+runs again, one GIL switch interval or more.
+
+Usage:
+    python -m benchmarks.bench_frame_counters
+    python -m benchmarks.bench_frame_counters --seconds 5 --readers 4
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from src.connection_manager import ConnectionManager  # noqa: E402
+from src.decoder import FrameDecoder  # noqa: E402
+
+FPS = 240
+
+# Fields of a /health-style snapshot built on every read
+_PROGRESS = {f"field{i}": float(i) for i in range(16)}
+
+
+def _snapshot(frames: int, latest) -> dict:
+    """Build a stats dict the way the tray and /health readers do."""
+    return {
+        "frames": frames,
+        "shape": None if latest is None else latest.shape,
+        "progress": dict(_PROGRESS),
+    }
+
+
+class LockedAccounting:
+    """The previous accounting: shared ints guarded by the component locks."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame_ready = threading.Condition(self._lock)
+        self._frame_buffer = deque(maxlen=2)
+        self._frame_count = 0
+        self._generation = 0
+        self._cm_lock = threading.Lock()
+        self._cm_frame_count = 0
+        self._last_frame_time = None
+
+    def publish(self, frame: np.ndarray) -> None:
+        # FrameDecoder._publish_frame
+        with self._frame_ready:
+            self._frame_buffer.append(frame)
+            self._frame_count += 1
+            self._generation += 1
+            self._frame_ready.notify_all()
+        # ConnectionManager.report_frame_received
+        with self._cm_lock:
+            self._last_frame_time = datetime.now()
+            self._cm_frame_count += 1
+
+    def read(self) -> dict:
+        with self._lock:
+            latest = self._frame_buffer[-1] if self._frame_buffer else None
+            count = self._frame_count
+        # ConnectionManager.get_stats built its dict under the lock
+        with self._cm_lock:
+            return _snapshot(count + self._cm_frame_count, latest)
+
+
+class CounterAccounting:
+    """The current accounting, using the real components."""
+
+    def __init__(self):
+        self._decoder = FrameDecoder(width=64, height=36)
+        self._manager = ConnectionManager(lambda s: None, lambda h: None)
+
+    def publish(self, frame: np.ndarray) -> None:
+        self._decoder._publish_frame(frame)
+        self._manager.report_frame_received()
+
+    def read(self) -> dict:
+        latest = self._decoder.latest_frame
+        return _snapshot(
+            self._decoder.frame_count + self._manager.frame_count, latest
+        )
+
+
+def run(accounting, seconds: float, readers: int) -> dict:
+    """Publish frames at FPS for ``seconds`` while ``readers`` threads poll."""
+    frame = np.zeros((36, 64, 3), dtype=np.uint8)
+    stop = threading.Event()
+    reads = [0] * readers
+
+    def reader(i: int) -> None:
+        while not stop.is_set():
+            accounting.read()
+            reads[i] += 1
+
+    threads = [
+        threading.Thread(target=reader, args=(i,), daemon=True)
+        for i in range(readers)
+    ]
+    for t in threads:
+        t.start()
+
+    interval = 1.0 / FPS
+    frames = int(seconds * FPS)
+    costs = np.empty(frames, dtype=np.float64)
+    start = time.perf_counter()
+    for i in range(frames):
+        deadline = start + i * interval
+        while time.perf_counter() < deadline:
+            time.sleep(0)
+        t0 = time.perf_counter()
+        accounting.publish(frame)
+        costs[i] = time.perf_counter() - t0
+
+    stop.set()
+    for t in threads:
+        t.join()
+    final = accounting.read()["frames"]
+
+    return {
+        "p50": float(np.percentile(costs, 50)),
+        "p99": float(np.percentile(costs, 99)),
+        "max": float(costs.max()),
+        "reads": sum(reads) / seconds,
+        "counted": final == 2 * frames,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--readers", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{FPS} fps for {args.seconds:.0f} s, {args.readers} polling readers")
+    print(
+        f"{'accounting':<12}{'p50 µs':>10}{'p99 µs':>10}{'max µs':>10}"
+        f"{'reads/s':>12}{'counts ok':>11}"
+    )
+    for label, accounting in (
+        ("locked", LockedAccounting()),
+        ("counters", CounterAccounting()),
+    ):
+        r = run(accounting, args.seconds, args.readers)
+        print(
+            f"{label:<12}{r['p50'] * 1e6:>10.1f}{r['p99'] * 1e6:>10.1f}"
+            f"{r['max'] * 1e6:>10.1f}{r['reads']:>12.0f}"
+            f"{'yes' if r['counted'] else 'NO':>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
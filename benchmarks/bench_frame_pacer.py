@@ -0,0 +1,152 @@
+"""
+Benchmark: virtual camera output pacing.
+
+Runs the fixed-rate output loop against the real pyvirtualcam Camera with an
+in-memory backend that timestamps every frame it receives. Compares the
+previous loop - ``cam.sleep_until_next_frame()`` followed by its own
+``time.sleep(interval - elapsed)`` - with VirtualCameraOutput's FramePacer,
+at 30 and 60 fps, and reports the delivered frame rate and how regular the
+frame intervals are.
+
+``--timer-resolution-ms`` rounds every sleep up to a multiple of the given
+period, which approximates a coarse OS timer (e.g. 15.6 ms on older Windows
+Python builds).
+
+Usage:
+    python -m benchmarks.bench_frame_pacer
+    python -m benchmarks.bench_frame_pacer --seconds 5 --timer-resolution-ms 15.6
+"""
+
+import argparse
+import math
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+import pyvirtualcam  # noqa: E402
+
+from src.virtual_camera import VirtualCameraOutput  # noqa: E402
+
+WIDTH, HEIGHT = 64, 36
+
+
+class _TimestampBackend:
+    """pyvirtualcam backend that records when each frame arrives."""
+
+    sent: list = []
+
+    def __init__(self, *, width, height, fps, fourcc, device, **kw):
+        _TimestampBackend.sent = []
+
+    def close(self):
+        pass
+
+    def send(self, frame):
+        _TimestampBackend.sent.append(time.perf_counter())
+
+    def device(self):
+        return "bench"
+
+    def native_fourcc(self):
+        return None
+
+
+pyvirtualcam.register_backend("bench", _TimestampBackend)
+
+
+def old_loop(cam, fps: float, running: threading.Event, frame) -> None:
+    """The output loop before FramePacer."""
+    interval = 1.0 / fps
+    while running.is_set():
+        t0 = time.monotonic()
+        cam.send(frame)
+        cam.sleep_until_next_frame()
+        elapsed = time.monotonic() - t0
+        sleep_remaining = interval - elapsed
+        if sleep_remaining > 0:
+            time.sleep(sleep_remaining)
+
+
+def run(mode: str, fps: float, seconds: float) -> dict:
+    """Run one output loop for ``seconds`` and summarize frame intervals."""
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    cam = pyvirtualcam.Camera(WIDTH, HEIGHT, fps, backend="bench")
+    running = threading.Event()
+    running.set()
+
+    if mode == "double sleep":
+        target = lambda: old_loop(cam, fps, running, frame)  # noqa: E731
+        stop = running.clear
+        vcam = None
+    else:
+        vcam = VirtualCameraOutput(
+            width=WIDTH,
+            height=HEIGHT,
+            fps=fps,
+            precise_pacing=mode == "pacer (precise)",
+        )
+        vcam._frame_source = lambda: frame
+        vcam._running = True
+        target = lambda: vcam._send_on_timer(cam)  # noqa: E731
+
+        def stop():
+            vcam._running = False
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    time.sleep(seconds)
+    stop()
+    thread.join()
+    cam.close()
+
+    sent = np.array(_TimestampBackend.sent)
+    intervals = np.diff(sent)
+    nominal = 1.0 / fps
+    return {
+        "fps": (len(sent) - 1) / (sent[-1] - sent[0]),
+        "jitter": float(intervals.std()),
+        "p99_error": float(np.percentile(np.abs(intervals - nominal), 99)),
+        "late": None if vcam is None else vcam.pacer.late_count,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--timer-resolution-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.timer_resolution_ms > 0:
+        resolution = args.timer_resolution_ms / 1000
+        real_sleep = time.sleep
+
+        def coarse_sleep(seconds):
+            if seconds <= 0:
+                real_sleep(0)
+            else:
+                real_sleep(math.ceil(seconds / resolution) * resolution)
+
+        time.sleep = coarse_sleep
+        print(f"sleep rounded up to {args.timer_resolution_ms:g} ms")
+
+    print(
+        f"{'loop':<18}{'target':>8}{'delivered fps':>15}"
+        f"{'jitter ms':>11}{'p99 error ms':>14}{'late':>7}"
+    )
+    for fps in (30, 60):
+        for mode in ("double sleep", "pacer", "pacer (precise)"):
+            r = run(mode, fps, args.seconds)
+            late = "-" if r["late"] is None else str(r["late"])
+            print(
+                f"{mode:<18}{fps:>8}{r['fps']:>15.2f}{r['jitter'] * 1000:>11.2f}"
+                f"{r['p99_error'] * 1000:>14.2f}{late:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Micro-benchmark: pooled readinto() ingestion vs. read() + np.frombuffer.
+
+Feeds the same raw RGB24 stream through FrameDecoder twice - once with the
+frame pool enabled and once with the allocate-per-frame path - and reports
+per-frame read time, buffer allocations per second and (where the platform
+exposes it) minor page faults, which track how much fresh memory the reader
+touches.
+
+The stream is served from a temporary file so the numbers measure the
+ingestion path itself rather than how fast a writer can fill a pipe.
+
+Usage:
+    python -m benchmarks.bench_frame_pool
+    python -m benchmarks.bench_frame_pool --width 3840 --height 2160 --frames 120
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from src.decoder import FrameDecoder  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+class _TimedReader:
+    """File wrapper that accumulates time spent inside read calls."""
+
+    def __init__(self, f):
+        self._f = f
+        self.read_time = 0.0
+        self.calls = 0
+
+    def read(self, size=-1):
+        t0 = time.perf_counter()
+        try:
+            return self._f.read(size)
+        finally:
+            self.read_time += time.perf_counter() - t0
+            self.calls += 1
+
+    def readinto(self, buf):
+        t0 = time.perf_counter()
+        try:
+            return self._f.readinto(buf)
+        finally:
+            self.read_time += time.perf_counter() - t0
+            self.calls += 1
+
+
+class _FileProc:
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.stderr = io.BytesIO(b"")
+
+
+class _FileAdapter:
+    def __init__(self, proc):
+        self._proc = proc
+
+    def get_stdout(self):
+        return self._proc
+
+
+def _minor_faults() -> int | None:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+
+
+def run(path: str, width: int, height: int, frames: int, pooled: bool) -> dict:
+    """Decode ``frames`` frames from ``path`` and collect statistics."""
+    with open(path, "rb") as f:
+        reader = _TimedReader(f)
+        decoder = FrameDecoder(
+            width=width, height=height, use_frame_pool=pooled
+        )
+
+        faults0 = _minor_faults()
+        t0 = time.perf_counter()
+        decoder.start(_FileAdapter(_FileProc(reader)))
+        while decoder.frame_count < frames:
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - t0
+        faults1 = _minor_faults()
+        decoder.stop()
+
+    if pooled and decoder.frame_pool is not None:
+        allocations = decoder.frame_pool.allocations
+    else:
+        # Every read() returns a freshly allocated bytes object.
+        allocations = frames
+
+    return {
+        "elapsed": elapsed,
+        "read_ms": reader.read_time / frames * 1000,
+        "allocs_per_s": allocations / elapsed,
+        "alloc_mb_per_s": allocations * width * height * 3 / 1e6 / elapsed,
+        "faults": None if faults0 is None else faults1 - faults0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frame = np.random.default_rng(0).integers(
+        0, 255, (args.height, args.width, 3), dtype=np.uint8
+    ).tobytes()
+
+    fd, path = tempfile.mkstemp(suffix=".rgb")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for _ in range(args.frames):
+                f.write(frame)
+
+        print(
+            f"{args.width}x{args.height} rgb24, {args.frames} frames, "
+            f"{len(frame) / 1e6:.1f} MB/frame"
+        )
+        print(
+            f"{'mode':<10}{'read ms/frame':>15}{'allocs/s':>12}"
+            f"{'alloc MB/s':>12}{'minor faults':>14}"
+        )
+        for pooled in (False, True):
+            best = None
+            for _ in range(args.repeat):
+                result = run(path, args.width, args.height, args.frames, pooled)
+                if best is None or result["read_ms"] < best["read_ms"]:
+                    best = result
+            faults = "n/a" if best["faults"] is None else str(best["faults"])
+            print(
+                f"{'pool' if pooled else 'read()':<10}"
+                f"{best['read_ms']:>15.3f}"
+                f"{best['allocs_per_s']:>12.1f}"
+                f"{best['alloc_mb_per_s']:>12.1f}"
+                f"{faults:>14}"
+            )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Benchmark: glass-to-glass latency per protocol and ingest profile.
+
+A local sender streams a test pattern with a machine-readable stamp burned
+into every frame: a strip of black and white blocks carrying a frame
+counter and the wall-clock time the frame was "captured". RTMP and SRT
+frames are encoded by an FFmpeg sender (libx264, zerolatency); WebRTC
+frames by an aiortc peer that signals the adapter like a phone would.
+
+The real adapter, FrameDecoder and VirtualCameraOutput receive the stream
+on loopback. The camera writes into a FileFrameSink, so no camera driver
+is needed; afterwards every frame in the sink is decoded and its latency
+is the sink's send time minus the stamp. Repeats of a frame (sender
+stalls) count once, and the first second after the first frame is left
+out so connection set-up does not skew the steady state.
+
+Frames are I420 end to end and the stamp is read from the Y plane.
+
+Requires FFmpeg with libx264 (RTMP) and libsrt (SRT), found the same way
+as the app (see src/config.py); WebRTC additionally needs aiortc and
+zeroconf and is skipped without them.
+
+Usage:
+    python -m benchmarks.bench_glass_to_glass
+    python -m benchmarks.bench_glass_to_glass --protocols srt --seconds 20
+    python -m benchmarks.bench_glass_to_glass --max-queued-bytes 0
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from src import config  # noqa: E402
+from src.decoder import FrameDecoder  # noqa: E402
+from src.file_sink import read_frames  # noqa: E402
+from src.ingest_profile import IngestProfile  # noqa: E402
+from src.pixel_format import PixelFormat  # noqa: E402
+from src.virtual_camera import VirtualCameraOutput  # noqa: E402
+
+WIDTH, HEIGHT = 640, 360
+PIXEL_FORMAT = PixelFormat.I420
+
+# Stamp: 64 blocks in two rows at the top left, one bit each. Big blocks
+# survive H.264 at ultrafast settings without any error correction.
+BLOCK = 20
+BITS_PER_ROW = 32
+SYNC = 0xA5
+WARMUP = 1.0
+
+
+# ── stamp ────────────────────────────────────────────
+
+def _stamp_bytes(counter: int, stamp_ms: int) -> bytes:
+    """Sync byte, 16-bit counter, 32-bit milliseconds, checksum."""
+    body = bytes([SYNC]) + (counter & 0xFFFF).to_bytes(2, "big") + (
+        stamp_ms & 0xFFFFFFFF
+    ).to_bytes(4, "big")
+    return body + bytes([sum(body) & 0xFF])
+
+
+def draw_stamp(rgb: np.ndarray, counter: int, stamp_ms: int) -> None:
+    """Burn ``counter`` and ``stamp_ms`` into the top of an RGB frame."""
+    bits = np.unpackbits(np.frombuffer(_stamp_bytes(counter, stamp_ms), dtype=np.uint8))
+    for index, bit in enumerate(bits):
+        row, col = divmod(index, BITS_PER_ROW)
+        rgb[row * BLOCK:(row + 1) * BLOCK, col * BLOCK:(col + 1) * BLOCK] = 255 * bit
+
+
+def read_stamp(luma: np.ndarray) -> tuple[int, int] | None:
+    """
+    Read the stamp from a frame's Y plane.
+
+    Returns ``(counter, stamp_ms)``, or None if the sync byte or the
+    checksum does not match (e.g. the standby frame).
+    """
+    rows = 64 // BITS_PER_ROW
+    strip = luma[:rows * BLOCK, :BITS_PER_ROW * BLOCK].astype(np.float32)
+    # Mean of each block's centre, away from the blurred edges
+    blocks = strip.reshape(rows, BLOCK, BITS_PER_ROW, BLOCK)[
+        :, BLOCK // 4:-BLOCK // 4, :, BLOCK // 4:-BLOCK // 4
+    ].mean(axis=(1, 3))
+    data = np.packbits((blocks.reshape(-1) > 128).astype(np.uint8)).tobytes()
+    if data[0] != SYNC or sum(data[:7]) & 0xFF != data[7]:
+        return None
+    return int.from_bytes(data[1:3], "big"), int.from_bytes(data[3:7], "big")
+
+
+class PatternSource:
+    """Moving test pattern with a stamp, one frame per call."""
+
+    def __init__(self):
+        y, x = np.mgrid[0:HEIGHT, 0:WIDTH]
+        self._background = np.stack(
+            [x * 255 // WIDTH, y * 255 // HEIGHT, (x + y) * 255 // (WIDTH + HEIGHT)],
+            axis=-1,
+        ).astype(np.uint8)
+        self.counter = 0
+
+    def next_frame(self) -> np.ndarray:
+        """Return the next RGB frame, stamped with the current time."""
+        frame = np.roll(self._background, self.counter * 4, axis=1)
+        self.counter += 1
+        draw_stamp(frame, self.counter, int(time.time() * 1000))
+        return frame
+
+
+# ── senders ──────────────────────────────────────────
+
+def _sender_output(protocol: str, port: int) -> list[str]:
+    if protocol == "rtmp":
+        return ["-f", "flv", f"rtmp://127.0.0.1:{port}/live/stream"]
+    return ["-f", "mpegts", f"srt://127.0.0.1:{port}?mode=caller"]
+
+
+def run_ffmpeg_sender(protocol: str, port: int, fps: float, stop: threading.Event) -> int:
+    """Encode pattern frames in real time until ``stop``; return frames sent."""
+    sender = subprocess.Popen(
+        [
+            config.FFMPEG_BIN, "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{WIDTH}x{HEIGHT}",
+            "-r", f"{fps:g}", "-i", "-",
+            "-c:v", "libx264", "-preset", "ultrafast", "-tune", "zerolatency",
+            "-g", f"{fps:g}", "-pix_fmt", "yuv420p",
+            *_sender_output(protocol, port),
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    source = PatternSource()
+    start = time.perf_counter()
+    try:
+        while not stop.is_set():
+            delay = start + source.counter / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            sender.stdin.write(source.next_frame().data)
+    except (BrokenPipeError, OSError):
+        pass
+    finally:
+        try:
+            sender.stdin.close()
+        except OSError:
+            pass
+        sender.kill()
+        sender.wait()
+    return source.counter
+
+
+async def run_webrtc_sender(port: int, stop: asyncio.Event) -> int:
+    """Stream pattern frames through an aiortc peer until ``stop``."""
+    from aiortc import RTCPeerConnection, RTCSessionDescription, VideoStreamTrack
+    from av import VideoFrame
+
+    source = PatternSource()
+
+    class PatternTrack(VideoStreamTrack):
+        async def recv(self):
+            pts, time_base = await self.next_timestamp()
+            frame = VideoFrame.from_ndarray(source.next_frame(), format="rgb24")
+            frame.pts = pts
+            frame.time_base = time_base
+            return frame
+
+    pc = RTCPeerConnection()
+    pc.addTrack(PatternTrack())
+    await pc.setLocalDescription(await pc.createOffer())
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(json.dumps(
+        {"type": pc.localDescription.type, "sdp": pc.localDescription.sdp}
+    ).encode("utf-8"))
+    await writer.drain()
+    answer = json.loads(await reader.read(65536))
+    writer.close()
+    await pc.setRemoteDescription(RTCSessionDescription(sdp=answer["sdp"], type=answer["type"]))
+    await stop.wait()
+    await pc.close()
+    return source.counter
+
+
+# ── receiver ─────────────────────────────────────────
+
+def make_adapter(protocol: str, profile: IngestProfile | None):
+    """Real adapter for ``protocol`` producing I420 at the pattern size."""
+    if protocol == "webrtc":
+        from src.protocols.webrtc import WebRTCAdapter
+        return WebRTCAdapter(width=WIDTH, height=HEIGHT, pixel_format=PIXEL_FORMAT)
+    if protocol == "rtmp":
+        from src.protocols.rtmp import RTMPAdapter as adapter_class
+    else:
+        from src.protocols.srt import SRTAdapter as adapter_class
+    return adapter_class(
+        width=WIDTH, height=HEIGHT, pixel_format=PIXEL_FORMAT, ingest_profile=profile
+    )
+
+
+async def run(protocol: str, profile: IngestProfile | None, port: int, args) -> dict:
+    """Stream for ``args.seconds``; return frame counts and latencies in ms."""
+    sink_path = os.path.join(args.workdir, f"{protocol}-{port}.yuv")
+    adapter = make_adapter(protocol, profile)
+    decoder = FrameDecoder(
+        width=WIDTH, height=HEIGHT, pixel_format=PIXEL_FORMAT,
+        max_queued_bytes=args.max_queued_bytes,
+    )
+    vcam = VirtualCameraOutput(
+        width=WIDTH, height=HEIGHT, fps=int(args.fps),
+        pixel_format=PIXEL_FORMAT, sink_path=sink_path,
+    )
+
+    await adapter.start(port=port, path="live/stream")
+    decoder.start(adapter)
+    vcam.start(frame_source=decoder.latest_envelope, wait_for_frame=decoder.wait_for_envelope)
+    await asyncio.sleep(0.5)  # let the listener bind
+
+    loop = asyncio.get_running_loop()
+    if protocol == "webrtc":
+        stop = asyncio.Event()
+        sender = asyncio.create_task(run_webrtc_sender(port, stop))
+        await asyncio.sleep(args.seconds)
+        stop.set()
+        sent = await sender
+    else:
+        stop = threading.Event()
+        sender = loop.run_in_executor(
+            None, run_ffmpeg_sender, protocol, port, args.fps, stop
+        )
+        await asyncio.sleep(args.seconds)
+        stop.set()
+        sent = await sender
+
+    await asyncio.sleep(0.5)  # frames still in flight
+    vcam.stop()
+    decoder.stop()
+    await adapter.stop()
+
+    latencies = []
+    seen = set()
+    first = None
+    for sent_at, frame in read_frames(sink_path, PIXEL_FORMAT):
+        stamp = read_stamp(frame[:HEIGHT])
+        if stamp is None or stamp[0] in seen:
+            continue
+        counter, stamp_ms = stamp
+        seen.add(counter)
+        if first is None:
+            first = counter
+        if counter - first < WARMUP * args.fps:
+            continue
+        # The stamp wraps every ~50 days; the difference does not
+        latencies.append((sent_at * 1000 - stamp_ms) % 2 ** 32)
+    os.remove(sink_path)
+    os.remove(sink_path + ".index")
+    return {"sent": sent, "received": len(seen), "latencies": np.array(latencies)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--protocols", nargs="+", default=["rtmp", "srt", "webrtc"],
+                        choices=["rtmp", "srt", "webrtc"])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--port", type=int, default=2950)
+    parser.add_argument("--max-queued-bytes", type=int, default=None,
+                        help="FrameDecoder backlog bound (default: read every frame)")
+    args = parser.parse_args()
+
+    if config.FFMPEG_BIN is None:
+        print("FFmpeg not found - install it or run: python src/setup_ffmpeg.py")
+        sys.exit(1)
+
+    print(f"{WIDTH}x{HEIGHT} I420 at {args.fps:g} fps, {args.seconds:g} s per run, "
+          f"first {WARMUP:g} s left out, max_queued_bytes={args.max_queued_bytes}")
+    print(f"{'protocol':<10}{'profile':<12}{'frames':>12}"
+          f"{'mean ms':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    port = args.port
+    with tempfile.TemporaryDirectory(prefix="lvc-g2g-") as workdir:
+        args.workdir = workdir
+        for protocol in args.protocols:
+            profiles = [None] if protocol == "webrtc" else list(IngestProfile)
+            for profile in profiles:
+                label = profile.value if profile else "n/a"
+                try:
+                    result = asyncio.run(run(protocol, profile, port, args))
+                except RuntimeError as e:
+                    # WebRTC without aiortc/zeroconf, FFmpeg without libsrt
+                    print(f"{protocol:<10}{label:<12}skipped: {str(e).splitlines()[0]}")
+                    continue
+                finally:
+                    port += 1  # avoid TIME_WAIT on the previous listener
+                frames = f"{result['received']}/{result['sent']}"
+                lat = result["latencies"]
+                if not result["received"]:
+                    print(f"{protocol:<10}{label:<12}{frames:>12}  no frames arrived")
+                    continue
+                if not lat.size:
+                    print(f"{protocol:<10}{label:<12}{frames:>12}  no stamped frames")
+                    continue
+                print(f"{protocol:<10}{label:<12}{frames:>12}"
+                      f"{lat.mean():>9.1f}{np.percentile(lat, 50):>9.1f}"
+                      f"{np.percentile(lat, 95):>9.1f}{np.percentile(lat, 99):>9.1f}"
+                      f"{lat.max():>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
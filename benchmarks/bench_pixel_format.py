@@ -0,0 +1,142 @@
+"""
+Benchmark: RGB24 vs. planar (NV12/I420) transport over the FFmpeg pipe.
+
+Encodes a short H.264 test clip once, then decodes it with the same
+rawvideo output options the adapters use, once per pixel format, while a
+reader drains stdout in whole frames. Reports pipe throughput, frames per
+second and CPU usage of FFmpeg and of the reader.
+
+Requires FFmpeg with libx264 (found the same way as the app, see
+src/config.py). CPU usage of the FFmpeg child is only available on
+platforms with the ``resource`` module.
+
+Usage:
+    python -m benchmarks.bench_pixel_format
+    python -m benchmarks.bench_pixel_format --width 1920 --height 1080 --seconds 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+from src import config  # noqa: E402
+from src.pixel_format import PixelFormat, ffmpeg_pix_fmt, frame_bytes  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+def _children_cpu() -> float | None:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def make_clip(path: str, width: int, height: int, fps: int, seconds: int) -> None:
+    """Encode a testsrc2 clip resembling a phone stream."""
+    subprocess.run(
+        [
+            config.FFMPEG_BIN, "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate={fps}",
+            "-t", str(seconds),
+            "-c:v", "libx264", "-preset", "ultrafast", "-tune", "zerolatency",
+            "-pix_fmt", "yuv420p",
+            path,
+        ],
+        check=True,
+    )
+
+
+def run(path: str, fmt: PixelFormat, width: int, height: int) -> dict:
+    """Decode ``path`` to rawvideo in ``fmt`` and drain the pipe."""
+    size = frame_bytes(fmt, width, height)
+    cmd = [
+        config.FFMPEG_BIN, "-loglevel", "error",
+        "-i", path,
+        "-f", "rawvideo",
+        "-pix_fmt", ffmpeg_pix_fmt(fmt),
+        "-s", f"{width}x{height}",
+        "-an", "-sn",
+        "pipe:1",
+    ]
+
+    cpu0 = _children_cpu()
+    reader_cpu0 = time.process_time()
+    t0 = time.perf_counter()
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, bufsize=0)
+    buf = bytearray(size)
+    view = memoryview(buf)
+    frames = 0
+    total = 0
+    while True:
+        filled = 0
+        while filled < size:
+            n = proc.stdout.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        total += filled
+        if filled < size:
+            break
+        frames += 1
+    proc.wait()
+
+    elapsed = time.perf_counter() - t0
+    reader_cpu = time.process_time() - reader_cpu0
+    cpu1 = _children_cpu()
+
+    return {
+        "frames": frames,
+        "fps": frames / elapsed,
+        "mb_per_s": total / 1e6 / elapsed,
+        "ffmpeg_cpu": None if cpu0 is None else (cpu1 - cpu0) / elapsed * 100,
+        "reader_cpu": reader_cpu / elapsed * 100,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=int, default=10)
+    args = parser.parse_args()
+
+    if config.FFMPEG_BIN is None:
+        print("FFmpeg not found - install it or run: python src/setup_ffmpeg.py")
+        sys.exit(1)
+
+    fd, clip = tempfile.mkstemp(suffix=".mp4")
+    os.close(fd)
+    try:
+        make_clip(clip, args.width, args.height, args.fps, args.seconds)
+        print(
+            f"{args.width}x{args.height} H.264 clip, "
+            f"{args.fps * args.seconds} frames, decoded as fast as possible"
+        )
+        print(
+            f"{'format':<8}{'fps':>10}{'pipe MB/s':>12}"
+            f"{'ffmpeg CPU%':>14}{'reader CPU%':>14}"
+        )
+        for fmt in PixelFormat:
+            r = run(clip, fmt, args.width, args.height)
+            ffmpeg_cpu = "n/a" if r["ffmpeg_cpu"] is None else f"{r['ffmpeg_cpu']:.0f}"
+            print(
+                f"{fmt.value:<8}{r['fps']:>10.1f}{r['mb_per_s']:>12.1f}"
+                f"{ffmpeg_cpu:>14}{r['reader_cpu']:>14.0f}"
+            )
+    finally:
+        os.unlink(clip)
+
+
+if __name__ == "__main__":
+    main()
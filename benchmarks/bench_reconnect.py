@@ -0,0 +1,145 @@
+"""
+Benchmark: sender reconnect to first frame.
+
+Starts the real RTMPAdapter and FrameDecoder, streams an H.264 test pattern
+over RTMP, kills the sender (as a phone dropping off Wi-Fi would) and starts
+a new one right away. Reports the time from launching the second sender to
+its first frame in FrameDecoder, and the decoder's own downtime metric
+(from the end of the first stream), with the warm-standby listener and
+with a listener spawned only when the first FFmpeg child exits.
+
+Requires FFmpeg with libx264 (found the same way as the app, see
+src/config.py).
+
+Usage:
+    python -m benchmarks.bench_reconnect
+    python -m benchmarks.bench_reconnect --runs 5 --profile fast-start
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from src import config  # noqa: E402
+from src.decoder import FrameDecoder  # noqa: E402
+from src.ingest_profile import IngestProfile  # noqa: E402
+from src.protocols.rtmp import RTMPAdapter  # noqa: E402
+
+from benchmarks.bench_time_to_first_frame import (  # noqa: E402
+    HEIGHT,
+    WIDTH,
+    start_sender,
+)
+
+
+async def run(
+    warm_standby: bool, profile: IngestProfile, port: int, timeout: float
+) -> dict | None:
+    """Measure one disconnect/reconnect cycle."""
+    adapter = RTMPAdapter(
+        width=WIDTH,
+        height=HEIGHT,
+        ingest_profile=profile,
+        warm_standby=warm_standby,
+    )
+    decoder = FrameDecoder(width=WIDTH, height=HEIGHT)
+    loop = asyncio.get_running_loop()
+
+    await adapter.start(port=port, path="live/stream")
+    decoder.start(adapter)
+    await asyncio.sleep(0.5)  # let the listener bind
+
+    first = start_sender(port, seconds=int(timeout) + 1)
+    await loop.run_in_executor(None, decoder.wait_for_frame, 0, timeout)
+    await asyncio.sleep(1.0)  # stream for a while, standby gets spawned
+    first.kill()
+    first.wait()
+
+    # Like a phone, reconnect at once and retry while connections are refused
+    reconnect_started = time.monotonic()
+    second = start_sender(port, seconds=int(timeout) + 1)
+    attempts = 1
+
+    # Frames still in flight from the first sender are not counted: the
+    # second sender's frames arrive after the decoder moved to the next child
+    while decoder.reattach_count == 0:
+        await asyncio.sleep(0.001)
+    generation = decoder.frame_generation
+
+    wait = loop.run_in_executor(None, decoder.wait_for_frame, generation, timeout)
+    while not wait.done():
+        if second.poll() is not None:
+            second = start_sender(port, seconds=int(timeout) + 1)
+            attempts += 1
+        await asyncio.sleep(0.01)
+    new_generation, _ = wait.result()
+    back_on_screen = time.monotonic()
+
+    second.kill()
+    second.wait()
+    reattached = decoder.reattach_count
+    downtime = decoder.last_downtime
+    decoder.stop()
+    await adapter.stop()
+
+    if new_generation == generation or not reattached:
+        return None
+    return {
+        "reconnect": back_on_screen - reconnect_started,
+        "downtime": downtime,
+        "attempts": attempts,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=2960)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument(
+        "--profile",
+        choices=[p.value for p in IngestProfile],
+        default=IngestProfile.DEFAULT.value,
+    )
+    args = parser.parse_args()
+
+    if config.FFMPEG_BIN is None:
+        print("FFmpeg not found - install it or run: python src/setup_ffmpeg.py")
+        sys.exit(1)
+
+    profile = IngestProfile(args.profile)
+    print(
+        f"RTMP {WIDTH}x{HEIGHT} H.264 sender, {profile.value} profile, "
+        f"{args.runs} runs per mode"
+    )
+    print(
+        f"{'listener':<18}{'reconnect→frame ms':>20}"
+        f"{'decoder downtime ms':>21}{'sender attempts':>18}"
+    )
+    port = args.port
+    for label, warm_standby in (("warm standby", True), ("spawn on exit", False)):
+        results = []
+        for _ in range(args.runs):
+            result = asyncio.run(run(warm_standby, profile, port, args.timeout))
+            port += 1  # avoid TIME_WAIT on the previous listener
+            if result is not None:
+                results.append(result)
+        if not results:
+            print(f"{label:<18}{'no frame':>20}")
+            continue
+        reconnect = statistics.median(r["reconnect"] for r in results)
+        downtime = statistics.median(r["downtime"] for r in results)
+        attempts = statistics.median(r["attempts"] for r in results)
+        print(
+            f"{label:<18}{reconnect * 1000:>20.0f}"
+            f"{downtime * 1000:>21.0f}{attempts:>18.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
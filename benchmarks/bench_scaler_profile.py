@@ -0,0 +1,137 @@
+"""
+Benchmark: per-frame cost of FFmpeg's fit step for each scaler profile.
+
+Writes a few raw yuv420p test frames per source size, loops them through
+FFmpeg with the same -vf chain and -sws_flags the RTMP/SRT adapters use and
+reads FFmpeg's own CPU time (-benchmark). A run that only passes the frames
+through (-vf null, no pixel format conversion) is subtracted, so the figure
+is what the scale, pad and pixel format conversion cost per frame. Decoding
+is not included.
+
+Cases: 1080p -> 720p, 4K -> 1080p and 720p -> 720p (equal sizes, where the
+scale filter passes frames through and only the pixel format conversion is
+left).
+
+Requires FFmpeg (found the same way as the app, see src/config.py).
+
+Usage:
+    python -m benchmarks.bench_scaler_profile
+    python -m benchmarks.bench_scaler_profile --frames 300 --pixel-format i420
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.getcwd())
+
+from src import config  # noqa: E402
+from src.frame_fitter import FitMode  # noqa: E402
+from src.pixel_format import PixelFormat, ffmpeg_pix_fmt  # noqa: E402
+from src.video_transform import (  # noqa: E402
+    ScalerProfile,
+    VideoTransform,
+    video_filter_args,
+)
+
+CASES = [
+    ((1920, 1080), (1280, 720)),
+    ((3840, 2160), (1920, 1080)),
+    ((1280, 720), (1280, 720)),
+]
+# Distinct frames written per source size; looped up to --frames
+UNIQUE_FRAMES = 10
+
+_UTIME = re.compile(r"bench: utime=([\d.]+)s stime=([\d.]+)s rtime=([\d.]+)s")
+
+
+def make_frames(path: str, width: int, height: int) -> None:
+    """Write ``UNIQUE_FRAMES`` raw yuv420p testsrc2 frames."""
+    subprocess.run(
+        [
+            config.FFMPEG_BIN, "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate=30",
+            "-frames:v", str(UNIQUE_FRAMES),
+            "-pix_fmt", "yuv420p", "-f", "rawvideo", path,
+        ],
+        check=True,
+    )
+
+
+def run(path: str, size: tuple, frames: int, output_args: list) -> tuple:
+    """Push ``frames`` frames through FFmpeg; return (cpu, wall) seconds."""
+    width, height = size
+    result = subprocess.run(
+        [
+            # -benchmark reports at info level
+            config.FFMPEG_BIN, "-hide_banner", "-nostats", "-benchmark",
+            "-stream_loop", str(frames // UNIQUE_FRAMES),
+            "-f", "rawvideo", "-pix_fmt", "yuv420p", "-s", f"{width}x{height}",
+            "-i", path,
+            "-frames:v", str(frames),
+            *output_args,
+            "-f", "null", "-",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    match = _UTIME.search(result.stderr)
+    if match is None:
+        raise RuntimeError(f"No -benchmark output from FFmpeg:\n{result.stderr}")
+    utime, stime, rtime = (float(v) for v in match.groups())
+    return utime + stime, rtime
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument(
+        "--pixel-format",
+        choices=[f.value for f in PixelFormat],
+        default=PixelFormat.RGB24.value,
+    )
+    args = parser.parse_args()
+
+    if config.FFMPEG_BIN is None:
+        print("FFmpeg not found - install it or run: python src/setup_ffmpeg.py")
+        sys.exit(1)
+
+    pix_fmt = ffmpeg_pix_fmt(PixelFormat(args.pixel_format))
+    frames = max(args.frames, UNIQUE_FRAMES)
+    print(
+        f"{frames} frames per run, output {args.pixel_format}, "
+        "letterbox, cost per frame above a pass-through run"
+    )
+    print(f"{'case':<22}{'profile':<16}{'CPU ms':>10}{'wall ms':>10}")
+
+    for source, output in CASES:
+        fd, path = tempfile.mkstemp(suffix=".yuv")
+        os.close(fd)
+        try:
+            make_frames(path, *source)
+            base_cpu, base_wall = run(
+                path, source, frames, ["-vf", "null", "-pix_fmt", "yuv420p"]
+            )
+            case = f"{source[0]}x{source[1]} -> {output[1]}p"
+            for profile in ScalerProfile:
+                cpu, wall = run(path, source, frames, [
+                    *video_filter_args(
+                        VideoTransform(), *output, FitMode.LETTERBOX, profile
+                    ),
+                    "-pix_fmt", pix_fmt,
+                ])
+                print(
+                    f"{case:<22}{profile.value:<16}"
+                    f"{max(cpu - base_cpu, 0.0) / frames * 1000:>10.2f}"
+                    f"{max(wall - base_wall, 0.0) / frames * 1000:>10.2f}"
+                )
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: shared-memory frame bus throughput with 1-4 reader processes.
+
+The writer publishes 1080p RGB24 frames at 30 fps into a SharedFrameWriter,
+as the decoder's bus subscriber does. Reader processes - standing in for a
+recorder, an OBS script and a QA analyser - attach with SharedFrameReader
+and copy every new frame out as soon as it is published.
+
+For each number of readers it reports the writer's time per frame (which
+must not grow with the readers: they never lock anything), the frames each
+reader received out of those written, copies discarded because the writer
+overtook them, and the latency from publish to the end of the reader's
+copy.
+
+Usage:
+    python -m benchmarks.bench_shm_bus
+    python -m benchmarks.bench_shm_bus --seconds 5 --width 1280 --height 720
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from src.shm_bus import SharedFrameReader, SharedFrameWriter  # noqa: E402
+
+
+def _read(name: str, ready, results) -> None:
+    """Reader process: copy every frame until the bus closes."""
+    latencies = []
+    with SharedFrameReader(name) as reader:
+        ready.set()
+        last = 0
+        while True:
+            frame = reader.wait_for_frame(last, timeout=5.0)
+            if frame is None:
+                break
+            latencies.append(time.monotonic() - frame.timestamp)
+            last = frame.sequence
+        results.put((len(latencies), reader.retry_count, latencies))
+
+
+def run(args, readers: int) -> dict:
+    """Publish for ``args.seconds``; return writer and reader statistics."""
+    name = f"lvc-bench-{uuid.uuid4().hex[:8]}"
+    frame_bytes = args.width * args.height * 3
+    writer = SharedFrameWriter(name, max_frame_bytes=frame_bytes)
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    events = [context.Event() for _ in range(readers)]
+    procs = [
+        context.Process(target=_read, args=(name, ready, results))
+        for ready in events
+    ]
+    for proc in procs:
+        proc.start()
+    for ready in events:
+        ready.wait(timeout=10)
+
+    frame = np.random.default_rng(0).integers(
+        0, 256, (args.height, args.width, 3), dtype=np.uint8
+    )
+    write_times = []
+    interval = 1 / args.fps
+    start = time.perf_counter()
+    count = int(args.seconds * args.fps)
+    for index in range(count):
+        delay = start + index * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        t0 = time.perf_counter()
+        writer.write(frame)
+        write_times.append(time.perf_counter() - t0)
+    # Let readers copy the last frame before the bus closes
+    time.sleep(0.1)
+    writer.close()
+
+    received = [results.get(timeout=10) for _ in procs]
+    for proc in procs:
+        proc.join(timeout=5)
+    latencies = np.concatenate([np.array(r[2]) for r in received]) * 1000
+    return {
+        "written": count,
+        "write_ms": np.mean(write_times) * 1000,
+        "received": [r[0] for r in received],
+        "retries": sum(r[1] for r in received),
+        "latency_mean": latencies.mean() if latencies.size else float("nan"),
+        "latency_p99": np.percentile(latencies, 99) if latencies.size else float("nan"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--max-readers", type=int, default=4)
+    args = parser.parse_args()
+
+    mb = args.width * args.height * 3 / 1e6
+    print(f"{args.width}x{args.height} RGB24 ({mb:.1f} MB) at {args.fps:g} fps, "
+          f"{args.seconds:g} s per run")
+    print(f"{'readers':>8}{'write ms':>10}{'frames/reader':>16}{'retries':>9}"
+          f"{'mean ms':>9}{'p99 ms':>9}{'MB/s out':>10}")
+    for readers in range(1, args.max_readers + 1):
+        r = run(args, readers)
+        per_reader = f"{min(r['received'])}/{r['written']}"
+        throughput = sum(r["received"]) * mb / args.seconds
+        print(f"{readers:>8}{r['write_ms']:>10.2f}"
+              f"{per_reader:>16}{r['retries']:>9}"
+              f"{r['latency_mean']:>9.2f}{r['latency_p99']:>9.2f}{throughput:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: time to first frame per ingest profile.
+
+Starts the real RTMPAdapter and FrameDecoder, then launches an FFmpeg
+sender that streams an H.264 test pattern over RTMP - the same thing a
+phone does after every reconnect. Reports, per ingest profile, the time
+from launching the sender to the first frame in FrameDecoder, plus the
+decoder's own ``first_frame_timing`` (from listener spawn and from the
+moment FFmpeg reported the sender).
+
+Requires FFmpeg with libx264 (found the same way as the app, see
+src/config.py).
+
+Usage:
+    python -m benchmarks.bench_time_to_first_frame
+    python -m benchmarks.bench_time_to_first_frame --runs 5 --port 2940
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from src import config  # noqa: E402
+from src.decoder import FrameDecoder  # noqa: E402
+from src.ingest_profile import IngestProfile  # noqa: E402
+from src.protocols.rtmp import RTMPAdapter  # noqa: E402
+
+WIDTH, HEIGHT = 640, 360
+
+
+def start_sender(port: int, seconds: int) -> subprocess.Popen:
+    """Stream a live-encoded test pattern to the local RTMP listener."""
+    return subprocess.Popen(
+        [
+            config.FFMPEG_BIN, "-loglevel", "error", "-re",
+            "-f", "lavfi", "-i", f"testsrc2=size={WIDTH}x{HEIGHT}:rate=30",
+            "-t", str(seconds),
+            "-c:v", "libx264", "-preset", "ultrafast", "-tune", "zerolatency",
+            "-g", "30",
+            "-f", "flv", f"rtmp://127.0.0.1:{port}/live/stream",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def run(profile: IngestProfile, port: int, timeout: float) -> dict | None:
+    """Measure one connect-to-first-frame cycle."""
+    adapter = RTMPAdapter(width=WIDTH, height=HEIGHT, ingest_profile=profile)
+    decoder = FrameDecoder(width=WIDTH, height=HEIGHT)
+
+    await adapter.start(port=port, path="live/stream")
+    decoder.start(adapter)
+    await asyncio.sleep(0.5)  # let the listener bind
+
+    sender_started = time.monotonic()
+    sender = start_sender(port, seconds=int(timeout) + 1)
+    loop = asyncio.get_running_loop()
+    _, frame = await loop.run_in_executor(
+        None, decoder.wait_for_frame, 0, timeout
+    )
+    first_frame = time.monotonic()
+    timing = decoder.first_frame_timing
+
+    sender.kill()
+    sender.wait()
+    decoder.stop()
+    await adapter.stop()
+
+    if frame is None or timing is None:
+        return None
+    return {
+        "since_sender": first_frame - sender_started,
+        "since_connect": timing.since_connect,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=2940)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    if config.FFMPEG_BIN is None:
+        print("FFmpeg not found - install it or run: python src/setup_ffmpeg.py")
+        sys.exit(1)
+
+    print(f"RTMP {WIDTH}x{HEIGHT} H.264 sender, {args.runs} runs per profile")
+    print(f"{'profile':<12}{'sender→frame ms':>18}{'detected→frame ms':>20}")
+    port = args.port
+    for profile in IngestProfile:
+        results = []
+        for _ in range(args.runs):
+            result = asyncio.run(run(profile, port, args.timeout))
+            port += 1  # avoid TIME_WAIT on the previous listener
+            if result is not None:
+                results.append(result)
+        if not results:
+            print(f"{profile.value:<12}{'no frame':>18}")
+            continue
+        since_sender = statistics.median(r["since_sender"] for r in results)
+        connects = [r["since_connect"] for r in results if r["since_connect"] is not None]
+        since_connect = (
+            f"{statistics.median(connects) * 1000:.0f}" if connects else "n/a"
+        )
+        print(f"{profile.value:<12}{since_sender * 1000:>18.0f}{since_connect:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -47,6 +47,30 @@ ALLOWED_ORIGINS = None
 FRAME_WIDTH = 1280
 FRAME_HEIGHT = 720
 FPS = 30
+# Seconds between FFmpeg -progress reports
+PROGRESS_PERIOD = 0.5
+# Stall watchdog: nominal frame intervals without a frame that count as a
+# stall, and seconds of stall after which the sender is dropped and the
+# listener restarted
+STALL_FRAME_INTERVALS = 3.0
+STALL_RECONNECT_AFTER = 5.0
+# Ingest delay: seconds the stream may fall behind the wall clock, for at
+# least INGEST_DELAY_HOLD seconds, before the FFmpeg child is resynced
+INGEST_DELAY_RESYNC = 2.0
+INGEST_DELAY_HOLD = 2.0
+# Frames queued per threaded / asyncio frame subscriber; the oldest is
+# dropped when a slow subscriber falls further behind
+SUBSCRIBER_QUEUE_SIZE = 2
+# Bounded decoder latency: most stale frames read over in a row before one
+# is published anyway, so a reader that never catches up still updates
+MAX_DRAINED_FRAMES = 4
+# Shared-memory frame bus: default name, ring slots and the largest frame
+# a slot holds (1080p RGB24); larger frames are not published
+SHM_BUS_NAME = "lvc-frames"
+SHM_BUS_SLOTS = 3
+SHM_BUS_MAX_FRAME_BYTES = 1920 * 1080 * 3
+# Longest on-demand pipeline trace capture in seconds
+TRACE_MAX_SECONDS = 60.0
 
 
 # ── Paths ────────────────────────────────────────────────
@@ -5,12 +5,18 @@ Handles loading, saving, validating, and providing access to user configuration.
 """
 import json
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Tuple
 import os
 
+from .frame_fitter import FitMode
+from .ingest_profile import IngestProfile
+from .pixel_format import PixelFormat
+from .stall_watchdog import StallPolicy
+from .video_transform import ScalerProfile, VideoTransform
+
 log = logging.getLogger(__name__)
 
 
@@ -48,6 +54,46 @@ class AppConfig:
         Video frame height in pixels (default: 720)
     fps : int
         Target frames per second (default: 30)
+    pixel_format : PixelFormat
+        Raw frame format between FFmpeg and the virtual camera
+        (default: RGB24). NV12 and I420 halve pipe bandwidth.
+    ingest_profile : IngestProfile
+        FFmpeg input probing for RTMP/SRT (default: DEFAULT). FAST_START
+        shortens the time from sender connect to first frame.
+    stall_frame_intervals : float
+        Frame intervals without a frame before the stream counts as
+        stalled (default: 3, i.e. 100 ms at 30 fps)
+    stall_reconnect_after : float
+        Seconds of stall after which the sender is dropped and the
+        listener restarted (default: 5)
+    stall_policy : StallPolicy
+        What the virtual camera shows during a stall (default: LAST_FRAME)
+    fit_mode : FitMode
+        How frames of another size are fitted to the virtual camera,
+        and how FFmpeg fits RTMP/SRT frames (default: LETTERBOX)
+    video_transform : VideoTransform
+        Crop / rotate / mirror applied by FFmpeg for RTMP/SRT
+        (default: none)
+    scaler_profile : ScalerProfile
+        Scaling algorithm FFmpeg uses for RTMP/SRT (default: BICUBIC).
+        FAST_BILINEAR is the cheapest on low-power machines.
+    native_resolution : bool
+        Keep the sender's resolution instead of scaling to
+        ``frame_width`` x ``frame_height``; the decoder and virtual camera
+        follow the size FFmpeg reports for RTMP/SRT and the size of
+        WebRTC frames (default: False)
+    max_queued_bytes : int or None
+        Latency bound for RTMP/SRT: when more bytes than this are waiting
+        in the FFmpeg pipe after a frame, the decoder skips to the newest
+        frame. 0 keeps only the newest; None reads every frame in order
+        (default: None)
+    ingest_delay_resync : float or None
+        Seconds an RTMP/SRT stream may fall behind the wall clock before
+        FFmpeg is replaced to drop the buffered media; None only measures
+        the delay (default: 2)
+    shared_memory_bus : str or None
+        Name of a shared-memory frame bus the decoder publishes into for
+        other local processes; None disables it (default: None)
     """
     protocol: ProtocolType = ProtocolType.RTMP
     rtmp_port: int = 2935
@@ -59,6 +105,18 @@ class AppConfig:
     frame_width: int = 1280
     frame_height: int = 720
     fps: int = 30
+    pixel_format: PixelFormat = PixelFormat.RGB24
+    ingest_profile: IngestProfile = IngestProfile.DEFAULT
+    stall_frame_intervals: float = 3.0
+    stall_reconnect_after: float = 5.0
+    stall_policy: StallPolicy = StallPolicy.LAST_FRAME
+    fit_mode: FitMode = FitMode.LETTERBOX
+    video_transform: VideoTransform = field(default_factory=VideoTransform)
+    scaler_profile: ScalerProfile = ScalerProfile.BICUBIC
+    native_resolution: bool = False
+    max_queued_bytes: Optional[int] = None
+    ingest_delay_resync: Optional[float] = 2.0
+    shared_memory_bus: Optional[str] = None
     
     def to_dict(self) -> dict:
         """
@@ -72,6 +130,11 @@ class AppConfig:
         data = asdict(self)
         # Convert enum to string value
         data['protocol'] = self.protocol.value
+        data['pixel_format'] = self.pixel_format.value
+        data['ingest_profile'] = self.ingest_profile.value
+        data['stall_policy'] = self.stall_policy.value
+        data['fit_mode'] = self.fit_mode.value
+        data['scaler_profile'] = self.scaler_profile.value
         return data
     
     @classmethod
@@ -102,6 +165,47 @@ class AppConfig:
             log.warning(f"Invalid protocol '{protocol_str}', defaulting to RTMP")
             protocol = ProtocolType.RTMP
         
+        pixel_format_str = data.get('pixel_format', 'rgb24')
+        try:
+            pixel_format = PixelFormat(pixel_format_str)
+        except ValueError:
+            log.warning(f"Invalid pixel format '{pixel_format_str}', defaulting to RGB24")
+            pixel_format = PixelFormat.RGB24
+        
+        ingest_profile_str = data.get('ingest_profile', 'default')
+        try:
+            ingest_profile = IngestProfile(ingest_profile_str)
+        except ValueError:
+            log.warning(f"Invalid ingest profile '{ingest_profile_str}', defaulting to default")
+            ingest_profile = IngestProfile.DEFAULT
+        
+        stall_policy_str = data.get('stall_policy', 'last-frame')
+        try:
+            stall_policy = StallPolicy(stall_policy_str)
+        except ValueError:
+            log.warning(f"Invalid stall policy '{stall_policy_str}', defaulting to last-frame")
+            stall_policy = StallPolicy.LAST_FRAME
+        
+        fit_mode_str = data.get('fit_mode', 'letterbox')
+        try:
+            fit_mode = FitMode(fit_mode_str)
+        except ValueError:
+            log.warning(f"Invalid fit mode '{fit_mode_str}', defaulting to letterbox")
+            fit_mode = FitMode.LETTERBOX
+        
+        try:
+            video_transform = VideoTransform.from_dict(data.get('video_transform', {}))
+        except (TypeError, ValueError) as e:
+            log.warning(f"Invalid video transform ({e}), defaulting to none")
+            video_transform = VideoTransform()
+        
+        scaler_profile_str = data.get('scaler_profile', 'bicubic')
+        try:
+            scaler_profile = ScalerProfile(scaler_profile_str)
+        except ValueError:
+            log.warning(f"Invalid scaler profile '{scaler_profile_str}', defaulting to bicubic")
+            scaler_profile = ScalerProfile.BICUBIC
+        
         return cls(
             protocol=protocol,
             rtmp_port=data.get('rtmp_port', 2935),
@@ -113,6 +217,18 @@ class AppConfig:
             frame_width=data.get('frame_width', 1280),
             frame_height=data.get('frame_height', 720),
             fps=data.get('fps', 30),
+            pixel_format=pixel_format,
+            ingest_profile=ingest_profile,
+            stall_frame_intervals=data.get('stall_frame_intervals', 3.0),
+            stall_reconnect_after=data.get('stall_reconnect_after', 5.0),
+            stall_policy=stall_policy,
+            fit_mode=fit_mode,
+            video_transform=video_transform,
+            scaler_profile=scaler_profile,
+            native_resolution=bool(data.get('native_resolution', False)),
+            max_queued_bytes=data.get('max_queued_bytes'),
+            ingest_delay_resync=data.get('ingest_delay_resync', 2.0),
+            shared_memory_bus=data.get('shared_memory_bus'),
         )
 
 
@@ -258,6 +374,54 @@ class ConfigurationManager:
         if config.fps <= 0:
             return False, f"FPS must be positive: {config.fps}"
         
+        # Validate pixel format
+        if not isinstance(config.pixel_format, PixelFormat):
+            return False, f"Invalid pixel format: {config.pixel_format}"
+        
+        if config.pixel_format != PixelFormat.RGB24 and (
+            config.frame_width % 2 or config.frame_height % 2
+        ):
+            return False, (
+                f"{config.pixel_format.value} requires even frame dimensions: "
+                f"{config.frame_width}x{config.frame_height}"
+            )
+        
+        # Validate ingest profile
+        if not isinstance(config.ingest_profile, IngestProfile):
+            return False, f"Invalid ingest profile: {config.ingest_profile}"
+        
+        # Validate stall detection
+        if config.stall_frame_intervals < 1:
+            return False, f"Stall threshold must be at least one frame interval: {config.stall_frame_intervals}"
+        
+        if config.stall_reconnect_after < config.stall_frame_intervals / config.fps:
+            return False, f"Stall reconnect delay must not be below the stall threshold: {config.stall_reconnect_after}"
+        
+        if not isinstance(config.stall_policy, StallPolicy):
+            return False, f"Invalid stall policy: {config.stall_policy}"
+        
+        if not isinstance(config.fit_mode, FitMode):
+            return False, f"Invalid fit mode: {config.fit_mode}"
+        
+        if not isinstance(config.video_transform, VideoTransform):
+            return False, f"Invalid video transform: {config.video_transform}"
+        
+        if not isinstance(config.scaler_profile, ScalerProfile):
+            return False, f"Invalid scaler profile: {config.scaler_profile}"
+        
+        if config.max_queued_bytes is not None and (
+            not isinstance(config.max_queued_bytes, int) or config.max_queued_bytes < 0
+        ):
+            return False, f"Max queued bytes must be a non-negative integer: {config.max_queued_bytes}"
+        
+        if config.ingest_delay_resync is not None and config.ingest_delay_resync <= 0:
+            return False, f"Ingest delay threshold must be positive: {config.ingest_delay_resync}"
+        
+        if config.shared_memory_bus is not None and (
+            not isinstance(config.shared_memory_bus, str) or not config.shared_memory_bus
+        ):
+            return False, f"Invalid shared memory bus name: {config.shared_memory_bus!r}"
+        
         # All validations passed
         return True, None
     
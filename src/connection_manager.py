@@ -6,10 +6,21 @@ Monitors connection health, manages reconnection attempts, and tracks connection
 import logging
 from enum import Enum
 from typing import Callable, Optional
-from datetime import datetime
 import threading
 import time
 
+from . import config
+from .frame_stats import FrameStats, FrameTimestampRing
+from .ingest_delay import IngestDelayTracker
+from .metrics import Counter
+from .protocols.ffmpeg_events import (
+    FFmpegEvent,
+    FFmpegEventType,
+    FFmpegProgress,
+    StreamInfo,
+)
+from .stall_watchdog import StallWatchdog
+
 log = logging.getLogger(__name__)
 
 
@@ -18,15 +29,23 @@ class ConnectionState(Enum):
     DISCONNECTED = "disconnected"
     CONNECTING = "connecting"
     CONNECTED = "connected"
+    STALLED = "stalled"  # connected, but frames stopped arriving
+    RESYNCING = "resyncing"  # FFmpeg replaced to drop ingest delay
     RECONNECTING = "reconnecting"
 
 
 class ConnectionHealth(Enum):
-    """Connection health enumeration based on frame rate."""
-    EXCELLENT = "excellent"  # >28 fps
-    GOOD = "good"            # 20-28 fps
+    """
+    Connection health based on measured frame timing.
+
+    The frame rate sets the level; a long stall or irregular frame
+    intervals (p95 well above the nominal interval) lower it, see
+    ``ConnectionManager.classify_health``.
+    """
+    EXCELLENT = "excellent"  # >28 fps, p95 interval <= 2x nominal
+    GOOD = "good"            # 20-28 fps, p95 interval <= 4x nominal
     POOR = "poor"            # 10-20 fps
-    CRITICAL = "critical"    # <10 fps
+    CRITICAL = "critical"    # <10 fps or stalled for 1 s
 
 
 
@@ -42,11 +61,23 @@ class ConnectionManager:
     MAX_RECONNECT_ATTEMPTS = 10
     BACKOFF_SEQUENCE = [1, 2, 4, 8, 16, 30]  # seconds, max 30s
     
+    # Frame statistics: windows reported by get_stats(); the first one
+    # drives the health classification
+    STATS_WINDOWS = (2.0, 10.0)  # seconds
+    FRAME_RING_CAPACITY = 4096   # 10 s at up to ~400 fps
+    STALL_CRITICAL = 1.0         # seconds without a frame
+    # Seconds a resync may take before the sender counts as lost
+    RESYNC_TIMEOUT = 10.0
+    
     def __init__(
         self,
         on_state_change: Callable[[ConnectionState], None],
         on_health_change: Callable[[ConnectionHealth], None],
-        on_reconnect_trigger: Optional[Callable[[], None]] = None
+        on_reconnect_trigger: Optional[Callable[[], None]] = None,
+        stall_threshold: Optional[float] = None,
+        stall_reconnect_after: Optional[float] = config.STALL_RECONNECT_AFTER,
+        on_resync: Optional[Callable[[], bool]] = None,
+        ingest_delay_resync: Optional[float] = config.INGEST_DELAY_RESYNC,
     ):
         """
         Initialize connection manager with callbacks for state changes.
@@ -59,27 +90,65 @@ class ConnectionManager:
             Called when connection health changes with new ConnectionHealth
         on_reconnect_trigger : callable, optional
             Called when automatic reconnection should be triggered
+        stall_threshold : float, optional
+            Seconds without a frame before a connected stream is STALLED;
+            defaults to ``config.STALL_FRAME_INTERVALS`` frame intervals
+        stall_reconnect_after : float, optional
+            Seconds of stall after which reconnection is triggered; None
+            keeps a stalled stream STALLED until frames return
+        on_resync : callable, optional
+            Called on a worker thread to flush a lagging ingest, typically
+            ``ProtocolAdapter.resync``; returns True if the FFmpeg child
+            was replaced and the sender is expected back
+        ingest_delay_resync : float, optional
+            Seconds the stream may fall behind the wall clock before
+            ``on_resync`` is called; None only measures the delay
         """
         self._on_state_change = on_state_change
         self._on_health_change = on_health_change
         self._on_reconnect_trigger = on_reconnect_trigger
+        self._on_resync = on_resync
         
         # State tracking
         self._state = ConnectionState.DISCONNECTED
         self._health = ConnectionHealth.CRITICAL
         self._lock = threading.Lock()
         
-        # Frame monitoring
-        self._last_frame_time: Optional[datetime] = None
-        self._frame_count = 0
+        # Frame monitoring; written by the decoder thread without the lock
+        self._frame_times = FrameTimestampRing(self.FRAME_RING_CAPACITY)
+        self._last_frame_time: Optional[float] = None  # time.monotonic()
+        self._frame_count = Counter("frames")
         self._monitoring = False
         self._monitor_thread: Optional[threading.Thread] = None
         
+        # Stall detection; fed with the frame timestamps
+        if stall_threshold is None:
+            stall_threshold = config.STALL_FRAME_INTERVALS / config.FPS
+        self._watchdog = StallWatchdog(
+            threshold=stall_threshold,
+            escalate_after=stall_reconnect_after,
+            on_stall=self._on_stall,
+            on_resume=self._on_stall_resume,
+            on_escalate=self._on_stall_escalate,
+        )
+        
         # Reconnection tracking
         self._reconnect_attempts = 0
         self._reconnect_thread: Optional[threading.Thread] = None
         self._auto_reconnect_enabled = True
         
+        # FFmpeg stderr events
+        self._decode_error_count = Counter("decode_errors")
+        self._stream_info: Optional[str] = None
+        self._stream: Optional[StreamInfo] = None  # parsed _stream_info
+        self._stream_source: object = None  # FFmpeg child the info came from
+        self._progress: Optional[FFmpegProgress] = None
+        
+        # Ingest delay of the current sender, from the progress reports
+        self._ingest_delay = IngestDelayTracker(threshold=ingest_delay_resync)
+        self._resync_count = Counter("resyncs")
+        self._resync_started: Optional[float] = None  # time.monotonic()
+        
     @property
     def current_state(self) -> ConnectionState:
         """Get current connection state."""
@@ -92,6 +161,132 @@ class ConnectionManager:
         with self._lock:
             return self._health
     
+    @property
+    def is_stalled(self) -> bool:
+        """Check if frames stopped arriving from a connected sender."""
+        return self._watchdog.is_stalled
+    
+    @property
+    def frame_count(self) -> int:
+        """Get number of frames reported since start."""
+        return self._frame_count.value
+    
+    @property
+    def decode_error_count(self) -> int:
+        """Get number of decode errors FFmpeg reported."""
+        return self._decode_error_count.value
+    
+    @property
+    def ingest_delay(self) -> Optional[float]:
+        """Get how far the sender's stream lags the wall clock, in seconds."""
+        with self._lock:
+            return self._ingest_delay.delay
+    
+    @property
+    def resync_count(self) -> int:
+        """Get number of resyncs triggered by ingest delay."""
+        return self._resync_count.value
+    
+    @property
+    def stream_info(self) -> Optional[str]:
+        """Get the sender's video stream description, if known."""
+        with self._lock:
+            return self._stream_info
+    
+    @property
+    def stream(self) -> Optional[StreamInfo]:
+        """Get the sender's codec, size and frame rate, if known."""
+        with self._lock:
+            return self._stream
+    
+    @property
+    def progress(self) -> Optional[FFmpegProgress]:
+        """Get FFmpeg's latest progress report (fps, speed, drops, ...)."""
+        with self._lock:
+            return self._progress
+    
+    def frame_stats(self, window: Optional[float] = None) -> FrameStats:
+        """
+        Frame timing statistics of the current connection.
+        
+        Parameters
+        ----------
+        window : float, optional
+            Seconds to look back; defaults to the health window
+            (``STATS_WINDOWS[0]``)
+        
+        Returns
+        -------
+        FrameStats
+            Frame rate, jitter, interval percentiles and longest stall
+        """
+        if window is None:
+            window = self.STATS_WINDOWS[0]
+        return self._frame_times.stats(window)
+    
+    def get_stats(self) -> dict:
+        """
+        Snapshot of connection state, frame timing and FFmpeg statistics.
+        
+        Returns
+        -------
+        dict
+            JSON-serializable state, health, total frames, frame
+            statistics per window
+            (keyed like ``"2s"``), stall watchdog statistics, decode error
+            count, stream description with its parsed codec, size and
+            frame rate, the latest progress report (or None), the ingest
+            delay and the number of resyncs
+        """
+        now = time.monotonic()
+        frames = {
+            f"{window:g}s": self._frame_times.stats(window, now).to_dict()
+            for window in self.STATS_WINDOWS
+        }
+        with self._lock:
+            return {
+                "state": self._state.value,
+                "health": self._health.value,
+                "frames_received": self._frame_count.value,
+                "frames": frames,
+                "stall": self._watchdog.get_stats(),
+                "decode_errors": self._decode_error_count.value,
+                "stream_info": self._stream_info,
+                "stream": self._stream.to_dict() if self._stream else None,
+                "progress": self._progress.to_dict() if self._progress else None,
+                "ingest_delay": self._ingest_delay.get_stats(),
+                "resyncs": self._resync_count.value,
+            }
+    
+    @classmethod
+    def classify_health(cls, stats: FrameStats) -> ConnectionHealth:
+        """
+        Map frame statistics to a health level.
+        
+        Parameters
+        ----------
+        stats : FrameStats
+            Statistics over the health window
+        
+        Returns
+        -------
+        ConnectionHealth
+            Level from frame rate, lowered by stalls and irregular
+            frame intervals
+        """
+        nominal = 1.0 / config.FPS
+        if (
+            stats.frame_count < 2
+            or stats.fps < 10
+            or stats.longest_stall >= cls.STALL_CRITICAL
+        ):
+            return ConnectionHealth.CRITICAL
+        if stats.fps < 20 or stats.p95_interval > 4 * nominal:
+            return ConnectionHealth.POOR
+        if stats.fps <= 28 or stats.p95_interval > 2 * nominal:
+            return ConnectionHealth.GOOD
+        return ConnectionHealth.EXCELLENT
+    
     def start_monitoring(self) -> None:
         """Begin monitoring connection health."""
         if self._monitoring:
@@ -104,11 +299,13 @@ class ConnectionManager:
             name="connection-monitor"
         )
         self._monitor_thread.start()
+        self._watchdog.start()
         log.info("Connection monitoring started")
     
     def stop_monitoring(self) -> None:
         """Stop monitoring connection health."""
         self._monitoring = False
+        self._watchdog.stop()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=3)
             self._monitor_thread = None
@@ -121,9 +318,18 @@ class ConnectionManager:
             self._state = ConnectionState.CONNECTED
             # Reset reconnection counter on successful connection
             self._reconnect_attempts = 0
+            # A new sender; watch it from its first frame on
+            self._watchdog.reset()
+            resync_started, self._resync_started = self._resync_started, None
             
         if old_state != ConnectionState.CONNECTED:
-            log.info("Connection established")
+            if old_state == ConnectionState.RESYNCING and resync_started is not None:
+                log.info(
+                    "Ingest resynced, sender back after %.0f ms",
+                    (time.monotonic() - resync_started) * 1000,
+                )
+            else:
+                log.info("Connection established")
             self._on_state_change(ConnectionState.CONNECTED)
     
     def report_connection_lost(self) -> None:
@@ -132,6 +338,9 @@ class ConnectionManager:
             old_state = self._state
             self._state = ConnectionState.DISCONNECTED
             self._last_frame_time = None
+            self._frame_times.clear()
+            self._watchdog.reset()
+            self._resync_started = None
             should_reconnect = self._auto_reconnect_enabled
             
         if old_state != ConnectionState.DISCONNECTED:
@@ -142,11 +351,57 @@ class ConnectionManager:
             if should_reconnect:
                 self._start_reconnection()
     
-    def report_frame_received(self) -> None:
-        """Called by decoder when frame is successfully decoded."""
+    def handle_ffmpeg_event(self, event: FFmpegEvent) -> None:
+        """
+        Subscriber for FFmpegStderrMonitor events.
+        
+        Runs on the stderr reader thread, so it only records state.
+        """
+        if event.type is FFmpegEventType.DECODE_ERROR:
+            self._decode_error_count.add()
+            return
+        resync = False
         with self._lock:
-            self._last_frame_time = datetime.now()
-            self._frame_count += 1
+            if event.type is FFmpegEventType.STREAM_INFO:
+                if event.source is not self._stream_source:
+                    self._ingest_delay.reset()  # a new session
+                self._stream_info = event.line
+                self._stream = event.stream_info
+                self._stream_source = event.source
+            elif event.type is FFmpegEventType.PROGRESS:
+                progress = event.progress
+                self._progress = progress
+                if (
+                    event.source is self._stream_source
+                    and progress.out_time is not None
+                    and self._ingest_delay.update(progress.out_time, progress.timestamp)
+                ):
+                    resync = self._state == ConnectionState.CONNECTED
+            elif (
+                event.type is FFmpegEventType.CLOSED
+                and event.source is self._stream_source
+            ):
+                # A standby listener or replaced child exiting does not end
+                # the stream that is being received
+                self._stream_info = None
+                self._stream = None
+                self._progress = None
+                self._ingest_delay.reset()
+        if resync:
+            self._start_resync()
+    
+    def report_frame_received(self) -> None:
+        """
+        Called by decoder when frame is successfully decoded.
+        
+        Runs for every frame on the decoder thread, so it only stores a
+        timestamp and takes no lock.
+        """
+        now = time.monotonic()
+        self._frame_times.record(now)
+        self._last_frame_time = now
+        self._frame_count.add()
+        self._watchdog.feed(now)
     
     def trigger_reconnect(self) -> None:
         """Manually trigger reconnection attempt."""
@@ -209,6 +464,13 @@ class ConnectionManager:
             # Wait for backoff delay
             time.sleep(delay)
             
+            # The adapter may have accepted the sender again meanwhile
+            # (e.g. on its warm-standby listener)
+            with self._lock:
+                if self._state == ConnectionState.CONNECTED:
+                    log.info("Connection restored, stopping reconnection attempts")
+                    return
+            
             # Trigger reconnection callback if provided
             if self._on_reconnect_trigger:
                 try:
@@ -223,79 +485,148 @@ class ConnectionManager:
         log.warning(f"Max reconnection attempts ({self.MAX_RECONNECT_ATTEMPTS}) reached")
         self._on_state_change(ConnectionState.DISCONNECTED)
     
-    def _monitor_loop(self) -> None:
-        """Background thread that monitors connection health based on frame rate."""
-        # Track frames over a sliding window for accurate FPS calculation
-        frame_timestamps = []
-        window_size = 30  # Track last 30 frames for FPS calculation
+    def _on_stall(self, silent: float) -> None:
+        """Watchdog callback: frames stopped arriving."""
+        with self._lock:
+            if self._state != ConnectionState.CONNECTED:
+                return
+            self._state = ConnectionState.STALLED
+        
+        self._on_state_change(ConnectionState.STALLED)
+    
+    def _on_stall_resume(self, duration: float) -> None:
+        """Watchdog callback: frames arrive again."""
+        with self._lock:
+            # Frames flowing again also end a reconnection started by the
+            # stall if the sender came back on the same connection
+            if self._state not in (
+                ConnectionState.STALLED, ConnectionState.RECONNECTING
+            ):
+                return
+            self._state = ConnectionState.CONNECTED
+            self._reconnect_attempts = 0
+        
+        self._on_state_change(ConnectionState.CONNECTED)
+    
+    def _on_stall_escalate(self, silent: float) -> None:
+        """Watchdog callback: the stall persists, drop the sender."""
+        with self._lock:
+            if (
+                self._state != ConnectionState.STALLED
+                or not self._auto_reconnect_enabled
+            ):
+                return
+            self._state = ConnectionState.RECONNECTING
+            # This restart is the first attempt; the backoff loop goes on
+            # from the second, so the new listener gets its full delay
+            self._reconnect_attempts = 1
+        
+        log.warning(
+            "No frame for %.1f s, reconnecting (sender stalled)", silent
+        )
+        self._on_state_change(ConnectionState.RECONNECTING)
         
+        # The stall already took longer than a backoff step, restart now
+        if self._on_reconnect_trigger:
+            try:
+                self._on_reconnect_trigger()
+            except Exception as e:
+                log.error(f"Reconnection trigger failed: {e}")
+        self._start_reconnection()
+    
+    def _start_resync(self) -> None:
+        """Enter RESYNCING and flush the ingest on a worker thread."""
+        with self._lock:
+            if self._state != ConnectionState.CONNECTED or self._on_resync is None:
+                return
+            self._state = ConnectionState.RESYNCING
+            self._resync_started = time.monotonic()
+            delay = self._ingest_delay.delay
+        self._resync_count.add()
+        
+        log.warning(
+            "Stream is %.1f s behind the wall clock, resyncing ingest", delay
+        )
+        self._on_state_change(ConnectionState.RESYNCING)
+        threading.Thread(
+            target=self._run_resync, daemon=True, name="ingest-resync"
+        ).start()
+    
+    def _run_resync(self) -> None:
+        """Call ``on_resync``; go back to CONNECTED if nothing was replaced."""
+        try:
+            replaced = self._on_resync()
+        except Exception as e:
+            log.error(f"Ingest resync failed: {e}")
+            replaced = False
+        if replaced:
+            return  # the sender reconnecting ends the resync
+        
+        with self._lock:
+            if self._state != ConnectionState.RESYNCING:
+                return
+            self._state = ConnectionState.CONNECTED
+            self._resync_started = None
+        log.warning("Ingest could not be resynced, keeping the connection")
+        self._on_state_change(ConnectionState.CONNECTED)
+    
+    def _check_resync_timeout(self) -> None:
+        """Treat a sender that did not come back after a resync as lost."""
+        with self._lock:
+            started = self._resync_started
+            timed_out = (
+                self._state == ConnectionState.RESYNCING
+                and started is not None
+                and time.monotonic() - started > self.RESYNC_TIMEOUT
+            )
+        if timed_out:
+            log.warning(
+                "Sender did not reconnect within %.0f s of the resync",
+                self.RESYNC_TIMEOUT,
+            )
+            self.report_connection_lost()
+    
+    def _monitor_loop(self) -> None:
+        """Background thread that re-evaluates connection health every second."""
         while self._monitoring:
-            time.sleep(1.0)  # Check every second
-            
-            with self._lock:
-                if self._state != ConnectionState.CONNECTED:
-                    # Only monitor health when connected
-                    # Reset health to critical when not connected
-                    if self._health != ConnectionHealth.CRITICAL:
-                        old_health = self._health
-                        self._health = ConnectionHealth.CRITICAL
-                    else:
-                        old_health = self._health
-                    continue
-                
-                if self._last_frame_time is None:
-                    # No frames received yet
-                    new_health = ConnectionHealth.CRITICAL
-                    old_health = self._health
-                    self._health = new_health
-                else:
-                    # Track frame reception timestamps
-                    current_time = datetime.now()
-                    elapsed_since_last = (current_time - self._last_frame_time).total_seconds()
-                    
-                    # Add timestamp to window if frame was recent
-                    if elapsed_since_last < 2.0:  # Frame within last 2 seconds
-                        frame_timestamps.append(self._last_frame_time)
-                        # Keep only recent frames in window
-                        cutoff_time = current_time.timestamp() - 2.0
-                        frame_timestamps = [
-                            ts for ts in frame_timestamps 
-                            if ts.timestamp() > cutoff_time
-                        ]
-                        # Limit window size
-                        if len(frame_timestamps) > window_size:
-                            frame_timestamps = frame_timestamps[-window_size:]
-                    
-                    # Calculate FPS based on frame timestamps
-                    if len(frame_timestamps) >= 2:
-                        # Calculate FPS from timestamp window
-                        time_span = (frame_timestamps[-1] - frame_timestamps[0]).total_seconds()
-                        if time_span > 0:
-                            fps = (len(frame_timestamps) - 1) / time_span
-                        else:
-                            fps = 30.0  # Default assumption
-                    elif elapsed_since_last < 1.0:
-                        # Recent frame but not enough history, assume good
-                        fps = 30.0
-                    else:
-                        # No recent frames
-                        fps = 1.0 / elapsed_since_last if elapsed_since_last > 0 else 0
-                    
-                    # Determine health based on FPS thresholds
-                    # excellent: >28fps, good: 20-28fps, poor: 10-20fps, critical: <10fps
-                    if fps > 28:
-                        new_health = ConnectionHealth.EXCELLENT
-                    elif fps >= 20:
-                        new_health = ConnectionHealth.GOOD
-                    elif fps >= 10:
-                        new_health = ConnectionHealth.POOR
-                    else:
-                        new_health = ConnectionHealth.CRITICAL
-                    
-                    old_health = self._health
-                    self._health = new_health
-            
-            # Trigger callback outside lock if health changed
-            if old_health != new_health:
-                log.info(f"Connection health changed: {old_health.value} -> {new_health.value} (fps: {fps:.1f})")
-                self._on_health_change(new_health)
+            time.sleep(1.0)
+            self._check_resync_timeout()
+            self._update_health()
+    
+    def _update_health(self) -> None:
+        """Classify health from the frame statistics and report changes."""
+        with self._lock:
+            connected = self._state in (
+                ConnectionState.CONNECTED, ConnectionState.STALLED
+            )
+        
+        # Only monitor health when connected
+        stats = self.frame_stats() if connected else None
+        new_health = (
+            self.classify_health(stats) if stats is not None
+            else ConnectionHealth.CRITICAL
+        )
+        
+        with self._lock:
+            old_health = self._health
+            self._health = new_health
+        
+        # Trigger callback outside lock if health changed
+        if old_health != new_health:
+            if stats is not None:
+                log.info(
+                    "Connection health changed: %s -> %s (%.1f fps, "
+                    "p95 interval %.0f ms, longest stall %.0f ms)",
+                    old_health.value,
+                    new_health.value,
+                    stats.fps,
+                    stats.p95_interval * 1000,
+                    stats.longest_stall * 1000,
+                )
+            else:
+                log.info(
+                    "Connection health changed: %s -> %s (not connected)",
+                    old_health.value,
+                    new_health.value,
+                )
+            self._on_health_change(new_health)
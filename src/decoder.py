@@ -1,34 +1,83 @@
 """
-H.264 → raw RGB frame decoder using ffmpeg subprocess pipe.
+H.264 → raw frame decoder using ffmpeg subprocess pipe.
 
 Receives H.264 NAL units, feeds them to a persistent ffmpeg process,
-and reads decoded raw RGB24 frames from stdout.
+and reads decoded raw frames from stdout (RGB24 by default, or planar
+NV12/I420 to halve pipe bandwidth).
 
 Only the *latest* decoded frame is kept (no queuing → no latency build-up).
+Every frame is stored in a ``FrameEnvelope`` with its sequence number, read
+time, source session and output timestamp (``latest_envelope``).
 This implementation now supports an optional circular buffer to store a
 small number of recent frames for smoother playback during network
 interruption.
 
+That alone does not stop frames from queuing in the FFmpeg pipe when the
+reader falls behind (slow ``on_frame`` callbacks, an overloaded machine).
+With ``max_queued_bytes`` the reader checks the pipe backlog after every
+frame and reads over stale frames to the newest one, so latency recovers
+as soon as the overload ends.
+
+Consumers that are not cheap subscribe with ``subscribe()`` instead of
+``on_frame`` and run on a worker thread or an asyncio loop of their own,
+so they cannot throttle the reader (see ``frame_subscribers``). Consumers
+in other processes read the frames from a shared-memory bus
+(``shared_memory_bus``, see ``shm_bus``).
+
+With a ``PipelineTracer`` the reader records how long every frame waited
+for FFmpeg, took to read and took to publish (see ``tracing``).
+
 Updated to work with protocol abstraction layer - accepts any ProtocolAdapter
 (RTMP, SRT, WebRTC) instead of being hardcoded to RTMP.
 """
 
 import subprocess
 import threading
+import time
 import shutil
 import logging
 import numpy as np
-from typing import Optional, Callable, List
+from typing import Any, Dict, Optional, Callable, List
 from collections import deque
+from dataclasses import dataclass
 
 from . import config
+from .frame_envelope import FrameEnvelope
+from .frame_pool import FramePool
+from .frame_subscribers import DeliveryMode, FrameSubscription
+from .frame_slot import FrameSlot
+from .metrics import Counter
+from .pipe_backlog import queued_bytes
+from .pixel_format import PixelFormat, ffmpeg_pix_fmt, frame_bytes, frame_shape
+from .shm_bus import SharedFrameWriter
+from .tracing import PIPE_READ, PIPE_WAIT, PUBLISH, PipelineTracer
+from .protocols.ffmpeg_events import (
+    FFmpegEvent,
+    FFmpegEventType,
+    FFmpegStderrMonitor,
+    StreamInfo,
+)
 
 log = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class FirstFrameTiming:
+    """
+    Seconds until the first frame reached the decoder after ``start()``.
+
+    ``since_listen`` and ``since_connect`` are measured from the adapter's
+    ``listen_started_at`` / ``connected_at`` timestamps and are None when
+    the adapter does not provide them.
+    """
+    since_start: float
+    since_listen: Optional[float] = None
+    since_connect: Optional[float] = None
+
+
 class FrameDecoder:
     """
-    Persistent ffmpeg-based H.264 → RGB24 decoder.
+    Persistent ffmpeg-based H.264 → raw frame decoder.
 
     Works with any ProtocolAdapter to decode video frames from different
     streaming protocols (RTMP, SRT, WebRTC).
@@ -44,8 +93,17 @@ class FrameDecoder:
     - Error handling: monitors both stdout and stderr for issues
     - Callback support: notifies when frames are decoded or errors occur
     - Optional circular buffer: store a small number of recent frames
+    - Frame pool: reads frames in place with readinto() instead of
+      allocating a new buffer per frame
     """
 
+    # Upper bound on how long the slot reader blocks before rechecking stop()
+    _SLOT_WAIT = 0.1
+    # Sleep between get_frame() polls for adapters without a frame slot
+    _POLL_INTERVAL = 0.005
+    # FFmpeg processes whose output format is remembered (native resolution)
+    _MAX_OUTPUT_FORMATS = 8
+
     def __init__(
         self,
         width: int = config.FRAME_WIDTH,
@@ -53,6 +111,13 @@ class FrameDecoder:
         buffer_size: int = 1,
         on_frame: Optional[Callable[[np.ndarray], None]] = None,
         on_error: Optional[Callable[[str], None]] = None,
+        use_frame_pool: bool = True,
+        pool_spares: int = 2,
+        pixel_format: PixelFormat = PixelFormat.RGB24,
+        native_resolution: bool = False,
+        max_queued_bytes: Optional[int] = None,
+        shared_memory_bus: Optional[str] = None,
+        tracer: Optional[PipelineTracer] = None,
     ):
         """
         Initialize frame decoder.
@@ -68,10 +133,53 @@ class FrameDecoder:
             A value of 1 keeps only the latest frame.
         on_frame : callable, optional
             Callback invoked when a frame is successfully decoded.
-            Receives the decoded frame as a numpy array.
+            Receives the decoded frame as a numpy array. It runs on the
+            reader thread, so it must be cheap; use ``subscribe()`` for
+            anything slower.
         on_error : callable, optional
             Callback invoked when a decode error occurs.
             Receives the error message as a string.
+        use_frame_pool : bool, default True
+            Read frames in place into a pool of preallocated arrays using
+            readinto() instead of allocating a new buffer for every frame.
+            Falls back to read() if the pipe does not support readinto().
+        pool_spares : int, default 2
+            Number of pool slots on top of ``buffer_size``, covering the
+            frame being read and frames still held by consumers (the virtual
+            camera thread, ``on_frame`` callbacks). Frames queued for
+            threaded and asyncio subscribers get slots of their own.
+        pixel_format : PixelFormat, default RGB24
+            Raw frame format produced by the protocol adapter. Determines
+            the frame size read from the pipe and the shape of decoded
+            arrays: ``(height, width, 3)`` for RGB24, ``(height * 3 // 2,
+            width)`` for NV12/I420.
+        native_resolution : bool, default False
+            The adapter keeps the sender's resolution. Before reading from
+            an FFmpeg process the decoder waits for the frame size FFmpeg
+            reports for its output (``OUTPUT_INFO``) and resizes to it;
+            ``width`` and ``height`` only apply until then. Needs an adapter
+            with an ``FFmpegStderrMonitor``.
+        max_queued_bytes : int, optional
+            Bound the latency of FFmpeg pipes: when more than this many
+            bytes are waiting in the pipe after a frame was read, that
+            frame is stale and the reader reads over it to the next one
+            instead of publishing it. FFmpeg writes a frame only once it
+            is decoded, so with 0 any waiting byte means a newer frame is
+            ready and only the newest is published. After
+            ``config.MAX_DRAINED_FRAMES`` stale frames in a row the next
+            one is published regardless, so a reader that stays behind
+            still shows motion. The pipe holds at most 64 KiB on Linux and
+            less on Windows; larger values never trigger. None (default)
+            reads every frame in order.
+        shared_memory_bus : str, optional
+            Also publish frames into a shared-memory ring of this name for
+            other processes (``shm_bus.SharedFrameReader``). The bus is
+            created by ``start()`` and removed by ``stop()``; frames are
+            copied into it on a subscriber thread, so the reader never
+            waits for the copy.
+        tracer : PipelineTracer, optional
+            Records the ``pipe_wait``, ``pipe_read`` and ``publish`` stage
+            of every frame.
 
         Returns
         -------
@@ -79,20 +187,71 @@ class FrameDecoder:
         """
         self.width = width
         self.height = height
-        self._frame_bytes = width * height * 3  # RGB24
+        self.pixel_format = pixel_format
+        self._frame_bytes = frame_bytes(pixel_format, width, height)
+        self._frame_shape = frame_shape(pixel_format, width, height)
         self._buffer_size = buffer_size
-        self._frame_buffer: deque[np.ndarray] = deque(maxlen=buffer_size)
+        self._frame_buffer: deque[FrameEnvelope] = deque(maxlen=buffer_size)
         self._on_frame = on_frame
         self._on_error = on_error
         self._protocol_adapter = None
         self._is_webrtc = False
         self._reader_thread: threading.Thread | None = None
         self._error_thread: threading.Thread | None = None
+        self._unsubscribe_stderr: Callable[[], None] | None = None
         self._lock = threading.Lock()
+        # Signalled whenever a new frame is published
+        self._frame_ready = threading.Condition(self._lock)
+        self._generation = 0
+        # Frames read (published or drained) and source sessions; written
+        # on the reader thread only
+        self._sequence = 0
+        self._session = 0
+        self._session_frames = 0
+        # Output frame rate per FFmpeg process, for frame timestamps
+        self._output_rates: Dict[Any, float] = {}
         self._running = False
-        self._frame_count = 0
-        self._error_count = 0
+        # Written on the reader/stderr threads, read by anyone
+        self._frames = Counter("frames")
+        self._drained_frames = Counter("drained_frames")
+        self._errors = Counter("errors")
         self._last_frame_time = 0.0
+        self._short_read_count = 0
+        self._truncated_frame_count = 0
+        self._eof_count = 0
+        self._reattach_count = 0
+        self._use_frame_pool = use_frame_pool
+        self._pool_spares = pool_spares
+        self._frame_pool: FramePool | None = None
+        self._started_at = 0.0
+        self._first_frame_timing: FirstFrameTiming | None = None
+
+        # Native resolution: output format per FFmpeg process, None once a
+        # process closed without reporting one
+        self._native_resolution = native_resolution
+        self._output_formats: Dict[Any, Optional[StreamInfo]] = {}
+        self._output_format_ready = threading.Condition()
+        self._resize_count = 0
+        self._max_queued_bytes = max_queued_bytes
+
+        # Replaced as a whole under the lock; the reader iterates a snapshot
+        self._subscribers: tuple[FrameSubscription, ...] = ()
+        self._subscribers_lock = threading.Lock()
+        self._shm_bus_name = shared_memory_bus
+        self._shm_writer: SharedFrameWriter | None = None
+        self._shm_subscription: FrameSubscription | None = None
+        self._tracer = tracer
+
+        # rebind() hand-off to the reader thread
+        self._rebind = threading.Condition()
+        self._rebind_pending = False
+        self._reader_active = False
+
+        # Downtime: from end of stream (or rebind) to the next frame
+        self._outage_started: float | None = None
+        self._last_downtime: float | None = None
+        self._total_downtime = 0.0
+        self._downtime_count = 0
 
     def clear_buffer(self) -> None:
         """Clear the frame buffer to free memory."""
@@ -110,14 +269,16 @@ class FrameDecoder:
         ----------
         protocol_adapter : ProtocolAdapter
             The protocol adapter providing the video stream.
-            Must have a get_stdout() method that returns a subprocess.Popen
-            with stdout containing raw RGB24 frames, OR a get_frame()
-            method for WebRTC.
+            Must either expose a ``frame_slot`` (WebRTC), have a
+            get_stdout() method that returns a subprocess.Popen with stdout
+            containing raw frames, or provide a non-blocking get_frame()
+            method that is polled.
 
         Raises
         ------
         RuntimeError
-            If the protocol adapter is not started or doesn't provide stdout/get_frame
+            If the protocol adapter is not started or doesn't provide
+            frame_slot/stdout/get_frame
 
         Returns
         -------
@@ -128,21 +289,86 @@ class FrameDecoder:
             return
 
         self._protocol_adapter = protocol_adapter
-        self._is_webrtc = False
+        self._started_at = time.monotonic()
+        self._first_frame_timing = None
+        self._outage_started = None
 
-        # Check if adapter has get_frame method (WebRTC)
-        if hasattr(protocol_adapter, "get_frame"):
-            self._is_webrtc = True
+        target = self._reader_target(protocol_adapter)
+        if self._is_webrtc:
             log.info("Starting frame decoder in WebRTC mode")
-            self._running = True
+        else:
+            log.info("Starting frame decoder with %s", type(protocol_adapter).__name__)
 
-            self._reader_thread = threading.Thread(
-                target=self._read_frames_webrtc, daemon=True, name="webrtc-reader"
-            )
-            self._reader_thread.start()
+        self._running = True
+        if self._shm_bus_name:
+            self._open_shared_memory_bus()
+        self._start_reader(target)
+        self._attach_error_source(protocol_adapter)
+
+    def rebind(self, protocol_adapter) -> None:
+        """
+        Switch to a new or restarted protocol adapter without a restart.
+
+        Unlike ``stop()``/``start()`` this keeps the frame buffer (so the
+        virtual camera goes on showing the last good frame), the frame
+        pool and, if it is still running, the reader thread. The reader
+        moves to the adapter's pipe at the next frame boundary, or as soon
+        as the previous FFmpeg process ends - callers stop the old adapter
+        first. The time until the next frame is recorded as downtime.
+
+        Parameters
+        ----------
+        protocol_adapter : ProtocolAdapter
+            Started adapter to read from; may be the current one after a
+            restart
+
+        Raises
+        ------
+        RuntimeError
+            If the adapter cannot be read from, as in ``start()``
+        """
+        if not self._running:
+            self.start(protocol_adapter)
             return
 
-        # Check for FFmpeg-based adapters (RTMP, SRT)
+        target = self._reader_target(protocol_adapter)
+        log.info("Rebinding frame decoder to %s", type(protocol_adapter).__name__)
+
+        with self._rebind:
+            self._protocol_adapter = protocol_adapter
+            self._rebind_pending = True
+            if self._outage_started is None:
+                self._outage_started = time.monotonic()
+            restart = not self._reader_active
+            self._rebind.notify_all()
+
+        if restart:
+            # The previous reader already ended with its stream
+            self._start_reader(target)
+        self._attach_error_source(protocol_adapter)
+
+    def _reader_target(self, protocol_adapter) -> Callable[[], None]:
+        """
+        Pick the reader loop for ``protocol_adapter``.
+
+        Raises
+        ------
+        RuntimeError
+            If the adapter offers no way to read frames
+        """
+        # Adapters that push frames into a FrameSlot (WebRTC)
+        if isinstance(getattr(protocol_adapter, "frame_slot", None), FrameSlot):
+            self._is_webrtc = True
+            return self._read_frames_slot
+
+        # Adapters that only offer a non-blocking get_frame() are polled
+        if not hasattr(protocol_adapter, "get_stdout") and hasattr(
+            protocol_adapter, "get_frame"
+        ):
+            self._is_webrtc = True
+            return self._read_frames_webrtc
+
+        # FFmpeg-based adapters (RTMP, SRT)
         if not hasattr(protocol_adapter, "get_stdout"):
             raise RuntimeError(
                 f"Protocol adapter {type(protocol_adapter).__name__} does not "
@@ -154,21 +380,63 @@ class FrameDecoder:
             raise RuntimeError(
                 "Protocol adapter not started or does not provide stdout"
             )
+        self._is_webrtc = False
+        return self._read_frames
 
-        log.info("Starting frame decoder with %s", type(protocol_adapter).__name__)
-        self._running = True
-
-        # Background thread that continuously reads decoded frames
+    def _start_reader(self, target: Callable[[], None]) -> None:
+        """Start the background thread that runs ``target``."""
+        with self._rebind:
+            self._rebind_pending = False
+            self._reader_active = True
         self._reader_thread = threading.Thread(
-            target=self._read_frames, daemon=True, name="ffmpeg-reader"
+            target=self._run_reader,
+            args=(target,),
+            daemon=True,
+            name="webrtc-reader" if self._is_webrtc else "ffmpeg-reader",
         )
         self._reader_thread.start()
 
-        # Error logging thread for ffmpeg
-        self._error_thread = threading.Thread(
-            target=self._read_errors, daemon=True, name="ffmpeg-errors"
-        )
-        self._error_thread.start()
+    def _run_reader(self, target: Callable[[], None]) -> None:
+        """Run reader loops until stopped, switching loops on ``rebind()``."""
+        while True:
+            target()
+            with self._rebind:
+                if not (self._running and self._rebind_pending):
+                    self._reader_active = False
+                    return
+                self._rebind_pending = False
+                adapter = self._protocol_adapter
+            try:
+                target = self._reader_target(adapter)
+            except RuntimeError as e:
+                log.error("Cannot rebind frame reader: %s", e)
+                with self._rebind:
+                    self._reader_active = False
+                return
+            log.debug("Frame reader switched to %s", type(adapter).__name__)
+
+    def _attach_error_source(self, protocol_adapter) -> None:
+        """
+        Follow decode errors of ``protocol_adapter``.
+
+        Subscribes to the adapter's stderr monitor when it has one,
+        otherwise reads stderr in a thread of its own.
+        """
+        if self._unsubscribe_stderr is not None:
+            self._unsubscribe_stderr()
+            self._unsubscribe_stderr = None
+
+        if self._is_webrtc:
+            return
+
+        monitor = getattr(protocol_adapter, "stderr_monitor", None)
+        if isinstance(monitor, FFmpegStderrMonitor):
+            self._unsubscribe_stderr = monitor.subscribe(self._on_ffmpeg_event)
+        elif self._error_thread is None or not self._error_thread.is_alive():
+            self._error_thread = threading.Thread(
+                target=self._read_errors, daemon=True, name="ffmpeg-errors"
+            )
+            self._error_thread.start()
 
     def stop(self) -> None:
         """
@@ -178,9 +446,16 @@ class FrameDecoder:
         and resets the decoder state. It waits for threads to finish
         gracefully before returning.
         """
-        self._running = False
+        with self._rebind:
+            self._running = False
+            self._rebind_pending = False
+            self._rebind.notify_all()
         self._protocol_adapter = None
 
+        if self._unsubscribe_stderr is not None:
+            self._unsubscribe_stderr()
+            self._unsubscribe_stderr = None
+
         # Wait for threads to finish
         if self._reader_thread is not None and self._reader_thread.is_alive():
             self._reader_thread.join(timeout=2)
@@ -190,17 +465,100 @@ class FrameDecoder:
             self._error_thread.join(timeout=2)
             self._error_thread = None
 
+        self._close_shared_memory_bus()
+
         with self._lock:
             self._frame_buffer.clear()
 
         log.info(
             "Frame decoder stopped (decoded %d frames, %d errors)",
-            self._frame_count,
-            self._error_count,
+            self._frames.value,
+            self._errors.value,
         )
 
     # ── data in / out ────────────────────────────────────
 
+    def subscribe(
+        self,
+        callback: Callable[[np.ndarray], Any],
+        mode: DeliveryMode = DeliveryMode.INLINE,
+        name: str = "",
+        queue_size: int = config.SUBSCRIBER_QUEUE_SIZE,
+        loop=None,
+        with_timestamp: bool = False,
+    ) -> FrameSubscription:
+        """
+        Call ``callback`` with every published frame.
+
+        Subscriptions outlive ``stop()`` and ``start()``; they end with
+        ``unsubscribe()``.
+
+        Parameters
+        ----------
+        callback : callable
+            Receives each frame; in ``ASYNCIO`` mode it may be a coroutine
+            function
+        mode : DeliveryMode, default INLINE
+            ``INLINE`` runs the callback on the reader thread, ``THREADED``
+            on a worker thread of its own and ``ASYNCIO`` on ``loop``; the
+            queued modes drop the oldest frame when the subscriber falls
+            ``queue_size`` frames behind
+        name : str, optional
+            Label in logs and ``get_stats()``; defaults to the callback name
+        queue_size : int
+            Frames queued for ``THREADED`` and ``ASYNCIO`` delivery
+        loop : asyncio.AbstractEventLoop, optional
+            Loop for ``ASYNCIO`` delivery
+        with_timestamp : bool, default False
+            Call ``callback(frame, read_at)`` with the frame's
+            ``time.monotonic()`` read time (``FrameEnvelope.read_at``)
+
+        Returns
+        -------
+        FrameSubscription
+            Handle with the subscriber's counters, for ``unsubscribe()``
+        """
+        subscription = FrameSubscription(
+            callback, mode, name, queue_size, loop, with_timestamp
+        )
+        subscription.start()
+        with self._subscribers_lock:
+            self._subscribers = self._subscribers + (subscription,)
+        pool = self._frame_pool
+        if pool is not None:
+            pool.grow(self._pool_slots())
+        log.debug("Frame subscriber %s added (%s)", subscription.name, mode.value)
+        return subscription
+
+    def unsubscribe(self, subscription: FrameSubscription) -> None:
+        """
+        Stop delivering frames to a subscriber and drop its queued frames.
+
+        Parameters
+        ----------
+        subscription : FrameSubscription
+            Handle returned by ``subscribe()``; unknown handles are ignored
+        """
+        with self._subscribers_lock:
+            if subscription not in self._subscribers:
+                return
+            self._subscribers = tuple(
+                s for s in self._subscribers if s is not subscription
+            )
+        subscription.stop()
+
+    @property
+    def subscribers(self) -> tuple[FrameSubscription, ...]:
+        """
+        Get the current frame subscriptions.
+
+        Returns
+        -------
+        tuple of FrameSubscription
+            Subscriptions in the order they receive frames.
+        """
+        return self._subscribers
+
     def feed(self, data: bytes) -> None:
         """
         Deprecated in protocol adapter mode.
@@ -224,10 +582,114 @@ class FrameDecoder:
         Returns
         -------
         np.ndarray | None
-            The latest decoded RGB frame, or None if no frame is available.
+            The latest decoded frame in the configured pixel format, or
+            None if no frame is available.
         """
-        with self._lock:
-            return self._frame_buffer[-1] if self._frame_buffer else None
+        envelope = self.latest_envelope
+        return None if envelope is None else envelope.frame
+
+    @property
+    def latest_envelope(self) -> FrameEnvelope | None:
+        """
+        Return the most recently published frame with its metadata.
+
+        Returns
+        -------
+        FrameEnvelope | None
+            The latest frame with its sequence number, read time, session
+            and timestamp, or None if no frame is available.
+        """
+        # deque indexing is atomic, so readers (tray, monitor, camera
+        # timer) never wait on the reader thread
+        try:
+            return self._frame_buffer[-1]
+        except IndexError:
+            return None
+
+    @property
+    def frame_generation(self) -> int:
+        """
+        Get the generation number of the latest frame.
+
+        The generation increases by one for every published frame and is
+        never reset, so consumers can tell new frames from repeats and
+        count frames they missed.
+
+        Returns
+        -------
+        int
+            Generation of the latest frame, 0 before the first frame.
+        """
+        return self._generation
+
+    @property
+    def first_frame_timing(self) -> FirstFrameTiming | None:
+        """
+        Get how long the first frame took after the last ``start()``.
+
+        Measured against the adapter's listener spawn and sender detection
+        times, so it covers FFmpeg's probing and decoder start-up.
+
+        Returns
+        -------
+        FirstFrameTiming or None
+            None until the first frame after ``start()`` arrives.
+        """
+        return self._first_frame_timing
+
+    def wait_for_frame(
+        self, after_generation: int, timeout: float
+    ) -> tuple[int, np.ndarray | None]:
+        """
+        Block until a frame newer than ``after_generation`` is published.
+
+        Parameters
+        ----------
+        after_generation : int
+            Generation of the last frame the caller has seen
+        timeout : float
+            Maximum time to wait in seconds
+
+        Returns
+        -------
+        tuple[int, np.ndarray | None]
+            The current generation and latest frame. If the wait timed out
+            the generation equals ``after_generation``, i.e. the sender
+            stalled and the returned frame (if any) is a repeat.
+        """
+        generation, envelope = self.wait_for_envelope(after_generation, timeout)
+        return generation, None if envelope is None else envelope.frame
+
+    def wait_for_envelope(
+        self, after_generation: int, timeout: float
+    ) -> tuple[int, FrameEnvelope | None]:
+        """
+        Like ``wait_for_frame()``, returning the frame with its metadata.
+
+        Returns
+        -------
+        tuple[int, FrameEnvelope | None]
+            The current generation and latest envelope.
+        """
+        with self._frame_ready:
+            self._frame_ready.wait_for(
+                lambda: self._generation > after_generation, timeout
+            )
+            envelope = self._frame_buffer[-1] if self._frame_buffer else None
+            return self._generation, envelope
+
+    @property
+    def frame_pool(self) -> FramePool | None:
+        """
+        Get the frame pool used for in-place reads.
+
+        Returns
+        -------
+        FramePool | None
+            The pool, or None if pooling is disabled or no FFmpeg stream
+            has been read yet.
+        """
+        return self._frame_pool
 
     @property
     def frame_count(self) -> int:
@@ -243,7 +705,7 @@ class FrameDecoder:
         int
             Total number of frames decoded successfully.
         """
-        return self._frame_count
+        return self._frames.value
 
     @property
     def error_count(self) -> int:
@@ -259,22 +721,290 @@ class FrameDecoder:
         int
             Total number of decode errors encountered.
         """
-        return self._error_count
+        return self._errors.value
+
+    @property
+    def truncated_frame_count(self) -> int:
+        """
+        Get the number of frames cut off by the end of the stream.
+
+        A truncated frame means the pipe closed partway through a frame;
+        the partial data is dropped and counted as a decode error.
+
+        Returns
+        -------
+        int
+            Total number of truncated frames.
+        """
+        return self._truncated_frame_count
+
+    @property
+    def eof_count(self) -> int:
+        """
+        Get the number of times the decoder pipe reached end of stream.
+
+        Returns
+        -------
+        int
+            Total number of end-of-stream events, truncated or not.
+        """
+        return self._eof_count
+
+    @property
+    def reattach_count(self) -> int:
+        """
+        Get the number of times the reader moved on to a new FFmpeg process.
+
+        Returns
+        -------
+        int
+            Hand-overs to the adapter's next listener without a restart.
+        """
+        return self._reattach_count
+
+    @property
+    def drained_frame_count(self) -> int:
+        """
+        Get the number of stale frames skipped to bound latency.
+
+        Returns
+        -------
+        int
+            Frames read but not published because a newer one was already
+            queued (see ``max_queued_bytes``).
+        """
+        return self._drained_frames.value
+
+    @property
+    def resize_count(self) -> int:
+        """
+        Get the number of frame size changes in native-resolution mode.
+
+        Returns
+        -------
+        int
+            Times a new FFmpeg process reported a different output size.
+        """
+        return self._resize_count
+
+    @property
+    def last_downtime(self) -> float | None:
+        """
+        Get the length of the most recent outage.
+
+        An outage runs from the end of a stream (or a ``rebind()``) to the
+        next decoded frame.
+
+        Returns
+        -------
+        float or None
+            Seconds, or None if frames never stopped since ``start()``.
+        """
+        return self._last_downtime
+
+    @property
+    def total_downtime(self) -> float:
+        """
+        Get the summed length of all completed outages.
+
+        Returns
+        -------
+        float
+            Seconds without new frames between streams.
+        """
+        return self._total_downtime
+
+    @property
+    def downtime_count(self) -> int:
+        """
+        Get the number of completed outages.
+
+        Returns
+        -------
+        int
+            Outages that ended with a new frame.
+        """
+        return self._downtime_count
+
+    def get_stats(self) -> dict:
+        """
+        Return decoder counters for diagnostics (e.g. the /health endpoint).
+
+        Returns
+        -------
+        dict
+            JSON-serializable counters; times are in seconds
+        """
+        timing = self._first_frame_timing
+        return {
+            "running": self._running,
+            "frames": self._frames.value,
+            "errors": self._errors.value,
+            "eof": self._eof_count,
+            "reattached": self._reattach_count,
+            "first_frame": None if timing is None else timing.since_start,
+            "last_downtime": self._last_downtime,
+            "total_downtime": self._total_downtime,
+            "downtimes": self._downtime_count,
+            "in_outage": self._outage_started is not None,
+            "frame_size": f"{self.width}x{self.height}",
+            "resizes": self._resize_count,
+            "drained": self._drained_frames.value,
+            "sequence": self._sequence,
+            "session": self._session,
+            "subscribers": {s.name: s.get_stats() for s in self._subscribers},
+            "shm_bus": None if self._shm_writer is None else self._shm_writer.get_stats(),
+        }
+
+    @property
+    def short_read_count(self) -> int:
+        """
+        Get the number of partial pipe reads.
+
+        Partial reads are normal for pipes and do not lose data; a rising
+        count only indicates that frames arrive in several chunks.
+
+        Returns
+        -------
+        int
+            Total number of reads that returned less than a full frame.
+        """
+        return self._short_read_count
 
     # ── internal ─────────────────────────────────────────
 
+    def _open_shared_memory_bus(self) -> None:
+        """Create the shared-memory bus and feed it from a subscriber thread."""
+        try:
+            self._shm_writer = SharedFrameWriter(
+                self._shm_bus_name,
+                self.pixel_format,
+                max(config.SHM_BUS_MAX_FRAME_BYTES, self._frame_bytes),
+            )
+        except (OSError, ValueError) as e:
+            # Decoding for the virtual camera goes on without the bus
+            log.error("Cannot create shared frame bus %s: %s", self._shm_bus_name, e)
+            return
+        # One queued frame: a slow copy skips frames instead of lagging.
+        # Frames carry their read time, so readers see their full age.
+        self._shm_subscription = self.subscribe(
+            self._shm_writer.write, DeliveryMode.THREADED, "shm-bus", queue_size=1,
+            with_timestamp=True,
+        )
+
+    def _close_shared_memory_bus(self) -> None:
+        """Stop feeding the bus, then remove it."""
+        if self._shm_subscription is not None:
+            self.unsubscribe(self._shm_subscription)
+            self._shm_subscription = None
+        if self._shm_writer is not None:
+            self._shm_writer.close()
+            self._shm_writer = None
+
+    def _publish_frame(self, frame: np.ndarray, pts: float | None = None) -> None:
+        """Store a decoded frame, wake waiting consumers and notify callbacks."""
+        tracer = self._tracer
+        if tracer is not None:
+            publish_started = time.perf_counter()
+        read_at = time.monotonic()
+        self._sequence += 1
+        self._session_frames += 1
+        envelope = FrameEnvelope(frame, self._sequence, read_at, self._session, pts)
+        # Counted before the hand-off so a woken consumer sees the count;
+        # the condition only pairs the frame with its generation
+        self._frames.add()
+        with self._frame_ready:
+            self._frame_buffer.append(envelope)
+            self._generation += 1
+            self._frame_ready.notify_all()
+
+        if self._first_frame_timing is None:
+            self._record_first_frame()
+        if self._outage_started is not None:
+            self._record_downtime()
+
+        # Notify callback if provided
+        if self._on_frame:
+            self._on_frame(frame)
+        for subscription in self._subscribers:
+            subscription.deliver(frame, read_at)
+        if tracer is not None:
+            tracer.record(PUBLISH, publish_started, time.perf_counter(), envelope.sequence)
+
+    def _begin_session(self) -> None:
+        """Start numbering frames of a new source (process, slot, adapter)."""
+        self._session += 1
+        self._session_frames = 0
+
+    def _frame_pts(self, proc) -> float | None:
+        """Output timestamp of the next frame read from ``proc``."""
+        rate = self._output_rates.get(proc)
+        return self._session_frames / rate if rate else None
+
+    def _record_first_frame(self) -> None:
+        """Record and log the time to the first frame since ``start()``."""
+        now = time.monotonic()
+        adapter = self._protocol_adapter
+        listen_at = getattr(adapter, "listen_started_at", None)
+        connect_at = getattr(adapter, "connected_at", None)
+
+        timing = FirstFrameTiming(
+            since_start=now - self._started_at,
+            since_listen=now - listen_at if isinstance(listen_at, float) else None,
+            since_connect=now - connect_at if isinstance(connect_at, float) else None,
+        )
+        self._first_frame_timing = timing
+
+        if timing.since_listen is not None:
+            log.info(
+                "First frame %.0f ms after listener start%s",
+                timing.since_listen * 1000,
+                ""
+                if timing.since_connect is None
+                else f" ({timing.since_connect * 1000:.0f} ms after sender detected)",
+            )
+        else:
+            log.info("First frame %.0f ms after decoder start", timing.since_start * 1000)
+
+    def _record_downtime(self) -> None:
+        """Close the current outage now that a frame arrived again."""
+        started = self._outage_started
+        if started is None:
+            return
+        self._outage_started = None
+        downtime = time.monotonic() - started
+        self._last_downtime = downtime
+        self._total_downtime += downtime
+        self._downtime_count += 1
+        log.info("Frames back after %.0f ms of downtime", downtime * 1000)
+
+    def _mark_outage(self) -> None:
+        """Start timing downtime unless an outage is already running."""
+        if self._outage_started is None:
+            self._outage_started = time.monotonic()
+
     def _read_frames(self) -> None:
         """
         Continuously read raw frames from protocol adapter's stdout.
 
         This method runs in a background thread and continuously reads
-        decoded RGB24 frames from the protocol adapter's stdout. It stores
+        decoded raw frames from the protocol adapter's stdout. It stores
         only the latest frame to minimize memory usage and latency.
 
+        Reads are framing-aware: a pipe may return fewer bytes than a full
+        frame at any time, so partial reads keep accumulating into the
+        current frame slot until it is complete. Bytes are never discarded,
+        which keeps the reader aligned with the rawvideo stream.
+
         The method handles various error conditions gracefully:
-        - Short reads: logs warning and continues with last valid frame
-        - End of stream: exits gracefully
-        - Network errors: logs error and continues with last valid frame
+        - Short reads: keeps filling the current frame
+        - Backlog above ``max_queued_bytes``: the frame just read is stale;
+          the next one is read into the same buffer and the skip counted,
+          up to ``config.MAX_DRAINED_FRAMES`` frames in a row
+        - Truncated frame at end of stream: counted and reported as an error
+        - End of stream: re-attaches to the adapter's next FFmpeg listener
+          if it has one, otherwise exits gracefully
+        - Network errors: logs error, keeps the partial frame and retries
 
         On poor network conditions, this implementation ensures that the
         application continues to display the last valid frame rather than
@@ -295,55 +1025,298 @@ class FrameDecoder:
 
         log.debug("Frame reader thread started")
 
+        self._begin_session()
+        stream = self._pipe_stream(proc)
+        readinto = self._pipe_readinto(stream)
+        # The frame size of each new process is only known once FFmpeg
+        # reports its output format
+        size_pending = self._native_resolution and self._reports_output_format()
+
+        # Frame currently being filled and how many bytes it already holds.
+        # Both survive exceptions so a failed read never loses alignment.
+        frame = None
+        view = None
+        filled = 0
+        tracer = self._tracer
+        # Stale frames read over since the last published one
+        drained = 0
+        max_drained = config.MAX_DRAINED_FRAMES
+        # Stage boundaries of the current frame: read requested, first data
+        wait_started = data_started = 0.0
+
         while self._running:
             try:
-                raw = proc.stdout.read(self._frame_bytes)
-
-                if len(raw) == 0:
-                    # End of stream - exit gracefully
-                    if self._running:
-                        log.info("End of stream reached")
-                    break
-
-                if len(raw) != self._frame_bytes:
-                    # Short read - log error but continue with last valid frame
-                    if self._running:
-                        error_msg = f"Short read from decoder: expected {self._frame_bytes} bytes, got {len(raw)}"
+                if view is None:
+                    if self._rebind_pending:
+                        # Frame boundary: let _run_reader switch pipes
+                        break
+                    if size_pending:
+                        if not self._adopt_output_format(proc):
+                            if not self._running or self._rebind_pending:
+                                break
+                            # Closed before its first frame
+                            self._eof_count += 1
+                            self._mark_outage()
+                            proc = self._next_process(proc)
+                            if proc is None:
+                                break
+                            stream = self._pipe_stream(proc)
+                            self._reattach_count += 1
+                            self._begin_session()
+                            continue
+                        size_pending = False
+                        # A new size replaces the pool
+                        readinto = self._pipe_readinto(stream)
+                    if readinto is not None:
+                        frame = self._frame_pool.acquire()
+                    else:
+                        frame = bytearray(self._frame_bytes)
+                    view = memoryview(frame).cast("B")
+                    filled = 0
+
+                if tracer is not None and filled == 0:
+                    wait_started = time.perf_counter()
+                    data_started = 0.0
+                while filled < self._frame_bytes:
+                    if readinto is not None:
+                        nread = readinto(view[filled:])
+                    else:
+                        chunk = stream.read(self._frame_bytes - filled)
+                        nread = len(chunk)
+                        view[filled:filled + nread] = chunk
+                    if not nread:
+                        break
+                    if tracer is not None and not data_started:
+                        data_started = time.perf_counter()
+                    filled += nread
+                    if filled < self._frame_bytes:
+                        self._short_read_count += 1
+
+                if filled < self._frame_bytes:
+                    # End of stream
+                    self._eof_count += 1
+                    self._mark_outage()
+                    if filled and self._running:
+                        # The stream ended in the middle of a frame
+                        error_msg = (
+                            f"Truncated frame at end of stream: expected "
+                            f"{self._frame_bytes} bytes, got {filled}"
+                        )
                         log.warning(error_msg)
-                        self._error_count += 1
+                        self._truncated_frame_count += 1
+                        self._errors.add()
                         if self._on_error:
                             self._on_error(error_msg)
-                        # Continue loop instead of breaking - graceful degradation
-                        continue
+                    elif self._running:
+                        log.info("End of stream reached")
 
-                # Successfully read a frame
-                frame = np.frombuffer(raw, dtype=np.uint8).reshape(
-                    (self.height, self.width, 3)
-                )
+                    proc = self._next_process(proc)
+                    if proc is None:
+                        break
+                    # Same thread, pool and last frame; only the pipe changes
+                    stream = self._pipe_stream(proc)
+                    readinto = self._pipe_readinto(stream)
+                    size_pending = self._native_resolution
+                    view.release()
+                    view = None
+                    frame = None
+                    self._reattach_count += 1
+                    self._begin_session()
+                    log.info("Frame reader re-attached to the next FFmpeg process")
+                    continue
 
-                with self._lock:
-                    self._frame_buffer.append(frame)
-                    self._frame_count += 1
+                if drained < max_drained and self._frame_is_stale(stream):
+                    # A newer frame is already on its way: read it into
+                    # the same buffer instead of publishing this one
+                    drained += 1
+                    self._drained_frames.add()
+                    self._sequence += 1
+                    self._session_frames += 1
+                    filled = 0
+                    continue
 
-                # Notify callback if provided
-                if self._on_frame:
-                    self._on_frame(frame)
+                # Successfully read a frame
+                if tracer is not None:
+                    read_done = time.perf_counter()
+                    sequence = self._sequence + 1
+                    tracer.record(PIPE_WAIT, wait_started, data_started, sequence)
+                    tracer.record(PIPE_READ, data_started, read_done, sequence)
+                view.release()
+                view = None
+                if readinto is None:
+                    frame = np.frombuffer(frame, dtype=np.uint8).reshape(
+                        self._frame_shape
+                    )
+
+                self._publish_frame(frame, self._frame_pts(proc))
+                drained = 0
+
+                # Drop our own reference so the pool can recycle the slot
+                # as soon as every consumer has released it.
+                frame = None
 
             except Exception as e:
                 if self._running:
                     error_msg = f"Error reading frame: {e}"
                     log.error(error_msg)
-                    self._error_count += 1
+                    self._errors.add()
                     if self._on_error:
                         self._on_error(error_msg)
                     # Continue loop instead of breaking - graceful degradation
                     # Last valid frame will continue to be displayed
                     continue
 
+        if view is not None:
+            view.release()
+
         log.debug("Frame reader thread exiting")
 
+    def _pipe_stream(self, proc):
+        """
+        Return the stream to read ``proc``'s frames from.
+
+        When latency is bounded this is the unbuffered ``raw`` stream, so
+        no frame data hides in a Python buffer where the pipe backlog
+        cannot see it.
+        """
+        stream = proc.stdout
+        if self._max_queued_bytes is not None:
+            return getattr(stream, "raw", stream)
+        return stream
+
+    def _frame_is_stale(self, stream) -> bool:
+        """True if the pipe backlog exceeds ``max_queued_bytes``."""
+        if self._max_queued_bytes is None:
+            return False
+        queued = queued_bytes(stream)
+        return queued is not None and queued > self._max_queued_bytes
+
+    def _pipe_readinto(self, stream):
+        """Return ``stream.readinto`` if frames are read into the pool."""
+        if not self._use_frame_pool:
+            return None
+        readinto = getattr(stream, "readinto", None)
+        if readinto is None:
+            log.debug("Decoder pipe has no readinto(), frame pool disabled")
+        elif self._frame_pool is None:
+            self._frame_pool = FramePool(self._frame_shape, self._pool_slots())
+        return readinto
+
+    def _pool_slots(self) -> int:
+        """Pool slots for the frame buffer, spares and queued subscribers."""
+        held = sum(s.max_held_frames for s in self._subscribers)
+        return self._buffer_size + self._pool_spares + held
+
+    def _reports_output_format(self) -> bool:
+        """True if the adapter's stderr monitor reports output formats."""
+        adapter = self._protocol_adapter
+        if isinstance(getattr(adapter, "stderr_monitor", None), FFmpegStderrMonitor):
+            return True
+        log.warning(
+            "%s has no FFmpeg stderr monitor; decoding at %dx%d",
+            type(adapter).__name__, self.width, self.height,
+        )
+        return False
+
+    def _adopt_output_format(self, proc) -> bool:
+        """
+        Wait for the output format of ``proc`` and resize to it.
+
+        Returns
+        -------
+        bool
+            False if the process closed without reporting one, or the
+            decoder was stopped or rebound
+        """
+        with self._output_format_ready:
+            # Bounded waits so stop() and rebind() are noticed
+            while (
+                proc not in self._output_formats
+                and self._running
+                and not self._rebind_pending
+            ):
+                self._output_format_ready.wait(self._SLOT_WAIT)
+            info = self._output_formats.pop(proc, None)
+        if info is None:
+            return False
+
+        expected = ffmpeg_pix_fmt(self.pixel_format)
+        if info.pix_fmt is not None and info.pix_fmt != expected:
+            log.warning("FFmpeg outputs %s, expected %s", info.pix_fmt, expected)
+        if (info.width, info.height) != (self.width, self.height):
+            log.info(
+                "Decoder frame size %dx%d -> %dx%d",
+                self.width, self.height, info.width, info.height,
+            )
+            self.width = info.width
+            self.height = info.height
+            self._frame_bytes = frame_bytes(self.pixel_format, info.width, info.height)
+            self._frame_shape = frame_shape(self.pixel_format, info.width, info.height)
+            # Frames still held by consumers keep the old pool alive
+            self._frame_pool = None
+            self._resize_count += 1
+        return True
+
+    def _next_process(self, previous):
+        """
+        Wait for the adapter to replace an FFmpeg process that ended.
+
+        RTMP and SRT adapters hand over to a warm-standby listener when the
+        sender disconnects; other adapters end the reader with the stream.
+
+        Returns
+        -------
+        subprocess.Popen or None
+            The process to read from next, or None when stopped
+        """
+        adapter = self._protocol_adapter
+        if not isinstance(getattr(adapter, "stderr_monitor", None), FFmpegStderrMonitor):
+            return None
+        wait_for_process = getattr(adapter, "wait_for_process", None)
+        if not callable(wait_for_process):
+            return None
+
+        while self._running and not self._rebind_pending:
+            proc = wait_for_process(previous, self._SLOT_WAIT)
+            if proc is not None:
+                return proc if proc.stdout is not None else None
+        return None
+
+    def _read_frames_slot(self) -> None:
+        """
+        Read frames from the adapter's FrameSlot.
+
+        Blocks on the slot instead of polling, so an idle stream costs no
+        CPU. The wait is bounded so ``stop()`` is noticed promptly.
+        """
+        slot = self._protocol_adapter.frame_slot
+        log.debug("WebRTC frame reader thread started")
+        self._begin_session()
+
+        while self._running and not self._rebind_pending:
+            try:
+                frame = slot.get(timeout=self._SLOT_WAIT)
+                if frame is None:
+                    if slot.closed:
+                        log.debug("Frame slot closed by adapter")
+                        self._mark_outage()
+                        break
+                    continue
+
+                self._publish_frame(frame)
+
+            except Exception as e:
+                if self._running:
+                    error_msg = f"Error reading WebRTC frame: {e}"
+                    log.error(error_msg)
+                    self._errors.add()
+                    if self._on_error:
+                        self._on_error(error_msg)
+
+        log.debug("WebRTC frame reader thread exiting")
+
     def _read_frames_webrtc(self) -> None:
-        """Read frames from WebRTC adapter using get_frame() method."""
+        """Poll frames from an adapter's non-blocking get_frame() method."""
         if self._protocol_adapter is None:
             log.error("No protocol adapter set")
             return
@@ -354,38 +1327,73 @@ class FrameDecoder:
 
         log.debug("WebRTC frame reader thread started")
 
-        while self._running:
+        adapter = self._protocol_adapter
+        self._begin_session()
+        while self._running and not self._rebind_pending:
             try:
-                frame = self._protocol_adapter.get_frame()
+                frame = adapter.get_frame()
 
                 if frame is None:
-                    import time
-
-                    time.sleep(0.001)
+                    time.sleep(self._POLL_INTERVAL)
                     continue
 
-                with self._lock:
-                    self._frame_buffer.append(frame)
-                    self._frame_count += 1
-
-                if self._on_frame:
-                    self._on_frame(frame)
+                self._publish_frame(frame)
 
             except Exception as e:
                 if self._running:
                     error_msg = f"Error reading WebRTC frame: {e}"
                     log.error(error_msg)
-                    self._error_count += 1
+                    self._errors.add()
                     if self._on_error:
                         self._on_error(error_msg)
                     continue
 
         log.debug("WebRTC frame reader thread exiting")
 
+    def _on_ffmpeg_event(self, event: FFmpegEvent) -> None:
+        """
+        Count decode errors reported by the adapter's stderr monitor.
+
+        Record each process's output frame rate for frame timestamps and,
+        in native-resolution mode, its output format for the reader thread.
+        """
+        if event.type is FFmpegEventType.DECODE_ERROR and self._running:
+            self._errors.add()
+            if self._on_error:
+                self._on_error(f"Decode error: {event.line}")
+            return
+        if (
+            event.type is FFmpegEventType.OUTPUT_INFO
+            and event.source is not None
+            and event.stream_info is not None
+            and event.stream_info.fps
+        ):
+            rates = self._output_rates
+            rates[event.source] = event.stream_info.fps
+            while len(rates) > self._MAX_OUTPUT_FORMATS:
+                del rates[next(iter(rates))]
+        if self._native_resolution and event.source is not None and (
+            event.type is FFmpegEventType.OUTPUT_INFO
+            and event.stream_info is not None
+            or event.type is FFmpegEventType.CLOSED
+        ):
+            with self._output_format_ready:
+                formats = self._output_formats
+                if event.type is FFmpegEventType.OUTPUT_INFO:
+                    formats[event.source] = event.stream_info
+                else:
+                    formats.setdefault(event.source, None)
+                while len(formats) > self._MAX_OUTPUT_FORMATS:
+                    del formats[next(iter(formats))]
+                self._output_format_ready.notify_all()
+
     def _read_errors(self) -> None:
         """
         Read and log ffmpeg stderr from protocol adapter.
 
+        Only used for adapters without an ``FFmpegStderrMonitor``; a second
+        reader on a monitored pipe would steal lines from the monitor.
+
         This method runs in a background thread and continuously monitors
         the protocol adapter's stderr for any issues. It looks for error
         indicators like 'error', 'failed', 'invalid', 'corrupt' and invokes
@@ -422,7 +1430,7 @@ class FrameDecoder:
                     for keyword in ["error", "failed", "invalid", "corrupt"]
                 ):
                     log.error("FFmpeg error: %s", line_str)
-                    self._error_count += 1
+                    self._errors.add()
                     if self._on_error:
                         self._on_error(f"Decode error: {line_str}")
                     # Continue monitoring - don't crash on errors
@@ -0,0 +1,159 @@
+"""
+File-backed stand-in for the pyvirtualcam camera.
+
+``VirtualCameraOutput`` normally writes into a virtual camera driver, which
+headless machines (CI, Linux benchmark hosts) do not have. With a sink path
+it writes into a ``FileFrameSink`` instead: every frame the output thread
+sends is appended to a raw video file, and the wall-clock time of the send
+to a sidecar index, so the frames can be checked afterwards exactly as a
+camera client would have received them.
+
+Files
+-----
+- ``<path>``: frames back to back in the output pixel format (playable
+  with ``ffplay -f rawvideo -pixel_format rgb24 -video_size WxH <path>``)
+- ``<path>.index``: one line per frame, ``<time.time()> <width> <height>``
+
+Integration Notes
+-----------------
+- The sink has the part of the ``pyvirtualcam.Camera`` interface the
+  output thread uses: ``send``, ``device``, ``close`` and the context
+  manager.
+- Frames are written on the output thread, so a slow disk shows up as
+  ``send`` time; at 1080p RGB24 and 30 fps the file grows by ~190 MB per
+  second.
+"""
+
+import logging
+import time
+from typing import BinaryIO, Iterator, Optional, TextIO, Tuple
+
+import numpy as np
+
+from .pixel_format import PixelFormat, frame_bytes, frame_shape
+
+log = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".index"
+
+
+class FileFrameSink:
+    """Appends sent frames to a raw video file with a send-time index."""
+
+    def __init__(
+        self,
+        path: str,
+        width: int,
+        height: int,
+        pixel_format: PixelFormat = PixelFormat.RGB24,
+        append: bool = False,
+    ):
+        """
+        Open the sink files.
+
+        Parameters
+        ----------
+        path : str
+            Raw video file; the index is written next to it
+        width : int
+            Frame width in pixels
+        height : int
+            Frame height in pixels
+        pixel_format : PixelFormat
+            Layout of the frames passed to ``send``
+        append : bool
+            Continue existing files (a camera reopened at another size)
+            instead of truncating them
+
+        Raises
+        ------
+        OSError
+            If the files cannot be opened
+        """
+        self.width = width
+        self.height = height
+        self.pixel_format = pixel_format
+        self._path = path
+        self._frame_bytes = frame_bytes(pixel_format, width, height)
+        mode = "a" if append else "w"
+        self._video: Optional[BinaryIO] = open(path, mode + "b")
+        self._index: Optional[TextIO] = open(path + INDEX_SUFFIX, mode, encoding="ascii")
+        self._frames = 0
+
+    @property
+    def device(self) -> str:
+        """Path of the raw video file, shown where a camera shows its device."""
+        return self._path
+
+    @property
+    def frames_written(self) -> int:
+        """Frames written since the sink was opened."""
+        return self._frames
+
+    def send(self, frame: np.ndarray) -> None:
+        """
+        Append one frame.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            Frame of the sink's size in its pixel format
+
+        Raises
+        ------
+        ValueError
+            If the frame does not have the sink's size
+        """
+        if frame.nbytes != self._frame_bytes:
+            raise ValueError(
+                f"frame of {frame.nbytes} bytes does not fit a "
+                f"{self.width}x{self.height} {self.pixel_format.value} sink"
+            )
+        self._video.write(np.ascontiguousarray(frame).data)
+        self._index.write(f"{time.time():.6f} {self.width} {self.height}\n")
+        self._frames += 1
+
+    def close(self) -> None:
+        """Flush and close the files."""
+        for f in (self._video, self._index):
+            if f is not None:
+                f.close()
+        self._video = self._index = None
+        log.debug("File sink %s closed after %d frames", self._path, self._frames)
+
+    def __enter__(self) -> "FileFrameSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_frames(
+    path: str, pixel_format: PixelFormat = PixelFormat.RGB24
+) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Read back the frames a ``FileFrameSink`` wrote.
+
+    Parameters
+    ----------
+    path : str
+        Raw video file of the sink
+    pixel_format : PixelFormat
+        Pixel format the sink was opened with
+
+    Yields
+    ------
+    tuple of (float, np.ndarray)
+        ``time.time()`` of the send and the frame; stops at the first
+        incomplete frame
+    """
+    with open(path, "rb") as video, open(path + INDEX_SUFFIX, encoding="ascii") as index:
+        for line in index:
+            sent_at, width, height = line.split()
+            width, height = int(width), int(height)
+            size = frame_bytes(pixel_format, width, height)
+            data = video.read(size)
+            if len(data) < size:
+                return
+            frame = np.frombuffer(data, dtype=np.uint8)
+            yield float(sent_at), frame.reshape(frame_shape(pixel_format, width, height))
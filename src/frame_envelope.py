@@ -0,0 +1,85 @@
+"""
+Per-frame metadata carried next to the frame array.
+
+A bare ``np.ndarray`` does not say how old it is, whether frames before it
+were skipped or which FFmpeg process produced it. ``FrameDecoder`` wraps
+every frame it publishes in a ``FrameEnvelope``:
+
+- ``sequence``: number of the frame among all frames the decoder read,
+  published or not; a gap between two envelopes is the number of frames
+  skipped in between (e.g. drained by ``max_queued_bytes``)
+- ``read_at``: ``time.monotonic()`` when the last byte of the frame was
+  read
+- ``session``: increases whenever the reader moves to another source (a
+  new FFmpeg process, a rebind, a restart)
+- ``pts``: position of the frame in its session's output timeline in
+  seconds, when the output frame rate is known (RTMP/SRT); None otherwise
+
+Envelopes are created once per frame on the reader thread, so the class
+uses ``__slots__`` and does no work beyond storing its fields.
+
+Integration Notes
+-----------------
+- The envelope references the frame, so it keeps a frame pool slot busy
+  exactly as the array itself would.
+- Envelopes are not modified after publishing; consumers may keep them.
+"""
+
+import time
+from typing import Optional
+
+import numpy as np
+
+
+class FrameEnvelope:
+    """A published frame with its sequence number, read time and session."""
+
+    __slots__ = ("frame", "sequence", "read_at", "session", "pts")
+
+    def __init__(
+        self,
+        frame: np.ndarray,
+        sequence: int,
+        read_at: float,
+        session: int,
+        pts: Optional[float] = None,
+    ):
+        """
+        Wrap a frame.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            Frame in the decoder's pixel format
+        sequence : int
+            Number of the frame among all frames read, from 1
+        read_at : float
+            ``time.monotonic()`` when the frame was read
+        session : int
+            Source session the frame came from, from 1
+        pts : float, optional
+            Seconds since the start of the session's output timeline
+        """
+        self.frame = frame
+        self.sequence = sequence
+        self.read_at = read_at
+        self.session = session
+        self.pts = pts
+
+    def age(self, now: Optional[float] = None) -> float:
+        """
+        Seconds since the frame was read.
+
+        Parameters
+        ----------
+        now : float, optional
+            ``time.monotonic()`` to measure against; defaults to now
+        """
+        return (time.monotonic() if now is None else now) - self.read_at
+
+    def __repr__(self) -> str:
+        pts = "None" if self.pts is None else f"{self.pts:.3f}"
+        return (
+            f"FrameEnvelope(sequence={self.sequence}, session={self.session}, "
+            f"pts={pts}, shape={self.frame.shape})"
+        )
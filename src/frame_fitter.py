@@ -0,0 +1,222 @@
+"""
+Fit decoded frames to the virtual camera's resolution.
+
+The camera is opened at the configured size, but a frame can arrive at a
+different one (e.g. WebRTC at the sender's resolution). Sending it as-is
+fails in pyvirtualcam, so ``FrameFitter`` scales it with nearest-neighbour
+sampling into the camera size, either letterboxed (whole frame visible,
+black bars) or cropped (camera filled, edges cut).
+
+Frames that already match are passed through untouched. For a new source
+size the fitter precomputes the sampling indices and allocates its output
+and scratch buffers once; every further frame of that size is written into
+the same buffers with ``np.take(..., out=...)`` and allocates nothing.
+
+Integration Notes
+-----------------
+- Not thread-safe; owned by the virtual camera thread.
+- The returned buffer is reused by the next ``fit()`` of the same source
+  size, which is fine for ``pyvirtualcam.Camera.send`` (it copies).
+- NV12 / I420 planes are fitted separately; sizes and offsets are kept
+  even so chroma stays aligned with luma.
+"""
+
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .pixel_format import PixelFormat, frame_shape, frame_size
+
+log = logging.getLogger(__name__)
+
+
+class FitMode(Enum):
+    """How a frame of another aspect ratio is fitted to the camera."""
+    LETTERBOX = "letterbox"  # scale to fit, pad with black
+    CROP = "crop"            # scale to fill, cut the overflow
+
+
+# Black per plane: RGB, then limited-range Y and neutral chroma
+_BLACK_RGB = 0
+_BLACK_Y = 16
+_NEUTRAL_CHROMA = 128
+
+
+@dataclass
+class _PlaneFit:
+    """Precomputed sampling for one plane of one source size."""
+    rows: np.ndarray            # source row per destination row
+    cols: np.ndarray            # source column per destination column
+    row_buffer: np.ndarray      # sampled rows, full source width
+    scaled: Optional[np.ndarray]  # sampled rect, when dest is not contiguous
+    dest: np.ndarray            # view of the output plane that is written
+
+
+class FrameFitter:
+    """Scales frames to a fixed output size without per-frame allocation."""
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        pixel_format: PixelFormat = PixelFormat.RGB24,
+        mode: FitMode = FitMode.LETTERBOX,
+    ):
+        """
+        Initialize a fitter for one output size.
+
+        Parameters
+        ----------
+        width : int
+            Output (camera) width in pixels
+        height : int
+            Output (camera) height in pixels
+        pixel_format : PixelFormat
+            Layout of input and output frames
+        mode : FitMode
+            Letterbox or crop
+        """
+        self.width = width
+        self.height = height
+        self.pixel_format = pixel_format
+        self.mode = mode
+        self._shape = frame_shape(pixel_format, width, height)
+        self._source_shape: Optional[Tuple[int, ...]] = None
+        self._output: Optional[np.ndarray] = None
+        self._planes: List[_PlaneFit] = []
+
+    def fit(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Return ``frame`` at the output size.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            Frame in ``pixel_format`` layout at any size
+
+        Returns
+        -------
+        np.ndarray
+            ``frame`` itself if it already has the output shape, otherwise
+            the fitter's output buffer holding the fitted frame
+        """
+        if frame.shape == self._shape:
+            return frame
+        if frame.shape != self._source_shape:
+            self._prepare(frame.shape)
+        for plane, source in zip(self._planes, self._split(frame)):
+            np.take(source, plane.rows, axis=0, out=plane.row_buffer, mode="clip")
+            if plane.scaled is None:
+                np.take(plane.row_buffer, plane.cols, axis=1, out=plane.dest, mode="clip")
+            else:
+                # np.take buffers a non-contiguous out, so sample into a
+                # contiguous scratch array and copy into the letterbox
+                np.take(plane.row_buffer, plane.cols, axis=1, out=plane.scaled, mode="clip")
+                plane.dest[...] = plane.scaled
+        return self._output
+
+    # ── internal ─────────────────────────────────────────
+
+    def _split(self, frame: np.ndarray) -> List[np.ndarray]:
+        """Views of the planes of a frame, chroma last."""
+        width, height = frame_size(self.pixel_format, frame.shape)
+        return self._plane_views(frame, width, height)
+
+    def _plane_views(
+        self, frame: np.ndarray, width: int, height: int
+    ) -> List[np.ndarray]:
+        """Plane views of a frame of the given size."""
+        if self.pixel_format is PixelFormat.RGB24:
+            return [frame]
+        luma = frame[:height]
+        chroma = frame[height:]
+        if self.pixel_format is PixelFormat.NV12:
+            # Interleaved UV pairs sample together
+            return [luma, chroma.reshape(height // 2, width // 2, 2)]
+        flat = chroma.reshape(-1)
+        quarter = (width // 2) * (height // 2)
+        return [
+            luma,
+            flat[:quarter].reshape(height // 2, width // 2),
+            flat[quarter:].reshape(height // 2, width // 2),
+        ]
+
+    def _prepare(self, shape: Tuple[int, ...]) -> None:
+        """Compute sampling and allocate buffers for a new source size."""
+        src_w, src_h = frame_size(self.pixel_format, shape)
+        planar = self.pixel_format is not PixelFormat.RGB24
+        if planar and (src_w % 2 or src_h % 2):
+            raise ValueError(f"odd frame size {src_w}x{src_h} for 4:2:0 format")
+        if self._output is None:
+            self._output = np.empty(self._shape, dtype=np.uint8)
+
+        dest, visible = self._geometry(src_w, src_h, even=planar)
+        log.info(
+            "Fitting %dx%d frames to %dx%d camera (%s)",
+            src_w, src_h, self.width, self.height, self.mode.value,
+        )
+
+        output_planes = self._plane_views(self._output, self.width, self.height)
+        # Background for letterbox bars
+        output_planes[0][...] = _BLACK_RGB if not planar else _BLACK_Y
+        for plane in output_planes[1:]:
+            plane[...] = _NEUTRAL_CHROMA
+
+        scratch = np.empty(shape, dtype=np.uint8)
+        self._planes = []
+        for index, (out_plane, src_plane) in enumerate(
+            zip(output_planes, self._plane_views(scratch, src_w, src_h))
+        ):
+            scale = 2 if index else 1  # chroma planes are half size
+            (dx, dy, dw, dh) = (v // scale for v in dest)
+            (vx, vy, vw, vh) = (v / scale for v in visible)
+            rows = _sample_indices(vy, vh, dh, src_plane.shape[0])
+            cols = _sample_indices(vx, vw, dw, src_plane.shape[1])
+            dest_view = out_plane[dy:dy + dh, dx:dx + dw]
+            extra = src_plane.shape[2:]
+            self._planes.append(_PlaneFit(
+                rows=rows,
+                cols=cols,
+                row_buffer=np.empty((dh, src_plane.shape[1]) + extra, dtype=np.uint8),
+                scaled=(
+                    None if dest_view.flags.c_contiguous
+                    else np.empty((dh, dw) + extra, dtype=np.uint8)
+                ),
+                dest=dest_view,
+            ))
+        self._source_shape = shape
+
+    def _geometry(
+        self, src_w: int, src_h: int, even: bool
+    ) -> Tuple[Tuple[int, int, int, int], Tuple[float, float, float, float]]:
+        """
+        Destination rect and visible source rect, both as (x, y, w, h).
+
+        With ``even`` the destination is aligned to 2 pixels.
+        """
+        if self.mode is FitMode.LETTERBOX:
+            scale = min(self.width / src_w, self.height / src_h)
+            dw = min(self.width, max(1, round(src_w * scale)))
+            dh = min(self.height, max(1, round(src_h * scale)))
+            if even:
+                dw, dh = max(2, dw - dw % 2), max(2, dh - dh % 2)
+            dx, dy = (self.width - dw) // 2, (self.height - dh) // 2
+            if even:
+                dx, dy = dx - dx % 2, dy - dy % 2
+            return (dx, dy, dw, dh), (0.0, 0.0, float(src_w), float(src_h))
+
+        scale = max(self.width / src_w, self.height / src_h)
+        vw, vh = self.width / scale, self.height / scale
+        return (
+            (0, 0, self.width, self.height),
+            ((src_w - vw) / 2, (src_h - vh) / 2, vw, vh),
+        )
+
+
+def _sample_indices(start: float, length: float, count: int, limit: int) -> np.ndarray:
+    """Nearest-neighbour source indices for ``count`` output pixels."""
+    centers = start + (np.arange(count) + 0.5) * (length / count)
+    return np.clip(centers.astype(np.intp), 0, limit - 1)
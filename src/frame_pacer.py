@@ -0,0 +1,239 @@
+"""
+Fixed-rate pacing for the virtual camera output loop.
+
+``FramePacer`` schedules frame slots on an absolute timeline
+(``origin + n * interval``) instead of sleeping for "interval minus the time
+this iteration took", so sleep overshoot does not accumulate into drift. It
+also measures how much ``time.sleep`` oversleeps and asks for that much
+less. A loop that falls more than a whole interval behind skips the slots
+it missed instead of sending a burst to catch up, and keeps the original
+timeline.
+
+Integration Notes
+-----------------
+- ``wait()`` is called once per frame by a single thread; ``get_stats()``
+  may be called from any thread.
+- The precise mode sleeps until shortly before the slot (allowing for the
+  worst recent oversleep) and spins, yielding the GIL, for the rest. That
+  keeps 60 fps slots within a fraction of a millisecond of their deadline
+  even with a coarse OS timer. It costs some CPU and is enabled by default
+  above 30 fps.
+- Python 3.11+ uses high-resolution waitable timers for ``time.sleep`` on
+  Windows, so no global timer-resolution change is needed.
+"""
+
+import bisect
+import time
+import logging
+from collections import deque
+from typing import Any, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+
+class FramePacer:
+    """Paces a loop to a fixed frame rate and records how late it runs."""
+
+    # Jitter histogram bucket upper bounds for |lateness| in milliseconds;
+    # the last bucket collects everything above
+    HISTOGRAM_BOUNDS_MS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+    # A slot served later than this fraction of an interval is late
+    LATE_FRACTION = 0.25
+    # Precise mode: stop sleeping this long before the slot and spin
+    SPIN_MARGIN = 0.002  # seconds
+    # Seconds over which the effective frame rate is measured
+    RATE_WINDOW_SECONDS = 2.0
+    # Oversleep estimators: smoothing of the mean, decay of the peak
+    OVERSLEEP_SMOOTHING = 0.1
+    OVERSLEEP_PEAK_DECAY = 0.98
+    # Cap on the peak as a fraction of the interval, so precise mode
+    # always sleeps for part of each wait
+    OVERSLEEP_PEAK_MAX_FRACTION = 0.5
+
+    def __init__(self, fps: float, precise: Optional[bool] = None):
+        """
+        Initialize a pacer; the timeline starts at the first ``wait()``.
+
+        Parameters
+        ----------
+        fps : float
+            Target frame rate
+        precise : bool, optional
+            Sleep-then-spin for sub-millisecond slot accuracy; defaults
+            to True above 30 fps
+
+        Raises
+        ------
+        ValueError
+            If ``fps`` is not positive
+        """
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self._fps = fps
+        self._interval = 1.0 / fps
+        self._precise = fps > 30 if precise is None else precise
+        self._late_after = self._interval * self.LATE_FRACTION
+        self._recent = deque(maxlen=max(2, int(fps * self.RATE_WINDOW_SECONDS) + 1))
+        # How much time.sleep overshoots; a property of the OS timer, so
+        # kept across resets
+        self._oversleep_mean = 0.0
+        self._oversleep_peak = 0.0
+        self.reset()
+
+    @property
+    def fps(self) -> float:
+        """Target frame rate."""
+        return self._fps
+
+    @property
+    def interval(self) -> float:
+        """Seconds between frame slots."""
+        return self._interval
+
+    @property
+    def precise(self) -> bool:
+        """True if the pacer spins for the last part of each wait."""
+        return self._precise
+
+    @property
+    def frame_count(self) -> int:
+        """Slots served since the last ``reset()``."""
+        return self._frames
+
+    @property
+    def late_count(self) -> int:
+        """Slots served later than ``LATE_FRACTION`` of an interval."""
+        return self._late
+
+    @property
+    def missed_count(self) -> int:
+        """Slots skipped because the loop fell a whole interval behind."""
+        return self._missed
+
+    @property
+    def effective_fps(self) -> float:
+        """Frame rate actually achieved over the last couple of seconds."""
+        recent = tuple(self._recent)
+        if len(recent) < 2 or recent[-1] <= recent[0]:
+            return 0.0
+        return (len(recent) - 1) / (recent[-1] - recent[0])
+
+    def reset(self) -> None:
+        """Forget the timeline and statistics; the next ``wait()`` restarts."""
+        self._origin: Optional[float] = None
+        self._slot = 0
+        self._frames = 0
+        self._late = 0
+        self._missed = 0
+        self._lateness_sum = 0.0
+        self._lateness_max = 0.0
+        self._histogram = [0] * (len(self.HISTOGRAM_BOUNDS_MS) + 1)
+        self._recent.clear()
+
+    def wait(self) -> float:
+        """
+        Block until the next frame slot.
+
+        The first call after ``reset()`` starts the timeline: its own call
+        time is slot 0, so it returns one interval later.
+
+        Returns
+        -------
+        float
+            Seconds between the slot's deadline and the return
+        """
+        now = time.perf_counter()
+        if self._origin is None:
+            self._origin = now
+            self._slot = 0
+
+        self._slot += 1
+        deadline = self._origin + self._slot * self._interval
+        behind = now - deadline
+        if behind >= self._interval:
+            # Overslept or the caller was slow: serve the latest slot that
+            # has started and drop the ones before it
+            missed = int(behind // self._interval)
+            self._slot += missed
+            self._missed += missed
+            deadline += missed * self._interval
+
+        self._sleep_until(deadline)
+        now = time.perf_counter()
+        lateness = now - deadline
+        self._record(now, lateness)
+        return lateness
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the pacing statistics.
+
+        Returns
+        -------
+        dict
+            JSON-serializable target and effective fps, mode, slot counts
+            (served, late, missed), mean and max lateness and mean
+            oversleep in milliseconds, and the histogram of |lateness|
+            keyed by bucket (e.g. ``"<=1ms"``); early slots have negative
+            lateness
+        """
+        frames = self._frames
+        histogram = list(self._histogram)
+        labels = [f"<={b:g}ms" for b in self.HISTOGRAM_BOUNDS_MS]
+        labels.append(f">{self.HISTOGRAM_BOUNDS_MS[-1]:g}ms")
+        return {
+            "fps": self._fps,
+            "effective_fps": round(self.effective_fps, 2),
+            "precise": self._precise,
+            "frames": frames,
+            "late": self._late,
+            "missed": self._missed,
+            "mean_lateness_ms": (
+                self._lateness_sum / frames * 1000 if frames else 0.0
+            ),
+            "max_lateness_ms": self._lateness_max * 1000,
+            "oversleep_ms": self._oversleep_mean * 1000,
+            "jitter_histogram": dict(zip(labels, histogram)),
+        }
+
+    # ── internal ─────────────────────────────────────────
+
+    def _sleep_until(self, deadline: float) -> None:
+        """Sleep until ``deadline``, spinning for the last part if precise."""
+        remaining = deadline - time.perf_counter()
+        # Decays on every wait, slept or not: a peak that suppressed the
+        # sleep would otherwise never come down
+        self._oversleep_peak *= self.OVERSLEEP_PEAK_DECAY
+        if not self._precise:
+            # One sleep, shortened by the typical oversleep
+            if remaining - self._oversleep_mean > 0:
+                self._sleep(remaining - self._oversleep_mean)
+            return
+        request = remaining - self._oversleep_peak - self.SPIN_MARGIN
+        if request > 0:
+            self._sleep(request)
+        while time.perf_counter() < deadline:
+            time.sleep(0)  # yield the GIL while spinning
+
+    def _sleep(self, seconds: float) -> None:
+        """``time.sleep`` that updates the oversleep estimates."""
+        start = time.perf_counter()
+        time.sleep(seconds)
+        over = max(time.perf_counter() - start - seconds, 0.0)
+        self._oversleep_mean += (over - self._oversleep_mean) * self.OVERSLEEP_SMOOTHING
+        self._oversleep_peak = min(
+            max(over, self._oversleep_peak),
+            self._interval * self.OVERSLEEP_PEAK_MAX_FRACTION,
+        )
+
+    def _record(self, now: float, lateness: float) -> None:
+        """Account one served slot."""
+        self._frames += 1
+        self._recent.append(now)
+        self._lateness_sum += lateness
+        if lateness > self._lateness_max:
+            self._lateness_max = lateness
+        if lateness > self._late_after:
+            self._late += 1
+        bucket = bisect.bisect_left(self.HISTOGRAM_BOUNDS_MS, abs(lateness) * 1000)
+        self._histogram[bucket] += 1
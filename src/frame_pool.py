@@ -0,0 +1,152 @@
+"""
+Preallocated frame pool for zero-copy frame ingestion.
+
+The FFmpeg-based decoder reads every raw frame from a pipe. Reading with
+``stdout.read(n)`` allocates a brand-new ``bytes`` object per frame
+(2.7 MB at 720p, 11 MB at 4K), which turns into hundreds of MB/s of garbage
+at 30–60 fps. ``FramePool`` instead keeps a fixed set of contiguous uint8
+arrays that the decoder fills in place with ``readinto()``.
+
+A slot is only handed out again once nobody references it any more: the
+frame buffer deque, ``latest_frame`` callers, ``on_frame`` callbacks and the
+virtual camera thread all hold plain references to the array, so the pool
+uses the interpreter's reference count to decide when a slot is free. Any
+view derived from a slot (slicing, ``reshape``, ``memoryview``) keeps its
+base alive as well, so a slot can never be overwritten while it is in use.
+"""
+
+import sys
+import logging
+from typing import List, Tuple
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+def _baseline_refcount() -> int:
+    """
+    Measure the reference count of an array that only the pool references.
+
+    The exact number depends on the interpreter version, so it is calibrated
+    once using the same access pattern as ``FramePool._is_free``.
+    """
+    slots = [np.empty(1, dtype=np.uint8)]
+    return sys.getrefcount(slots[0])
+
+
+_FREE_REFCOUNT = _baseline_refcount()
+
+
+class FramePool:
+    """
+    Fixed set of reusable frame arrays.
+
+    Slots are handed out round-robin so the least recently used array is
+    preferred. If every slot is still referenced by a consumer the pool
+    falls back to allocating a fresh array rather than blocking the reader;
+    such misses are counted so an undersized pool is easy to spot.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], count: int):
+        """
+        Initialize the pool.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Shape of every frame array, e.g. ``(height, width, 3)``
+        count : int
+            Number of slots to preallocate (at least 1)
+        """
+        if count < 1:
+            raise ValueError(f"Frame pool needs at least one slot: {count}")
+
+        self._shape = tuple(shape)
+        self._slots: List[np.ndarray] = [
+            np.empty(self._shape, dtype=np.uint8) for _ in range(count)
+        ]
+        self._next = 0
+        self._allocations = count
+        self._misses = 0
+
+        log.debug(
+            "Frame pool allocated %d slots of %s (%.1f MB)",
+            count,
+            self._shape,
+            count * self._slots[0].nbytes / 1e6,
+        )
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of the arrays handed out by this pool."""
+        return self._shape
+
+    @property
+    def size(self) -> int:
+        """Number of preallocated slots."""
+        return len(self._slots)
+
+    @property
+    def allocations(self) -> int:
+        """Total arrays allocated, including the preallocated slots."""
+        return self._allocations
+
+    @property
+    def misses(self) -> int:
+        """Number of times no free slot was available."""
+        return self._misses
+
+    def free_count(self) -> int:
+        """Return the number of slots not currently referenced elsewhere."""
+        return sum(1 for i in range(len(self._slots)) if self._is_free(i))
+
+    def grow(self, count: int) -> None:
+        """
+        Preallocate slots until the pool has ``count``; never shrinks.
+
+        Safe to call while another thread acquires slots.
+
+        Parameters
+        ----------
+        count : int
+            Number of slots the pool should have
+        """
+        added = count - len(self._slots)
+        if added <= 0:
+            return
+        # One extend, so acquire() never sees a partly grown list
+        self._slots.extend([np.empty(self._shape, dtype=np.uint8) for _ in range(added)])
+        self._allocations += added
+        log.debug("Frame pool grown to %d slots", count)
+
+    def acquire(self) -> np.ndarray:
+        """
+        Return an array that no consumer currently references.
+
+        The contents of the returned array are undefined; the caller is
+        expected to overwrite all of it.
+
+        Returns
+        -------
+        np.ndarray
+            A C-contiguous uint8 array of the pool's shape
+        """
+        count = len(self._slots)
+        for offset in range(count):
+            index = (self._next + offset) % count
+            if self._is_free(index):
+                self._next = (index + 1) % count
+                return self._slots[index]
+
+        # Every slot is still held by a consumer - never block the reader,
+        # hand out a one-off array instead.
+        self._misses += 1
+        self._allocations += 1
+        if self._misses == 1 or self._misses % 100 == 0:
+            log.debug("Frame pool exhausted (%d misses so far)", self._misses)
+        return np.empty(self._shape, dtype=np.uint8)
+
+    def _is_free(self, index: int) -> bool:
+        """Check whether slot ``index`` is referenced only by the pool."""
+        return sys.getrefcount(self._slots[index]) <= _FREE_REFCOUNT
@@ -0,0 +1,110 @@
+"""
+Single-slot, overwrite-latest frame channel.
+
+Used between producers that push decoded frames from another thread (the
+WebRTC track relay running on the asyncio loop) and the FrameDecoder reader
+thread. Only the newest frame is kept: ``put`` replaces any frame that has
+not been collected yet, so a slow consumer never builds up latency, and
+``get`` blocks on a condition variable instead of polling, so an idle
+stream costs no CPU.
+"""
+
+import threading
+import logging
+from typing import Optional
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+class FrameSlot:
+    """
+    Thread-safe holder for the most recent frame.
+
+    ``put`` never blocks. ``get`` waits until a frame is available, the
+    timeout expires or the slot is closed.
+    """
+
+    def __init__(self):
+        """Initialize an empty, open slot."""
+        self._cond = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._closed = False
+        self._put_count = 0
+        self._dropped_count = 0
+
+    @property
+    def closed(self) -> bool:
+        """True once ``close`` has been called."""
+        return self._closed
+
+    @property
+    def put_count(self) -> int:
+        """Total frames handed to ``put``."""
+        return self._put_count
+
+    @property
+    def dropped_count(self) -> int:
+        """Frames overwritten before a consumer collected them."""
+        return self._dropped_count
+
+    def put(self, frame: np.ndarray) -> bool:
+        """
+        Store ``frame`` as the latest frame and wake a waiting consumer.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            Frame to publish; the slot keeps a reference, not a copy
+
+        Returns
+        -------
+        bool
+            False if the slot is closed and the frame was discarded
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            if self._frame is not None:
+                self._dropped_count += 1
+            self._frame = frame
+            self._put_count += 1
+            self._cond.notify()
+        return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Take the latest frame, waiting for one if the slot is empty.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum seconds to wait; ``None`` waits until a frame arrives
+            or the slot is closed, ``0`` never waits
+
+        Returns
+        -------
+        np.ndarray or None
+            The newest frame, or None on timeout or when the slot is
+            closed and empty
+        """
+        with self._cond:
+            if self._frame is None and not self._closed:
+                self._cond.wait_for(
+                    lambda: self._frame is not None or self._closed, timeout
+                )
+            frame = self._frame
+            self._frame = None
+            return frame
+
+    def close(self) -> None:
+        """Close the slot, waking every waiting consumer."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        log.debug(
+            "Frame slot closed (%d frames, %d dropped)",
+            self._put_count,
+            self._dropped_count,
+        )
@@ -0,0 +1,191 @@
+"""
+Per-frame timing statistics.
+
+``FrameTimestampRing`` keeps the monotonic arrival time of the most recent
+frames in a preallocated numpy array; recording a frame is two stores and
+allocates nothing, so it is cheap enough to call from the decoder thread for
+every frame. ``FrameStats`` summarizes a time window of the ring: the real
+frame rate, inter-frame jitter, frame interval percentiles and the longest
+stall (including the one still in progress).
+
+Integration Notes
+-----------------
+- ``record()`` is meant for a single producer thread and takes no lock;
+  ``stats()`` may run concurrently on any thread and works on a copy.
+- A frame recorded while ``stats()`` copies the ring can replace the oldest
+  timestamp of the copy; the copy is sorted and windowed, so at worst one
+  frame at the edge of the capacity is missing.
+"""
+
+import time
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FrameStats:
+    """
+    Frame timing over one window; intervals and stalls are in seconds.
+
+    With fewer than two frames in the window the interval figures are 0.
+    """
+    window: float                # seconds covered
+    frame_count: int = 0         # frames that arrived in the window
+    fps: float = 0.0             # frames per second actually received
+    jitter: float = 0.0          # standard deviation of frame intervals
+    p50_interval: float = 0.0
+    p95_interval: float = 0.0
+    p99_interval: float = 0.0
+    longest_stall: float = 0.0   # longest gap, including the current one
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for JSON endpoints."""
+        return asdict(self)
+
+
+class FrameTimestampRing:
+    """Fixed-size ring buffer of frame arrival times."""
+
+    def __init__(self, capacity: int = 4096):
+        """
+        Initialize an empty ring.
+
+        Parameters
+        ----------
+        capacity : int
+            Timestamps kept; should cover the longest window at the
+            highest frame rate of interest
+        """
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._capacity = capacity
+        self._count = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of timestamps kept."""
+        return self._capacity
+
+    @property
+    def count(self) -> int:
+        """Frames recorded since creation or the last ``clear()``."""
+        return self._count
+
+    @property
+    def latest(self) -> Optional[float]:
+        """Most recent timestamp, or None if the ring is empty."""
+        count = self._count
+        if count == 0:
+            return None
+        return float(self._times[(count - 1) % self._capacity])
+
+    def record(self, timestamp: Optional[float] = None) -> None:
+        """
+        Record one frame arrival.
+
+        Parameters
+        ----------
+        timestamp : float, optional
+            ``time.monotonic()`` of the arrival; defaults to now
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        count = self._count
+        self._times[count % self._capacity] = timestamp
+        self._count = count + 1
+
+    def clear(self) -> None:
+        """Forget all recorded frames."""
+        self._count = 0
+
+    def since(self, start: float) -> np.ndarray:
+        """
+        Return the timestamps at or after ``start``, oldest first.
+
+        Parameters
+        ----------
+        start : float
+            ``time.monotonic()`` lower bound
+
+        Returns
+        -------
+        np.ndarray
+            A float64 copy; empty if no frame arrived since ``start``
+        """
+        count = self._count
+        if count <= self._capacity:
+            times = self._times[:count].copy()
+        else:
+            split = count % self._capacity
+            times = np.concatenate((self._times[split:], self._times[:split]))
+        times = times[times >= start]
+        times.sort()
+        return times
+
+    def stats(self, window: float, now: Optional[float] = None) -> FrameStats:
+        """
+        Summarize the frames of the last ``window`` seconds.
+
+        Parameters
+        ----------
+        window : float
+            Length of the window in seconds
+        now : float, optional
+            End of the window as ``time.monotonic()``; defaults to now
+
+        Returns
+        -------
+        FrameStats
+            Statistics for the window
+        """
+        if now is None:
+            now = time.monotonic()
+        times = self.since(now - window)
+        n = len(times)
+        if n == 0:
+            return FrameStats(window=window, longest_stall=self._open_stall(now, window))
+
+        # If the stream started inside the window, rate it over its own age
+        # rather than over time before the first frame
+        oldest = self._oldest()
+        covered = window if oldest < now - window else max(now - times[0], 1e-9)
+        fps = (n if covered == window else n - 1) / covered
+
+        open_gap = now - times[-1]
+        if n < 2:
+            return FrameStats(
+                window=window, frame_count=n, fps=fps, longest_stall=open_gap
+            )
+
+        intervals = np.diff(times)
+        p50, p95, p99 = np.percentile(intervals, (50, 95, 99))
+        return FrameStats(
+            window=window,
+            frame_count=n,
+            fps=fps,
+            jitter=float(intervals.std()),
+            p50_interval=float(p50),
+            p95_interval=float(p95),
+            p99_interval=float(p99),
+            longest_stall=max(float(intervals.max()), open_gap),
+        )
+
+    # ── internal ─────────────────────────────────────────
+
+    def _oldest(self) -> float:
+        """Oldest timestamp still in the ring (ring must not be empty)."""
+        count = self._count
+        if count <= self._capacity:
+            return float(self._times[0])
+        return float(self._times[count % self._capacity])
+
+    def _open_stall(self, now: float, window: float) -> float:
+        """Gap since the last frame, capped at ``window`` when unknown."""
+        latest = self.latest
+        return window if latest is None else now - latest
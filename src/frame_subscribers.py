@@ -0,0 +1,312 @@
+"""
+Frame subscribers with per-subscriber delivery.
+
+``FrameDecoder`` publishes every frame on its reader thread. A callback
+called there directly (``on_frame``) throttles decoding whenever it is
+slow: health reporting is cheap, but a preview encoder or a recorder is
+not. A ``FrameSubscription`` decides per subscriber where its callback
+runs:
+
+- ``INLINE``: on the reader thread, for callbacks that only bump counters
+- ``THREADED``: on a worker thread of its own, fed through a bounded queue
+- ``ASYNCIO``: on an asyncio loop, for coroutine callbacks
+
+Queued subscribers never block the reader. When a subscriber's queue is
+full the oldest frame is dropped, so a slow subscriber sees the newest
+frames at its own rate. Every subscription counts its deliveries, drops
+and callback errors and tracks its lag: the time from publishing a frame
+to the start of its callback.
+
+Integration Notes
+-----------------
+- Frames are pool slots of the decoder. A queued frame keeps its slot
+  alive; the decoder adds ``max_held_frames`` slots to its pool for every
+  subscription.
+- Callbacks must not modify frames; every subscriber gets the same array.
+- Exceptions from callbacks are logged and counted, never propagated to
+  the reader thread.
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from . import config
+from .metrics import Counter
+
+log = logging.getLogger(__name__)
+
+
+class DeliveryMode(Enum):
+    """Where a subscriber's callback runs."""
+    INLINE = "inline"      # reader thread
+    THREADED = "threaded"  # own worker thread, bounded queue
+    ASYNCIO = "asyncio"    # asyncio loop, bounded queue
+
+
+class FrameSubscription:
+    """One frame callback with its own delivery mode, queue and counters."""
+
+    # Bound on how long stop() waits for a worker's current callback
+    _JOIN_TIMEOUT = 1.0
+
+    def __init__(
+        self,
+        callback: Callable[[np.ndarray], Any],
+        mode: DeliveryMode = DeliveryMode.INLINE,
+        name: str = "",
+        queue_size: int = config.SUBSCRIBER_QUEUE_SIZE,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        with_timestamp: bool = False,
+    ):
+        """
+        Initialize a subscription; ``start()`` begins delivery.
+
+        Parameters
+        ----------
+        callback : callable
+            Receives each delivered frame. In ``ASYNCIO`` mode it may
+            return an awaitable, which is awaited before the next frame.
+        mode : DeliveryMode
+            Where the callback runs
+        name : str, optional
+            Label for logs, stats and the worker thread
+        queue_size : int
+            Frames queued for ``THREADED`` and ``ASYNCIO`` delivery
+        loop : asyncio.AbstractEventLoop, optional
+            Loop running ``ASYNCIO`` callbacks
+        with_timestamp : bool
+            Also pass the ``time.monotonic()`` the frame was published at
+            as the callback's second argument
+
+        Raises
+        ------
+        ValueError
+            If ``queue_size`` is below 1 or ``ASYNCIO`` has no loop
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        if mode is DeliveryMode.ASYNCIO and loop is None:
+            raise ValueError("asyncio delivery needs an event loop")
+        self._callback = callback
+        self._mode = mode
+        self._name = name or getattr(callback, "__name__", "subscriber")
+        self._queue_size = queue_size
+        self._loop = loop
+        self._with_timestamp = with_timestamp
+
+        self._queue: Deque[Tuple[np.ndarray, float]] = deque()
+        self._queue_changed = threading.Condition()
+        self._closed = False
+        self._drain_scheduled = False
+        self._worker: Optional[threading.Thread] = None
+
+        # Drops are counted on the reader thread, deliveries where the
+        # callback runs
+        self._delivered = Counter("delivered")
+        self._dropped = Counter("dropped")
+        self._errors = Counter("errors")
+        self._last_lag: Optional[float] = None
+        self._max_lag = 0.0
+
+    @property
+    def name(self) -> str:
+        """Label of the subscriber."""
+        return self._name
+
+    @property
+    def mode(self) -> DeliveryMode:
+        """Where the callback runs."""
+        return self._mode
+
+    @property
+    def max_held_frames(self) -> int:
+        """Frames the subscription can reference at once: queued plus in the callback."""
+        if self._mode is DeliveryMode.INLINE:
+            return 0
+        return self._queue_size + 1
+
+    @property
+    def delivered_count(self) -> int:
+        """Frames the callback has been called with."""
+        return self._delivered.value
+
+    @property
+    def dropped_count(self) -> int:
+        """Frames dropped from the full queue before delivery."""
+        return self._dropped.value
+
+    @property
+    def error_count(self) -> int:
+        """Callbacks that raised."""
+        return self._errors.value
+
+    @property
+    def last_lag(self) -> Optional[float]:
+        """Seconds from publishing the last delivered frame to its callback."""
+        return self._last_lag
+
+    @property
+    def max_lag(self) -> float:
+        """Largest lag in seconds since the subscription started."""
+        return self._max_lag
+
+    @property
+    def pending(self) -> int:
+        """Frames queued and not yet delivered."""
+        return len(self._queue)
+
+    def start(self) -> None:
+        """Start the worker thread of a ``THREADED`` subscription."""
+        if self._mode is not DeliveryMode.THREADED or self._worker is not None:
+            return
+        self._worker = threading.Thread(
+            target=self._run_worker,
+            daemon=True,
+            name=f"frame-subscriber-{self._name}",
+        )
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop delivery and drop queued frames."""
+        with self._queue_changed:
+            self._closed = True
+            self._queue.clear()
+            self._queue_changed.notify_all()
+        worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout=self._JOIN_TIMEOUT)
+        self._worker = None
+
+    def deliver(self, frame: np.ndarray, published_at: float) -> None:
+        """
+        Hand a frame to the subscriber; never blocks on a queued callback.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            Published frame
+        published_at : float
+            ``time.monotonic()`` when the frame was published
+        """
+        if self._closed:
+            return
+        if self._mode is DeliveryMode.INLINE:
+            self._call(frame, published_at)
+            return
+
+        schedule = False
+        with self._queue_changed:
+            if self._closed:
+                return
+            if len(self._queue) >= self._queue_size:
+                self._queue.popleft()
+                self._dropped.add()
+            self._queue.append((frame, published_at))
+            if self._mode is DeliveryMode.THREADED:
+                self._queue_changed.notify()
+            elif not self._drain_scheduled:
+                self._drain_scheduled = schedule = True
+        if schedule:
+            self._schedule_drain()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the subscription for /health.
+
+        Returns
+        -------
+        dict
+            Mode, counters, queued frames and lags in seconds
+        """
+        return {
+            "mode": self._mode.value,
+            "delivered": self._delivered.value,
+            "dropped": self._dropped.value,
+            "errors": self._errors.value,
+            "pending": len(self._queue),
+            "lag": self._last_lag,
+            "max_lag": self._max_lag,
+        }
+
+    def __repr__(self) -> str:
+        return f"FrameSubscription({self._name!r}, mode={self._mode.value})"
+
+    # ── internal ─────────────────────────────────────────
+
+    def _take(self) -> Optional[Tuple[np.ndarray, float]]:
+        """Oldest queued frame, or None once empty (caller holds the lock)."""
+        if self._closed or not self._queue:
+            return None
+        return self._queue.popleft()
+
+    def _run_worker(self) -> None:
+        """Deliver queued frames until stopped."""
+        while True:
+            with self._queue_changed:
+                while not self._closed and not self._queue:
+                    self._queue_changed.wait()
+                item = self._take()
+            if item is None:
+                return
+            self._call(*item)
+            # Drop our reference so the pool can recycle the slot
+            item = None
+
+    def _schedule_drain(self) -> None:
+        """Start draining the queue on the subscriber's loop."""
+        try:
+            self._loop.call_soon_threadsafe(self._start_drain)
+        except RuntimeError:
+            # Loop closed: nothing will ever deliver these frames
+            with self._queue_changed:
+                self._dropped.add(len(self._queue))
+                self._queue.clear()
+                self._drain_scheduled = False
+
+    def _start_drain(self) -> None:
+        """Runs on the loop; one drain task at a time."""
+        self._loop.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        """Deliver queued frames on the loop until the queue is empty."""
+        while True:
+            with self._queue_changed:
+                item = self._take()
+                if item is None:
+                    self._drain_scheduled = False
+                    return
+            result = self._call(*item)
+            item = None
+            if inspect.isawaitable(result):
+                try:
+                    await result
+                except Exception as e:
+                    self._record_error(e)
+
+    def _call(self, frame: np.ndarray, published_at: float) -> Any:
+        """Call the callback, recording lag and errors."""
+        lag = time.monotonic() - published_at
+        self._last_lag = lag
+        if lag > self._max_lag:
+            self._max_lag = lag
+        self._delivered.add()
+        try:
+            if self._with_timestamp:
+                return self._callback(frame, published_at)
+            return self._callback(frame)
+        except Exception as e:
+            self._record_error(e)
+            return None
+
+    def _record_error(self, error: Exception) -> None:
+        """Count and log a failed callback."""
+        self._errors.add()
+        log.error("Frame subscriber %s failed: %s", self._name, error)
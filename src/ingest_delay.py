@@ -0,0 +1,146 @@
+"""
+Ingest delay: how far a stream has fallen behind the wall clock.
+
+Long RTMP sessions can slowly build up latency in FFmpeg's input buffering
+and the network queues in front of it while the frame rate still looks
+healthy. ``IngestDelayTracker`` compares the media time FFmpeg reports in
+its ``-progress`` output (``out_time``) with ``time.monotonic()``: once the
+stream has started, wall time minus media time only grows if frames are
+delivered later and later. The smallest offset seen in the session is the
+baseline, so start-up probing and buffering do not count as delay.
+
+Integration Notes
+-----------------
+- One tracker follows one session (one FFmpeg child serving one sender);
+  call ``reset()`` when the session changes.
+- ``update()`` runs on the stderr reader thread once per progress report;
+  ``get_stats()`` may be called from any thread.
+- A jump back in media time (the sender restarted its encoder on the same
+  connection) starts a new baseline.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from . import config
+
+log = logging.getLogger(__name__)
+
+
+class IngestDelayTracker:
+    """Tracks the growth of wall time minus media time within a session."""
+
+    # Media time moving back by more than this starts a new baseline
+    REWIND_TOLERANCE = 1.0  # seconds
+
+    def __init__(
+        self,
+        threshold: Optional[float] = config.INGEST_DELAY_RESYNC,
+        hold: float = config.INGEST_DELAY_HOLD,
+    ):
+        """
+        Initialize a tracker without a session.
+
+        Parameters
+        ----------
+        threshold : float, optional
+            Delay in seconds above which a resync is due; None only
+            measures
+        hold : float
+            Seconds the delay must stay above ``threshold``, so a burst
+            that FFmpeg catches up on by itself does not count
+
+        Raises
+        ------
+        ValueError
+            If ``threshold`` is not positive or ``hold`` is negative
+        """
+        if threshold is not None and threshold <= 0:
+            raise ValueError("threshold must be positive")
+        if hold < 0:
+            raise ValueError("hold must not be negative")
+        self._threshold = threshold
+        self._hold = hold
+        self._max_delay = 0.0  # over all sessions
+        self.reset()
+
+    @property
+    def threshold(self) -> Optional[float]:
+        """Delay in seconds above which a resync is due, or None."""
+        return self._threshold
+
+    @property
+    def delay(self) -> Optional[float]:
+        """Current delay in seconds, None before the first report."""
+        return self._delay
+
+    @property
+    def max_delay(self) -> float:
+        """Largest delay seen since the tracker was created."""
+        return self._max_delay
+
+    def reset(self) -> None:
+        """Forget the session; the next report starts a new baseline."""
+        self._baseline: Optional[float] = None
+        self._last_media_time: Optional[float] = None
+        self._delay: Optional[float] = None
+        self._over_since: Optional[float] = None
+        self._due = False
+
+    def update(self, media_time: float, now: float) -> bool:
+        """
+        Record one progress report.
+
+        Parameters
+        ----------
+        media_time : float
+            Seconds of media FFmpeg has output in this session
+        now : float
+            ``time.monotonic()`` of the report
+
+        Returns
+        -------
+        bool
+            True once per session, when the delay has stayed above the
+            threshold for ``hold`` seconds
+        """
+        last = self._last_media_time
+        if last is not None and media_time < last - self.REWIND_TOLERANCE:
+            log.info("Stream time went back %.1f s, new ingest baseline", last - media_time)
+            self.reset()
+        self._last_media_time = media_time
+
+        offset = now - media_time
+        if self._baseline is None or offset < self._baseline:
+            self._baseline = offset
+        delay = offset - self._baseline
+        self._delay = delay
+        if delay > self._max_delay:
+            self._max_delay = delay
+
+        if self._threshold is None or delay <= self._threshold:
+            self._over_since = None
+            return False
+        if self._over_since is None:
+            self._over_since = now
+        if self._due or now - self._over_since < self._hold:
+            return False
+        self._due = True
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the tracker for /health.
+
+        Returns
+        -------
+        dict
+            Current and maximum delay and the threshold in seconds, and
+            whether a resync was due in this session
+        """
+        return {
+            "delay": self._delay,
+            "max_delay": self._max_delay,
+            "threshold": self._threshold,
+            "resync_due": self._due,
+        }
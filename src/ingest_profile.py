@@ -0,0 +1,59 @@
+"""
+FFmpeg ingest profiles for the RTMP and SRT listeners.
+
+When a sender connects, FFmpeg probes the incoming stream (by default up to
+5 MB / 5 s) before the first raw frame leaves the pipe, and every reconnect
+pays that again. The profiles trade probing for start-up time:
+
+- DEFAULT: FFmpeg's own probing, most tolerant of unusual senders.
+- FAST_START: minimal probing plus an explicit container hint (FLV for
+  RTMP, MPEG-TS for SRT) and no input buffering. Meant for the usual phone
+  senders that send H.264 with codec parameters up front.
+"""
+
+from enum import Enum
+from typing import List
+
+
+class IngestProfile(Enum):
+    """Supported ingest profiles."""
+    DEFAULT = "default"
+    FAST_START = "fast-start"
+
+
+# Bytes FAST_START lets FFmpeg probe per container. FLV carries the stream
+# parameters in its metadata; MPEG-TS needs the PAT/PMT and an SPS first.
+_FAST_START_PROBESIZE = {
+    "flv": 32,
+    "mpegts": 32768,
+}
+
+
+def ingest_input_args(profile: IngestProfile, container: str) -> List[str]:
+    """
+    Return FFmpeg input options for ``profile``.
+
+    The options must be placed before ``-i``.
+
+    Parameters
+    ----------
+    profile : IngestProfile
+        Selected ingest profile
+    container : str
+        Container the protocol carries, ``"flv"`` (RTMP) or ``"mpegts"`` (SRT)
+
+    Returns
+    -------
+    list of str
+        Extra arguments; empty for DEFAULT
+    """
+    if profile is IngestProfile.DEFAULT:
+        return []
+
+    return [
+        "-probesize", str(_FAST_START_PROBESIZE[container]),
+        "-analyzeduration", "0",
+        "-fflags", "nobuffer",
+        "-flags", "low_delay",
+        "-f", container,
+    ]
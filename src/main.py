@@ -19,10 +19,12 @@ from . import config
 from .server import StreamServer
 from .decoder import FrameDecoder
 from .virtual_camera import VirtualCameraOutput
+from .tracing import PipelineTracer
 from .tray import TrayApp
 from .config_manager import ConfigurationManager, AppConfig, ProtocolType
 from .connection_manager import ConnectionManager, ConnectionState, ConnectionHealth
 from .protocols.factory import ProtocolFactory
+from .protocols.ffmpeg_events import FFmpegStderrMonitor
 from .settings_dialog import SettingsDialog
 from .log_viewer import LogViewer
 
@@ -44,12 +46,29 @@ class Application:
         self._config: AppConfig = self._config_mgr.load()
 
         # Components
+        # Stage histograms are always on; traces are captured via /trace
+        self._tracer = PipelineTracer()
         self._decoder = FrameDecoder(
             width=self._config.frame_width,
             height=self._config.frame_height,
-            on_frame=self._on_frame_decoded,
+            pixel_format=self._config.pixel_format,
+            native_resolution=self._config.native_resolution,
+            max_queued_bytes=self._config.max_queued_bytes,
+            shared_memory_bus=self._config.shared_memory_bus,
+            tracer=self._tracer,
+        )
+        # Cheap enough for the reader thread; counted in /health
+        self._decoder.subscribe(self._on_frame_decoded, name="connection")
+        self._vcam = VirtualCameraOutput(
+            width=self._config.frame_width,
+            height=self._config.frame_height,
+            fps=self._config.fps,
+            pixel_format=self._config.pixel_format,
+            stall_policy=self._config.stall_policy,
+            fit_mode=self._config.fit_mode,
+            native_resolution=self._config.native_resolution,
+            tracer=self._tracer,
         )
-        self._vcam = VirtualCameraOutput()
         self._protocol_factory = ProtocolFactory()
         self._protocol_adapter = None
 
@@ -58,6 +77,10 @@ class Application:
             on_state_change=self._on_connection_state_change,
             on_health_change=self._on_connection_health_change,
             on_reconnect_trigger=self._on_reconnect_trigger,
+            stall_threshold=self._config.stall_frame_intervals / self._config.fps,
+            stall_reconnect_after=self._config.stall_reconnect_after,
+            on_resync=self._on_resync,
+            ingest_delay_resync=self._config.ingest_delay_resync,
         )
 
         self._server = StreamServer(
@@ -129,8 +152,13 @@ class Application:
 
     # ── tray callbacks ───────────────────────────────────
 
-    async def _on_frame_decoded(self, frame) -> None:
-        """Callback from decoder when a frame is successfully decoded."""
+    def _on_frame_decoded(self, frame) -> None:
+        """
+        Callback from decoder when a frame is successfully decoded.
+
+        Inline frame subscriber: runs on the decoder thread for every
+        frame; it feeds the frame statistics and the stall watchdog.
+        """
         self._conn_mgr.report_frame_received()
 
     def _start_streaming(self) -> None:
@@ -146,6 +174,12 @@ class Application:
                 on_disconnect=self._on_sender_disconnect,
                 width=self._config.frame_width,
                 height=self._config.frame_height,
+                pixel_format=self._config.pixel_format,
+                ingest_profile=self._config.ingest_profile,
+                transform=self._config.video_transform,
+                fit_mode=self._config.fit_mode,
+                scaler=self._config.scaler_profile,
+                native_resolution=self._config.native_resolution,
             )
         except Exception as e:
             log.exception("Failed to create protocol adapter")
@@ -154,6 +188,10 @@ class Application:
             )
             return
 
+        monitor = getattr(self._protocol_adapter, "stderr_monitor", None)
+        if isinstance(monitor, FFmpegStderrMonitor):
+            monitor.subscribe(self._conn_mgr.handle_ffmpeg_event)
+
         # 2. Start Adapter (async)
         port = (
             self._config.rtmp_port
@@ -186,7 +224,10 @@ class Application:
         # 4. Start Virtual Camera
         vcam_success = False
         try:
-            self._vcam.start(frame_source=lambda: self._decoder.latest_frame)
+            self._vcam.start(
+                frame_source=lambda: self._decoder.latest_envelope,
+                wait_for_frame=self._decoder.wait_for_envelope,
+            )
             vcam_success = True
         except Exception as e:
             log.error("Virtual camera failed to start: %s", e)
@@ -194,6 +235,10 @@ class Application:
 
         # 5. Start Info Server (async)
         self._server.set_protocol_adapter(self._protocol_adapter)
+        self._server.set_connection_manager(self._conn_mgr)
+        self._server.set_frame_decoder(self._decoder)
+        self._server.set_virtual_camera(self._vcam)
+        self._server.set_tracer(self._tracer)
         self._server.set_http_port(self._config.http_port)
         future = asyncio.run_coroutine_threadsafe(self._server.start(), self._loop)
         try:
@@ -262,6 +307,7 @@ class Application:
         """Callback from connection manager when state changes."""
         log.info("Connection state changed: %s", state.value)
         self._tray.update_connection_state(state)
+        self._vcam.set_stalled(state == ConnectionState.STALLED)
 
         # If we just connected, update total URLs (might have changed based on adapter)
         if state == ConnectionState.CONNECTED and self._protocol_adapter:
@@ -282,10 +328,19 @@ class Application:
             # Run in loop thread
             asyncio.run_coroutine_threadsafe(self._restart_adapter(), self._loop)
 
+    def _on_resync(self) -> bool:
+        """Callback from connection manager when the ingest lags behind."""
+        adapter = self._protocol_adapter
+        return adapter.resync() if adapter is not None and self._streaming else False
+
     async def _restart_adapter(self) -> None:
         """Helper to restart the protocol adapter during reconnection."""
         if not self._protocol_adapter:
             return
+        if self._protocol_adapter.is_listening:
+            # The standby listener already took over; the decoder follows it
+            log.info("Protocol adapter is listening, no restart needed")
+            return
 
         log.info("Restarting protocol adapter …")
         await self._protocol_adapter.stop()
@@ -297,9 +352,9 @@ class Application:
         )
         try:
             await self._protocol_adapter.start(port=port)
-            # Re-start decoder with the same adapter instance (which now has a new process)
-            self._decoder.stop()
-            self._decoder.start(self._protocol_adapter)
+            # The decoder keeps its thread and last frame and moves on to
+            # the adapter's new process
+            self._decoder.rebind(self._protocol_adapter)
         except Exception as e:
             log.error("Failed to restart adapter: %s", e)
 
@@ -327,6 +382,13 @@ class Application:
 
             # 2. Update components that can be updated live
             self._conn_mgr.set_auto_reconnect(new_config.auto_reconnect)
+            if self._streaming and self._protocol_adapter is not None:
+                # Restarts only the FFmpeg child, if the transform changed
+                self._protocol_adapter.set_video_transform(
+                    new_config.video_transform,
+                    new_config.fit_mode,
+                    new_config.scaler_profile,
+                )
 
             # 3. If streaming, some changes require restart
             if self._streaming:
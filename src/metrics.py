@@ -0,0 +1,85 @@
+"""
+Per-thread counters for the frame path.
+
+Frame and error counts are bumped for every frame on the decoder and
+virtual camera threads and read now and then by the tray, the /health
+endpoint and the connection monitor. ``Counter`` gives every writing thread
+a slot of its own, so ``add()`` takes no lock and never contends with
+readers, and increments from different threads (e.g. decode errors from the
+reader thread and the stderr monitor) cannot overwrite each other as a
+shared ``+= 1`` can. ``value`` sums the slots.
+
+Integration Notes
+-----------------
+- A thread's first ``add()`` registers its slot under a lock; later calls
+  are a thread-local lookup plus an in-place add on a slot only that thread
+  writes.
+- Slots of finished threads are kept, so totals never go backwards.
+- ``value`` may miss increments that race with it, never more.
+"""
+
+import threading
+import logging
+from typing import List
+
+log = logging.getLogger(__name__)
+
+
+class Counter:
+    """Monotonic counter with one single-writer slot per thread."""
+
+    def __init__(self, name: str = ""):
+        """
+        Initialize a counter at zero.
+
+        Parameters
+        ----------
+        name : str, optional
+            Label used in ``repr()`` and logs
+        """
+        self.name = name
+        self._local = threading.local()
+        self._slots: List[List[int]] = []
+        self._register_lock = threading.Lock()
+        self._base = 0
+
+    @property
+    def value(self) -> int:
+        """Sum over all threads since creation or the last ``reset()``."""
+        return self._sum() - self._base
+
+    def add(self, n: int = 1) -> None:
+        """
+        Add ``n`` to the calling thread's slot.
+
+        Parameters
+        ----------
+        n : int
+            Amount to add (default 1)
+        """
+        try:
+            slot = self._local.slot
+        except AttributeError:
+            slot = self._register()
+        slot[0] += n
+
+    def reset(self) -> None:
+        """Restart counting from zero without touching the writers' slots."""
+        self._base = self._sum()
+
+    def __repr__(self) -> str:
+        return f"Counter({self.name!r}, value={self.value})"
+
+    # ── internal ─────────────────────────────────────────
+
+    def _sum(self) -> int:
+        """Sum of all slots; the list is only appended to, so a copy is safe."""
+        return sum(slot[0] for slot in tuple(self._slots))
+
+    def _register(self) -> List[int]:
+        """Create the calling thread's slot."""
+        slot = [0]
+        with self._register_lock:
+            self._slots.append(slot)
+        self._local.slot = slot
+        return slot
@@ -0,0 +1,84 @@
+"""
+How many bytes are waiting in a pipe, without reading them.
+
+The decoder reads rawvideo frames from FFmpeg's stdout strictly in order.
+If it falls behind, finished frames queue up in the OS pipe (and behind it
+in FFmpeg's output buffers) and every later frame is shown that much late.
+``queued_bytes`` lets the reader see that backlog: ``FIONREAD`` on POSIX,
+``PeekNamedPipe`` on Windows.
+
+Integration Notes
+-----------------
+- Only the OS pipe is measured. Data already in a Python ``BufferedReader``
+  is not, so callers that act on the count should read from the raw
+  (unbuffered) stream.
+- Streams without a file descriptor (``io.BytesIO`` in tests) report None.
+"""
+
+import io
+import logging
+import os
+from typing import IO, Optional
+
+log = logging.getLogger(__name__)
+
+if os.name == "nt":
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.PeekNamedPipe.argtypes = [
+        wintypes.HANDLE,
+        wintypes.LPVOID,
+        wintypes.DWORD,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+        wintypes.LPDWORD,
+    ]
+    _kernel32.PeekNamedPipe.restype = wintypes.BOOL
+
+    def _fd_queued_bytes(fd: int) -> Optional[int]:
+        available = wintypes.DWORD()
+        handle = msvcrt.get_osfhandle(fd)
+        if not _kernel32.PeekNamedPipe(
+            handle, None, 0, None, ctypes.byref(available), None
+        ):
+            return None
+        return available.value
+
+else:
+    import array
+    import fcntl
+    import termios
+
+    def _fd_queued_bytes(fd: int) -> Optional[int]:
+        count = array.array("i", [0])
+        fcntl.ioctl(fd, termios.FIONREAD, count, True)
+        return count[0]
+
+
+def queued_bytes(stream: IO[bytes]) -> Optional[int]:
+    """
+    Return the number of bytes readable from ``stream`` without blocking.
+
+    Parameters
+    ----------
+    stream : file object
+        Read end of a pipe, e.g. ``Popen.stdout`` or its ``raw`` stream
+
+    Returns
+    -------
+    int or None
+        Bytes waiting in the OS pipe, or None if the stream has no file
+        descriptor or the platform cannot tell
+    """
+    try:
+        fd = stream.fileno()
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        return None
+    try:
+        return _fd_queued_bytes(fd)
+    except OSError as e:
+        log.debug("Cannot query pipe backlog: %s", e)
+        return None
@@ -0,0 +1,131 @@
+"""
+Raw frame pixel formats shared by the adapters, decoder and virtual camera.
+
+RGB24 moves 3 bytes per pixel through the FFmpeg stdout pipe. The planar
+4:2:0 formats (NV12, I420) move 1.5 bytes per pixel and can be handed to
+pyvirtualcam as-is, which halves pipe bandwidth and skips FFmpeg's
+YUV → RGB conversion.
+
+Frame layouts follow pyvirtualcam:
+- RGB24: ``(height, width, 3)``
+- NV12 / I420: ``(height * 3 // 2, width)`` - the full-size Y plane
+  followed by the chroma plane(s)
+"""
+
+from enum import Enum
+from typing import Tuple
+
+import numpy as np
+
+
+class PixelFormat(Enum):
+    """Supported raw frame pixel formats."""
+    RGB24 = "rgb24"
+    NV12 = "nv12"
+    I420 = "i420"
+
+
+# FFmpeg -pix_fmt names
+_FFMPEG_PIX_FMT = {
+    PixelFormat.RGB24: "rgb24",
+    PixelFormat.NV12: "nv12",
+    PixelFormat.I420: "yuv420p",
+}
+
+
+def ffmpeg_pix_fmt(fmt: PixelFormat) -> str:
+    """Return the FFmpeg ``-pix_fmt`` name for ``fmt``."""
+    return _FFMPEG_PIX_FMT[fmt]
+
+
+def is_planar(fmt: PixelFormat) -> bool:
+    """Return True for the planar 4:2:0 formats."""
+    return fmt is not PixelFormat.RGB24
+
+
+def frame_shape(fmt: PixelFormat, width: int, height: int) -> Tuple[int, ...]:
+    """
+    Return the numpy array shape of one frame.
+
+    Parameters
+    ----------
+    fmt : PixelFormat
+        Frame pixel format
+    width : int
+        Frame width in pixels
+    height : int
+        Frame height in pixels
+
+    Returns
+    -------
+    tuple of int
+        ``(height, width, 3)`` for RGB24, ``(height * 3 // 2, width)``
+        for NV12 and I420
+    """
+    if fmt is PixelFormat.RGB24:
+        return (height, width, 3)
+    return (height * 3 // 2, width)
+
+
+def frame_size(fmt: PixelFormat, shape: Tuple[int, ...]) -> Tuple[int, int]:
+    """Return ``(width, height)`` of a frame array of ``shape``."""
+    if fmt is PixelFormat.RGB24:
+        return shape[1], shape[0]
+    return shape[1], shape[0] * 2 // 3
+
+
+def frame_bytes(fmt: PixelFormat, width: int, height: int) -> int:
+    """Return the size in bytes of one frame."""
+    if fmt is PixelFormat.RGB24:
+        return width * height * 3
+    return width * height * 3 // 2
+
+
+def rgb_to_format(rgb: np.ndarray, fmt: PixelFormat) -> np.ndarray:
+    """
+    Convert an RGB24 image to ``fmt``.
+
+    Uses BT.601 limited-range coefficients. Meant for occasional frames
+    such as the standby image, not for the per-frame path.
+
+    Parameters
+    ----------
+    rgb : np.ndarray
+        RGB image of shape ``(height, width, 3)`` with even dimensions
+        for the planar formats
+    fmt : PixelFormat
+        Target pixel format
+
+    Returns
+    -------
+    np.ndarray
+        Frame in the layout returned by ``frame_shape``
+    """
+    if fmt is PixelFormat.RGB24:
+        return rgb
+
+    height, width = rgb.shape[:2]
+    r, g, b = (rgb[:, :, i].astype(np.float32) for i in range(3))
+    y = 16 + (65.481 * r + 128.553 * g + 24.966 * b) / 255
+    u = 128 + (-37.797 * r - 74.203 * g + 112.0 * b) / 255
+    v = 128 + (112.0 * r - 93.786 * g - 18.214 * b) / 255
+
+    # 2x2 chroma subsampling
+    def subsample(plane: np.ndarray) -> np.ndarray:
+        return plane.reshape(height // 2, 2, width // 2, 2).mean(axis=(1, 3))
+
+    u = subsample(u)
+    v = subsample(v)
+
+    out = np.empty(frame_shape(fmt, width, height), dtype=np.uint8)
+    out[:height] = np.clip(y, 0, 255).round()
+    chroma = out[height:]
+    if fmt is PixelFormat.NV12:
+        chroma[:, 0::2] = np.clip(u, 0, 255).round()
+        chroma[:, 1::2] = np.clip(v, 0, 255).round()
+    else:
+        flat = chroma.reshape(-1)
+        quarter = (width // 2) * (height // 2)
+        flat[:quarter] = np.clip(u, 0, 255).round().reshape(-1)
+        flat[quarter:] = np.clip(v, 0, 255).round().reshape(-1)
+    return out
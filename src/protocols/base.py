@@ -5,7 +5,10 @@ Defines the abstract interface that all protocol adapters (RTMP, SRT, WebRTC)
 must implement to provide a unified streaming interface.
 """
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
+
+from ..frame_fitter import FitMode
+from ..video_transform import ScalerProfile, VideoTransform
 
 
 class ProtocolAdapter(ABC):
@@ -76,6 +79,66 @@ class ProtocolAdapter(ABC):
         """
         pass
     
+    @property
+    def is_listening(self) -> bool:
+        """
+        Check if the adapter waits for a new sender without being restarted.
+
+        Adapters whose listener survives a disconnect (e.g. RTMP and SRT
+        with a warm standby) override this; reconnection logic skips the
+        restart while it is True. It is False while a sender is connected,
+        so a stalled sender is dropped by a restart.
+
+        Returns
+        -------
+        bool
+            False unless overridden
+        """
+        return False
+
+    def set_video_transform(
+        self,
+        transform: VideoTransform,
+        fit_mode: Optional[FitMode] = None,
+        scaler: Optional[ScalerProfile] = None,
+    ) -> bool:
+        """
+        Change the crop / rotate / mirror transform applied while decoding.
+
+        Adapters that decode with FFmpeg (RTMP, SRT) override this and
+        restart their FFmpeg child; others ignore transforms.
+
+        Parameters
+        ----------
+        transform : VideoTransform
+            New transform
+        fit_mode : FitMode, optional
+            New fit mode; None keeps the current one
+        scaler : ScalerProfile, optional
+            New scaling algorithm; None keeps the current one
+
+        Returns
+        -------
+        bool
+            False unless overridden
+        """
+        return False
+
+    def resync(self) -> bool:
+        """
+        Flush buffered media that makes the stream lag behind real time.
+
+        Adapters that decode with FFmpeg (RTMP, SRT) override this and
+        replace their FFmpeg child without reporting a disconnect; the
+        sender reconnects to the new listener.
+
+        Returns
+        -------
+        bool
+            False unless overridden
+        """
+        return False
+
     @property
     @abstractmethod
     def is_connected(self) -> bool:
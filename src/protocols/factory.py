@@ -13,6 +13,10 @@ from .rtmp import RTMPAdapter
 from .srt import SRTAdapter
 from .webrtc import WebRTCAdapter
 from ..config_manager import ProtocolType
+from ..frame_fitter import FitMode
+from ..ingest_profile import IngestProfile
+from ..pixel_format import PixelFormat
+from ..video_transform import ScalerProfile, VideoTransform
 
 log = logging.getLogger(__name__)
 
@@ -33,6 +37,12 @@ class ProtocolFactory:
         on_disconnect: Optional[Callable[[], None]] = None,
         width: int = 1280,
         height: int = 720,
+        pixel_format: PixelFormat = PixelFormat.RGB24,
+        ingest_profile: IngestProfile = IngestProfile.DEFAULT,
+        transform: VideoTransform = VideoTransform(),
+        fit_mode: FitMode = FitMode.LETTERBOX,
+        scaler: ScalerProfile = ScalerProfile.BICUBIC,
+        native_resolution: bool = False,
     ) -> ProtocolAdapter:
         """
         Factory method to create appropriate protocol adapter.
@@ -49,6 +59,24 @@ class ProtocolFactory:
             Frame width for video decoding (default: 1280)
         height : int, optional
             Frame height for video decoding (default: 720)
+        pixel_format : PixelFormat, optional
+            Raw frame format produced by the adapter (default: RGB24)
+        ingest_profile : IngestProfile, optional
+            Input probing profile for the FFmpeg-based adapters (RTMP, SRT);
+            ignored by WebRTC (default: DEFAULT)
+        transform : VideoTransform, optional
+            Crop / rotate / mirror applied by FFmpeg (RTMP, SRT); ignored
+            by WebRTC (default: none)
+        fit_mode : FitMode, optional
+            How FFmpeg fits the picture to ``width`` x ``height`` (RTMP,
+            SRT); ignored by WebRTC (default: LETTERBOX)
+        scaler : ScalerProfile, optional
+            Scaling algorithm of FFmpeg's fit step (RTMP, SRT); ignored by
+            WebRTC (default: BICUBIC)
+        native_resolution : bool, optional
+            Keep the sender's resolution instead of scaling to ``width`` x
+            ``height`` (RTMP, SRT); WebRTC frames always keep it
+            (default: False)
         
         Returns
         -------
@@ -78,6 +106,12 @@ class ProtocolFactory:
                 on_disconnect=on_disconnect,
                 width=width,
                 height=height,
+                pixel_format=pixel_format,
+                ingest_profile=ingest_profile,
+                transform=transform,
+                fit_mode=fit_mode,
+                scaler=scaler,
+                native_resolution=native_resolution,
             )
         
         elif protocol_type == ProtocolType.SRT:
@@ -86,6 +120,12 @@ class ProtocolFactory:
                 on_disconnect=on_disconnect,
                 width=width,
                 height=height,
+                pixel_format=pixel_format,
+                ingest_profile=ingest_profile,
+                transform=transform,
+                fit_mode=fit_mode,
+                scaler=scaler,
+                native_resolution=native_resolution,
             )
         
         elif protocol_type == ProtocolType.WEBRTC:
@@ -94,6 +134,7 @@ class ProtocolFactory:
                 on_disconnect=on_disconnect,
                 width=width,
                 height=height,
+                pixel_format=pixel_format,
             )
         
         else:
@@ -0,0 +1,427 @@
+"""
+FFmpeg stderr demultiplexer.
+
+An FFmpeg child reports everything interesting on stderr: when a sender
+connects, the probed input stream, decode errors, progress and its own exit.
+The adapters start FFmpeg with ``-progress pipe:2`` (see ``progress_args``),
+so progress arrives as machine-readable ``key=value`` blocks that are parsed
+into ``FFmpegProgress`` snapshots instead of scraped from the human-readable
+stats line.
+Having several threads ``readline()`` the same pipe means each line reaches
+whichever reader wins, so ``FFmpegStderrMonitor`` is the single reader for a
+child's stderr. It parses each line once into an ``FFmpegEvent`` and fans it
+out to subscriber callbacks (the protocol adapter, FrameDecoder and
+ConnectionManager).
+
+Integration Notes
+-----------------
+- One monitor belongs to one adapter; ``run()`` is called once per FFmpeg
+  child with that child's stderr, so subscriptions survive restarts.
+  Runs for different children may overlap (a warm-standby listener is
+  monitored while the active one is still streaming); each event carries
+  the ``source`` passed to ``run()`` so subscribers can tell them apart.
+- Callbacks run on the reader thread and must be cheap - hand anything
+  slow off to another thread.
+- Lines are also logged here (error/warning/debug), so subscribers should
+  not log raw lines again.
+- ``STREAM_INFO`` and ``OUTPUT_INFO`` events carry the stream line parsed
+  into a ``StreamInfo`` (codec, size, frame rate); the output one gives the
+  exact size of the raw frames FFmpeg writes to the pipe.
+"""
+
+import re
+import threading
+import time
+import logging
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import IO, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .. import config
+
+log = logging.getLogger(__name__)
+
+
+class FFmpegEventType(Enum):
+    """Kinds of events parsed from FFmpeg stderr."""
+    CONNECTED = "connected"        # sender connected (protocol-specific marker)
+    DISCONNECTED = "disconnected"  # sender went away
+    STREAM_INFO = "stream_info"    # input "Stream #0:x: Video: ..." line
+    OUTPUT_INFO = "output_info"    # the same line for our rawvideo output
+    DECODE_ERROR = "decode_error"  # error reported by FFmpeg
+    PROGRESS = "progress"          # completed -progress block
+    LOG = "log"                    # anything else
+    CLOSED = "closed"              # stderr reached EOF - the child exited
+
+
+@dataclass(frozen=True)
+class FFmpegProgress:
+    """
+    One ``-progress`` report.
+
+    ``input_fps`` is measured between consecutive reports, so it reflects
+    the current rate; ``fps`` is FFmpeg's own average since start.
+    Values FFmpeg reports as ``N/A`` are None.
+    """
+    frame: int = 0                        # frames written to the pipe
+    fps: float = 0.0                      # FFmpeg's average output fps
+    input_fps: float = 0.0                # frames received per second
+    speed: Optional[float] = None         # decode speed, x realtime
+    bitrate_kbps: Optional[float] = None  # output bitrate
+    dup_frames: int = 0                   # frames duplicated to hold -r
+    drop_frames: int = 0                  # frames dropped to hold -r
+    out_time: Optional[float] = None      # media seconds decoded so far
+    total_size: int = 0                   # bytes written to the pipe
+    ended: bool = False                   # True for the final report
+    timestamp: float = field(default_factory=time.monotonic)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for JSON endpoints."""
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class StreamInfo:
+    """
+    Video stream description from a ``Stream #0:x: Video:`` line.
+
+    Fields FFmpeg does not print are None (e.g. the frame rate of a stream
+    with only a time base).
+    """
+    codec: str                     # e.g. "h264", "rawvideo"
+    width: int
+    height: int
+    fps: Optional[float] = None
+    pix_fmt: Optional[str] = None  # e.g. "yuv420p"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for JSON endpoints."""
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class FFmpegEvent:
+    """A single parsed stderr line or completed progress block."""
+    type: FFmpegEventType
+    line: str
+    timestamp: float = field(default_factory=time.monotonic)
+    progress: Optional[FFmpegProgress] = None
+    source: Any = None  # whatever run() was given, usually the Popen
+    stream_info: Optional[StreamInfo] = None  # STREAM_INFO / OUTPUT_INFO
+
+
+class _RunState:
+    """Parser state of one ``run()``, i.e. of one FFmpeg child."""
+    __slots__ = (
+        "source", "in_output_section", "progress_fields", "progress", "stop_requested",
+    )
+
+    def __init__(self, source: Any):
+        self.source = source
+        self.stop_requested = False
+        self.in_output_section = False
+        self.progress_fields: Dict[str, str] = {}
+        self.progress: Optional[FFmpegProgress] = None
+
+
+FFmpegEventCallback = Callable[[FFmpegEvent], None]
+
+# stop() without a source ends every run
+_ALL_RUNS = object()
+
+# Lower-case substrings that mean the sender went away
+DISCONNECT_MARKERS = (
+    "connection closed",
+    "eof",
+    "broken pipe",
+    "disconnected",
+    "connection lost",
+    "error during demuxing",
+)
+
+# Lower-case substrings FFmpeg uses for errors
+ERROR_MARKERS = ("error", "failed", "invalid", "corrupt")
+
+# A line of a -progress block, e.g. "out_time_us=1033333"
+_PROGRESS_LINE = re.compile(r"^([a-z0-9_]+)=(\S*)$")
+
+# Parts of "Stream #0:0: Video: h264 (High), yuv420p(progressive), 1920x1080
+# [SAR 1:1 DAR 16:9], 30 fps, 30 tbr, 1k tbn"
+_STREAM_CODEC = re.compile(r"Video: (\w+)")
+_STREAM_PIX_FMT = re.compile(r", ([a-z][a-z0-9_]*)(?:\(|, \d+x\d+)")
+_STREAM_SIZE = re.compile(r", (\d+)x(\d+)")
+_STREAM_FPS = re.compile(r", ([\d.]+)(k?) (fps|tbr)")
+
+
+def progress_args(period: float = config.PROGRESS_PERIOD) -> List[str]:
+    """
+    Return FFmpeg options that write progress reports to stderr.
+
+    Replaces the human-readable stats line with ``key=value`` blocks every
+    ``period`` seconds.
+    """
+    return ["-nostats", "-progress", "pipe:2", "-stats_period", str(period)]
+
+
+def parse_stream_info(line: str) -> Optional[StreamInfo]:
+    """
+    Parse a ``Stream #0:x: Video:`` line.
+
+    Parameters
+    ----------
+    line : str
+        One FFmpeg stderr line
+
+    Returns
+    -------
+    StreamInfo or None
+        None if the line has no video codec and size
+    """
+    codec = _STREAM_CODEC.search(line)
+    size = _STREAM_SIZE.search(line)
+    if codec is None or size is None:
+        return None
+    pix_fmt = _STREAM_PIX_FMT.search(line)
+    # Prefer "fps"; fall back to "tbr" (e.g. variable frame rate streams)
+    rates = {}
+    for value, kilo, unit in _STREAM_FPS.findall(line):
+        rates[unit] = float(value) * (1000 if kilo else 1)
+    return StreamInfo(
+        codec=codec.group(1),
+        width=int(size.group(1)),
+        height=int(size.group(2)),
+        fps=rates.get("fps", rates.get("tbr")),
+        pix_fmt=pix_fmt.group(1) if pix_fmt else None,
+    )
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    """Parse '2.07x', '52767.1kbits/s', '30.00'; None for N/A or missing."""
+    if value is None:
+        return None
+    match = re.match(r"-?\d+(\.\d+)?", value)
+    return float(match.group()) if match else None
+
+
+class FFmpegStderrMonitor:
+    """
+    Single reader of an FFmpeg child's stderr with subscriber fan-out.
+
+    ``run()`` blocks until the stream reaches EOF, so callers run it on a
+    worker thread (the adapters use the event loop's default executor).
+    """
+
+    def __init__(self, connect_markers: Sequence[str] = ()):
+        """
+        Initialize the monitor.
+
+        Parameters
+        ----------
+        connect_markers : sequence of str, optional
+            Case-sensitive substrings that mark a sender connecting; these
+            differ per protocol
+        """
+        self._connect_markers = tuple(connect_markers)
+        self._subscribers: Tuple[FFmpegEventCallback, ...] = ()
+        self._subscribe_lock = threading.Lock()
+        self._line_count = 0
+        # Parser state of the runs in progress; each has its own stop flag
+        self._runs: List[_RunState] = []
+        self._runs_lock = threading.Lock()
+        self._progress: Optional[FFmpegProgress] = None
+
+    @property
+    def progress(self) -> Optional[FFmpegProgress]:
+        """Latest progress report of any monitored FFmpeg process."""
+        return self._progress
+
+    @property
+    def line_count(self) -> int:
+        """Total stderr lines parsed across all runs."""
+        return self._line_count
+
+    def subscribe(self, callback: FFmpegEventCallback) -> Callable[[], None]:
+        """
+        Register ``callback`` for every future event.
+
+        Parameters
+        ----------
+        callback : callable
+            Receives each ``FFmpegEvent`` on the reader thread
+
+        Returns
+        -------
+        callable
+            Function that removes the subscription again
+        """
+        with self._subscribe_lock:
+            self._subscribers = self._subscribers + (callback,)
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback: FFmpegEventCallback) -> None:
+        """Remove ``callback``; unknown callbacks are ignored."""
+        with self._subscribe_lock:
+            self._subscribers = tuple(
+                cb for cb in self._subscribers if cb != callback
+            )
+
+    def run(self, stderr: IO[bytes], source: Any = None) -> None:
+        """
+        Read ``stderr`` line by line until EOF, dispatching events.
+
+        Emits a final ``CLOSED`` event when the stream ends.
+
+        Parameters
+        ----------
+        stderr : binary file object
+            The FFmpeg child's stderr pipe
+        source : any, optional
+            Stored on every event of this run, typically the child's Popen
+        """
+        state = _RunState(source)
+        with self._runs_lock:
+            self._runs.append(state)
+        log.debug("FFmpeg stderr monitor started")
+
+        try:
+            for raw in iter(stderr.readline, b""):
+                if state.stop_requested:
+                    break
+                line = raw.decode("utf-8", errors="ignore").strip()
+                if not line:
+                    continue
+                self._line_count += 1
+                event = self._parse(line, state)
+                if event is not None:
+                    self._dispatch(event)
+        except (OSError, ValueError) as e:
+            # Pipe closed underneath us while the child was being stopped
+            log.debug("FFmpeg stderr read ended: %s", e)
+        finally:
+            with self._runs_lock:
+                self._runs.remove(state)
+
+        log.debug("FFmpeg stderr closed")
+        self._dispatch(FFmpegEvent(FFmpegEventType.CLOSED, "", source=source))
+
+    def stop(self, source: Any = _ALL_RUNS) -> None:
+        """
+        Make running ``run()`` calls return after the line they are waiting for.
+
+        A blocked ``readline()`` cannot be interrupted; terminating the
+        FFmpeg child closes the pipe and ends ``run()`` as well. Runs
+        started later are not affected.
+
+        Parameters
+        ----------
+        source : any, optional
+            Stop only the runs reading this source (e.g. one child's
+            Popen); all runs if omitted
+        """
+        with self._runs_lock:
+            for state in self._runs:
+                if source is _ALL_RUNS or state.source is source:
+                    state.stop_requested = True
+
+    # ── internal ─────────────────────────────────────────
+
+    def _parse(self, line: str, state: _RunState) -> Optional[FFmpegEvent]:
+        """
+        Classify one stderr line and log it at a matching level.
+
+        Lines of a progress block are collected silently; the event is
+        emitted once the block's closing ``progress=`` line arrives.
+        """
+        match = _PROGRESS_LINE.match(line)
+        if match:
+            key, value = match.groups()
+            if key != "progress":
+                state.progress_fields[key] = value
+                return None
+            state.progress = self._build_progress(state, value == "end")
+            state.progress_fields = {}
+            self._progress = state.progress
+            return FFmpegEvent(
+                FFmpegEventType.PROGRESS,
+                line,
+                progress=state.progress,
+                source=state.source,
+            )
+
+        lower = line.lower()
+
+        if "error" in lower:
+            log.error("FFmpeg: %s", line)
+        elif "warning" in lower:
+            log.warning("FFmpeg: %s", line)
+        else:
+            log.debug("FFmpeg: %s", line)
+
+        # Stream lines after "Output #" describe our rawvideo output,
+        # not the sender's stream
+        if line.startswith("Output #"):
+            state.in_output_section = True
+        elif line.startswith("Input #"):
+            state.in_output_section = False
+
+        if line.startswith("Stream #") and "Video:" in line:
+            return FFmpegEvent(
+                FFmpegEventType.OUTPUT_INFO
+                if state.in_output_section
+                else FFmpegEventType.STREAM_INFO,
+                line,
+                source=state.source,
+                stream_info=parse_stream_info(line),
+            )
+
+        if any(k in lower for k in DISCONNECT_MARKERS):
+            event_type = FFmpegEventType.DISCONNECTED
+        elif any(k in line for k in self._connect_markers):
+            event_type = FFmpegEventType.CONNECTED
+        elif any(k in lower for k in ERROR_MARKERS):
+            event_type = FFmpegEventType.DECODE_ERROR
+        else:
+            event_type = FFmpegEventType.LOG
+
+        return FFmpegEvent(event_type, line, source=state.source)
+
+    def _build_progress(self, state: _RunState, ended: bool) -> FFmpegProgress:
+        """Turn the collected ``key=value`` fields into a snapshot."""
+        fields = state.progress_fields
+        now = time.monotonic()
+        frame = int(_number(fields.get("frame")) or 0)
+        dup = int(_number(fields.get("dup_frames")) or 0)
+        drop = int(_number(fields.get("drop_frames")) or 0)
+        out_time_us = _number(fields.get("out_time_us"))
+
+        # Frames that came in = frames written - duplicates + drops
+        input_fps = 0.0
+        previous = state.progress
+        if previous is not None and now > previous.timestamp:
+            received = frame - dup + drop
+            received_before = (
+                previous.frame - previous.dup_frames + previous.drop_frames
+            )
+            input_fps = max(received - received_before, 0) / (now - previous.timestamp)
+
+        return FFmpegProgress(
+            frame=frame,
+            fps=_number(fields.get("fps")) or 0.0,
+            input_fps=input_fps,
+            speed=_number(fields.get("speed")),
+            bitrate_kbps=_number(fields.get("bitrate")),
+            dup_frames=dup,
+            drop_frames=drop,
+            out_time=None if out_time_us is None else out_time_us / 1e6,
+            total_size=int(_number(fields.get("total_size")) or 0),
+            ended=ended,
+            timestamp=now,
+        )
+
+    def _dispatch(self, event: FFmpegEvent) -> None:
+        """Hand ``event`` to every subscriber, isolating their failures."""
+        for callback in self._subscribers:
+            try:
+                callback(event)
+            except Exception:
+                log.exception("FFmpeg event subscriber failed")
@@ -0,0 +1,677 @@
+"""
+Shared FFmpeg listener for the RTMP and SRT adapters.
+
+Both adapters run FFmpeg in listen mode: one child accepts one sender,
+decodes it and writes raw frames to stdout, then exits when the sender
+disconnects. Everything around that child is the same for both protocols
+and lives in ``FFmpegListenerAdapter``:
+
+- the stderr monitor and the connection state it drives
+- the warm-standby listener (see standby.py) and the hand-over to it when
+  the current child exits, when the sender reconnects to the standby first
+  or on ``resync()``
+- restarting the child for a new video transform
+- ``wait_for_process()``, which the decoder uses to re-attach
+
+A protocol adapter only supplies the FFmpeg input: its listen URL and the
+options placed before ``-i``, plus its connection URLs and instructions.
+"""
+
+import asyncio
+import subprocess
+import threading
+import logging
+import time
+from abc import abstractmethod
+from typing import List, Callable, Optional
+
+from .base import ProtocolAdapter
+from .. import config
+from ..frame_fitter import FitMode
+from ..ingest_profile import IngestProfile, ingest_input_args
+from ..pixel_format import PixelFormat, ffmpeg_pix_fmt
+from ..video_transform import ScalerProfile, VideoTransform, video_filter_args
+from .ffmpeg_events import (
+    FFmpegEvent,
+    FFmpegEventType,
+    FFmpegStderrMonitor,
+    StreamInfo,
+    progress_args,
+)
+from .standby import StandbyListener, terminate_process
+
+log = logging.getLogger(__name__)
+
+
+class FFmpegListenerAdapter(ProtocolAdapter):
+    """
+    Protocol adapter around an FFmpeg child in listen mode.
+
+    Subclasses set the class attributes and implement ``_listen_url()``,
+    ``get_connection_urls()`` and ``get_connection_instructions()``; they
+    may extend ``_input_args()`` and ``_output_args()``.
+    """
+
+    # Name in logs and errors, e.g. "RTMP"
+    PROTOCOL = ""
+    # Container the protocol carries, for the ingest profile
+    CONTAINER = ""
+    # FFmpeg stderr lines that mean a sender connected
+    CONNECT_MARKERS: tuple = ()
+    # FFmpeg build requirement shown when FFmpeg is missing
+    FFMPEG_REQUIREMENT = ""
+    # Popen buffering of the listener's pipes
+    PIPE_BUFSIZE = -1
+
+    def __init__(
+        self,
+        on_connect: Optional[Callable[[], None]] = None,
+        on_disconnect: Optional[Callable[[], None]] = None,
+        width: int = config.FRAME_WIDTH,
+        height: int = config.FRAME_HEIGHT,
+        pixel_format: PixelFormat = PixelFormat.RGB24,
+        ingest_profile: IngestProfile = IngestProfile.DEFAULT,
+        transform: VideoTransform = VideoTransform(),
+        fit_mode: FitMode = FitMode.LETTERBOX,
+        scaler: ScalerProfile = ScalerProfile.BICUBIC,
+        native_resolution: bool = False,
+        warm_standby: bool = True,
+    ):
+        """
+        Initialize the adapter; ``start()`` spawns the first listener.
+
+        Parameters
+        ----------
+        on_connect : callable, optional
+            Callback invoked when a client connects
+        on_disconnect : callable, optional
+            Callback invoked when a client disconnects
+        width : int
+            Frame width for decoding (default from config)
+        height : int
+            Frame height for decoding (default from config)
+        pixel_format : PixelFormat
+            Raw frame format written to stdout (default RGB24)
+        ingest_profile : IngestProfile
+            Input probing profile (default: FFmpeg's own probing)
+        transform : VideoTransform
+            Crop / rotate / mirror applied by FFmpeg (default: none)
+        fit_mode : FitMode
+            How FFmpeg fits the picture to ``width`` x ``height``
+            (default: LETTERBOX)
+        scaler : ScalerProfile
+            Scaling algorithm of the fit step (default: BICUBIC)
+        native_resolution : bool
+            Keep the sender's resolution instead of scaling to ``width`` x
+            ``height``; readers take the frame size from the ``OUTPUT_INFO``
+            event (default False)
+        warm_standby : bool
+            Pre-spawn the next listener while a sender is streaming, so a
+            reconnect does not wait for FFmpeg to start (default True)
+        """
+        self._on_connect = on_connect
+        self._on_disconnect = on_disconnect
+        self._width = width
+        self._height = height
+        self._pixel_format = pixel_format
+        self._ingest_profile = ingest_profile
+        self._transform = transform
+        self._fit_mode = fit_mode
+        self._scaler = scaler
+        self._native_resolution = native_resolution
+        self._warm_standby = warm_standby
+        self._cmd: Optional[List[str]] = None
+        self._port: Optional[int] = None
+        self._path: Optional[str] = None
+        self._proc: Optional[subprocess.Popen] = None
+        self._connected = False
+        self._stream_info: Optional[StreamInfo] = None
+        # time.monotonic() of the last listener spawn / detected sender
+        self._listen_started_at: Optional[float] = None
+        self._connected_at: Optional[float] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        # Sole reader of FFmpeg stderr; the decoder and connection manager
+        # subscribe to it instead of reading the pipe themselves
+        self._stderr_monitor = FFmpegStderrMonitor(
+            connect_markers=self.CONNECT_MARKERS
+        )
+        self._stderr_monitor.subscribe(self._handle_ffmpeg_event)
+        # Next listener, spawned while the current one serves a sender
+        self._standby = StandbyListener(
+            self._spawn_listener, self._stderr_monitor, self.PROTOCOL.lower()
+        )
+        # Guards _proc hand-overs; the decoder waits on it for the next child
+        self._proc_changed = threading.Condition()
+        self._stopping = False
+
+    async def start(self, port: int, path: str = "") -> None:
+        """
+        Start the FFmpeg listener.
+
+        Parameters
+        ----------
+        port : int
+            Port number to listen on
+        path : str, optional
+            Stream path, for protocols that have one; defaults to
+            ``_default_path()``
+
+        Raises
+        ------
+        RuntimeError
+            If FFmpeg is not found or fails to start
+        """
+        if self._proc is not None:
+            log.warning("%s adapter already started", self.PROTOCOL)
+            return
+
+        if config.FFMPEG_BIN is None:
+            raise RuntimeError(
+                "FFmpeg not found.\n\n"
+                f"Please install FFmpeg{self.FFMPEG_REQUIREMENT}:\n"
+                "1. Download from https://ffmpeg.org/download.html\n"
+                "2. Add to PATH, or\n"
+                "3. Run: python src/setup_ffmpeg.py"
+            )
+
+        self._port = port
+        self._path = path or self._default_path()
+
+        cmd = self._build_command()
+
+        log.info("Starting %s server on %s", self.PROTOCOL, self._listen_url())
+        log.debug("FFmpeg command: %s", " ".join(cmd))
+
+        self._cmd = cmd
+        try:
+            proc = self._spawn_listener()
+        except Exception as e:
+            raise RuntimeError(f"Failed to start FFmpeg {self.PROTOCOL} server: {e}")
+
+        with self._proc_changed:
+            self._proc = proc
+            self._stopping = False
+            self._listen_started_at = time.monotonic()
+            self._connected_at = None
+            self._proc_changed.notify_all()
+
+        # Start monitoring FFmpeg stderr for connection events
+        self._monitor_task = asyncio.create_task(self._monitor_connection())
+
+        log.info("%s adapter started successfully", self.PROTOCOL)
+
+    async def stop(self) -> None:
+        """
+        Stop the listener and clean up resources.
+
+        Gracefully terminates the FFmpeg process and cancels monitoring tasks.
+        """
+        log.info("Stopping %s adapter", self.PROTOCOL)
+
+        # No hand-over to a standby listener from here on
+        with self._proc_changed:
+            self._stopping = True
+            self._proc_changed.notify_all()
+        self._standby.close()
+
+        # Cancel monitoring task
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+
+        # Terminate FFmpeg process
+        if self._proc is not None:
+            terminate_process(self._proc)
+            self._proc = None
+
+        # Reset connection state
+        if self._connected:
+            self._connected = False
+            if self._on_disconnect:
+                self._on_disconnect()
+
+        log.info("%s adapter stopped", self.PROTOCOL)
+
+    @property
+    def is_connected(self) -> bool:
+        """
+        Check if a sender is currently connected.
+
+        Returns
+        -------
+        bool
+            True if a sender is connected and streaming
+        """
+        return self._connected
+
+    @property
+    def is_listening(self) -> bool:
+        """
+        Check if an FFmpeg listener is waiting for a sender.
+
+        With the warm standby, a listener is waiting again right after a
+        sender disconnects, so reconnecting needs no adapter restart. A
+        child still holding a (possibly stalled) sender is not listening.
+
+        Returns
+        -------
+        bool
+            True if the current FFmpeg process is alive, not stopping and
+            has no sender
+        """
+        proc = self._proc
+        return (
+            proc is not None
+            and not self._stopping
+            and not self._connected
+            and proc.poll() is None
+        )
+
+    def get_stdout(self) -> Optional[subprocess.Popen]:
+        """
+        Get the FFmpeg process for frame reading.
+
+        This method provides access to the FFmpeg process stdout for
+        reading decoded frames. This maintains compatibility with the
+        existing FrameDecoder implementation.
+
+        Returns
+        -------
+        subprocess.Popen or None
+            The FFmpeg process, or None if not started
+        """
+        return self._proc
+
+    def wait_for_process(
+        self,
+        previous: Optional[subprocess.Popen],
+        timeout: Optional[float] = None,
+    ) -> Optional[subprocess.Popen]:
+        """
+        Wait until the FFmpeg process is replaced.
+
+        Used by FrameDecoder to re-attach to the promoted standby listener
+        when the current process reaches end of stream.
+
+        Parameters
+        ----------
+        previous : subprocess.Popen or None
+            The process the caller was reading from
+        timeout : float, optional
+            Maximum seconds to wait; None waits indefinitely
+
+        Returns
+        -------
+        subprocess.Popen or None
+            The new process, or None on timeout
+        """
+        with self._proc_changed:
+            self._proc_changed.wait_for(
+                lambda: self._proc is not None and self._proc is not previous,
+                timeout,
+            )
+            proc = self._proc
+        return proc if proc is not previous else None
+
+    @property
+    def listen_started_at(self) -> Optional[float]:
+        """
+        When the current FFmpeg listener was spawned.
+
+        Returns
+        -------
+        float or None
+            ``time.monotonic()`` timestamp, or None if not started
+        """
+        return self._listen_started_at
+
+    @property
+    def connected_at(self) -> Optional[float]:
+        """
+        When FFmpeg reported the current sender.
+
+        FFmpeg only logs the sender once it has probed the input, so this
+        is after probing rather than at socket accept.
+
+        Returns
+        -------
+        float or None
+            ``time.monotonic()`` timestamp, or None if no sender yet
+        """
+        return self._connected_at
+
+    @property
+    def native_resolution(self) -> bool:
+        """
+        Check if frames keep the sender's resolution.
+
+        Returns
+        -------
+        bool
+            True if FFmpeg does not scale to the configured size
+        """
+        return self._native_resolution
+
+    @property
+    def stream_info(self) -> Optional[StreamInfo]:
+        """
+        The current sender's video stream as probed by FFmpeg.
+
+        Returns
+        -------
+        StreamInfo or None
+            Codec, size and frame rate, or None without a sender
+        """
+        return self._stream_info
+
+    @property
+    def video_transform(self) -> VideoTransform:
+        """
+        Transform FFmpeg applies to the decoded picture.
+
+        Returns
+        -------
+        VideoTransform
+            The current transform
+        """
+        return self._transform
+
+    def set_video_transform(
+        self,
+        transform: VideoTransform,
+        fit_mode: Optional[FitMode] = None,
+        scaler: Optional[ScalerProfile] = None,
+    ) -> bool:
+        """
+        Change the transform, restarting only the FFmpeg child.
+
+        The decoder re-attaches to the new child like after a reconnect; a
+        connected sender is dropped and has to reconnect.
+
+        Parameters
+        ----------
+        transform : VideoTransform
+            New transform
+        fit_mode : FitMode, optional
+            New fit mode; None keeps the current one
+        scaler : ScalerProfile, optional
+            New scaling algorithm; None keeps the current one
+
+        Returns
+        -------
+        bool
+            True if the transform changed (and a running child was
+            restarted), False if it already applied
+        """
+        fit_mode = self._fit_mode if fit_mode is None else fit_mode
+        scaler = self._scaler if scaler is None else scaler
+        if (transform, fit_mode, scaler) == (
+            self._transform, self._fit_mode, self._scaler
+        ):
+            return False
+        self._transform = transform
+        self._fit_mode = fit_mode
+        self._scaler = scaler
+        if self._cmd is None:
+            return True  # not started; start() builds the command
+
+        with self._proc_changed:
+            if self._stopping:
+                return True
+            self._cmd = self._build_command()
+            log.info("%s video transform changed, restarting FFmpeg", self.PROTOCOL)
+            log.debug("FFmpeg command: %s", " ".join(self._cmd))
+            # The standby was spawned with the old filters, and the current
+            # child may hold the port: both go before the new one starts.
+            # With _proc cleared, events of the old child are ignored.
+            self._standby.close()
+            previous, self._proc = self._proc, None
+            was_connected, self._connected = self._connected, False
+            self._stream_info = None
+            if previous is not None:
+                # Its remaining output is discarded, no need to wait long
+                terminate_process(previous, timeout=1.0)
+            try:
+                proc, spawned_at = self._standby.take()
+            except Exception as e:
+                log.error("Failed to restart FFmpeg %s listener: %s", self.PROTOCOL, e)
+                proc, spawned_at = None, None
+            self._proc = proc
+            self._listen_started_at = spawned_at
+            self._connected_at = None
+            self._proc_changed.notify_all()
+
+        if was_connected and self._on_disconnect:
+            self._on_disconnect()
+        return True
+
+    def resync(self) -> bool:
+        """
+        Drop buffered media by handing over to the next FFmpeg listener.
+
+        The sender's connection is closed without reporting a disconnect;
+        it reconnects to the standby listener (and ``on_connect`` fires
+        again) while the decoder re-attaches and keeps the last frame.
+
+        Returns
+        -------
+        bool
+            True if the FFmpeg child was replaced, False without a
+            connected sender
+        """
+        with self._proc_changed:
+            previous = self._proc
+            if self._stopping or previous is None or not self._connected:
+                return False
+            log.info(
+                "Resyncing %s ingest, replacing FFmpeg (pid %s)",
+                self.PROTOCOL, previous.pid,
+            )
+            # Cleared first, so the old child's CLOSED event stays quiet
+            stream_info, self._stream_info = self._stream_info, None
+            self._connected = False
+            # Reentrant lock: the hand-over runs under the same condition
+            if self._hand_over(previous, retire=True):
+                return True
+            # No new listener; the old child still serves the sender
+            self._connected = True
+            self._stream_info = stream_info
+            return False
+
+    @property
+    def stderr_monitor(self) -> FFmpegStderrMonitor:
+        """
+        Parsed FFmpeg stderr events.
+
+        Returns
+        -------
+        FFmpegStderrMonitor
+            Monitor to subscribe to; it outlives individual FFmpeg processes
+        """
+        return self._stderr_monitor
+
+    async def _monitor_connection(self) -> None:
+        """
+        Monitor FFmpeg stderr for connection events.
+
+        Runs the stderr monitor on a worker thread until FFmpeg exits;
+        connection changes arrive through ``_handle_ffmpeg_event``.
+        """
+        proc = self._proc
+        if proc is None or proc.stderr is None:
+            return
+
+        log.debug("Starting connection monitoring")
+
+        try:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(
+                None, self._stderr_monitor.run, proc.stderr, proc
+            )
+        except asyncio.CancelledError:
+            log.debug("Connection monitoring cancelled")
+            # Only this child's reader; a standby's keeps running
+            self._stderr_monitor.stop(proc)
+            raise
+        except Exception as e:
+            log.error("Error monitoring connection: %s", e)
+
+    @abstractmethod
+    def _listen_url(self) -> str:
+        """FFmpeg input URL that listens on the configured port."""
+
+    def _default_path(self) -> Optional[str]:
+        """Stream path used when ``start()`` gets none; None if path-less."""
+        return None
+
+    def _input_args(self) -> List[str]:
+        """Options placed before ``-i``; the ingest profile by default."""
+        return ingest_input_args(self._ingest_profile, self.CONTAINER)
+
+    def _output_args(self) -> List[str]:
+        """Extra raw-video output options, e.g. a fixed frame rate."""
+        return []
+
+    def _build_command(self) -> List[str]:
+        """FFmpeg listener command for the current port and settings."""
+        return [
+            config.FFMPEG_BIN,
+            "-loglevel",
+            "info",
+            *progress_args(),
+            *self._input_args(),
+            "-i",
+            self._listen_url(),
+            "-f",
+            "rawvideo",
+            *video_filter_args(
+                self._transform,
+                None if self._native_resolution else self._width,
+                None if self._native_resolution else self._height,
+                self._fit_mode,
+                self._scaler,
+            ),
+            "-pix_fmt",
+            ffmpeg_pix_fmt(self._pixel_format),
+            *self._output_args(),
+            "-flags",
+            "low_delay",
+            "-fflags",
+            "nobuffer",
+            "-an",
+            "-sn",  # No audio, no subtitles
+            "pipe:1",  # Output to stdout
+        ]
+
+    def _spawn_listener(self) -> subprocess.Popen:
+        """Start one FFmpeg listener with the command built by ``start()``."""
+        return subprocess.Popen(
+            self._cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=self.PIPE_BUFSIZE,
+            creationflags=(
+                subprocess.CREATE_NO_WINDOW
+                if hasattr(subprocess, "CREATE_NO_WINDOW")
+                else 0
+            ),
+        )
+
+    def _handle_ffmpeg_event(self, event: FFmpegEvent) -> None:
+        """Track connection state from parsed FFmpeg stderr events."""
+        source = event.source
+        if source is not None and source is not self._proc:
+            self._handle_standby_event(event)
+            return
+
+        if event.type in (FFmpegEventType.CONNECTED, FFmpegEventType.STREAM_INFO):
+            if event.stream_info is not None:
+                info = event.stream_info
+                self._stream_info = info
+                log.info(
+                    "%s sender stream: %s %dx%d @ %s fps",
+                    self.PROTOCOL, info.codec, info.width, info.height, info.fps or "?",
+                )
+            if not self._connected:
+                log.info("%s client connected", self.PROTOCOL)
+                self._connected = True
+                self._connected_at = event.timestamp
+                if self._on_connect:
+                    self._on_connect()
+            if self._warm_standby and self._cmd is not None and not self._stopping:
+                self._standby.fill()
+
+        elif event.type in (FFmpegEventType.DISCONNECTED, FFmpegEventType.CLOSED):
+            if self._connected:
+                log.info("%s client disconnected", self.PROTOCOL)
+                self._connected = False
+                self._stream_info = None
+                if self._on_disconnect:
+                    self._on_disconnect()
+            # Only a child that served a sender is replaced; one that
+            # exited on its own (e.g. port in use) would exit again
+            if (
+                event.type is FFmpegEventType.CLOSED
+                and source is not None
+                and self._connected_at is not None
+            ):
+                self._hand_over(source)
+
+    def _handle_standby_event(self, event: FFmpegEvent) -> None:
+        """Handle events of the standby listener or of a replaced child."""
+        if not self._standby.owns(event.source):
+            return  # a replaced child winding down
+
+        if event.type is FFmpegEventType.CLOSED:
+            self._standby.discard(event.source)
+
+        elif event.type in (FFmpegEventType.CONNECTED, FFmpegEventType.STREAM_INFO):
+            # The sender came back before the current child noticed that
+            # the old connection is gone
+            log.info("%s sender reconnected to the standby listener", self.PROTOCOL)
+            if self._hand_over(self._proc, retire=True):
+                self._connected_at = event.timestamp
+                self._handle_ffmpeg_event(event)
+
+    def _hand_over(
+        self, previous: Optional[subprocess.Popen], retire: bool = False
+    ) -> bool:
+        """
+        Make the standby listener (or a fresh one) the current process.
+
+        Parameters
+        ----------
+        previous : subprocess.Popen or None
+            The process being replaced; nothing happens if it is no
+            longer the current one
+        retire : bool
+            Terminate ``previous``; needed when it is still running
+
+        Returns
+        -------
+        bool
+            True if the process was replaced
+        """
+        with self._proc_changed:
+            if self._stopping or self._cmd is None or previous is not self._proc:
+                return False
+            try:
+                proc, spawned_at = self._standby.take()
+            except Exception as e:
+                log.error("Failed to start next FFmpeg %s listener: %s", self.PROTOCOL, e)
+                return False
+            self._proc = proc
+            self._listen_started_at = spawned_at
+            self._connected_at = None
+            self._stream_info = None
+            self._proc_changed.notify_all()
+
+        log.info("%s listener handed over (pid %s)", self.PROTOCOL, proc.pid)
+        if retire and previous is not None:
+            self._standby.retire(previous)
+        return True
@@ -0,0 +1,183 @@
+"""
+Warm-standby FFmpeg listeners for the RTMP and SRT adapters.
+
+In listen mode an FFmpeg child serves exactly one sender and exits when that
+sender disconnects. Spawning a replacement only then costs process start-up
+and bind time on top of the reconnect backoff. FFmpeg closes its listening
+socket as soon as it accepts a sender, so the port is free again while the
+current child is still streaming: ``StandbyListener`` uses that window to
+spawn the next listener ahead of time, and the adapter promotes it when the
+current child exits (or when the sender reconnects to it first).
+
+Integration Notes
+-----------------
+- The standby's stderr is read by the adapter's ``FFmpegStderrMonitor`` on a
+  daemon thread, with the Popen as the event ``source``.
+- ``take()`` falls back to spawning a listener on the spot, so a missing or
+  failed standby only costs the spawn time.
+"""
+
+import subprocess
+import threading
+import time
+import logging
+from typing import Callable, Optional, Tuple
+
+from .ffmpeg_events import FFmpegStderrMonitor
+
+log = logging.getLogger(__name__)
+
+
+def terminate_process(proc: subprocess.Popen, timeout: float = 3.0) -> None:
+    """
+    Terminate an FFmpeg child, killing it if it does not exit in time.
+
+    Parameters
+    ----------
+    proc : subprocess.Popen
+        Process to stop
+    timeout : float
+        Seconds to wait for a graceful exit before killing
+    """
+    try:
+        if proc.stdin:
+            proc.stdin.close()
+    except Exception:
+        pass
+
+    try:
+        proc.terminate()
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    except Exception as e:
+        log.warning("Error terminating FFmpeg process: %s", e)
+
+
+class StandbyListener:
+    """
+    Holds at most one pre-spawned FFmpeg listener.
+
+    All methods are thread-safe; they are called from stderr monitor
+    threads as well as the event loop.
+    """
+
+    def __init__(
+        self,
+        spawn: Callable[[], subprocess.Popen],
+        monitor: FFmpegStderrMonitor,
+        name: str,
+    ):
+        """
+        Initialize the standby slot.
+
+        Parameters
+        ----------
+        spawn : callable
+            Starts one FFmpeg listener and returns its Popen
+        monitor : FFmpegStderrMonitor
+            Monitor that reads the stderr of every spawned listener
+        name : str
+            Protocol name, used for thread names and logging
+        """
+        self._spawn = spawn
+        self._monitor = monitor
+        self._name = name
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self._spawned_at: Optional[float] = None
+        self._spawn_count = 0
+
+    @property
+    def process(self) -> Optional[subprocess.Popen]:
+        """The waiting standby listener, if any."""
+        return self._proc
+
+    @property
+    def spawn_count(self) -> int:
+        """Listeners spawned by this slot, standby or on demand."""
+        return self._spawn_count
+
+    def owns(self, proc: object) -> bool:
+        """True if ``proc`` is the current standby listener."""
+        return proc is not None and proc is self._proc
+
+    def fill(self) -> None:
+        """Spawn a standby listener unless one is already waiting."""
+        with self._lock:
+            if self._proc is not None:
+                return
+            try:
+                self._proc, self._spawned_at = self._start()
+            except Exception as e:
+                log.warning("Could not spawn standby %s listener: %s", self._name, e)
+                return
+        log.debug("Standby %s listener ready (pid %s)", self._name, self._proc.pid)
+
+    def take(self) -> Tuple[subprocess.Popen, float]:
+        """
+        Hand out the standby listener, spawning one if none is waiting.
+
+        Returns
+        -------
+        tuple of (subprocess.Popen, float)
+            The listener and its ``time.monotonic()`` spawn time
+
+        Raises
+        ------
+        OSError
+            If a listener has to be spawned and that fails
+        """
+        with self._lock:
+            proc, spawned_at = self._proc, self._spawned_at
+            self._proc = None
+            self._spawned_at = None
+            if proc is not None and proc.poll() is None:
+                return proc, spawned_at
+            log.debug("No standby %s listener waiting, spawning one", self._name)
+            return self._start()
+
+    def discard(self, proc: object) -> None:
+        """Forget ``proc`` if it is the standby; used when it exits by itself."""
+        with self._lock:
+            if proc is None or proc is not self._proc:
+                return
+            self._proc = None
+            self._spawned_at = None
+        log.warning("Standby %s listener exited", self._name)
+
+    def retire(self, proc: subprocess.Popen) -> None:
+        """Terminate a replaced listener without blocking the caller."""
+        threading.Thread(
+            target=terminate_process,
+            args=(proc,),
+            name=f"{self._name}-retire",
+            daemon=True,
+        ).start()
+
+    def close(self) -> None:
+        """Terminate the standby listener, if any."""
+        with self._lock:
+            proc = self._proc
+            self._proc = None
+            self._spawned_at = None
+        if proc is not None:
+            terminate_process(proc)
+
+    # ── internal ─────────────────────────────────────────
+
+    def _start(self) -> Tuple[subprocess.Popen, float]:
+        """Spawn a listener and start reading its stderr (lock held)."""
+        proc = self._spawn()
+        spawned_at = time.monotonic()
+        self._spawn_count += 1
+        if proc.stderr is not None:
+            threading.Thread(
+                target=self._monitor.run,
+                args=(proc.stderr, proc),
+                name=f"{self._name}-stderr",
+                daemon=True,
+            ).start()
+        return proc, spawned_at
@@ -26,7 +26,6 @@ import json
 import logging
 import socket
 import threading
-import queue
 from typing import List, Callable, Optional, Dict, Any
 from dataclasses import dataclass
 
@@ -53,6 +52,8 @@ except ImportError:
 
 from .base import ProtocolAdapter
 from .. import config
+from ..frame_slot import FrameSlot
+from ..pixel_format import PixelFormat, ffmpeg_pix_fmt, is_planar
 
 log = logging.getLogger(__name__)
 
@@ -90,6 +91,7 @@ class WebRTCAdapter(ProtocolAdapter):
         on_disconnect: Optional[Callable[[], None]] = None,
         width: int = config.FRAME_WIDTH,
         height: int = config.FRAME_HEIGHT,
+        pixel_format: PixelFormat = PixelFormat.RGB24,
     ):
         """
         Initialize WebRTC adapter.
@@ -104,6 +106,8 @@ class WebRTCAdapter(ProtocolAdapter):
             Frame width for video (default from config)
         height : int
             Frame height for video (default from config)
+        pixel_format : PixelFormat
+            Frame format handed to the decoder (default RGB24)
 
         Raises
         ------
@@ -126,6 +130,7 @@ class WebRTCAdapter(ProtocolAdapter):
         self._on_disconnect = on_disconnect
         self._width = width
         self._height = height
+        self._pixel_format = pixel_format
         self._config = WebRTCConfig()
 
         # WebRTC state
@@ -141,8 +146,8 @@ class WebRTCAdapter(ProtocolAdapter):
         self._signaling_server: Optional[asyncio.Server] = None
         self._port: Optional[int] = None
 
-        # Frame queue for WebRTC video tracks
-        self._frame_queue: queue.Queue = queue.Queue(maxsize=2)
+        # Latest-frame handoff to the FrameDecoder reader thread
+        self._frame_slot = FrameSlot()
         self._video_track = None
         self._running = True
 
@@ -172,6 +177,11 @@ class WebRTCAdapter(ProtocolAdapter):
         self._port = port
         self._config.signaling_port = port
 
+        # A stopped adapter closed its slot; give the next decoder a fresh one
+        if self._frame_slot.closed:
+            self._frame_slot = FrameSlot()
+        self._running = True
+
         # Start signaling server
         try:
             self._signaling_server = await asyncio.start_server(
@@ -201,6 +211,7 @@ class WebRTCAdapter(ProtocolAdapter):
         log.info("Stopping WebRTC adapter")
 
         self._running = False
+        self._frame_slot.close()
 
         # Close all peer connections
         for peer_id, pc in list(self._peer_connections.items()):
@@ -494,30 +505,27 @@ class WebRTCAdapter(ProtocolAdapter):
         return ips
 
     async def _relay_video_track(self, track) -> None:
-        """Relay video frames from WebRTC track to frame queue."""
+        """Relay video frames from WebRTC track to the frame slot."""
         try:
             while self._running:
                 try:
                     async for frame in track:
                         if frame is not None:
                             try:
-                                if hasattr(frame, "to_ndarray"):
-                                    img = frame.to_ndarray()
-                                else:
+                                if not hasattr(frame, "to_ndarray"):
                                     continue
+                                if is_planar(self._pixel_format):
+                                    img = frame.to_ndarray(
+                                        format=ffmpeg_pix_fmt(self._pixel_format)
+                                    )
+                                else:
+                                    img = frame.to_ndarray()
 
                                 if img is not None and img.size > 0:
                                     if len(img.shape) == 3 and img.shape[2] == 3:
                                         img = img[:, :, ::-1]
 
-                                    try:
-                                        self._frame_queue.put_nowait(img)
-                                    except queue.Full:
-                                        try:
-                                            self._frame_queue.get_nowait()
-                                            self._frame_queue.put_nowait(img)
-                                        except queue.Empty:
-                                            pass
+                                    self._frame_slot.put(img)
                             except Exception as e:
                                 log.debug(f"Frame processing error: {e}")
                                 continue
@@ -529,13 +537,23 @@ class WebRTCAdapter(ProtocolAdapter):
         except Exception as e:
             log.error(f"Video relay error: {e}")
 
+    @property
+    def frame_slot(self) -> FrameSlot:
+        """
+        Latest-frame channel the decoder blocks on.
+
+        Returns
+        -------
+        FrameSlot
+            Slot receiving every decoded video frame; only the newest
+            uncollected frame is kept
+        """
+        return self._frame_slot
+
     def get_frame(self):
-        """Get the latest video frame from WebRTC stream."""
-        try:
-            return self._frame_queue.get_nowait()
-        except queue.Empty:
-            return None
+        """Get the latest video frame from WebRTC stream without waiting."""
+        return self._frame_slot.get(timeout=0)
 
     def get_stdout(self):
-        """Return None for WebRTC (uses get_frame instead)."""
+        """Return None for WebRTC (frames are delivered via frame_slot)."""
         return None
@@ -3,9 +3,12 @@ HTTP Metadata Server.
 
 - Serves a simple info page with RTMP streaming instructions.
 - Provides a /health diagnostic endpoint.
+- POST /trace?seconds=N captures a Chrome trace of the frame pipeline
+  (loopback clients only: captures write files).
 - No longer handles video frames directly (now handled by FFmpeg RTMP listener).
 """
 import asyncio
+import ipaddress
 import socket
 import logging
 import os
@@ -40,12 +43,32 @@ class StreamServer:
         self._site: web.TCPSite | None = None
         self._local_ips: list[str] = []
         self._protocol_adapter = None
+        self._connection_manager = None
+        self._frame_decoder = None
+        self._virtual_camera = None
+        self._tracer = None
         self._http_port = config.HTTP_PORT
 
     def set_protocol_adapter(self, adapter):
         """Set the active protocol adapter to display correct info."""
         self._protocol_adapter = adapter
 
+    def set_connection_manager(self, manager):
+        """Set the ConnectionManager whose statistics /health reports."""
+        self._connection_manager = manager
+
+    def set_frame_decoder(self, decoder):
+        """Set the FrameDecoder whose statistics /health reports."""
+        self._frame_decoder = decoder
+
+    def set_virtual_camera(self, camera):
+        """Set the VirtualCameraOutput whose statistics /health reports."""
+        self._virtual_camera = camera
+
+    def set_tracer(self, tracer):
+        """Set the PipelineTracer whose stages /health and /trace use."""
+        self._tracer = tracer
+
     def set_http_port(self, port: int):
         """Update the HTTP port (requires restart)."""
         self._http_port = port
@@ -62,6 +85,7 @@ class StreamServer:
         app.router.add_get("/", self._handle_index)
         app.router.add_get("/health", self._handle_health)
         app.router.add_get("/qr", self._handle_qr)
+        app.router.add_post("/trace", self._handle_trace)
         self._app = app
  
         runner = web.AppRunner(app, access_log=log)
@@ -157,12 +181,52 @@ class StreamServer:
             "ips": self._local_ips,
             "http_port": self._http_port,
             "ffmpeg": config.FFMPEG_BIN,
+            "connection": (
+                self._connection_manager.get_stats()
+                if self._connection_manager else None
+            ),
+            "decoder": (
+                self._frame_decoder.get_stats()
+                if self._frame_decoder else None
+            ),
+            "camera": (
+                self._virtual_camera.get_stats()
+                if self._virtual_camera else None
+            ),
+            "tracing": self._tracer.get_stats() if self._tracer else None,
         }
         return web.json_response(info)
 
+    async def _handle_trace(self, request: web.Request) -> web.Response:
+        """Start a pipeline trace capture of ``seconds`` (default 5)."""
+        # The server listens on every interface; only this machine may
+        # start captures, which write files
+        if not self._is_loopback(request.remote):
+            return web.json_response({"error": "only allowed from localhost"}, status=403)
+        if self._tracer is None:
+            return web.json_response({"error": "tracing not available"}, status=503)
+        try:
+            seconds = float(request.query.get("seconds", "5"))
+            path = self._tracer.start_capture(seconds)
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        except RuntimeError as e:
+            return web.json_response({"error": str(e)}, status=409)
+        return web.json_response({"path": path, "seconds": seconds})
 
     # ── helpers ──────────────────────────────────────────
 
+    @staticmethod
+    def _is_loopback(remote: str | None) -> bool:
+        """True if the client address is a loopback address."""
+        try:
+            address = ipaddress.ip_address(remote or "")
+        except ValueError:
+            return False
+        # IPv4 clients of a dual-stack socket appear as ::ffff:a.b.c.d
+        mapped = getattr(address, "ipv4_mapped", None)
+        return (mapped or address).is_loopback
+
     @staticmethod
     def _get_local_ips() -> list[str]:
         """Return all local IPv4 addresses, prioritized: primary, then others, then localhost."""
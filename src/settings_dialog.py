@@ -7,6 +7,7 @@ protocol, ports, video dimensions, and reconnection behavior.
 import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
+from dataclasses import replace
 from typing import Optional, Callable
 
 from .config_manager import AppConfig, ProtocolType, ConfigurationManager
@@ -149,7 +150,10 @@ class SettingsDialog:
         """Validate and save settings."""
         try:
             # Create a new config object from UI variables
-            new_config = AppConfig(
+            # Start from the current config so settings without a widget
+            # (e.g. pixel format) are preserved
+            new_config = replace(
+                self._config,
                 protocol=ProtocolType(self._protocol_var.get()),
                 rtmp_port=int(self._rtmp_port_var.get()),
                 srt_port=int(self._srt_port_var.get()),
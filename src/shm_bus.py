@@ -0,0 +1,504 @@
+"""
+Shared-memory frame bus for consumers in other processes.
+
+A recorder, an OBS script or a QA analyser running next to the app can
+read the decoded frames without decoding the stream a second time or
+copying frames over a socket. ``SharedFrameWriter`` publishes frames into
+a ring of slots in a ``multiprocessing.shared_memory`` block;
+``SharedFrameReader`` attaches to it by name in any process.
+
+Layout (little-endian):
+
+- bus header, 64 bytes: magic, version, slot count, flags (closed), slot
+  capacity in bytes, sequence number of the latest frame (0: none yet),
+  process id of the writer
+- per slot, 64 bytes of header followed by the frame data: seqlock,
+  sequence number, ``time.monotonic()`` timestamp, width, height, pixel
+  format, data size
+
+Every slot is guarded by a seqlock: the writer makes the lock odd, writes
+the frame, then makes it even again. A reader copies the slot and keeps
+the copy only if the lock was even and unchanged around it, and retries
+otherwise. Readers never write to the block, so any number of them can
+read at their own pace without ever blocking the writer; with several
+slots the writer is normally filling a slot other than the latest one.
+
+Integration Notes
+-----------------
+- One writer per bus. A second writer of the same name fails while the
+  first one's process is alive; a block left by a crashed writer is
+  replaced. ``close()`` marks the bus closed before unlinking it; readers
+  see ``closed`` and can attach to a new bus of the same name.
+- ``time.monotonic()`` is system-wide on Windows and Linux, so readers can
+  compare it with their own clock to get the latency.
+- Frames larger than the slot capacity are not published (native
+  resolution above 1080p with the defaults); they are counted.
+- The reader returns frames in a buffer it reuses for the next read
+  unless ``out`` is given.
+- Run ``python -m src.shm_bus [name]`` to watch a bus.
+"""
+
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+
+from . import config
+from .pixel_format import PixelFormat, frame_shape, frame_size
+
+log = logging.getLogger(__name__)
+
+_MAGIC = b"LVCB"
+_VERSION = 1
+_CLOSED = 0x1
+
+# magic, version, slots, flags, slot capacity, latest sequence, writer pid
+_BUS_HEADER = struct.Struct("<4sIIIQQQ")
+# seqlock, sequence, timestamp, width, height, format, data size
+_SLOT_HEADER = struct.Struct("<QQdIIIxxxxQ")
+_HEADER_BYTES = 64
+_LATEST_OFFSET = 24  # latest sequence in the bus header
+_FLAGS_OFFSET = 12
+
+# Format codes stored in slot headers
+_FORMATS = tuple(PixelFormat)
+
+# Serializes the resource tracker workaround in _attach()
+_attach_lock = threading.Lock()
+
+
+def _align(n: int) -> int:
+    return (n + _HEADER_BYTES - 1) // _HEADER_BYTES * _HEADER_BYTES
+
+
+class SharedFrame(NamedTuple):
+    """One frame read from the bus."""
+    sequence: int
+    timestamp: float
+    width: int
+    height: int
+    pixel_format: PixelFormat
+    data: np.ndarray  # shaped as ``frame_shape(pixel_format, width, height)``
+
+
+class SharedFrameWriter:
+    """Publishes frames into a shared-memory ring; never waits for readers."""
+
+    def __init__(
+        self,
+        name: str = config.SHM_BUS_NAME,
+        pixel_format: PixelFormat = PixelFormat.RGB24,
+        max_frame_bytes: int = config.SHM_BUS_MAX_FRAME_BYTES,
+        slots: int = config.SHM_BUS_SLOTS,
+    ):
+        """
+        Create the shared-memory block.
+
+        Parameters
+        ----------
+        name : str
+            Name readers attach to; a block of that name left by a closed
+            or crashed writer is replaced
+        pixel_format : PixelFormat
+            Layout of published frames
+        max_frame_bytes : int
+            Capacity of a slot
+        slots : int
+            Frames kept in the ring, at least 2
+
+        Raises
+        ------
+        ValueError
+            If ``slots`` is below 2 or ``max_frame_bytes`` not positive
+        FileExistsError
+            If a running writer or another program owns a block of that
+            name
+        OSError
+            If the block cannot be created
+        """
+        if slots < 2:
+            raise ValueError("the ring needs at least 2 slots")
+        if max_frame_bytes <= 0:
+            raise ValueError("max_frame_bytes must be positive")
+        self.pixel_format = pixel_format
+        self._slots = slots
+        self._capacity = max_frame_bytes
+        self._stride = _HEADER_BYTES + _align(max_frame_bytes)
+        size = _HEADER_BYTES + slots * self._stride
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            if not _is_abandoned(name):
+                raise FileExistsError(
+                    f"shared memory block {name} is in use by another writer"
+                ) from None
+            log.warning("Replacing stale shared frame bus %s", name)
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._name = name
+        self._buf = self._shm.buf
+        self._data = [
+            np.ndarray(
+                max_frame_bytes, dtype=np.uint8, buffer=self._buf,
+                offset=self._slot_offset(i) + _HEADER_BYTES,
+            )
+            for i in range(slots)
+        ]
+        _BUS_HEADER.pack_into(
+            self._buf, 0, _MAGIC, _VERSION, slots, 0, max_frame_bytes, 0, os.getpid()
+        )
+        self._sequence = 0
+        self._oversize_count = 0
+        self._closed = False
+        log.info(
+            "Shared frame bus %s: %d slots of %.1f MB",
+            name, slots, max_frame_bytes / 1e6,
+        )
+
+    @property
+    def name(self) -> str:
+        """Name readers attach to."""
+        return self._name
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the latest frame, 0 before the first."""
+        return self._sequence
+
+    @property
+    def oversize_count(self) -> int:
+        """Frames not published because they exceed the slot capacity."""
+        return self._oversize_count
+
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None) -> bool:
+        """
+        Publish a frame into the next slot.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            Contiguous frame in ``pixel_format`` layout at any size
+        timestamp : float, optional
+            ``time.monotonic()`` when the frame was read from the decoder
+            pipe, so readers measure its full age; defaults to now
+
+        Returns
+        -------
+        bool
+            False if the bus is closed or the frame does not fit
+        """
+        if self._closed:
+            return False
+        if frame.nbytes > self._capacity:
+            if self._oversize_count == 0:
+                log.warning(
+                    "Frame of %d bytes exceeds the shared frame bus slots (%d bytes)",
+                    frame.nbytes, self._capacity,
+                )
+            self._oversize_count += 1
+            return False
+        width, height = frame_size(self.pixel_format, frame.shape)
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        sequence = self._sequence + 1
+        index = sequence % self._slots
+        offset = self._slot_offset(index)
+        (lock,) = struct.unpack_from("<Q", self._buf, offset)
+        struct.pack_into("<Q", self._buf, offset, lock + 1)  # odd: writing
+        self._data[index][:frame.nbytes] = frame.reshape(-1)
+        _SLOT_HEADER.pack_into(
+            self._buf, offset, lock + 1, sequence, timestamp, width, height,
+            _FORMATS.index(self.pixel_format), frame.nbytes,
+        )
+        struct.pack_into("<Q", self._buf, offset, lock + 2)  # even: complete
+        struct.pack_into("<Q", self._buf, _LATEST_OFFSET, sequence)
+        self._sequence = sequence
+        return True
+
+    def close(self) -> None:
+        """Mark the bus closed for readers and remove it."""
+        if self._closed:
+            return
+        self._closed = True
+        struct.pack_into("<I", self._buf, _FLAGS_OFFSET, _CLOSED)
+        # Views of the buffer must go before the mapping can be closed
+        self._data = []
+        self._buf = None
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        log.info("Shared frame bus %s closed after %d frames", self._name, self._sequence)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the writer for /health.
+
+        Returns
+        -------
+        dict
+            Bus name, frames written and frames too large for a slot
+        """
+        return {
+            "name": self._name,
+            "frames": self._sequence,
+            "oversize": self._oversize_count,
+            "slot_bytes": self._capacity,
+        }
+
+    # ── internal ─────────────────────────────────────────
+
+    def _slot_offset(self, index: int) -> int:
+        return _HEADER_BYTES + index * self._stride
+
+
+class SharedFrameReader:
+    """Reads the latest frame from a bus without ever blocking its writer."""
+
+    # Copies retried before a read gives up on a busy slot
+    _MAX_RETRIES = 8
+    # Sleep between polls in wait_for_frame()
+    _POLL_INTERVAL = 0.001
+
+    def __init__(self, name: str = config.SHM_BUS_NAME):
+        """
+        Attach to a bus.
+
+        Parameters
+        ----------
+        name : str
+            Name the writer was created with
+
+        Raises
+        ------
+        FileNotFoundError
+            If no bus of that name exists
+        ValueError
+            If the block is not a frame bus of this version
+        """
+        self._shm = _attach(name)
+        self._buf = self._shm.buf
+        magic, version, slots, _, capacity, _, _ = _BUS_HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._buf = None
+            self._shm.close()
+            raise ValueError(f"{name} is not a frame bus (version {_VERSION})")
+        self._name = name
+        self._slots = slots
+        self._capacity = capacity
+        self._stride = _HEADER_BYTES + _align(capacity)
+        self._data = [
+            np.ndarray(
+                capacity, dtype=np.uint8, buffer=self._buf,
+                offset=_HEADER_BYTES + i * self._stride + _HEADER_BYTES,
+            )
+            for i in range(slots)
+        ]
+        self._buffer = np.empty(capacity, dtype=np.uint8)
+        self._retries = 0
+
+    @property
+    def name(self) -> str:
+        """Name of the bus."""
+        return self._name
+
+    @property
+    def closed(self) -> bool:
+        """True once the writer closed the bus."""
+        (flags,) = struct.unpack_from("<I", self._buf, _FLAGS_OFFSET)
+        return bool(flags & _CLOSED)
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the latest published frame, 0 before the first."""
+        (sequence,) = struct.unpack_from("<Q", self._buf, _LATEST_OFFSET)
+        return sequence
+
+    @property
+    def retry_count(self) -> int:
+        """Copies discarded because the writer was in the slot."""
+        return self._retries
+
+    def read_latest(self, out: Optional[np.ndarray] = None) -> Optional[SharedFrame]:
+        """
+        Copy the latest frame.
+
+        Parameters
+        ----------
+        out : np.ndarray, optional
+            Contiguous uint8 buffer of at least the frame size to copy
+            into; by default a buffer the reader reuses for every read
+
+        Returns
+        -------
+        SharedFrame or None
+            None before the first frame, or if the writer overtook every
+            retry
+        """
+        buffer = self._buffer if out is None else out.reshape(-1)
+        for _ in range(self._MAX_RETRIES):
+            latest = self.sequence
+            if latest == 0:
+                return None
+            index = latest % self._slots
+            offset = _HEADER_BYTES + index * self._stride
+            (lock, sequence, timestamp, width, height, fmt, nbytes) = (
+                _SLOT_HEADER.unpack_from(self._buf, offset)
+            )
+            if lock % 2 or sequence != latest:
+                # Being rewritten with a newer frame
+                self._retries += 1
+                continue
+            buffer[:nbytes] = self._data[index][:nbytes]
+            (after,) = struct.unpack_from("<Q", self._buf, offset)
+            if after != lock:
+                self._retries += 1
+                continue
+            pixel_format = _FORMATS[fmt]
+            data = buffer[:nbytes].reshape(frame_shape(pixel_format, width, height))
+            return SharedFrame(sequence, timestamp, width, height, pixel_format, data)
+        return None
+
+    def wait_for_frame(
+        self,
+        after: int,
+        timeout: Optional[float] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> Optional[SharedFrame]:
+        """
+        Wait for a frame newer than sequence number ``after`` and copy it.
+
+        Parameters
+        ----------
+        after : int
+            Sequence number of the last frame the caller has seen
+        timeout : float, optional
+            Maximum seconds to wait; None waits until the bus closes
+        out : np.ndarray, optional
+            Buffer to copy into, as for ``read_latest()``
+
+        Returns
+        -------
+        SharedFrame or None
+            None on timeout or when the bus closed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.sequence > after:
+                frame = self.read_latest(out)
+                if frame is not None and frame.sequence > after:
+                    return frame
+            if self.closed:
+                return None
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(self._POLL_INTERVAL)
+
+    def close(self) -> None:
+        """Detach from the bus; the writer keeps it."""
+        if self._buf is None:
+            return
+        self._data = []
+        self._buf = None
+        self._shm.close()
+
+    def __enter__(self) -> "SharedFrameReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach without letting this process's exit remove the block."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    if os.name == "nt":
+        return shared_memory.SharedMemory(name=name)
+    # Before 3.13 attaching registers the block with the resource tracker,
+    # which unlinks it when the reader exits. Unregistering afterwards is
+    # not enough: spawned children share their parent's tracker and would
+    # drop the writer's registration, so the block is never registered.
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _is_abandoned(name: str) -> bool:
+    """True if the block ``name`` is a frame bus whose writer is gone."""
+    try:
+        shm = _attach(name)
+    except FileNotFoundError:
+        # Removed in the meantime
+        return True
+    try:
+        magic, version, _, flags, _, _, pid = _BUS_HEADER.unpack_from(shm.buf, 0)
+    finally:
+        shm.close()
+    if magic != _MAGIC or version != _VERSION:
+        # Not ours to remove
+        return False
+    return bool(flags & _CLOSED) or not _process_alive(pid)
+
+
+def _process_alive(pid: int) -> bool:
+    """True if a process with this id exists."""
+    if os.name == "nt":
+        # Windows removes a block with its last handle, so one that still
+        # exists is held open by a running process
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _watch(name: str) -> None:
+    """Print the rate and latency of a bus once a second."""
+    with SharedFrameReader(name) as reader:
+        print(f"Watching {name} (Ctrl+C to stop)")
+        last, count, lag, started = reader.sequence, 0, 0.0, time.monotonic()
+        while True:
+            frame = reader.wait_for_frame(last, timeout=1.0)
+            if frame is not None:
+                count += 1
+                lag += time.monotonic() - frame.timestamp
+                last = frame.sequence
+                size = f"{frame.width}x{frame.height} {frame.pixel_format.value}"
+            elif reader.closed:
+                print("Bus closed")
+                return
+            elapsed = time.monotonic() - started
+            if elapsed >= 1.0:
+                if count:
+                    print(
+                        f"{size}: {count / elapsed:.1f} fps, "
+                        f"latency {lag / count * 1000:.1f} ms, seq {last}"
+                    )
+                else:
+                    print("no frames")
+                count, lag, started = 0, 0.0, time.monotonic()
+
+
+if __name__ == "__main__":
+    try:
+        _watch(sys.argv[1] if len(sys.argv) > 1 else config.SHM_BUS_NAME)
+    except KeyboardInterrupt:
+        pass
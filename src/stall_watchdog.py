@@ -0,0 +1,240 @@
+"""
+Stall detection driven by frame arrival.
+
+A sender that silently stops sending (Wi-Fi roam, headset asleep) leaves
+FFmpeg waiting on an open connection: nothing reaches stderr and the adapter
+still reports the sender as connected. ``StallWatchdog`` is fed once per
+decoded frame and runs a timer thread that sleeps exactly until the current
+frame's deadline, so a stall is reported a few milliseconds after the
+threshold passes rather than on the next periodic health check.
+
+Integration Notes
+-----------------
+- ``feed()`` runs on the decoder thread for every frame; it stores a
+  timestamp and only signals the timer thread while a stall is active.
+- Callbacks run on the watchdog thread: ``on_stall`` once the threshold
+  passes, ``on_resume`` on the first frame after a stall and ``on_escalate``
+  once if the stall lasts ``escalate_after`` seconds.
+- The watchdog is armed by the first frame after ``start()`` or
+  ``reset()``, so waiting for a sender is not a stall.
+"""
+
+import threading
+import time
+import logging
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+
+class StallPolicy(Enum):
+    """What the virtual camera shows while the sender is stalled."""
+    LAST_FRAME = "last-frame"  # keep repeating the last decoded frame
+    STANDBY = "standby"        # switch to the standby frame
+
+
+class StallWatchdog:
+    """Reports when frames stop arriving for longer than a threshold."""
+
+    def __init__(
+        self,
+        threshold: float,
+        escalate_after: Optional[float] = None,
+        on_stall: Optional[Callable[[float], None]] = None,
+        on_resume: Optional[Callable[[float], None]] = None,
+        on_escalate: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Initialize an idle watchdog.
+
+        Parameters
+        ----------
+        threshold : float
+            Seconds without a frame before the stream counts as stalled,
+            typically a few nominal frame intervals
+        escalate_after : float, optional
+            Seconds without a frame before ``on_escalate`` fires; None
+            disables escalation
+        on_stall : callable, optional
+            Called with the time since the last frame when a stall is
+            detected
+        on_resume : callable, optional
+            Called with the stall's duration when frames arrive again
+        on_escalate : callable, optional
+            Called with the time since the last frame when the stall
+            outlasts ``escalate_after``
+
+        Raises
+        ------
+        ValueError
+            If ``threshold`` is not positive or ``escalate_after`` is below it
+        """
+        if threshold <= 0:
+            raise ValueError("threshold must be positive")
+        if escalate_after is not None and escalate_after < threshold:
+            raise ValueError("escalate_after must not be below threshold")
+        self._threshold = threshold
+        self._escalate_after = escalate_after
+        self._on_stall = on_stall
+        self._on_resume = on_resume
+        self._on_escalate = on_escalate
+
+        self._last_frame: Optional[float] = None  # time.monotonic()
+        self._stalled = False
+        self._stalled_since = 0.0  # last frame before the current stall
+        self._escalated = False
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistics, written by the watchdog thread only
+        self._stall_count = 0
+        self._escalation_count = 0
+        self._last_detection_latency: Optional[float] = None
+        self._last_stall_duration: Optional[float] = None
+
+    @property
+    def threshold(self) -> float:
+        """Seconds without a frame that count as a stall."""
+        return self._threshold
+
+    @property
+    def is_stalled(self) -> bool:
+        """True while a stall is in progress."""
+        return self._stalled
+
+    @property
+    def stall_count(self) -> int:
+        """Stalls detected since creation."""
+        return self._stall_count
+
+    @property
+    def last_detection_latency(self) -> Optional[float]:
+        """Seconds between the last stall's deadline and its detection."""
+        return self._last_detection_latency
+
+    @property
+    def last_stall_duration(self) -> Optional[float]:
+        """Length of the last stall that ended, in seconds."""
+        return self._last_stall_duration
+
+    def start(self) -> None:
+        """Start the watchdog thread; it waits for the first frame."""
+        if self._running:
+            return
+        self.reset()
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="stall-watchdog"
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watchdog thread."""
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def feed(self, timestamp: Optional[float] = None) -> None:
+        """
+        Record a frame arrival.
+
+        Parameters
+        ----------
+        timestamp : float, optional
+            ``time.monotonic()`` of the arrival; defaults to now
+        """
+        first = self._last_frame is None
+        self._last_frame = time.monotonic() if timestamp is None else timestamp
+        if first or self._stalled:
+            self._wake.set()
+
+    def reset(self) -> None:
+        """Disarm until the next frame, without reporting a resume."""
+        self._last_frame = None
+        self._stalled = False
+        self._escalated = False
+        self._wake.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the watchdog for /health.
+
+        Returns
+        -------
+        dict
+            Whether a stall is in progress, the threshold, stall and
+            escalation counts and the last detection latency and stall
+            duration in seconds (or None)
+        """
+        return {
+            "stalled": self._stalled,
+            "threshold": self._threshold,
+            "stalls": self._stall_count,
+            "escalations": self._escalation_count,
+            "last_detection_latency": self._last_detection_latency,
+            "last_stall_duration": self._last_stall_duration,
+        }
+
+    # ── internal ─────────────────────────────────────────
+
+    def _run(self) -> None:
+        """Sleep until the next deadline or frame and act on it."""
+        while self._running:
+            timeout = self._check(time.monotonic())
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def _check(self, now: float) -> Optional[float]:
+        """Update the stall state; return seconds until the next deadline."""
+        last = self._last_frame
+        if last is None:
+            return None  # not armed, wait for the first frame
+
+        silent = now - last
+        if not self._stalled:
+            if silent < self._threshold:
+                return self._threshold - silent
+            self._stalled = True
+            self._stalled_since = last
+            self._stall_count += 1
+            self._last_detection_latency = silent - self._threshold
+            log.warning(
+                "Stream stalled: no frame for %.0f ms (detected %.1f ms "
+                "after the threshold)",
+                silent * 1000,
+                self._last_detection_latency * 1000,
+            )
+            self._notify(self._on_stall, silent)
+
+        elif last > self._stalled_since:
+            duration = last - self._stalled_since
+            self._stalled = False
+            self._escalated = False
+            self._last_stall_duration = duration
+            log.info("Stream resumed after %.0f ms stall", duration * 1000)
+            self._notify(self._on_resume, duration)
+            return self._threshold - (now - last)
+
+        if self._escalate_after is None or self._escalated:
+            return None  # wait for the next frame
+        if silent < self._escalate_after:
+            return self._escalate_after - silent
+        self._escalated = True
+        self._escalation_count += 1
+        log.warning("Stream stalled for %.1f s, escalating", silent)
+        self._notify(self._on_escalate, silent)
+        return None
+
+    @staticmethod
+    def _notify(callback: Optional[Callable[[float], None]], seconds: float) -> None:
+        """Invoke a callback, keeping the watchdog alive if it fails."""
+        if callback is None:
+            return
+        try:
+            callback(seconds)
+        except Exception:
+            log.exception("Stall watchdog callback failed")
@@ -8,6 +8,7 @@ This module provides the integration layer that connects:
 - Protocol adapter callbacks → ConnectionManager state tracking
 - FrameDecoder frame callback → ConnectionManager health monitoring
 - ConnectionManager reconnection trigger → Protocol adapter restart
+- FFmpeg stderr events → ConnectionManager decode error / stream info
 
 Requirements: 1.1, 1.4, 1.6
 """
@@ -18,6 +19,7 @@ from enum import Enum
 
 from .connection_manager import ConnectionManager, ConnectionState, ConnectionHealth
 from .protocols.base import ProtocolAdapter
+from .protocols.ffmpeg_events import FFmpegStderrMonitor
 from .decoder import FrameDecoder
 
 log = logging.getLogger(__name__)
@@ -233,37 +235,39 @@ class StreamingPipeline:
             log.warning("Cannot reconnect: pipeline not running")
             return
         
-        if self._loop is None:
+        if self._loop is None or self._loop.is_closed():
             log.error("Cannot reconnect: no event loop")
             return
         
         # Schedule reconnection in the event loop
-        asyncio.run_coroutine_threadsafe(
-            self._perform_reconnection(),
-            self._loop
-        )
+        coro = self._perform_reconnection()
+        try:
+            asyncio.run_coroutine_threadsafe(coro, self._loop)
+        except RuntimeError as e:
+            # Loop closed meanwhile
+            coro.close()
+            log.error("Cannot reconnect: %s", e)
     
     async def _perform_reconnection(self) -> None:
         """
         Perform the actual reconnection.
         
-        This stops and restarts the protocol adapter and frame decoder.
-        If successful, ConnectionManager will be notified via the on_connect
-        callback.
+        This restarts the protocol adapter and rebinds the frame decoder to
+        it, so the last frame stays on screen meanwhile. If successful,
+        ConnectionManager will be notified via the on_connect callback.
         """
+        if self._protocol_adapter.is_listening is True:
+            # A standby listener took over; the decoder re-attaches by itself
+            log.info("Protocol adapter is listening, skipping reconnection")
+            return
+
         log.info("Performing reconnection...")
         
         try:
-            # Stop current adapter and decoder
-            self._frame_decoder.stop()
+            # Restart the adapter; the decoder follows without a restart
             await self._protocol_adapter.stop()
-            
-            # Small delay before restarting
-            await asyncio.sleep(0.5)
-            
-            # Restart adapter and decoder
             await self._protocol_adapter.start(self._port, self._path)
-            self._frame_decoder.start(self._protocol_adapter)
+            self._frame_decoder.rebind(self._protocol_adapter)
             
             log.info("Reconnection completed successfully")
             
@@ -318,6 +322,11 @@ def create_wired_protocol_adapter(
     adapter._on_connect = on_connect_wrapper
     adapter._on_disconnect = on_disconnect_wrapper
     
+    # FFmpeg-based adapters also report decode errors and stream info
+    monitor = getattr(adapter, 'stderr_monitor', None)
+    if isinstance(monitor, FFmpegStderrMonitor):
+        monitor.subscribe(connection_manager.handle_ffmpeg_event)
+    
     return adapter
 
 
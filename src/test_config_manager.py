@@ -9,6 +9,11 @@ import tempfile
 from pathlib import Path
 
 from src.config_manager import AppConfig, ConfigurationManager, ProtocolType
+from src.pixel_format import PixelFormat
+from src.frame_fitter import FitMode
+from src.ingest_profile import IngestProfile
+from src.video_transform import ScalerProfile, VideoTransform
+from src.stall_watchdog import StallPolicy
 
 
 class TestAppConfig:
@@ -92,6 +97,83 @@ class TestAppConfig:
         
         assert config.protocol == ProtocolType.RTMP
     
+    def test_pixel_format_serialization(self):
+        """Test pixel format is stored by value and invalid values fall back."""
+        config = AppConfig(pixel_format=PixelFormat.NV12)
+        
+        assert config.to_dict()['pixel_format'] == 'nv12'
+        assert AppConfig.from_dict({'pixel_format': 'i420'}).pixel_format == PixelFormat.I420
+        assert AppConfig.from_dict({'pixel_format': 'bogus'}).pixel_format == PixelFormat.RGB24
+        assert AppConfig.from_dict({}).pixel_format == PixelFormat.RGB24
+    
+    def test_ingest_profile_serialization(self):
+        """Test ingest profile is stored by value and invalid values fall back."""
+        config = AppConfig(ingest_profile=IngestProfile.FAST_START)
+        
+        assert config.to_dict()['ingest_profile'] == 'fast-start'
+        assert AppConfig.from_dict({'ingest_profile': 'fast-start'}).ingest_profile == IngestProfile.FAST_START
+        assert AppConfig.from_dict({'ingest_profile': 'bogus'}).ingest_profile == IngestProfile.DEFAULT
+        assert AppConfig.from_dict({}).ingest_profile == IngestProfile.DEFAULT
+    
+    def test_stall_settings_serialization(self):
+        """Test stall settings round-trip and invalid policies fall back."""
+        config = AppConfig(stall_frame_intervals=5.0, stall_policy=StallPolicy.STANDBY)
+        
+        assert config.to_dict()['stall_policy'] == 'standby'
+        assert AppConfig.from_dict(config.to_dict()) == config
+        assert AppConfig.from_dict({'stall_policy': 'bogus'}).stall_policy == StallPolicy.LAST_FRAME
+        assert AppConfig.from_dict({}).stall_reconnect_after == 5.0
+    
+    def test_fit_mode_serialization(self):
+        """Test fit mode is stored by value and invalid values fall back."""
+        config = AppConfig(fit_mode=FitMode.CROP)
+        
+        assert config.to_dict()['fit_mode'] == 'crop'
+        assert AppConfig.from_dict({'fit_mode': 'crop'}).fit_mode == FitMode.CROP
+        assert AppConfig.from_dict({'fit_mode': 'bogus'}).fit_mode == FitMode.LETTERBOX
+    
+    def test_video_transform_serialization(self):
+        """Test the transform round-trips through JSON and bad values fall back."""
+        transform = VideoTransform(crop=(0.1, 0, 0.1, 0), rotation=270, mirror=True)
+        data = json.loads(json.dumps(AppConfig(video_transform=transform).to_dict()))
+        
+        assert AppConfig.from_dict(data).video_transform == transform
+        bad = {'video_transform': {'rotation': 45}}
+        assert AppConfig.from_dict(bad).video_transform == VideoTransform()
+    
+    def test_scaler_profile_serialization(self):
+        """Test the scaler profile is stored by value and defaults to bicubic."""
+        config = AppConfig(scaler_profile=ScalerProfile.FAST_BILINEAR)
+        
+        assert config.to_dict()['scaler_profile'] == 'fast-bilinear'
+        assert AppConfig.from_dict(config.to_dict()).scaler_profile == ScalerProfile.FAST_BILINEAR
+        assert AppConfig.from_dict({'scaler_profile': 'x'}).scaler_profile == ScalerProfile.BICUBIC
+    
+    def test_native_resolution_serialization(self):
+        """Test native resolution is stored and off by default."""
+        config = AppConfig(native_resolution=True)
+        
+        assert config.to_dict()['native_resolution'] is True
+        assert AppConfig.from_dict(config.to_dict()).native_resolution
+        assert not AppConfig.from_dict({}).native_resolution
+    
+    def test_ingest_delay_resync_serialization(self):
+        """Test the ingest delay threshold is stored; None disables resyncs."""
+        assert AppConfig().ingest_delay_resync == 2.0
+        restored = AppConfig.from_dict(AppConfig(ingest_delay_resync=None).to_dict())
+        assert restored.ingest_delay_resync is None
+    
+    def test_shared_memory_bus_serialization(self):
+        """Test the shared memory bus name is stored and off by default."""
+        assert AppConfig().shared_memory_bus is None
+        restored = AppConfig.from_dict(AppConfig(shared_memory_bus="lvc-frames").to_dict())
+        assert restored.shared_memory_bus == "lvc-frames"
+    
+    def test_max_queued_bytes_serialization(self):
+        """Test the latency bound is stored and off by default."""
+        assert AppConfig().max_queued_bytes is None
+        assert AppConfig.from_dict(AppConfig(max_queued_bytes=0).to_dict()).max_queued_bytes == 0
+    
     def test_round_trip_serialization(self):
         """Test that to_dict() and from_dict() are inverses."""
         original = AppConfig(
@@ -210,6 +292,36 @@ class TestConfigurationManager:
         assert is_valid is False
         assert 'SRT port' in error_msg
     
+    def test_validate_ingest_delay_resync(self):
+        """Test validation rejects a non-positive ingest delay threshold."""
+        manager = ConfigurationManager()
+        
+        assert manager.validate(AppConfig(ingest_delay_resync=None))[0] is True
+        is_valid, error_msg = manager.validate(AppConfig(ingest_delay_resync=0))
+        
+        assert is_valid is False
+        assert 'Ingest delay threshold' in error_msg
+    
+    def test_validate_shared_memory_bus(self):
+        """Test validation rejects an empty shared memory bus name."""
+        manager = ConfigurationManager()
+        
+        assert manager.validate(AppConfig(shared_memory_bus="lvc-frames"))[0] is True
+        is_valid, error_msg = manager.validate(AppConfig(shared_memory_bus=""))
+        
+        assert is_valid is False
+        assert 'shared memory bus' in error_msg
+    
+    def test_validate_max_queued_bytes(self):
+        """Test validation rejects a negative latency bound."""
+        manager = ConfigurationManager()
+        
+        assert manager.validate(AppConfig(max_queued_bytes=0))[0] is True
+        is_valid, error_msg = manager.validate(AppConfig(max_queued_bytes=-1))
+        
+        assert is_valid is False
+        assert 'queued bytes' in error_msg
+    
     def test_validate_invalid_http_port(self):
         """Test validation rejects invalid HTTP port."""
         manager = ConfigurationManager()
@@ -268,6 +380,32 @@ class TestConfigurationManager:
         assert is_valid is False
         assert 'FPS' in error_msg
     
+    def test_validate_stall_settings(self):
+        """Test validation rejects a stall threshold below one frame interval."""
+        manager = ConfigurationManager()
+        
+        config = AppConfig(stall_frame_intervals=0.5)
+        is_valid, error_msg = manager.validate(config)
+        assert is_valid is False
+        assert 'Stall threshold' in error_msg
+        
+        config = AppConfig(stall_frame_intervals=30, fps=30, stall_reconnect_after=0.5)
+        is_valid, error_msg = manager.validate(config)
+        assert is_valid is False
+        assert 'reconnect delay' in error_msg
+    
+    def test_validate_planar_format_requires_even_dimensions(self):
+        """Test validation rejects odd dimensions for 4:2:0 formats."""
+        manager = ConfigurationManager()
+        
+        config = AppConfig(pixel_format=PixelFormat.NV12, frame_width=1279)
+        is_valid, error_msg = manager.validate(config)
+        assert is_valid is False
+        assert 'even' in error_msg
+        
+        config = AppConfig(pixel_format=PixelFormat.RGB24, frame_width=1279)
+        assert manager.validate(config) == (True, None)
+    
     def test_save_invalid_config_raises_error(self):
         """Test that saving invalid configuration raises ValueError."""
         with tempfile.TemporaryDirectory() as tmpdir:
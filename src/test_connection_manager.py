@@ -37,3 +37,324 @@ def test_health_monitoring_basics(conn_mgr):
     assert conn_mgr._last_frame_time is None
     conn_mgr.report_frame_received()
     assert conn_mgr._last_frame_time is not None
+
+def test_ffmpeg_events_feed_stats(conn_mgr):
+    from src.protocols.ffmpeg_events import FFmpegEvent, FFmpegEventType, FFmpegProgress
+
+    progress = FFmpegProgress(frame=30, fps=30.0, speed=1.0)
+    conn_mgr.handle_ffmpeg_event(FFmpegEvent(FFmpegEventType.STREAM_INFO, "Stream #0:0: Video: h264"))
+    conn_mgr.handle_ffmpeg_event(FFmpegEvent(FFmpegEventType.DECODE_ERROR, "corrupt frame"))
+    conn_mgr.handle_ffmpeg_event(FFmpegEvent(FFmpegEventType.PROGRESS, "progress=continue", progress=progress))
+
+    stats = conn_mgr.get_stats()
+    assert stats["decode_errors"] == 1
+    assert stats["stream_info"] == "Stream #0:0: Video: h264"
+    assert stats["progress"]["frame"] == 30
+    assert conn_mgr.progress is progress
+
+    conn_mgr.handle_ffmpeg_event(FFmpegEvent(FFmpegEventType.CLOSED, ""))
+    assert conn_mgr.progress is None
+    assert conn_mgr.decode_error_count == 1
+
+
+def test_closed_standby_keeps_stream_info(conn_mgr):
+    from src.protocols.ffmpeg_events import FFmpegEvent, FFmpegEventType
+
+    active, standby = object(), object()
+    conn_mgr.handle_ffmpeg_event(FFmpegEvent(FFmpegEventType.STREAM_INFO, "Stream #0:0: Video: h264", source=active))
+    conn_mgr.handle_ffmpeg_event(FFmpegEvent(FFmpegEventType.CLOSED, "", source=standby))
+    assert conn_mgr.stream_info == "Stream #0:0: Video: h264"
+
+    conn_mgr.handle_ffmpeg_event(FFmpegEvent(FFmpegEventType.CLOSED, "", source=active))
+    assert conn_mgr.stream_info is None
+
+
+def test_parsed_stream_in_stats(conn_mgr):
+    from src.protocols.ffmpeg_events import FFmpegEvent, FFmpegEventType, StreamInfo
+
+    line = "Stream #0:0: Video: h264 (High), yuv420p(progressive), 1920x1080, 30 fps"
+    info = StreamInfo("h264", 1920, 1080, fps=30.0, pix_fmt="yuv420p")
+    conn_mgr.handle_ffmpeg_event(FFmpegEvent(FFmpegEventType.STREAM_INFO, line, stream_info=info))
+
+    assert conn_mgr.stream is info
+    assert conn_mgr.get_stats()["stream"] == info.to_dict()
+
+    conn_mgr.handle_ffmpeg_event(FFmpegEvent(FFmpegEventType.CLOSED, ""))
+    assert conn_mgr.stream is None
+
+
+def progress_event(out_time, timestamp, source=None):
+    from src.protocols.ffmpeg_events import FFmpegEvent, FFmpegEventType, FFmpegProgress
+
+    progress = FFmpegProgress(out_time=out_time, timestamp=timestamp)
+    return FFmpegEvent(FFmpegEventType.PROGRESS, "progress=continue", source=source, progress=progress)
+
+
+def lag_behind(manager, seconds=6):
+    """Report media time advancing at half of real time."""
+    for t in range(seconds + 1):
+        manager.handle_ffmpeg_event(progress_event(0.5 * t, 1000.0 + t))
+
+
+def test_ingest_delay_triggers_resync():
+    import threading
+
+    states = []
+    resynced = threading.Event()
+    manager = ConnectionManager(
+        on_state_change=states.append,
+        on_health_change=lambda h: None,
+        on_resync=lambda: resynced.set() or True,
+        ingest_delay_resync=1.0,
+    )
+    manager.report_connection_established()
+
+    lag_behind(manager)
+
+    assert resynced.wait(1.0)
+    assert manager.current_state == ConnectionState.RESYNCING
+    assert manager.resync_count == 1
+    assert manager.get_stats()["ingest_delay"]["delay"] == pytest.approx(3.0)
+    # The sender reconnecting to the new listener ends the resync
+    manager.report_connection_established()
+    assert states == [
+        ConnectionState.CONNECTED, ConnectionState.RESYNCING, ConnectionState.CONNECTED,
+    ]
+
+
+def test_failed_resync_keeps_connection():
+    import threading
+
+    states = []
+    done = threading.Event()
+
+    def on_state_change(state):
+        states.append(state)
+        if len(states) == 3:
+            done.set()
+
+    manager = ConnectionManager(
+        on_state_change=on_state_change,
+        on_health_change=lambda h: None,
+        on_resync=lambda: False,
+        ingest_delay_resync=1.0,
+    )
+    manager.report_connection_established()
+    lag_behind(manager)
+
+    assert done.wait(1.0)
+    assert states[1:] == [ConnectionState.RESYNCING, ConnectionState.CONNECTED]
+
+
+def test_resync_timeout_counts_as_lost():
+    from unittest.mock import patch
+
+    conn_mgr = ConnectionManager(
+        on_state_change=lambda s: None,
+        on_health_change=lambda h: None,
+        on_resync=lambda: True,
+        ingest_delay_resync=1.0,
+    )
+    conn_mgr.set_auto_reconnect(False)
+    conn_mgr.report_connection_established()
+    lag_behind(conn_mgr)
+    assert conn_mgr.current_state == ConnectionState.RESYNCING
+
+    with patch.object(ConnectionManager, "RESYNC_TIMEOUT", 0.0):
+        conn_mgr._check_resync_timeout()
+
+    assert conn_mgr.current_state == ConnectionState.DISCONNECTED
+
+
+def test_ingest_delay_follows_stream_source(conn_mgr):
+    """Progress of other FFmpeg children does not count; a new sender resets."""
+    from src.protocols.ffmpeg_events import FFmpegEvent, FFmpegEventType
+
+    active, standby = object(), object()
+    conn_mgr.handle_ffmpeg_event(FFmpegEvent(FFmpegEventType.STREAM_INFO, "Stream #0:0: Video: h264", source=active))
+    conn_mgr.handle_ffmpeg_event(progress_event(0.0, 10.0, source=active))
+    conn_mgr.handle_ffmpeg_event(progress_event(0.0, 11.0, source=active))
+    conn_mgr.handle_ffmpeg_event(progress_event(0.0, 20.0, source=standby))
+    assert conn_mgr.ingest_delay == pytest.approx(1.0)
+
+    conn_mgr.handle_ffmpeg_event(FFmpegEvent(FFmpegEventType.STREAM_INFO, "Stream #0:0: Video: h264", source=standby))
+    assert conn_mgr.ingest_delay is None
+
+
+def test_reconnect_not_triggered_when_restored_during_backoff(conn_mgr):
+    import time
+    from unittest.mock import Mock
+
+    trigger = Mock()
+    conn_mgr._on_reconnect_trigger = trigger
+    conn_mgr.BACKOFF_SEQUENCE = [0.2]
+
+    conn_mgr.report_connection_established()
+    conn_mgr.report_connection_lost()
+    time.sleep(0.05)
+    conn_mgr.report_connection_established()  # e.g. warm-standby listener
+    time.sleep(0.4)
+
+    trigger.assert_not_called()
+    assert conn_mgr.current_state == ConnectionState.CONNECTED
+
+
+def feed_frames(conn_mgr, fps, seconds):
+    import time
+    now = time.monotonic()
+    count = int(fps * seconds)
+    for i in range(count):
+        conn_mgr._frame_times.record(now - (count - 1 - i) / fps)
+
+
+@pytest.mark.parametrize("fps, expected", [
+    (30, ConnectionHealth.EXCELLENT),
+    (24, ConnectionHealth.GOOD),
+    (15, ConnectionHealth.POOR),
+    (5, ConnectionHealth.CRITICAL),
+])
+def test_health_follows_measured_fps(conn_mgr, fps, expected):
+    changes = []
+    conn_mgr._on_health_change = changes.append
+    conn_mgr.report_connection_established()
+    feed_frames(conn_mgr, fps, 3)
+
+    conn_mgr._update_health()
+
+    assert conn_mgr.current_health == expected
+    assert conn_mgr.frame_stats().fps == pytest.approx(fps, rel=0.1)
+    assert changes == ([] if expected is ConnectionHealth.CRITICAL else [expected])
+
+
+def test_irregular_intervals_lower_health():
+    from src.frame_stats import FrameStats
+
+    steady = FrameStats(window=2.0, frame_count=60, fps=30, p95_interval=0.034, longest_stall=0.04)
+    bursty = FrameStats(window=2.0, frame_count=60, fps=30, p95_interval=0.1, longest_stall=0.2)
+    stalled = FrameStats(window=2.0, frame_count=60, fps=30, p95_interval=0.034, longest_stall=1.2)
+
+    assert ConnectionManager.classify_health(steady) is ConnectionHealth.EXCELLENT
+    assert ConnectionManager.classify_health(bursty) is ConnectionHealth.GOOD
+    assert ConnectionManager.classify_health(stalled) is ConnectionHealth.CRITICAL
+
+
+def test_frame_stats_reported_and_reset(conn_mgr):
+    conn_mgr.set_auto_reconnect(False)
+    conn_mgr.report_connection_established()
+    for _ in range(5):
+        conn_mgr.report_frame_received()
+
+    frames = conn_mgr.get_stats()["frames"]
+    assert set(frames) == {"2s", "10s"}
+    assert frames["2s"]["frame_count"] == 5
+
+    conn_mgr.report_connection_lost()
+    assert conn_mgr.frame_stats().frame_count == 0
+
+
+def wait_for_state(conn_mgr, state, timeout=2.0):
+    import time
+    deadline = time.monotonic() + timeout
+    while conn_mgr.current_state != state:
+        assert time.monotonic() < deadline, conn_mgr.current_state
+        time.sleep(0.005)
+
+
+def test_stall_and_resume():
+    import time
+    states = []
+    conn_mgr = ConnectionManager(
+        on_state_change=states.append,
+        on_health_change=lambda h: None,
+        stall_threshold=0.05,
+        stall_reconnect_after=None,
+    )
+    conn_mgr.start_monitoring()
+    try:
+        conn_mgr.report_connection_established()
+        conn_mgr.report_frame_received()
+        wait_for_state(conn_mgr, ConnectionState.STALLED, timeout=0.5)
+        assert conn_mgr.is_stalled
+
+        conn_mgr.report_frame_received()
+        wait_for_state(conn_mgr, ConnectionState.CONNECTED, timeout=0.5)
+    finally:
+        conn_mgr.stop_monitoring()
+
+    assert states == [
+        ConnectionState.CONNECTED,
+        ConnectionState.STALLED,
+        ConnectionState.CONNECTED,
+    ]
+    assert conn_mgr.get_stats()["stall"]["stalls"] == 1
+
+
+def test_persistent_stall_triggers_reconnect():
+    from unittest.mock import MagicMock
+    trigger = MagicMock()
+    conn_mgr = ConnectionManager(
+        on_state_change=lambda s: None,
+        on_health_change=lambda h: None,
+        on_reconnect_trigger=trigger,
+        stall_threshold=0.05,
+        stall_reconnect_after=0.2,
+    )
+    conn_mgr.start_monitoring()
+    try:
+        conn_mgr.report_connection_established()
+        conn_mgr.report_frame_received()
+        wait_for_state(conn_mgr, ConnectionState.RECONNECTING, timeout=0.5)
+        trigger.assert_called_once()
+    finally:
+        conn_mgr.stop_monitoring()
+        conn_mgr.set_auto_reconnect(False)
+
+
+def test_stall_escalation_restarts_once_per_backoff_step():
+    import time
+    from unittest.mock import MagicMock
+    trigger = MagicMock()
+    conn_mgr = ConnectionManager(
+        on_state_change=lambda s: None,
+        on_health_change=lambda h: None,
+        on_reconnect_trigger=trigger,
+        stall_threshold=0.05,
+        stall_reconnect_after=0.1,
+    )
+    conn_mgr.BACKOFF_SEQUENCE = [0.3, 0.6]
+    conn_mgr.start_monitoring()
+    try:
+        conn_mgr.report_connection_established()
+        conn_mgr.report_frame_received()
+        wait_for_state(conn_mgr, ConnectionState.RECONNECTING, timeout=0.5)
+        # Past the first backoff step: the fresh listener is left alone
+        time.sleep(0.45)
+        trigger.assert_called_once()
+        assert conn_mgr._reconnect_attempts == 2
+    finally:
+        conn_mgr.stop_monitoring()
+        conn_mgr.set_auto_reconnect(False)
+        conn_mgr.report_connection_established()
+
+
+def test_stall_without_auto_reconnect_stays_stalled():
+    import time
+    trigger = []
+    conn_mgr = ConnectionManager(
+        on_state_change=lambda s: None,
+        on_health_change=lambda h: None,
+        on_reconnect_trigger=lambda: trigger.append(1),
+        stall_threshold=0.05,
+        stall_reconnect_after=0.1,
+    )
+    conn_mgr.set_auto_reconnect(False)
+    conn_mgr.start_monitoring()
+    try:
+        conn_mgr.report_connection_established()
+        conn_mgr.report_frame_received()
+        time.sleep(0.3)
+        assert conn_mgr.current_state == ConnectionState.STALLED
+    finally:
+        conn_mgr.stop_monitoring()
+
+    assert trigger == []
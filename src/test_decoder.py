@@ -6,11 +6,15 @@ of directly managing FFmpeg processes.
 """
 import pytest
 import numpy as np
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
 import subprocess
 import io
+import os
+import threading
+import time
 
 from src.decoder import FrameDecoder
+from src.pixel_format import PixelFormat
 
 
 class TestFrameDecoderWithProtocolAdapter:
@@ -295,5 +299,609 @@ class TestFrameDecoderGracefulDegradation:
         assert decoder.frame_count > 0
 
 
+class ChunkedStream:
+    """Pipe-like stream that returns at most ``chunk`` bytes per read."""
+
+    def __init__(self, data: bytes, chunk: int, fail_at: int = -1):
+        self._data = io.BytesIO(data)
+        self._chunk = chunk
+        self._fail_at = fail_at
+        self.calls = 0
+
+    def _next_call(self):
+        self.calls += 1
+        if self.calls == self._fail_at:
+            raise IOError("Simulated pipe error")
+
+    def read(self, size):
+        self._next_call()
+        return self._data.read(min(size, self._chunk))
+
+    def readinto(self, buf):
+        self._next_call()
+        data = self._data.read(min(len(buf), self._chunk))
+        buf[:len(data)] = data
+        return len(data)
+
+
+class TestFrameDecoderResynchronisation:
+    """Test that partial reads never lose alignment with the rawvideo stream."""
+
+    @staticmethod
+    def _start(decoder, stream):
+        mock_adapter = Mock(spec=["get_stdout"])
+        mock_proc = Mock(spec=subprocess.Popen)
+        mock_proc.stdout = stream
+        mock_proc.stderr = io.BytesIO(b'')
+        mock_adapter.get_stdout.return_value = mock_proc
+        decoder.start(mock_adapter)
+        import time
+        time.sleep(0.2)
+
+    @pytest.mark.parametrize("use_frame_pool", [True, False])
+    def test_partial_reads_are_accumulated(self, use_frame_pool):
+        """Frames split across many short reads should arrive intact."""
+        frames = [np.full((10, 10, 3), i, dtype=np.uint8) for i in range(4)]
+        received = []
+        decoder = FrameDecoder(
+            width=10, height=10,
+            on_frame=lambda f: received.append(f.copy()),
+            use_frame_pool=use_frame_pool,
+        )
+
+        data = b''.join(f.tobytes() for f in frames)
+        self._start(decoder, ChunkedStream(data, chunk=77))
+        decoder.stop()
+
+        assert decoder.frame_count == 4
+        assert decoder.error_count == 0
+        assert decoder.short_read_count > 0
+        for expected, frame in zip(frames, received):
+            np.testing.assert_array_equal(frame, expected)
+
+    def test_truncated_frame_counted_separately_from_eof(self):
+        """A partial frame at end of stream is a truncation, a clean end is not."""
+        error_callback = Mock()
+        decoder = FrameDecoder(width=10, height=10, on_error=error_callback)
+
+        frame = np.ones((10, 10, 3), dtype=np.uint8).tobytes()
+        self._start(decoder, ChunkedStream(frame + frame[:120], chunk=64))
+        decoder.stop()
+
+        assert decoder.frame_count == 1
+        assert decoder.eof_count == 1
+        assert decoder.truncated_frame_count == 1
+        assert error_callback.call_count == 1
+
+        clean = FrameDecoder(width=10, height=10)
+        self._start(clean, ChunkedStream(frame, chunk=64))
+        clean.stop()
+
+        assert clean.eof_count == 1
+        assert clean.truncated_frame_count == 0
+        assert clean.error_count == 0
+
+    def test_error_mid_frame_keeps_alignment(self):
+        """An exception between chunks must not discard the partial frame."""
+        frames = [np.full((10, 10, 3), i + 1, dtype=np.uint8) for i in range(3)]
+        received = []
+        decoder = FrameDecoder(
+            width=10, height=10, on_frame=lambda f: received.append(f.copy())
+        )
+
+        data = b''.join(f.tobytes() for f in frames)
+        self._start(decoder, ChunkedStream(data, chunk=100, fail_at=3))
+        decoder.stop()
+
+        assert decoder.error_count == 1
+        assert decoder.frame_count == 3
+        for expected, frame in zip(frames, received):
+            np.testing.assert_array_equal(frame, expected)
+
+    @pytest.mark.parametrize("pixel_format", [PixelFormat.NV12, PixelFormat.I420])
+    def test_planar_frames(self, pixel_format):
+        """Planar formats should read 1.5 bytes per pixel into 2-D frames."""
+        frames = [np.full((15, 10), i, dtype=np.uint8) for i in range(3)]
+        decoder = FrameDecoder(width=10, height=10, pixel_format=pixel_format)
+
+        data = b''.join(f.tobytes() for f in frames)
+        self._start(decoder, ChunkedStream(data, chunk=64))
+
+        assert decoder.frame_count == 3
+        assert decoder.error_count == 0
+        assert decoder.latest_frame.shape == (15, 10)
+        np.testing.assert_array_equal(decoder.latest_frame, frames[-1])
+
+        decoder.stop()
+
+
+class TestFrameDecoderFrameHandoff:
+    """Test the generation counter and wait_for_frame()."""
+
+    def test_wait_returns_new_frames(self):
+        """wait_for_frame should return as soon as a newer frame exists."""
+        decoder = FrameDecoder(width=10, height=10)
+        assert decoder.frame_generation == 0
+
+        frame = np.ones((10, 10, 3), dtype=np.uint8)
+        decoder._publish_frame(frame)
+
+        generation, latest = decoder.wait_for_frame(0, timeout=1.0)
+        assert generation == 1
+        assert latest is frame
+
+    def test_wait_times_out_without_new_frame(self):
+        """A timed-out wait returns the same generation and the last frame."""
+        decoder = FrameDecoder(width=10, height=10)
+        frame = np.ones((10, 10, 3), dtype=np.uint8)
+        decoder._publish_frame(frame)
+
+        import time
+        t0 = time.monotonic()
+        generation, latest = decoder.wait_for_frame(1, timeout=0.05)
+
+        assert time.monotonic() - t0 >= 0.04
+        assert generation == 1
+        assert latest is frame
+
+    def test_wait_wakes_on_publish(self):
+        """A blocked waiter should wake up when the reader publishes."""
+        import threading
+        decoder = FrameDecoder(width=10, height=10)
+        result = []
+        waiter = threading.Thread(
+            target=lambda: result.append(decoder.wait_for_frame(0, timeout=2.0))
+        )
+        waiter.start()
+
+        decoder._publish_frame(np.zeros((10, 10, 3), dtype=np.uint8))
+        waiter.join(timeout=1.0)
+
+        assert not waiter.is_alive()
+        assert result[0][0] == 1
+
+
+class TestFrameDecoderFirstFrameTiming:
+    """Test the time-to-first-frame metric."""
+
+    def test_timing_uses_adapter_timestamps(self):
+        """since_listen/since_connect should use the adapter's timestamps."""
+        import time
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        adapter = Mock(spec=["get_stdout", "listen_started_at", "connected_at"])
+        proc = Mock(spec=subprocess.Popen)
+        proc.stdout = io.BytesIO(frame.tobytes() * 2)
+        proc.stderr = io.BytesIO(b'')
+        adapter.get_stdout.return_value = proc
+        adapter.listen_started_at = time.monotonic() - 2.0
+        adapter.connected_at = time.monotonic() - 0.5
+
+        decoder = FrameDecoder(width=10, height=10)
+        assert decoder.first_frame_timing is None
+        decoder.start(adapter)
+        decoder.wait_for_frame(0, timeout=1.0)
+        timing = decoder.first_frame_timing
+        decoder.stop()
+
+        assert timing.since_listen == pytest.approx(2.0, abs=0.3)
+        assert timing.since_connect == pytest.approx(0.5, abs=0.3)
+        assert timing.since_start < timing.since_connect
+
+    def test_timing_without_adapter_timestamps(self):
+        """Adapters without timestamps only get since_start."""
+        decoder = FrameDecoder(width=10, height=10)
+        decoder._publish_frame(np.zeros((10, 10, 3), dtype=np.uint8))
+
+        timing = decoder.first_frame_timing
+        assert timing.since_listen is None
+        assert timing.since_connect is None
+
+
+class TestFrameDecoderReattach:
+    """Test re-attaching to the adapter's next FFmpeg process."""
+
+    def test_reader_follows_handed_over_process(self):
+        """A new process after end of stream should be read by the same thread."""
+        from src.protocols.ffmpeg_events import FFmpegStderrMonitor
+
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        first = Mock(spec=subprocess.Popen)
+        first.stdout = io.BytesIO(frame.tobytes() * 2)
+        second = Mock(spec=subprocess.Popen)
+        second.stdout = io.BytesIO((frame + 1).tobytes())
+        handed_over = []
+
+        def wait_for_process(previous, timeout=None):
+            if previous is first and not handed_over:
+                handed_over.append(second)
+                return second
+            return None
+
+        adapter = Mock(spec=["get_stdout", "stderr_monitor", "wait_for_process"])
+        adapter.get_stdout.return_value = first
+        adapter.stderr_monitor = FFmpegStderrMonitor()
+        adapter.wait_for_process.side_effect = wait_for_process
+
+        decoder = FrameDecoder(width=10, height=10)
+        decoder.start(adapter)
+        generation, latest = decoder.wait_for_frame(2, timeout=1.0)
+        thread = decoder._reader_thread
+        decoder.stop()
+
+        assert generation == 3
+        assert latest[0, 0, 0] == 1
+        assert decoder.reattach_count == 1
+        assert decoder.eof_count == 2
+        assert not thread.is_alive()
+
+    def test_reader_exits_without_hand_over_support(self):
+        """Adapters without wait_for_process keep the old end-of-stream exit."""
+        adapter = Mock(spec=["get_stdout"])
+        proc = Mock(spec=subprocess.Popen)
+        proc.stdout = io.BytesIO(b"")
+        proc.stderr = io.BytesIO(b"")
+        adapter.get_stdout.return_value = proc
+
+        decoder = FrameDecoder(width=10, height=10)
+        decoder.start(adapter)
+        decoder._reader_thread.join(timeout=1.0)
+
+        assert not decoder._reader_thread.is_alive()
+        assert decoder.reattach_count == 0
+        decoder.stop()
+
+
+class TestFrameDecoderRebind:
+    """Test rebind() onto a restarted adapter."""
+
+    @staticmethod
+    def make_adapter(data, hand_over=False):
+        from src.protocols.ffmpeg_events import FFmpegStderrMonitor
+
+        spec = ["get_stdout"]
+        if hand_over:
+            spec += ["stderr_monitor", "wait_for_process"]
+        adapter = Mock(spec=spec)
+        proc = Mock(spec=subprocess.Popen)
+        proc.stdout = io.BytesIO(data)
+        proc.stderr = io.BytesIO(b"")
+        adapter.get_stdout.return_value = proc
+        if hand_over:
+            adapter.stderr_monitor = FFmpegStderrMonitor()
+            adapter.wait_for_process.side_effect = (
+                lambda previous, timeout=None: time.sleep(timeout)
+            )
+        return adapter
+
+    def test_rebind_reuses_waiting_reader(self):
+        """A reader waiting for the next process should switch adapters."""
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        first = self.make_adapter(frame.tobytes(), hand_over=True)
+        second = self.make_adapter((frame + 7).tobytes(), hand_over=True)
+
+        decoder = FrameDecoder(width=10, height=10)
+        decoder.start(first)
+        generation, _ = decoder.wait_for_frame(0, timeout=1.0)
+        reader = decoder._reader_thread
+        pool = decoder.frame_pool
+
+        decoder.rebind(second)
+        # The last frame stays available while the new stream starts
+        assert decoder.latest_frame is not None
+        generation, latest = decoder.wait_for_frame(generation, timeout=1.0)
+
+        assert latest[0, 0, 0] == 7
+        assert decoder._reader_thread is reader
+        assert decoder.frame_pool is pool
+        assert decoder.downtime_count == 1
+        assert decoder.last_downtime > 0
+        assert first.stderr_monitor._subscribers == ()
+        assert len(second.stderr_monitor._subscribers) == 1
+        decoder.stop()
+        assert not reader.is_alive()
+
+    def test_rebind_restarts_finished_reader(self):
+        """If the reader ended with its stream, rebind() starts a new one."""
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        first = self.make_adapter(frame.tobytes())
+        decoder = FrameDecoder(width=10, height=10)
+        decoder.start(first)
+        decoder.wait_for_frame(0, timeout=1.0)
+        decoder._reader_thread.join(timeout=1.0)
+
+        decoder.rebind(self.make_adapter((frame + 3).tobytes()))
+        generation, latest = decoder.wait_for_frame(1, timeout=1.0)
+        stats = decoder.get_stats()
+        decoder.stop()
+
+        assert generation == 2
+        assert latest[0, 0, 0] == 3
+        assert stats["downtimes"] == 1
+        assert stats["eof"] == 2
+
+    def test_rebind_starts_stopped_decoder(self):
+        """rebind() on a decoder that is not running behaves like start()."""
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        decoder = FrameDecoder(width=10, height=10)
+        decoder.rebind(self.make_adapter(frame.tobytes()))
+        generation, _ = decoder.wait_for_frame(0, timeout=1.0)
+        decoder.stop()
+
+        assert generation == 1
+        assert decoder.last_downtime is None
+
+
+class TestFrameDecoderNativeResolution:
+    """Test resizing to the output format FFmpeg reports per process."""
+
+    @staticmethod
+    def output_info(proc, width, height):
+        from src.protocols.ffmpeg_events import (
+            FFmpegEvent,
+            FFmpegEventType,
+            StreamInfo,
+        )
+
+        return FFmpegEvent(
+            FFmpegEventType.OUTPUT_INFO,
+            "Stream #0:0: Video: rawvideo",
+            source=proc,
+            stream_info=StreamInfo("rawvideo", width, height, pix_fmt="rgb24"),
+        )
+
+    @staticmethod
+    def make_adapter(first, second):
+        from src.protocols.ffmpeg_events import FFmpegStderrMonitor
+
+        handed_over = []
+
+        def wait_for_process(previous, timeout=None):
+            if previous is first and not handed_over:
+                handed_over.append(second)
+                return second
+            time.sleep(timeout)
+            return None
+
+        adapter = Mock(spec=["get_stdout", "stderr_monitor", "wait_for_process"])
+        adapter.get_stdout.return_value = first
+        adapter.stderr_monitor = FFmpegStderrMonitor()
+        adapter.wait_for_process.side_effect = wait_for_process
+        return adapter
+
+    def test_reader_resizes_per_process(self):
+        """Each process is read at the size FFmpeg reported for it."""
+        first = Mock(spec=subprocess.Popen)
+        first.stdout = io.BytesIO(np.full((4, 6, 3), 1, np.uint8).tobytes())
+        second = Mock(spec=subprocess.Popen)
+        second.stdout = io.BytesIO(np.full((8, 10, 3), 2, np.uint8).tobytes())
+        adapter = self.make_adapter(first, second)
+
+        decoder = FrameDecoder(width=10, height=10, native_resolution=True)
+        decoder.start(adapter)
+        # Nothing is read before the format is known
+        assert decoder.wait_for_frame(0, timeout=0.2)[0] == 0
+
+        adapter.stderr_monitor._dispatch(self.output_info(first, 6, 4))
+        generation, latest = decoder.wait_for_frame(0, timeout=1.0)
+        assert latest.shape == (4, 6, 3)
+
+        adapter.stderr_monitor._dispatch(self.output_info(second, 10, 8))
+        generation, latest = decoder.wait_for_frame(generation, timeout=1.0)
+        stats = decoder.get_stats()
+        decoder.stop()
+
+        assert latest.shape == (8, 10, 3)
+        assert latest[0, 0, 0] == 2
+        assert decoder.frame_pool.shape == (8, 10, 3)
+        assert stats["frame_size"] == "10x8"
+        assert stats["resizes"] == 2
+
+    def test_process_closed_without_format_is_skipped(self):
+        """A listener that exits before its output starts counts as EOF."""
+        from src.protocols.ffmpeg_events import FFmpegEvent, FFmpegEventType
+
+        first = Mock(spec=subprocess.Popen)
+        first.stdout = io.BytesIO(b"")
+        second = Mock(spec=subprocess.Popen)
+        second.stdout = io.BytesIO(np.zeros((10, 10, 3), np.uint8).tobytes())
+        adapter = self.make_adapter(first, second)
+
+        decoder = FrameDecoder(width=10, height=10, native_resolution=True)
+        decoder.start(adapter)
+        adapter.stderr_monitor._dispatch(
+            FFmpegEvent(FFmpegEventType.CLOSED, "", source=first)
+        )
+        adapter.stderr_monitor._dispatch(self.output_info(second, 10, 10))
+        generation, _ = decoder.wait_for_frame(0, timeout=1.0)
+        decoder.stop()
+
+        assert generation == 1
+        assert decoder.resize_count == 0
+        assert decoder.reattach_count == 1
+
+
+class TestFrameDecoderSubscribers:
+    """Test subscribe() and per-subscriber stats."""
+
+    def test_subscribers_receive_frames(self):
+        from src.frame_subscribers import DeliveryMode
+        decoder = FrameDecoder(width=10, height=10)
+        inline, threaded = [], []
+        done = threading.Event()
+        decoder.subscribe(inline.append, name="inline")
+        sub = decoder.subscribe(
+            lambda f: threaded.append(f) or done.set(),
+            DeliveryMode.THREADED, name="threaded",
+        )
+
+        frame = np.ones((10, 10, 3), dtype=np.uint8)
+        decoder._publish_frame(frame)
+
+        assert done.wait(1.0)
+        assert inline[0] is frame and threaded[0] is frame
+        stats = decoder.get_stats()["subscribers"]
+        assert set(stats) == {"inline", "threaded"}
+        assert stats["threaded"]["delivered"] == 1
+
+        decoder.unsubscribe(sub)
+        decoder._publish_frame(frame)
+        assert len(inline) == 2 and len(threaded) == 1
+        assert [s.name for s in decoder.subscribers] == ["inline"]
+
+    def test_failing_subscriber_does_not_count_as_decode_error(self):
+        decoder = FrameDecoder(width=10, height=10)
+        sub = decoder.subscribe(lambda f: 1 / 0)
+
+        decoder._publish_frame(np.ones((10, 10, 3), dtype=np.uint8))
+
+        assert sub.error_count == 1
+        assert decoder.error_count == 0
+
+
+class TestFrameDecoderBoundedLatency:
+    """Test reading over frames that queued up in the pipe."""
+
+    @staticmethod
+    def make_adapter(frames):
+        """Adapter whose pipe already holds ``frames``, then ends."""
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"".join(f.tobytes() for f in frames))
+        os.close(write_fd)
+        proc = Mock(spec=subprocess.Popen)
+        proc.stdout = os.fdopen(read_fd, "rb")
+        proc.stderr = io.BytesIO(b"")
+        adapter = Mock(spec=["get_stdout"])
+        adapter.get_stdout.return_value = proc
+        return adapter
+
+    @staticmethod
+    def run(decoder, adapter):
+        decoder.start(adapter)
+        decoder._reader_thread.join(timeout=1.0)
+        adapter.get_stdout().stdout.close()
+        published = decoder.frame_generation
+        latest = decoder.latest_frame
+        decoder.stop()
+        return published, latest
+
+    frames = [np.full((10, 10, 3), value, dtype=np.uint8) for value in (1, 2, 3)]
+
+    def test_reads_through_to_newest_frame(self):
+        decoder = FrameDecoder(width=10, height=10, max_queued_bytes=0)
+        published, latest = self.run(decoder, self.make_adapter(self.frames))
+
+        assert published == 1
+        assert latest[0, 0, 0] == 3
+        assert decoder.drained_frame_count == 2
+        assert decoder.get_stats()["drained"] == 2
+
+    def test_backlog_up_to_bound_is_kept(self):
+        """Only the backlog above max_queued_bytes is skipped."""
+        decoder = FrameDecoder(width=10, height=10, max_queued_bytes=300)
+        published, latest = self.run(decoder, self.make_adapter(self.frames))
+
+        assert published == 2
+        assert latest[0, 0, 0] == 3
+        assert decoder.drained_frame_count == 1
+
+    def test_in_order_by_default(self):
+        decoder = FrameDecoder(width=10, height=10)
+        published, _ = self.run(decoder, self.make_adapter(self.frames))
+
+        assert published == 3
+        assert decoder.drained_frame_count == 0
+
+    def test_drained_frames_leave_sequence_gaps(self):
+        decoder = FrameDecoder(width=10, height=10, max_queued_bytes=0)
+        envelopes = []
+        decoder.subscribe(lambda f: envelopes.append(decoder.latest_envelope))
+        self.run(decoder, self.make_adapter(self.frames))
+
+        assert [e.sequence for e in envelopes] == [3]
+        assert decoder.get_stats()["sequence"] == 3
+
+    def test_publishes_while_backlog_never_empties(self):
+        """A reader that stays behind still publishes every few frames."""
+        frames = [np.full((10, 10, 3), value, dtype=np.uint8) for value in range(1, 11)]
+        decoder = FrameDecoder(width=10, height=10, max_queued_bytes=0)
+        published = []
+        decoder.subscribe(lambda f: published.append(int(f[0, 0, 0])))
+
+        with patch("src.decoder.config.MAX_DRAINED_FRAMES", 3):
+            self.run(decoder, self.make_adapter(frames))
+
+        # Frames 1-9 each have a newer one queued behind them
+        assert published == [4, 8, 10]
+        assert decoder.drained_frame_count == 7
+
+
+class TestFrameDecoderEnvelopes:
+    """Test the metadata published with every frame."""
+
+    def test_latest_envelope(self):
+        decoder = FrameDecoder(width=10, height=10)
+        assert decoder.latest_envelope is None
+
+        frame = np.ones((10, 10, 3), dtype=np.uint8)
+        before = time.monotonic()
+        decoder._publish_frame(frame)
+        decoder._publish_frame(frame, pts=0.5)
+
+        envelope = decoder.latest_envelope
+        assert envelope.frame is frame
+        assert decoder.latest_frame is frame
+        assert envelope.sequence == 2
+        assert envelope.pts == 0.5
+        assert before <= envelope.read_at <= time.monotonic()
+        assert envelope.age() >= 0
+
+        generation, waited = decoder.wait_for_envelope(1, timeout=0.01)
+        assert generation == 2
+        assert waited is envelope
+
+    def test_pts_follows_output_frame_rate(self):
+        """Timestamps come from FFmpeg's output rate, per session."""
+        from src.protocols.ffmpeg_events import FFmpegEvent, FFmpegEventType, StreamInfo
+        frames = [np.full((10, 10, 3), v, dtype=np.uint8) for v in (1, 2, 3)]
+        adapter = TestFrameDecoderBoundedLatency.make_adapter(frames)
+        decoder = FrameDecoder(width=10, height=10)
+        decoder._on_ffmpeg_event(FFmpegEvent(
+            FFmpegEventType.OUTPUT_INFO, "Stream #0:0: Video: rawvideo",
+            source=adapter.get_stdout(),
+            stream_info=StreamInfo("rawvideo", 10, 10, fps=25.0, pix_fmt="rgb24"),
+        ))
+        envelopes = []
+        decoder.subscribe(lambda f: envelopes.append(decoder.latest_envelope))
+        TestFrameDecoderBoundedLatency.run(decoder, adapter)
+
+        assert [e.pts for e in envelopes] == pytest.approx([0.0, 0.04, 0.08])
+        assert {e.session for e in envelopes} == {1}
+
+    def test_tracer_records_reader_stages(self):
+        from src.tracing import PipelineTracer
+        frames = [np.zeros((10, 10, 3), dtype=np.uint8)] * 2
+        tracer = PipelineTracer()
+        decoder = FrameDecoder(width=10, height=10, tracer=tracer)
+        TestFrameDecoderBoundedLatency.run(
+            decoder, TestFrameDecoderBoundedLatency.make_adapter(frames)
+        )
+
+        stages = tracer.get_stats()["stages"]
+        assert {name: s["count"] for name, s in stages.items()} == {
+            "pipe_wait": 2, "pipe_read": 2, "publish": 2,
+        }
+
+    def test_pts_unknown_without_output_rate(self):
+        frames = [np.zeros((10, 10, 3), dtype=np.uint8)]
+        decoder = FrameDecoder(width=10, height=10)
+        envelopes = []
+        decoder.subscribe(lambda f: envelopes.append(decoder.latest_envelope))
+        TestFrameDecoderBoundedLatency.run(
+            decoder, TestFrameDecoderBoundedLatency.make_adapter(frames)
+        )
+
+        assert envelopes[0].pts is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,327 @@
+"""
+Unit tests for FFmpegStderrMonitor line parsing and event fan-out.
+"""
+import io
+import subprocess
+import time
+import pytest
+import numpy as np
+from unittest.mock import Mock
+
+from src.protocols.ffmpeg_events import (
+    FFmpegEventType,
+    FFmpegStderrMonitor,
+    StreamInfo,
+    parse_stream_info,
+)
+from src.decoder import FrameDecoder
+
+# stderr of an FFmpeg 7 RTMP listener receiving a short stream
+RTMP_SESSION = b"""\
+Input #0, flv, from 'rtmp://0.0.0.0:2935/live/stream':
+  Metadata:
+    encoder         : Lavf61.1.100
+  Stream #0:0: Video: h264 (Constrained Baseline), yuv420p(progressive), 320x240, 30 fps, 30 tbr, 1k tbn
+Stream mapping:
+  Stream #0:0 -> #0:0 (h264 (native) -> rawvideo (native))
+Output #0, rawvideo, to 'pipe:1':
+  Stream #0:0: Video: rawvideo (RGB[24] / 0x18424752), rgb24, 320x240, 30 fps, 30 tbn
+[h264 @ 0x1] corrupt decoded frame in POC 12
+frame=31
+fps=0.00
+stream_0_0_q=-0.0
+bitrate=52767.1kbits/s
+total_size=6815744
+out_time_us=1033333
+out_time_ms=1033333
+out_time=00:00:01.033333
+dup_frames=0
+drop_frames=0
+speed=2.07x
+progress=continue
+[in#0/flv @ 0x2] Error during demuxing: Input/output error
+frame=   60 fps=0.0 q=-0.0 Lsize=   13500KiB time=00:00:02.00 bitrate=55296.0kbits/s speed=46.2x
+"""
+
+
+def progress_block(frame, dup=0, drop=0, end=False):
+    return (
+        f"frame={frame}\nfps=30.00\nbitrate=N/A\ntotal_size=N/A\n"
+        f"out_time_us={frame * 33333}\ndup_frames={dup}\ndrop_frames={drop}\n"
+        f"speed=1.00x\nprogress={'end' if end else 'continue'}\n"
+    ).encode()
+
+
+def run_monitor(data: bytes, connect_markers=()):
+    monitor = FFmpegStderrMonitor(connect_markers=connect_markers)
+    events = []
+    monitor.subscribe(events.append)
+    monitor.run(io.BytesIO(data))
+    return monitor, events
+
+
+class TestFFmpegStderrMonitor:
+    """Test parsing and dispatch."""
+
+    def test_parses_rtmp_session(self):
+        """Each line should be classified once, ending with CLOSED."""
+        monitor, events = run_monitor(RTMP_SESSION)
+        types = [e.type for e in events]
+
+        stream = [e for e in events if e.type is FFmpegEventType.STREAM_INFO]
+        assert len(stream) == 1
+        assert "h264" in stream[0].line
+        assert FFmpegEventType.DECODE_ERROR in types
+        assert FFmpegEventType.DISCONNECTED in types
+        assert FFmpegEventType.PROGRESS in types
+        assert types[-1] is FFmpegEventType.CLOSED
+        # The human-readable summary line is not a progress report
+        assert types.count(FFmpegEventType.PROGRESS) == 1
+
+    def test_parses_stream_descriptions(self):
+        """Input and output stream lines carry their parsed format."""
+        _, events = run_monitor(RTMP_SESSION)
+
+        (stream,) = [e for e in events if e.type is FFmpegEventType.STREAM_INFO]
+        (output,) = [e for e in events if e.type is FFmpegEventType.OUTPUT_INFO]
+        assert stream.stream_info == StreamInfo("h264", 320, 240, 30.0, "yuv420p")
+        assert output.stream_info == StreamInfo("rawvideo", 320, 240, 30.0, "rgb24")
+
+    @pytest.mark.parametrize("line,expected", [
+        (
+            "Stream #0:0: Video: hevc (Main), yuv420p(tv, bt709), 2532x1170, 59.94 fps, 60 tbr, 1k tbn",
+            StreamInfo("hevc", 2532, 1170, 59.94, "yuv420p"),
+        ),
+        (
+            "Stream #0:0: Video: rawvideo (NV12 / 0x3231564E), nv12(progressive), 1280x720, q=2-31, 30 tbn",
+            StreamInfo("rawvideo", 1280, 720, None, "nv12"),
+        ),
+        (
+            "Stream #0:0: Video: h264, 1 reference frame, yuv420p(left), 1920x1080, 25k tbr",
+            StreamInfo("h264", 1920, 1080, 25000.0, "yuv420p"),
+        ),
+        ("Stream #0:1: Audio: aac (LC), 48000 Hz, stereo, fltp", None),
+    ])
+    def test_parse_stream_info(self, line, expected):
+        assert parse_stream_info(line) == expected
+
+    def test_parses_progress_block(self):
+        """A -progress block should become one PROGRESS event."""
+        monitor, events = run_monitor(RTMP_SESSION)
+        progress = [e for e in events if e.type is FFmpegEventType.PROGRESS][0].progress
+
+        assert progress.frame == 31
+        assert progress.speed == pytest.approx(2.07)
+        assert progress.bitrate_kbps == pytest.approx(52767.1)
+        assert progress.out_time == pytest.approx(1.033333)
+        assert progress.total_size == 6815744
+        assert progress.dup_frames == 0
+        assert not progress.ended
+        assert monitor.progress is progress
+
+    def test_progress_not_available_fields(self):
+        """N/A values should parse as None, 'end' should mark the last report."""
+        _, events = run_monitor(progress_block(10, end=True))
+        progress = events[0].progress
+
+        assert progress.bitrate_kbps is None
+        assert progress.total_size == 0
+        assert progress.ended
+
+    def test_input_fps_between_reports(self):
+        """input_fps should count received frames between two reports."""
+        monitor = FFmpegStderrMonitor()
+        events = []
+        monitor.subscribe(events.append)
+
+        class SlowStream:
+            def __init__(self, blocks):
+                self._lines = [l + b"\n" for b in blocks for l in b.splitlines()]
+
+            def readline(self):
+                if not self._lines:
+                    return b""
+                line = self._lines.pop(0)
+                if line.startswith(b"progress="):
+                    time.sleep(0.1)
+                return line
+
+        # 30 frames written, 5 of them duplicates and 2 dropped -> 27 received
+        monitor.run(SlowStream([progress_block(0), progress_block(30, dup=5, drop=2)]))
+        second = [e.progress for e in events if e.progress][1]
+
+        assert second.input_fps == pytest.approx(27 / 0.1, rel=0.3)
+
+    def test_connect_markers(self):
+        """Protocol-specific markers should produce CONNECTED events."""
+        _, events = run_monitor(b"SRT CONNECTED\n", connect_markers=("SRT CONNECTED",))
+        assert events[0].type is FFmpegEventType.CONNECTED
+
+    def test_disconnect_wins_over_connect_marker(self):
+        """A disconnect line must not be mistaken for a connect."""
+        _, events = run_monitor(b"connection closed\n", connect_markers=("connect",))
+        assert events[0].type is FFmpegEventType.DISCONNECTED
+
+    def test_unsubscribe(self):
+        """Unsubscribed callbacks should receive no further events."""
+        monitor = FFmpegStderrMonitor()
+        callback = Mock()
+        unsubscribe = monitor.subscribe(callback)
+        unsubscribe()
+
+        monitor.run(io.BytesIO(b"hello\n"))
+        callback.assert_not_called()
+
+    def test_failing_subscriber_is_isolated(self):
+        """One subscriber raising must not starve the others."""
+        monitor = FFmpegStderrMonitor()
+        events = []
+        monitor.subscribe(Mock(side_effect=RuntimeError("boom")))
+        monitor.subscribe(events.append)
+
+        monitor.run(io.BytesIO(b"hello\n"))
+        assert [e.type for e in events] == [FFmpegEventType.LOG, FFmpegEventType.CLOSED]
+
+    def test_monitor_can_run_again(self):
+        """Subscriptions should survive across FFmpeg processes."""
+        monitor = FFmpegStderrMonitor()
+        events = []
+        monitor.subscribe(events.append)
+
+        monitor.run(io.BytesIO(b"first\n"))
+        monitor.run(io.BytesIO(b"second\n"))
+        assert [e.line for e in events if e.type is FFmpegEventType.LOG] == [
+            "first", "second"
+        ]
+
+    def test_concurrent_runs_keep_separate_state(self):
+        """A standby child's run must not see the active child's parser state."""
+        import threading
+
+        monitor = FFmpegStderrMonitor()
+        events = []
+        monitor.subscribe(events.append)
+        in_output = threading.Event()
+        standby_done = threading.Event()
+
+        class ActiveStream:
+            lines = [b"Output #0, rawvideo, to 'pipe:1':\n", b""]
+
+            def readline(self):
+                line = self.lines.pop(0)
+                if not line:
+                    in_output.set()
+                    standby_done.wait(1.0)
+                return line
+
+        active, standby = object(), object()
+        thread = threading.Thread(target=monitor.run, args=(ActiveStream(), active))
+        thread.start()
+        in_output.wait(1.0)
+        monitor.run(io.BytesIO(b"  Stream #0:0: Video: h264, 1280x720\n"), standby)
+        standby_done.set()
+        thread.join(1.0)
+
+        stream = [e for e in events if e.type is FFmpegEventType.STREAM_INFO]
+        assert [e.source for e in stream] == [standby]
+        closed = [e.source for e in events if e.type is FFmpegEventType.CLOSED]
+        assert closed == [standby, active]
+
+    def test_stop_ends_run(self):
+        """stop() should end run() even if the stream never reaches EOF."""
+        monitor = FFmpegStderrMonitor()
+        stream = Mock()
+        stream.readline = Mock(return_value=b"line\n")
+        monitor.subscribe(lambda event: monitor.stop())
+
+        monitor.run(stream)
+        assert monitor.line_count == 1
+
+    def test_stop_is_per_run(self):
+        """Stopping one child's run must not end or be undone by another run."""
+        import threading
+
+        monitor = FFmpegStderrMonitor()
+        closed = []
+        monitor.subscribe(
+            lambda e: closed.append(e.source) if e.type is FFmpegEventType.CLOSED else None
+        )
+        old_read = threading.Event()
+        new_started = threading.Event()
+        new_lines = threading.Event()
+
+        class OldStream:
+            """Stopped child: blocks in readline until a new run has started."""
+            calls = 0
+
+            def readline(self):
+                self.calls += 1
+                if self.calls == 1:
+                    return b"first\n"
+                old_read.set()
+                new_started.wait(1.0)
+                return b"still open\n"
+
+        class NewStream:
+            """Overlapping child: keeps producing lines after the stop."""
+            lines = [b"a\n", b"b\n", b"c\n", b""]
+
+            def readline(self):
+                new_started.set()
+                new_lines.wait(1.0)
+                return self.lines.pop(0)
+
+        old, new = object(), object()
+        old_thread = threading.Thread(
+            target=monitor.run, args=(OldStream(), old), daemon=True
+        )
+        old_thread.start()
+        assert old_read.wait(1.0)
+        monitor.stop(old)
+        new_thread = threading.Thread(
+            target=monitor.run, args=(NewStream(), new), daemon=True
+        )
+        new_thread.start()
+        old_thread.join(1.0)
+
+        # The new run did not clear the old run's stop request...
+        assert not old_thread.is_alive()
+        assert closed == [old]
+        # ...and the old run's stop did not end the new run
+        new_lines.set()
+        new_thread.join(1.0)
+        assert closed == [old, new]
+        assert monitor.line_count == 4
+
+
+class TestFrameDecoderStderrSubscription:
+    """Test that the decoder uses the monitor instead of reading stderr."""
+
+    def test_decoder_counts_monitor_errors(self):
+        """Decode errors should come from the adapter's monitor."""
+        monitor = FFmpegStderrMonitor()
+        on_error = Mock()
+        adapter = Mock(spec=["get_stdout", "stderr_monitor"])
+        adapter.stderr_monitor = monitor
+        proc = Mock(spec=subprocess.Popen)
+        proc.stdout = io.BytesIO(np.zeros((10, 10, 3), dtype=np.uint8).tobytes())
+        proc.stderr = Mock()
+        adapter.get_stdout.return_value = proc
+
+        decoder = FrameDecoder(width=10, height=10, on_error=on_error)
+        decoder.start(adapter)
+        monitor.run(io.BytesIO(b"[h264 @ 0x1] corrupt decoded frame\n"))
+        time.sleep(0.05)
+
+        assert decoder._error_thread is None
+        proc.stderr.readline.assert_not_called()
+        assert decoder.error_count == 1
+        on_error.assert_called_once()
+
+        decoder.stop()
+        monitor.run(io.BytesIO(b"Error after stop\n"))
+        assert decoder.error_count == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,54 @@
+"""
+Unit tests for FileFrameSink.
+"""
+import time
+
+import numpy as np
+import pytest
+
+from src.file_sink import FileFrameSink, read_frames
+from src.pixel_format import PixelFormat
+
+
+class TestFileFrameSink:
+    """Test writing and reading back sink files."""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "out.yuv")
+        frames = [np.full((6, 4), i, dtype=np.uint8) for i in range(3)]
+        before = time.time()
+        with FileFrameSink(path, 4, 4, PixelFormat.NV12) as sink:
+            for frame in frames:
+                sink.send(frame)
+        assert sink.frames_written == 3
+
+        read = list(read_frames(path, PixelFormat.NV12))
+        assert [f[0, 0] for _, f in read] == [0, 1, 2]
+        assert all(before <= sent_at <= time.time() for sent_at, _ in read)
+
+    def test_append_continues_files(self, tmp_path):
+        path = str(tmp_path / "out.rgb")
+        with FileFrameSink(path, 2, 2) as sink:
+            sink.send(np.zeros((2, 2, 3), dtype=np.uint8))
+        with FileFrameSink(path, 4, 2, append=True) as sink:
+            sink.send(np.ones((2, 4, 3), dtype=np.uint8))
+        assert [f.shape for _, f in read_frames(path)] == [(2, 2, 3), (2, 4, 3)]
+
+        # Without append a new sink starts over
+        FileFrameSink(path, 2, 2).close()
+        assert list(read_frames(path)) == []
+
+    def test_rejects_frames_of_another_size(self, tmp_path):
+        with FileFrameSink(str(tmp_path / "out.rgb"), 2, 2) as sink:
+            with pytest.raises(ValueError):
+                sink.send(np.zeros((4, 4, 3), dtype=np.uint8))
+
+    def test_stops_at_incomplete_frame(self, tmp_path):
+        path = str(tmp_path / "out.rgb")
+        with FileFrameSink(path, 2, 2) as sink:
+            sink.send(np.zeros((2, 2, 3), dtype=np.uint8))
+            sink.send(np.zeros((2, 2, 3), dtype=np.uint8))
+        with open(path, "r+b") as f:
+            f.truncate(20)
+
+        assert len(list(read_frames(path))) == 1
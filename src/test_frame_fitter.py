@@ -0,0 +1,114 @@
+"""
+Unit tests for FrameFitter.
+"""
+import pytest
+import numpy as np
+
+from src.frame_fitter import FitMode, FrameFitter
+from src.pixel_format import PixelFormat, frame_shape
+
+
+def _planar_frame(pixel_format, width, height, y, u, v):
+    """Build an NV12 / I420 frame with constant planes."""
+    frame = np.empty(frame_shape(pixel_format, width, height), dtype=np.uint8)
+    frame[:height] = y
+    chroma = frame[height:].reshape(-1)
+    if pixel_format is PixelFormat.NV12:
+        chroma[0::2] = u
+        chroma[1::2] = v
+    else:
+        quarter = (width // 2) * (height // 2)
+        chroma[:quarter] = u
+        chroma[quarter:] = v
+    return frame
+
+
+class TestFrameFitter:
+    """Test letterbox / crop fitting and buffer reuse."""
+
+    def test_passthrough_when_size_matches(self):
+        """A frame at the output size is returned as-is."""
+        fitter = FrameFitter(8, 4)
+        frame = np.zeros((4, 8, 3), dtype=np.uint8)
+
+        assert fitter.fit(frame) is frame
+
+    def test_letterbox_rgb(self):
+        """A narrower frame is centred between black bars."""
+        fitter = FrameFitter(8, 4, mode=FitMode.LETTERBOX)
+        frame = np.full((8, 8, 3), 200, dtype=np.uint8)
+
+        out = fitter.fit(frame)
+
+        assert out.shape == (4, 8, 3)
+        assert (out[:, 2:6] == 200).all()
+        assert (out[:, :2] == 0).all() and (out[:, 6:] == 0).all()
+
+    def test_letterbox_keeps_orientation(self):
+        """Nearest-neighbour scaling keeps the frame's layout."""
+        fitter = FrameFitter(4, 4)
+        frame = np.zeros((8, 8, 3), dtype=np.uint8)
+        frame[:4] = 255  # top half white
+
+        out = fitter.fit(frame)
+
+        assert (out[:2] == 255).all()
+        assert (out[2:] == 0).all()
+
+    def test_crop_fills_camera(self):
+        """Crop scales to fill and cuts the sides of a wider frame."""
+        fitter = FrameFitter(4, 4, mode=FitMode.CROP)
+        frame = np.zeros((4, 8, 3), dtype=np.uint8)
+        frame[:, 2:6] = 200  # centre square
+
+        out = fitter.fit(frame)
+
+        assert out.shape == (4, 4, 3)
+        assert (out == 200).all()
+
+    @pytest.mark.parametrize("pixel_format", [PixelFormat.NV12, PixelFormat.I420])
+    def test_letterbox_planar(self, pixel_format):
+        """Planes are fitted separately; bars are black with neutral chroma."""
+        fitter = FrameFitter(8, 4, pixel_format)
+        frame = _planar_frame(pixel_format, 4, 4, y=200, u=60, v=90)
+
+        out = fitter.fit(frame)
+        expected = _planar_frame(pixel_format, 8, 4, y=16, u=128, v=128)
+        luma = expected[:4]
+        luma[:, 2:6] = 200
+        if pixel_format is PixelFormat.NV12:
+            expected[4:, 2:6:2] = 60
+            expected[4:, 3:6:2] = 90
+        else:
+            chroma = expected[4:].reshape(-1)
+            planes = chroma[:8].reshape(2, 4), chroma[8:].reshape(2, 4)
+            planes[0][:, 1:3] = 60
+            planes[1][:, 1:3] = 90
+
+        np.testing.assert_array_equal(out, expected)
+
+    def test_reuses_output_buffer(self):
+        """Frames of a known size are written into the same buffer."""
+        fitter = FrameFitter(8, 4)
+        first = fitter.fit(np.full((8, 8, 3), 1, dtype=np.uint8))
+        second = fitter.fit(np.full((8, 8, 3), 2, dtype=np.uint8))
+
+        assert second is first
+        assert (second[:, 2:6] == 2).all()
+
+    def test_source_size_change(self):
+        """A new source size is prepared again, including the bars."""
+        fitter = FrameFitter(8, 4)
+        fitter.fit(np.full((2, 8, 3), 50, dtype=np.uint8))  # fills the width
+
+        out = fitter.fit(np.full((4, 4, 3), 100, dtype=np.uint8))
+
+        assert (out[:, 2:6] == 100).all()
+        assert (out[:, :2] == 0).all()
+
+    def test_odd_planar_size_rejected(self):
+        """4:2:0 frames need even dimensions."""
+        fitter = FrameFitter(8, 4, PixelFormat.NV12)
+
+        with pytest.raises(ValueError):
+            fitter.fit(np.zeros((6, 3), dtype=np.uint8))  # 3x4 NV12
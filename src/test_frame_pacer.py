@@ -0,0 +1,89 @@
+"""
+Unit tests for FramePacer.
+"""
+import time
+
+import pytest
+
+from src.frame_pacer import FramePacer
+
+
+class TestFramePacer:
+    """Test timeline pacing and statistics."""
+
+    @pytest.mark.parametrize("precise", [False, True])
+    def test_holds_rate_without_drift(self, precise):
+        pacer = FramePacer(100, precise=precise)
+        start = time.perf_counter()
+        for _ in range(50):
+            pacer.wait()
+        elapsed = time.perf_counter() - start
+
+        # 50 slots after the start, within a fraction of an interval
+        assert elapsed == pytest.approx(0.5, abs=0.01)
+        assert pacer.effective_fps == pytest.approx(100, rel=0.03)
+        assert pacer.frame_count == 50
+
+    def test_first_wait_lasts_one_interval(self):
+        pacer = FramePacer(50)
+        start = time.perf_counter()
+        pacer.wait()
+        assert time.perf_counter() - start == pytest.approx(0.02, abs=0.005)
+
+    def test_slow_caller_skips_slots_instead_of_bursting(self):
+        pacer = FramePacer(100, precise=True)
+        pacer.wait()
+        origin = pacer._origin
+        time.sleep(0.035)  # miss a few slots
+        lateness = pacer.wait()
+
+        assert pacer.missed_count >= 2
+        assert 0 <= lateness < 0.01
+        # Still on the original timeline
+        pacer.wait()
+        slot_time = origin + pacer._slot * pacer.interval
+        assert time.perf_counter() - slot_time < 0.005
+
+    def test_sleeps_again_after_a_long_oversleep(self, monkeypatch):
+        """One OS hiccup must not leave precise mode spinning for good."""
+        real_sleep = time.sleep
+        sleeps = []
+
+        def hiccup_once(seconds):
+            if seconds > 0:
+                # The first sleep overshoots by more than a 60 fps interval
+                real_sleep(seconds + (0.02 if not sleeps else 0))
+                sleeps.append(seconds)
+            else:
+                real_sleep(0)
+
+        monkeypatch.setattr(time, "sleep", hiccup_once)
+        pacer = FramePacer(60, precise=True)
+        for _ in range(30):
+            pacer.wait()
+
+        assert pacer._oversleep_peak < pacer.interval
+        # Every wait after the hiccup sleeps before it spins
+        assert len(sleeps) >= 28
+
+    def test_stats(self):
+        pacer = FramePacer(200, precise=True)
+        for _ in range(20):
+            pacer.wait()
+        stats = pacer.get_stats()
+
+        assert stats["frames"] == 20
+        assert sum(stats["jitter_histogram"].values()) == 20
+        assert stats["late"] == pacer.late_count
+        assert stats["precise"] is True
+
+        pacer.reset()
+        assert pacer.get_stats()["frames"] == 0
+
+    def test_precise_by_default_above_30_fps(self):
+        assert not FramePacer(30).precise
+        assert FramePacer(60).precise
+
+    def test_invalid_fps(self):
+        with pytest.raises(ValueError):
+            FramePacer(0)
@@ -0,0 +1,183 @@
+"""
+Unit tests for FramePool and pooled frame reads in FrameDecoder.
+"""
+import io
+import threading
+import time
+import subprocess
+import pytest
+import numpy as np
+from unittest.mock import Mock
+
+from src.frame_pool import FramePool
+from src.decoder import FrameDecoder
+from src.frame_subscribers import DeliveryMode
+
+
+class TestFramePool:
+    """Test slot reuse and reference tracking."""
+
+    def test_preallocates_slots(self):
+        """Pool should preallocate the requested number of slots."""
+        pool = FramePool((4, 4, 3), 3)
+
+        assert pool.size == 3
+        assert pool.allocations == 3
+        assert pool.misses == 0
+        assert pool.free_count() == 3
+
+    def test_rejects_empty_pool(self):
+        """Pool must have at least one slot."""
+        with pytest.raises(ValueError):
+            FramePool((4, 4, 3), 0)
+
+    def test_released_slot_is_reused(self):
+        """A slot nobody references should be handed out again."""
+        pool = FramePool((4, 4, 3), 2)
+
+        first = pool.acquire()
+        first_id = id(first)
+        del first
+        pool.acquire()
+        third = pool.acquire()
+
+        assert id(third) == first_id
+        assert pool.misses == 0
+
+    def test_held_slot_is_not_reused(self):
+        """A slot still referenced by a consumer must not be overwritten."""
+        pool = FramePool((4, 4, 3), 2)
+
+        held = pool.acquire()
+        for _ in range(5):
+            assert pool.acquire() is not held
+
+    def test_view_keeps_slot_alive(self):
+        """Views derived from a slot should keep the slot out of rotation."""
+        pool = FramePool((4, 4, 3), 2)
+
+        view = pool.acquire()[1:3]
+        assert pool.free_count() == 1
+        del view
+        assert pool.free_count() == 2
+
+    def test_exhausted_pool_allocates(self):
+        """When every slot is held the pool should allocate instead of blocking."""
+        pool = FramePool((4, 4, 3), 1)
+
+        held = pool.acquire()
+        extra = pool.acquire()
+
+        assert extra is not held
+        assert extra.shape == (4, 4, 3)
+        assert pool.misses == 1
+        assert pool.allocations == 2
+
+    def test_grow_adds_slots(self):
+        """Growing keeps the existing slots and never shrinks the pool."""
+        pool = FramePool((4, 4, 3), 1)
+        held = pool.acquire()
+
+        pool.grow(3)
+        pool.grow(2)
+
+        assert pool.size == 3
+        assert pool.allocations == 3
+        assert pool.acquire() is not held
+        assert pool.misses == 0
+
+
+class TestFrameDecoderPooledReads:
+    """Test FrameDecoder frame ingestion through the pool."""
+
+    @staticmethod
+    def _make_adapter(data: bytes):
+        mock_adapter = Mock(spec=["get_stdout"])
+        mock_proc = Mock(spec=subprocess.Popen)
+        mock_proc.stdout = io.BytesIO(data)
+        mock_proc.stderr = io.BytesIO(b'')
+        mock_adapter.get_stdout.return_value = mock_proc
+        return mock_adapter
+
+    def test_frames_are_read_into_pool(self):
+        """Decoded frames should be pool slots with the streamed contents."""
+        frames = [np.full((10, 10, 3), i, dtype=np.uint8) for i in range(5)]
+        decoder = FrameDecoder(width=10, height=10, buffer_size=1)
+
+        decoder.start(self._make_adapter(b''.join(f.tobytes() for f in frames)))
+        time.sleep(0.2)
+
+        assert decoder.frame_count == 5
+        latest = decoder.latest_frame
+        np.testing.assert_array_equal(latest, frames[-1])
+        assert decoder.frame_pool is not None
+        assert decoder.frame_pool.size == 3
+        assert decoder.frame_pool.misses == 0
+
+        decoder.stop()
+
+    def test_consumer_references_are_respected(self):
+        """Frames kept by an on_frame consumer must never be overwritten."""
+        kept = []
+        frames = [np.full((10, 10, 3), i, dtype=np.uint8) for i in range(6)]
+        decoder = FrameDecoder(width=10, height=10, on_frame=kept.append)
+
+        decoder.start(self._make_adapter(b''.join(f.tobytes() for f in frames)))
+        time.sleep(0.2)
+        decoder.stop()
+
+        assert len(kept) == 6
+        for expected, frame in zip(frames, kept):
+            np.testing.assert_array_equal(frame, expected)
+        assert decoder.frame_pool.misses > 0
+
+    def test_pool_covers_queued_subscribers(self):
+        """Frames held by slow queued subscribers must not exhaust the pool."""
+        frames = [np.full((10, 10, 3), i, dtype=np.uint8) for i in range(8)]
+        decoder = FrameDecoder(width=10, height=10, buffer_size=1)
+        release = threading.Event()
+        subs = [
+            decoder.subscribe(
+                lambda f: release.wait(1.0), DeliveryMode.THREADED, queue_size=1
+            )
+            for _ in range(2)
+        ]
+
+        decoder.start(self._make_adapter(b''.join(f.tobytes() for f in frames)))
+        time.sleep(0.2)
+        try:
+            assert decoder.frame_count == 8
+            assert decoder.frame_pool.size == 1 + 2 + 2 * 2
+            assert decoder.frame_pool.misses == 0
+        finally:
+            release.set()
+            decoder.stop()
+            for sub in subs:
+                decoder.unsubscribe(sub)
+
+    def test_pool_grows_for_later_subscribers(self):
+        decoder = FrameDecoder(width=10, height=10, buffer_size=1)
+        decoder.start(self._make_adapter(np.ones((10, 10, 3), dtype=np.uint8).tobytes()))
+        time.sleep(0.1)
+        decoder.stop()
+        assert decoder.frame_pool.size == 3
+
+        sub = decoder.subscribe(lambda f: None, DeliveryMode.THREADED, queue_size=2)
+        inline = decoder.subscribe(lambda f: None)
+        assert decoder.frame_pool.size == 3 + 3
+        decoder.unsubscribe(sub)
+        decoder.unsubscribe(inline)
+
+    def test_pool_can_be_disabled(self):
+        """use_frame_pool=False should keep the allocate-per-frame path."""
+        frame = np.ones((10, 10, 3), dtype=np.uint8)
+        decoder = FrameDecoder(width=10, height=10, use_frame_pool=False)
+
+        decoder.start(self._make_adapter(frame.tobytes()))
+        time.sleep(0.1)
+
+        assert decoder.frame_count == 1
+        assert decoder.frame_pool is None
+        np.testing.assert_array_equal(decoder.latest_frame, frame)
+
+        decoder.stop()
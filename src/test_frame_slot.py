@@ -0,0 +1,130 @@
+"""
+Unit tests for FrameSlot and slot-based frame reads in FrameDecoder.
+"""
+import threading
+import time
+import pytest
+import numpy as np
+from unittest.mock import Mock
+
+from src.frame_slot import FrameSlot
+from src.decoder import FrameDecoder
+
+
+class TestFrameSlot:
+    """Test overwrite-latest semantics and blocking waits."""
+
+    def test_get_returns_put_frame(self):
+        """A stored frame should be returned once and then cleared."""
+        slot = FrameSlot()
+        frame = np.zeros((2, 2, 3), dtype=np.uint8)
+
+        assert slot.put(frame)
+        assert slot.get(timeout=0) is frame
+        assert slot.get(timeout=0) is None
+
+    def test_put_overwrites_unread_frame(self):
+        """Only the newest frame should survive; older ones count as dropped."""
+        slot = FrameSlot()
+        frames = [np.full((2, 2, 3), i, dtype=np.uint8) for i in range(3)]
+        for frame in frames:
+            slot.put(frame)
+
+        assert slot.get(timeout=0) is frames[-1]
+        assert slot.put_count == 3
+        assert slot.dropped_count == 2
+
+    def test_get_times_out(self):
+        """An empty slot should return None after the timeout."""
+        slot = FrameSlot()
+
+        t0 = time.monotonic()
+        assert slot.get(timeout=0.05) is None
+        assert time.monotonic() - t0 >= 0.04
+
+    def test_get_wakes_on_put(self):
+        """A blocked consumer should wake as soon as a frame is put."""
+        slot = FrameSlot()
+        frame = np.zeros((2, 2, 3), dtype=np.uint8)
+        result = []
+        consumer = threading.Thread(target=lambda: result.append(slot.get(timeout=2.0)))
+        consumer.start()
+
+        time.sleep(0.02)
+        slot.put(frame)
+        consumer.join(timeout=1.0)
+
+        assert not consumer.is_alive()
+        assert result == [frame]
+
+    def test_close_wakes_consumer_and_rejects_frames(self):
+        """Closing should release waiters and discard further frames."""
+        slot = FrameSlot()
+        result = []
+        consumer = threading.Thread(target=lambda: result.append(slot.get()))
+        consumer.start()
+
+        time.sleep(0.02)
+        slot.close()
+        consumer.join(timeout=1.0)
+
+        assert not consumer.is_alive()
+        assert result == [None]
+        assert slot.closed
+        assert not slot.put(np.zeros((2, 2, 3), dtype=np.uint8))
+
+
+class TestFrameDecoderSlotReads:
+    """Test FrameDecoder reading from an adapter's FrameSlot."""
+
+    @staticmethod
+    def _make_adapter():
+        adapter = Mock(spec=["frame_slot", "get_frame", "get_stdout"])
+        adapter.frame_slot = FrameSlot()
+        adapter.get_stdout.return_value = None
+        return adapter
+
+    def test_frames_are_published(self):
+        """Frames put into the slot should reach the decoder's buffer."""
+        adapter = self._make_adapter()
+        decoder = FrameDecoder(width=10, height=10)
+        decoder.start(adapter)
+
+        frame = np.ones((10, 10, 3), dtype=np.uint8)
+        adapter.frame_slot.put(frame)
+        generation, latest = decoder.wait_for_frame(0, timeout=1.0)
+
+        assert generation == 1
+        assert latest is frame
+        adapter.get_frame.assert_not_called()
+        decoder.stop()
+
+    def test_reader_exits_when_slot_closes(self):
+        """Closing the adapter's slot should end the reader thread."""
+        adapter = self._make_adapter()
+        decoder = FrameDecoder(width=10, height=10)
+        decoder.start(adapter)
+        reader = decoder._reader_thread
+
+        adapter.frame_slot.close()
+        reader.join(timeout=1.0)
+
+        assert not reader.is_alive()
+        decoder.stop()
+
+    def test_idle_reader_does_not_spin(self):
+        """An idle slot reader should barely consume CPU time."""
+        adapter = self._make_adapter()
+        decoder = FrameDecoder(width=10, height=10)
+
+        cpu0 = time.process_time()
+        decoder.start(adapter)
+        time.sleep(0.3)
+        decoder.stop()
+
+        # Process CPU over the idle period stays far below one busy core
+        assert time.process_time() - cpu0 < 0.15
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+"""
+Unit tests for FrameTimestampRing and FrameStats.
+"""
+import pytest
+import numpy as np
+
+from src.frame_stats import FrameStats, FrameTimestampRing
+
+
+def steady_ring(fps, seconds, end=100.0, capacity=4096):
+    ring = FrameTimestampRing(capacity)
+    count = int(fps * seconds)
+    for i in range(count):
+        ring.record(end - (count - 1 - i) / fps)
+    return ring
+
+
+class TestFrameTimestampRing:
+    """Test recording and windowing."""
+
+    def test_empty_ring(self):
+        """An empty ring reports no frames and a stall over the window."""
+        ring = FrameTimestampRing(8)
+        stats = ring.stats(2.0, now=10.0)
+
+        assert ring.latest is None
+        assert stats.frame_count == 0
+        assert stats.fps == 0.0
+        assert stats.longest_stall == 2.0
+
+    def test_wraps_and_keeps_newest(self):
+        """Past capacity the oldest timestamps are overwritten."""
+        ring = FrameTimestampRing(4)
+        for t in range(10):
+            ring.record(float(t))
+
+        assert ring.count == 10
+        assert ring.latest == 9.0
+        assert list(ring.since(0.0)) == [6.0, 7.0, 8.0, 9.0]
+        assert list(ring.since(7.5)) == [8.0, 9.0]
+
+    def test_clear(self):
+        """clear() forgets all frames."""
+        ring = steady_ring(30, 1)
+        ring.clear()
+        assert ring.count == 0
+        assert len(ring.since(0.0)) == 0
+
+    def test_rejects_tiny_capacity(self):
+        with pytest.raises(ValueError):
+            FrameTimestampRing(1)
+
+
+class TestFrameStats:
+    """Test the window statistics."""
+
+    def test_steady_stream(self):
+        """A steady 30 fps stream has its true rate and no jitter."""
+        ring = steady_ring(30, 5)
+        stats = ring.stats(2.0, now=100.0)
+
+        assert stats.fps == pytest.approx(30, abs=0.6)
+        assert stats.jitter == pytest.approx(0.0, abs=1e-9)
+        assert stats.p50_interval == pytest.approx(1 / 30)
+        assert stats.p99_interval == pytest.approx(1 / 30)
+        assert stats.longest_stall == pytest.approx(1 / 30)
+
+    def test_stall_and_percentiles(self):
+        """A 500 ms gap shows as longest stall and in the tail percentiles."""
+        ring = FrameTimestampRing()
+        times = list(np.arange(0, 1, 1 / 30)) + list(np.arange(1.5, 3, 1 / 30))
+        for t in times:
+            ring.record(float(t))
+        stats = ring.stats(3.0, now=times[-1])
+
+        assert stats.longest_stall == pytest.approx(0.5 + 1 / 30, abs=1e-3)
+        assert stats.p50_interval == pytest.approx(1 / 30)
+        assert stats.p99_interval > 0.1
+        assert stats.jitter > 0
+
+    def test_open_stall_counts(self):
+        """Time since the last frame is a stall too."""
+        ring = steady_ring(30, 2, end=10.0)
+        stats = ring.stats(2.0, now=11.5)
+
+        assert stats.longest_stall == pytest.approx(1.5)
+        assert stats.fps < 10
+
+    def test_young_stream_rated_over_its_age(self):
+        """A stream shorter than the window is not diluted by the window."""
+        ring = steady_ring(30, 0.5, end=100.0)
+        stats = ring.stats(10.0, now=100.0)
+
+        assert stats.fps == pytest.approx(30, abs=1.0)
+
+    def test_to_dict(self):
+        stats = FrameStats(window=2.0, frame_count=3, fps=1.5)
+        assert stats.to_dict()["frame_count"] == 3
@@ -0,0 +1,123 @@
+"""
+Unit tests for FrameSubscription.
+"""
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.frame_subscribers import DeliveryMode, FrameSubscription
+
+
+def frame(value):
+    return np.full((2, 2, 3), value, dtype=np.uint8)
+
+
+def wait_until(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestFrameSubscription:
+    """Test delivery modes, drop-oldest queues and counters."""
+
+    def test_inline_runs_on_caller_thread(self):
+        threads = []
+        sub = FrameSubscription(lambda f: threads.append(threading.current_thread()))
+        sub.deliver(frame(1), time.monotonic())
+
+        assert threads == [threading.current_thread()]
+        assert sub.delivered_count == 1
+        assert sub.last_lag >= 0
+
+    def test_threaded_slow_subscriber_does_not_block(self):
+        """A slow callback drops the oldest frames and keeps the newest."""
+        release = threading.Event()
+        received = []
+
+        def slow(f):
+            release.wait(1.0)
+            received.append(int(f[0, 0, 0]))
+
+        sub = FrameSubscription(slow, DeliveryMode.THREADED, "slow", queue_size=2)
+        sub.start()
+        try:
+            sub.deliver(frame(0), time.monotonic())
+            assert wait_until(lambda: sub.pending == 0)  # frame 0 in the callback
+
+            start = time.monotonic()
+            for value in range(1, 6):
+                sub.deliver(frame(value), time.monotonic())
+            assert time.monotonic() - start < 0.1
+
+            release.set()
+            assert wait_until(lambda: len(received) == 3)
+        finally:
+            sub.stop()
+
+        assert received == [0, 4, 5]
+        assert sub.dropped_count == 3
+        stats = sub.get_stats()
+        assert stats["mode"] == "threaded"
+        assert stats["delivered"] == 3
+        assert stats["max_lag"] > 0
+
+    def test_callback_errors_are_counted(self):
+        def broken(f):
+            raise RuntimeError("boom")
+
+        sub = FrameSubscription(broken)
+        sub.deliver(frame(1), time.monotonic())
+
+        assert sub.error_count == 1
+        assert sub.delivered_count == 1
+
+    def test_stop_ends_delivery(self):
+        received = []
+        sub = FrameSubscription(received.append, DeliveryMode.THREADED)
+        sub.start()
+        sub.stop()
+        sub.deliver(frame(1), time.monotonic())
+
+        assert received == []
+        assert sub.pending == 0
+
+    def test_asyncio_awaits_coroutine_callbacks(self):
+        received = []
+
+        async def on_frame(f):
+            await asyncio.sleep(0)
+            received.append(int(f[0, 0, 0]))
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            sub = FrameSubscription(on_frame, DeliveryMode.ASYNCIO, loop=loop)
+            # Published from another thread, as the decoder's reader does
+            publisher = threading.Thread(
+                target=lambda: [sub.deliver(frame(v), time.monotonic()) for v in (1, 2)]
+            )
+            publisher.start()
+            publisher.join()
+            for _ in range(100):
+                if len(received) + sub.dropped_count == 2:
+                    break
+                await asyncio.sleep(0.01)
+            return sub
+
+        sub = asyncio.run(main())
+        assert received[-1] == 2
+        assert sub.delivered_count == len(received)
+
+    def test_asyncio_needs_a_loop(self):
+        with pytest.raises(ValueError):
+            FrameSubscription(lambda f: None, DeliveryMode.ASYNCIO)
+
+    def test_queue_size_must_be_positive(self):
+        with pytest.raises(ValueError):
+            FrameSubscription(lambda f: None, DeliveryMode.THREADED, queue_size=0)
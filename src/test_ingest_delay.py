@@ -0,0 +1,78 @@
+"""
+Unit tests for IngestDelayTracker.
+"""
+import pytest
+
+from src.ingest_delay import IngestDelayTracker
+
+
+def feed(tracker, reports):
+    """Feed (media_time, now) pairs; return the update() results."""
+    return [tracker.update(media, now) for media, now in reports]
+
+
+class TestIngestDelayTracker:
+    """Test delay measurement and the resync trigger."""
+
+    def test_start_up_buffering_is_baseline(self):
+        """A constant offset is not delay, however large."""
+        tracker = IngestDelayTracker(threshold=1.0)
+        feed(tracker, [(t, 100.0 + 3.0 + t) for t in range(10)])
+
+        assert tracker.delay == pytest.approx(0.0)
+
+    def test_growing_offset_is_delay(self):
+        tracker = IngestDelayTracker(threshold=None)
+        # Media time advances at 90% of real time
+        feed(tracker, [(0.9 * t, float(t)) for t in range(11)])
+
+        assert tracker.delay == pytest.approx(1.0)
+        assert tracker.max_delay == pytest.approx(1.0)
+
+    def test_burst_lowers_baseline(self):
+        """Frames arriving faster than real time set a smaller offset."""
+        tracker = IngestDelayTracker(threshold=None)
+        feed(tracker, [(0.0, 5.0), (2.0, 5.5), (3.0, 6.5)])
+
+        assert tracker.delay == pytest.approx(0.0)
+
+    def test_resync_due_after_hold(self):
+        tracker = IngestDelayTracker(threshold=1.0, hold=2.0)
+        # 0.5 s behind per report: over the threshold from t=3 on
+        results = feed(tracker, [(0.5 * t, float(t)) for t in range(10)])
+
+        assert results.index(True) == 5
+        # Only once per session
+        assert results.count(True) == 1
+        assert tracker.get_stats()["resync_due"]
+
+    def test_recovery_within_hold_does_not_trigger(self):
+        tracker = IngestDelayTracker(threshold=1.0, hold=2.0)
+        results = feed(tracker, [(0.0, 0.0), (0.0, 1.5), (2.4, 2.5), (3.5, 3.5)])
+
+        assert not any(results)
+        assert tracker.max_delay == pytest.approx(1.5)
+
+    def test_reset_starts_new_session(self):
+        tracker = IngestDelayTracker(threshold=1.0, hold=0.0)
+        assert feed(tracker, [(0.0, 0.0), (0.0, 2.0)]) == [False, True]
+
+        tracker.reset()
+        assert tracker.delay is None
+        assert feed(tracker, [(0.0, 10.0), (0.0, 12.0)]) == [False, True]
+        assert tracker.max_delay == pytest.approx(2.0)
+
+    def test_media_time_rewind_starts_new_baseline(self):
+        tracker = IngestDelayTracker(threshold=None)
+        feed(tracker, [(100.0, 100.0), (100.0, 101.0), (0.0, 102.0)])
+
+        assert tracker.delay == pytest.approx(0.0)
+
+    @pytest.mark.parametrize("kwargs", [{"threshold": 0}, {"hold": -1}])
+    def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            IngestDelayTracker(**kwargs)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+"""
+Unit tests for ingest profiles and their use in the FFmpeg adapters.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.ingest_profile import IngestProfile, ingest_input_args
+from src.protocols.rtmp import RTMPAdapter
+from src.protocols.srt import SRTAdapter
+
+
+class TestIngestInputArgs:
+    """Test the FFmpeg options each profile produces."""
+
+    def test_default_adds_nothing(self):
+        assert ingest_input_args(IngestProfile.DEFAULT, "flv") == []
+
+    def test_fast_start_limits_probing(self):
+        args = ingest_input_args(IngestProfile.FAST_START, "flv")
+
+        assert args[args.index("-probesize") + 1] == "32"
+        assert args[args.index("-analyzeduration") + 1] == "0"
+        assert args[args.index("-f") + 1] == "flv"
+        assert "nobuffer" in args
+
+    def test_fast_start_mpegts_probes_more(self):
+        """MPEG-TS needs enough bytes for the PAT/PMT and the first SPS."""
+        args = ingest_input_args(IngestProfile.FAST_START, "mpegts")
+
+        assert int(args[args.index("-probesize") + 1]) > 32
+        assert args[args.index("-f") + 1] == "mpegts"
+
+
+class TestAdapterCommands:
+    """Test that the profile's options land before -i."""
+
+    @staticmethod
+    async def _start(adapter, port):
+        with patch('src.protocols.ffmpeg_listener.config.FFMPEG_BIN', '/usr/bin/ffmpeg'):
+            with patch('src.protocols.ffmpeg_listener.subprocess.Popen', return_value=MagicMock()) as mock_popen:
+                with patch('src.protocols.ffmpeg_listener.asyncio.create_task'):
+                    await adapter.start(port=port)
+        return mock_popen.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_rtmp_fast_start(self):
+        adapter = RTMPAdapter(ingest_profile=IngestProfile.FAST_START)
+        cmd = await self._start(adapter, 2935)
+
+        input_index = cmd.index('-i')
+        assert cmd.index('-probesize') < input_index
+        assert cmd[cmd.index('-f') + 1] == 'flv'
+        assert cmd.index('-rtmp_listen') < input_index
+        assert adapter.listen_started_at is not None
+        assert adapter.connected_at is None
+
+    @pytest.mark.asyncio
+    async def test_srt_fast_start(self):
+        adapter = SRTAdapter(ingest_profile=IngestProfile.FAST_START)
+        cmd = await self._start(adapter, 9000)
+
+        assert cmd.index('-probesize') < cmd.index('-i')
+        assert cmd[cmd.index('-f') + 1] == 'mpegts'
+
+    @pytest.mark.asyncio
+    async def test_default_profile_keeps_ffmpeg_probing(self):
+        adapter = SRTAdapter()
+        cmd = await self._start(adapter, 9000)
+
+        assert '-probesize' not in cmd
+        assert '-analyzeduration' not in cmd
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,51 @@
+"""
+Unit tests for the per-thread Counter.
+"""
+import threading
+
+from src.metrics import Counter
+
+
+class TestCounter:
+    """Test counting across threads."""
+
+    def test_single_thread(self):
+        counter = Counter("frames")
+        counter.add()
+        counter.add(4)
+        assert counter.value == 5
+        assert "frames" in repr(counter)
+
+    def test_concurrent_writers_lose_nothing(self):
+        """Increments from several threads must all be counted."""
+        counter = Counter()
+        start = threading.Barrier(4)
+
+        def work():
+            start.wait()
+            for _ in range(50_000):
+                counter.add()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert counter.value == 200_000
+
+    def test_finished_threads_still_count(self):
+        counter = Counter()
+        t = threading.Thread(target=counter.add, args=(3,))
+        t.start()
+        t.join()
+        counter.add()
+        assert counter.value == 4
+
+    def test_reset(self):
+        counter = Counter()
+        counter.add(10)
+        counter.reset()
+        assert counter.value == 0
+        counter.add()
+        assert counter.value == 1
@@ -0,0 +1,28 @@
+"""
+Unit tests for measuring the backlog of a pipe.
+"""
+import io
+import os
+
+import pytest
+
+from src.pipe_backlog import queued_bytes
+
+
+def test_counts_unread_bytes():
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "rb", buffering=0) as reader:
+        assert queued_bytes(reader) == 0
+        os.write(write_fd, b"x" * 1000)
+        assert queued_bytes(reader) == 1000
+        reader.read(300)
+        assert queued_bytes(reader) == 700
+    os.close(write_fd)
+
+
+def test_stream_without_descriptor():
+    assert queued_bytes(io.BytesIO(b"data")) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
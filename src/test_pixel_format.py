@@ -0,0 +1,60 @@
+"""
+Unit tests for raw frame pixel format helpers.
+"""
+import numpy as np
+import pytest
+
+from src.pixel_format import (
+    PixelFormat,
+    ffmpeg_pix_fmt,
+    frame_bytes,
+    frame_shape,
+    rgb_to_format,
+)
+
+
+class TestFrameGeometry:
+    """Test frame size math for each format."""
+
+    def test_rgb24(self):
+        assert frame_shape(PixelFormat.RGB24, 1280, 720) == (720, 1280, 3)
+        assert frame_bytes(PixelFormat.RGB24, 1280, 720) == 1280 * 720 * 3
+
+    @pytest.mark.parametrize("fmt", [PixelFormat.NV12, PixelFormat.I420])
+    def test_planar_formats_use_half_the_bytes(self, fmt):
+        assert frame_shape(fmt, 1280, 720) == (1080, 1280)
+        assert frame_bytes(fmt, 1280, 720) * 2 == frame_bytes(PixelFormat.RGB24, 1280, 720)
+
+    def test_ffmpeg_names(self):
+        assert ffmpeg_pix_fmt(PixelFormat.RGB24) == "rgb24"
+        assert ffmpeg_pix_fmt(PixelFormat.NV12) == "nv12"
+        assert ffmpeg_pix_fmt(PixelFormat.I420) == "yuv420p"
+
+
+class TestRgbConversion:
+    """Test RGB → planar conversion used for the standby frame."""
+
+    def test_rgb24_is_unchanged(self):
+        rgb = np.zeros((4, 4, 3), dtype=np.uint8)
+        assert rgb_to_format(rgb, PixelFormat.RGB24) is rgb
+
+    @pytest.mark.parametrize("fmt", [PixelFormat.NV12, PixelFormat.I420])
+    def test_gray_maps_to_neutral_chroma(self, fmt):
+        rgb = np.full((4, 6, 3), 128, dtype=np.uint8)
+
+        out = rgb_to_format(rgb, fmt)
+
+        assert out.shape == frame_shape(fmt, 6, 4)
+        assert out.dtype == np.uint8
+        np.testing.assert_allclose(out[:4], 126, atol=1)
+        np.testing.assert_allclose(out[4:], 128, atol=1)
+
+    def test_nv12_interleaves_chroma(self):
+        rgb = np.zeros((2, 2, 3), dtype=np.uint8)
+        rgb[:, :, 0] = 255  # pure red: V high, U low
+
+        out = rgb_to_format(rgb, PixelFormat.NV12)
+
+        u, v = out[2]
+        assert v > 200
+        assert u < 128
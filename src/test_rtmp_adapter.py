@@ -6,6 +6,7 @@ generation, connection state tracking, and FFmpeg process management.
 """
 import pytest
 import asyncio
+import time
 from unittest.mock import Mock, patch, MagicMock
 import subprocess
 
@@ -302,6 +303,177 @@ class TestRTMPAdapter:
                 # Second start should not create new process
                 await adapter.start(port=2935, path="live/stream")
                 assert mock_popen.call_count == 1  # Still 1
+    
+    @pytest.mark.asyncio
+    async def test_monitor_connection_tracks_sender(self):
+        """Test _monitor_connection() detects connect and disconnect from FFmpeg 7 output."""
+        adapter = RTMPAdapter()
+        on_connect = Mock()
+        on_disconnect = Mock()
+        adapter._on_connect = on_connect
+        adapter._on_disconnect = on_disconnect
+        
+        mock_stderr = MagicMock()
+        mock_stderr.readline = Mock(side_effect=[
+            b"Input #0, flv, from 'rtmp://0.0.0.0:2935/live/stream':\n",
+            b"  Stream #0:0: Video: h264 (High), yuv420p, 1280x720, 30 fps\n",
+            b"[in#0/flv @ 0x1] Error during demuxing: Input/output error\n",
+            b"",  # EOF
+        ])
+        
+        mock_proc = MagicMock()
+        mock_proc.stderr = mock_stderr
+        adapter._proc = mock_proc
+        
+        await adapter._monitor_connection()
+        
+        on_connect.assert_called_once()
+        on_disconnect.assert_called_once()
+        assert adapter.is_connected is False
+
+
+class TestRTMPAdapterWarmStandby:
+    """Test hand-over to the warm-standby listener."""
+
+    @staticmethod
+    def make_adapter():
+        adapter = RTMPAdapter(on_connect=Mock(), on_disconnect=Mock())
+        adapter._cmd = ["ffmpeg"]
+        active = MagicMock()
+        active.poll.return_value = None
+        adapter._proc = active
+        standby = MagicMock()
+        standby.stderr = None  # no monitor thread
+        standby.poll.return_value = None
+        return adapter, active, standby
+
+    @staticmethod
+    def event(event_type, source):
+        from src.protocols.ffmpeg_events import FFmpegEvent
+        return FFmpegEvent(event_type, "Stream #0:0: Video: h264", source=source)
+
+    def test_standby_promoted_when_sender_disconnects(self):
+        """The standby spawned on connect should take over on EOF."""
+        from src.protocols.ffmpeg_events import FFmpegEventType
+        adapter, active, standby = self.make_adapter()
+
+        with patch('subprocess.Popen', return_value=standby) as mock_popen:
+            adapter._handle_ffmpeg_event(self.event(FFmpegEventType.STREAM_INFO, active))
+            assert mock_popen.call_count == 1
+            assert adapter._standby.process is standby
+            # A child serving a sender needs a restart to accept another
+            assert not adapter.is_listening
+
+            adapter._handle_ffmpeg_event(self.event(FFmpegEventType.CLOSED, active))
+
+        adapter._on_connect.assert_called_once()
+        adapter._on_disconnect.assert_called_once()
+        assert adapter.get_stdout() is standby
+        assert adapter.wait_for_process(active, timeout=0) is standby
+        assert adapter.is_listening
+        assert adapter.connected_at is None
+
+    def test_tracks_sender_stream_info(self):
+        """The parsed stream description lasts as long as the sender."""
+        from src.protocols.ffmpeg_events import FFmpegEvent, FFmpegEventType, StreamInfo
+        adapter, active, standby = self.make_adapter()
+        info = StreamInfo("h264", 1920, 1080, fps=30.0, pix_fmt="yuv420p")
+
+        with patch('subprocess.Popen', return_value=standby):
+            adapter._handle_ffmpeg_event(FFmpegEvent(
+                FFmpegEventType.STREAM_INFO, "Stream #0:0: Video: h264",
+                source=active, stream_info=info,
+            ))
+            assert adapter.stream_info is info
+
+            adapter._handle_ffmpeg_event(self.event(FFmpegEventType.CLOSED, active))
+
+        assert adapter.stream_info is None
+
+    def test_sender_reconnecting_to_standby_retires_old_child(self):
+        """A sender showing up on the standby replaces a stale session."""
+        from src.protocols.ffmpeg_events import FFmpegEventType
+        adapter, active, standby = self.make_adapter()
+
+        with patch('subprocess.Popen', return_value=standby):
+            adapter._handle_ffmpeg_event(self.event(FFmpegEventType.STREAM_INFO, active))
+        with patch('src.protocols.standby.terminate_process') as terminate:
+            adapter._handle_ffmpeg_event(self.event(FFmpegEventType.STREAM_INFO, standby))
+            # The replaced child is stopped on a helper thread
+            for _ in range(100):
+                if terminate.called:
+                    break
+                time.sleep(0.01)
+            terminate.assert_called_once_with(active)
+
+        assert adapter.get_stdout() is standby
+        assert adapter.is_connected
+        assert adapter.connected_at is not None
+        adapter._on_connect.assert_called_once()
+        adapter._on_disconnect.assert_not_called()
+
+        # The replaced child's exit does not end the new session
+        adapter._handle_ffmpeg_event(self.event(FFmpegEventType.CLOSED, active))
+        assert adapter.is_connected
+
+    def test_resync_hands_over_without_disconnect(self):
+        """resync() replaces the sender's child without reporting a disconnect."""
+        from src.protocols.ffmpeg_events import FFmpegEventType
+        adapter, active, standby = self.make_adapter()
+
+        with patch('subprocess.Popen', return_value=standby):
+            adapter._handle_ffmpeg_event(self.event(FFmpegEventType.STREAM_INFO, active))
+        with patch('src.protocols.standby.terminate_process') as terminate:
+            assert adapter.resync()
+            for _ in range(100):
+                if terminate.called:
+                    break
+                time.sleep(0.01)
+            terminate.assert_called_once_with(active)
+            adapter._handle_ffmpeg_event(self.event(FFmpegEventType.CLOSED, active))
+
+        assert adapter.get_stdout() is standby
+        assert not adapter.is_connected
+        assert adapter.stream_info is None
+        adapter._on_disconnect.assert_not_called()
+
+    def test_resync_needs_a_sender(self):
+        """Without a connected sender there is nothing to resync."""
+        adapter, active, _ = self.make_adapter()
+
+        with patch('subprocess.Popen') as mock_popen:
+            assert not adapter.resync()
+
+        mock_popen.assert_not_called()
+        assert adapter.get_stdout() is active
+
+    def test_child_without_sender_is_not_respawned(self):
+        """A listener that exits before any sender (e.g. port in use) stays down."""
+        from src.protocols.ffmpeg_events import FFmpegEventType
+        adapter, active, _ = self.make_adapter()
+
+        with patch('subprocess.Popen') as mock_popen:
+            adapter._handle_ffmpeg_event(self.event(FFmpegEventType.CLOSED, active))
+
+        mock_popen.assert_not_called()
+        assert adapter.get_stdout() is active
+
+    @pytest.mark.asyncio
+    async def test_stop_closes_standby(self):
+        """stop() should terminate the standby and prevent hand-overs."""
+        from src.protocols.ffmpeg_events import FFmpegEventType
+        adapter, active, standby = self.make_adapter()
+
+        with patch('subprocess.Popen', return_value=standby):
+            adapter._handle_ffmpeg_event(self.event(FFmpegEventType.STREAM_INFO, active))
+        await adapter.stop()
+
+        assert standby.terminate.called
+        assert active.terminate.called
+        assert not adapter.is_listening
+        with patch('subprocess.Popen') as mock_popen:
+            adapter._handle_ffmpeg_event(self.event(FFmpegEventType.CLOSED, active))
+        mock_popen.assert_not_called()
 
 
 class TestRTMPAdapterBackwardCompatibility:
@@ -0,0 +1,185 @@
+"""
+Unit tests for the shared-memory frame bus.
+"""
+import multiprocessing
+import struct
+import threading
+import uuid
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.pixel_format import PixelFormat, frame_shape
+from src.shm_bus import SharedFrameReader, SharedFrameWriter
+
+
+@pytest.fixture
+def bus():
+    writer = SharedFrameWriter(
+        f"lvc-test-{uuid.uuid4().hex[:8]}", max_frame_bytes=64 * 48 * 3, slots=3
+    )
+    reader = SharedFrameReader(writer.name)
+    yield writer, reader
+    reader.close()
+    writer.close()
+
+
+def frame(value, width=8, height=6, fmt=PixelFormat.RGB24):
+    return np.full(frame_shape(fmt, width, height), value, dtype=np.uint8)
+
+
+def _read_in_child(name, queue):
+    with SharedFrameReader(name) as reader:
+        shared = reader.wait_for_frame(0, timeout=5.0)
+        queue.put(None if shared is None else (shared.sequence, int(shared.data.sum())))
+
+
+class TestSharedFrameBus:
+    """Test the ring layout and the seqlock protocol."""
+
+    def test_reads_latest_frame(self, bus):
+        writer, reader = bus
+        assert reader.read_latest() is None
+
+        for value in (1, 2, 3, 4):
+            assert writer.write(frame(value), timestamp=10.0 + value)
+        shared = reader.read_latest()
+
+        assert shared.sequence == 4
+        assert shared.timestamp == 14.0
+        assert (shared.width, shared.height) == (8, 6)
+        assert shared.pixel_format is PixelFormat.RGB24
+        assert shared.data.shape == (6, 8, 3)
+        assert (shared.data == 4).all()
+
+    def test_frame_size_may_change(self, bus):
+        writer, reader = bus
+        writer.write(frame(1))
+        writer.write(frame(2, width=16, height=10))
+
+        shared = reader.read_latest(out=np.empty(16 * 10 * 3, dtype=np.uint8))
+        assert shared.data.shape == (10, 16, 3)
+
+    def test_slot_being_written_is_not_read(self, bus):
+        """An odd seqlock means the writer is in the slot: the copy is retried."""
+        writer, reader = bus
+        writer.write(frame(1))
+        offset = writer._slot_offset(1)
+        (lock,) = struct.unpack_from("<Q", writer._buf, offset)
+        struct.pack_into("<Q", writer._buf, offset, lock + 1)
+
+        assert reader.read_latest() is None
+        assert reader.retry_count == SharedFrameReader._MAX_RETRIES
+
+        struct.pack_into("<Q", writer._buf, offset, lock + 2)
+        assert reader.read_latest().sequence == 1
+
+    def test_wait_for_frame(self, bus):
+        writer, reader = bus
+        assert reader.wait_for_frame(0, timeout=0.01) is None
+
+        timer = threading.Timer(0.02, writer.write, args=(frame(7),))
+        timer.start()
+        shared = reader.wait_for_frame(0, timeout=1.0)
+        timer.join()
+
+        assert shared.sequence == 1
+        assert reader.wait_for_frame(1, timeout=0.01) is None
+
+    def test_oversize_frames_are_counted(self, bus):
+        writer, reader = bus
+        assert not writer.write(frame(1, width=128, height=96))
+
+        assert writer.oversize_count == 1
+        assert reader.sequence == 0
+
+    def test_close_is_seen_by_readers(self, bus):
+        writer, reader = bus
+        writer.close()
+
+        assert reader.closed
+        assert reader.wait_for_frame(0) is None
+        assert not writer.write(frame(1))
+
+    def test_planar_formats(self):
+        writer = SharedFrameWriter(
+            f"lvc-test-{uuid.uuid4().hex[:8]}", PixelFormat.NV12, max_frame_bytes=1024
+        )
+        try:
+            with SharedFrameReader(writer.name) as reader:
+                writer.write(frame(5, fmt=PixelFormat.NV12))
+                shared = reader.read_latest()
+            assert shared.pixel_format is PixelFormat.NV12
+            assert (shared.width, shared.height) == (8, 6)
+        finally:
+            writer.close()
+
+    def test_not_a_bus(self):
+        from multiprocessing import shared_memory
+        block = shared_memory.SharedMemory(create=True, size=128)
+        try:
+            with pytest.raises(ValueError):
+                SharedFrameReader(block.name)
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_second_writer_does_not_take_over_bus(self, bus):
+        """A running writer's bus is never replaced by another writer."""
+        writer, reader = bus
+        with pytest.raises(FileExistsError):
+            SharedFrameWriter(writer.name, max_frame_bytes=64)
+
+        assert writer.write(frame(3))
+        assert reader.read_latest().sequence == 1
+        assert not reader.closed
+
+    def test_bus_of_crashed_writer_is_replaced(self, bus):
+        writer, reader = bus
+        writer.write(frame(1))
+        with patch("src.shm_bus._process_alive", return_value=False):
+            replacement = SharedFrameWriter(writer.name, max_frame_bytes=64)
+        try:
+            with SharedFrameReader(writer.name) as new_reader:
+                assert new_reader.sequence == 0
+        finally:
+            replacement.close()
+
+    def test_reader_in_another_process(self, bus):
+        writer, _ = bus
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        child = context.Process(target=_read_in_child, args=(writer.name, queue))
+        child.start()
+        writer.write(frame(1))
+        result = queue.get(timeout=10)
+        child.join(timeout=5)
+
+        assert result == (1, 8 * 6 * 3)
+        # The child's exit must not remove the bus
+        with SharedFrameReader(writer.name) as reader:
+            assert reader.sequence == 1
+
+
+class TestFrameDecoderSharedMemoryBus:
+    """Test publishing decoded frames into the bus."""
+
+    def test_decoder_publishes_into_bus(self):
+        from src.decoder import FrameDecoder
+        name = f"lvc-test-{uuid.uuid4().hex[:8]}"
+        decoder = FrameDecoder(width=10, height=10, shared_memory_bus=name)
+        decoder._open_shared_memory_bus()
+        try:
+            with SharedFrameReader(name) as reader:
+                decoder._publish_frame(np.full((10, 10, 3), 9, dtype=np.uint8))
+                shared = reader.wait_for_frame(0, timeout=1.0)
+                assert (shared.data == 9).all()
+                # The read time, not the time of the copy into the bus
+                assert shared.timestamp == decoder.latest_envelope.read_at
+            assert decoder.get_stats()["shm_bus"]["frames"] == 1
+        finally:
+            decoder._close_shared_memory_bus()
+
+        assert decoder.get_stats()["shm_bus"] is None
+        assert decoder.subscribers == ()
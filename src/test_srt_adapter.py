@@ -8,6 +8,7 @@ import pytest
 import asyncio
 from unittest.mock import Mock, patch, MagicMock
 from src.protocols.srt import SRTAdapter
+from src.pixel_format import PixelFormat
 
 
 class TestSRTAdapter:
@@ -48,7 +49,7 @@ class TestSRTAdapter:
         """Test start() raises error when FFmpeg is not found."""
         adapter = SRTAdapter()
         
-        with patch('src.protocols.srt.config.FFMPEG_BIN', None):
+        with patch('src.protocols.ffmpeg_listener.config.FFMPEG_BIN', None):
             with pytest.raises(RuntimeError, match="ffmpeg not found"):
                 await adapter.start(port=9000)
     
@@ -61,9 +62,9 @@ class TestSRTAdapter:
         mock_proc.stdout = MagicMock()
         mock_proc.stderr = MagicMock()
         
-        with patch('src.protocols.srt.config.FFMPEG_BIN', '/usr/bin/ffmpeg'):
-            with patch('src.protocols.srt.subprocess.Popen', return_value=mock_proc):
-                with patch('src.protocols.srt.asyncio.create_task') as mock_create_task:
+        with patch('src.protocols.ffmpeg_listener.config.FFMPEG_BIN', '/usr/bin/ffmpeg'):
+            with patch('src.protocols.ffmpeg_listener.subprocess.Popen', return_value=mock_proc):
+                with patch('src.protocols.ffmpeg_listener.asyncio.create_task') as mock_create_task:
                     await adapter.start(port=9000)
         
         assert adapter._port == 9000
@@ -76,8 +77,8 @@ class TestSRTAdapter:
         adapter = SRTAdapter()
         adapter._proc = MagicMock()  # Simulate already running
         
-        with patch('src.protocols.srt.config.FFMPEG_BIN', '/usr/bin/ffmpeg'):
-            with patch('src.protocols.srt.subprocess.Popen') as mock_popen:
+        with patch('src.protocols.ffmpeg_listener.config.FFMPEG_BIN', '/usr/bin/ffmpeg'):
+            with patch('src.protocols.ffmpeg_listener.subprocess.Popen') as mock_popen:
                 await adapter.start(port=9000)
         
         # Should not create new process
@@ -89,9 +90,9 @@ class TestSRTAdapter:
         adapter = SRTAdapter(width=1920, height=1080)
         mock_proc = MagicMock()
         
-        with patch('src.protocols.srt.config.FFMPEG_BIN', '/usr/bin/ffmpeg'):
-            with patch('src.protocols.srt.subprocess.Popen', return_value=mock_proc) as mock_popen:
-                with patch('src.protocols.srt.asyncio.create_task'):
+        with patch('src.protocols.ffmpeg_listener.config.FFMPEG_BIN', '/usr/bin/ffmpeg'):
+            with patch('src.protocols.ffmpeg_listener.subprocess.Popen', return_value=mock_proc) as mock_popen:
+                with patch('src.protocols.ffmpeg_listener.asyncio.create_task'):
                     await adapter.start(port=9000)
         
         # Verify FFmpeg command
@@ -102,10 +103,44 @@ class TestSRTAdapter:
         assert 'rawvideo' in call_args
         assert '-pix_fmt' in call_args
         assert 'rgb24' in call_args
-        assert '-s' in call_args
-        assert '1920x1080' in call_args
+        # The filter chain scales to the output size; -s would add a
+        # second scaler with FFmpeg's default algorithm
+        assert '-s' not in call_args
+        assert 'scale=1920:1080:' in call_args[call_args.index('-vf') + 1]
         assert 'pipe:1' in call_args
     
+    @pytest.mark.asyncio
+    async def test_start_command_planar_pixel_format(self):
+        """Test that a planar pixel format is passed to FFmpeg."""
+        adapter = SRTAdapter(pixel_format=PixelFormat.I420)
+        mock_proc = MagicMock()
+        
+        with patch('src.protocols.ffmpeg_listener.config.FFMPEG_BIN', '/usr/bin/ffmpeg'):
+            with patch('src.protocols.ffmpeg_listener.subprocess.Popen', return_value=mock_proc) as mock_popen:
+                with patch('src.protocols.ffmpeg_listener.asyncio.create_task'):
+                    await adapter.start(port=9000)
+        
+        call_args = mock_popen.call_args[0][0]
+        pix_fmt_index = call_args.index('-pix_fmt')
+        assert call_args[pix_fmt_index + 1] == 'yuv420p'
+    
+    @pytest.mark.asyncio
+    async def test_start_command_reports_progress(self):
+        """Test that FFmpeg writes -progress reports to stderr before the input."""
+        adapter = SRTAdapter()
+        mock_proc = MagicMock()
+        
+        with patch('src.protocols.ffmpeg_listener.config.FFMPEG_BIN', '/usr/bin/ffmpeg'):
+            with patch('src.protocols.ffmpeg_listener.subprocess.Popen', return_value=mock_proc) as mock_popen:
+                with patch('src.protocols.ffmpeg_listener.asyncio.create_task'):
+                    await adapter.start(port=9000)
+        
+        call_args = mock_popen.call_args[0][0]
+        progress_index = call_args.index('-progress')
+        assert call_args[progress_index + 1] == 'pipe:2'
+        assert '-nostats' in call_args
+        assert progress_index < call_args.index('-i')
+    
     @pytest.mark.asyncio
     async def test_stop(self):
         """Test stop() cleans up resources."""
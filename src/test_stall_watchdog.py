@@ -0,0 +1,138 @@
+"""
+Unit tests for StallWatchdog.
+"""
+import threading
+import time
+
+import pytest
+
+from src.stall_watchdog import StallWatchdog
+
+
+class Recorder:
+    """Collects watchdog callbacks with the time they fired."""
+
+    def __init__(self):
+        self.events = []
+        self.changed = threading.Event()
+
+    def callback(self, name):
+        def record(seconds):
+            self.events.append((name, seconds, time.monotonic()))
+            self.changed.set()
+        return record
+
+    def names(self):
+        return [name for name, _, _ in self.events]
+
+    def wait_for(self, name, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while name not in self.names():
+            self.changed.clear()
+            if not self.changed.wait(deadline - time.monotonic()):
+                raise AssertionError(f"no {name} callback, got {self.names()}")
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+def make_watchdog(recorder, threshold=0.05, escalate_after=None):
+    return StallWatchdog(
+        threshold=threshold,
+        escalate_after=escalate_after,
+        on_stall=recorder.callback("stall"),
+        on_resume=recorder.callback("resume"),
+        on_escalate=recorder.callback("escalate"),
+    )
+
+
+class TestStallWatchdog:
+    """Test stall detection, resume and escalation."""
+
+    def test_detects_stall_within_milliseconds(self, recorder):
+        watchdog = make_watchdog(recorder)
+        watchdog.start()
+        try:
+            watchdog.feed()
+            last_frame = time.monotonic()
+            recorder.wait_for("stall")
+        finally:
+            watchdog.stop()
+
+        _, silent, fired_at = recorder.events[0]
+        assert silent >= 0.05
+        assert fired_at - last_frame < 0.05 + 0.03
+        assert watchdog.last_detection_latency < 0.03
+        assert watchdog.is_stalled
+        assert watchdog.stall_count == 1
+
+    def test_steady_frames_do_not_stall(self, recorder):
+        watchdog = make_watchdog(recorder)
+        watchdog.start()
+        try:
+            for _ in range(20):
+                watchdog.feed()
+                time.sleep(0.01)
+        finally:
+            watchdog.stop()
+
+        assert recorder.events == []
+
+    def test_not_armed_before_first_frame(self, recorder):
+        watchdog = make_watchdog(recorder)
+        watchdog.start()
+        time.sleep(0.15)
+        watchdog.stop()
+
+        assert recorder.events == []
+
+    def test_resume_reports_stall_duration(self, recorder):
+        watchdog = make_watchdog(recorder)
+        watchdog.start()
+        try:
+            watchdog.feed()
+            recorder.wait_for("stall")
+            time.sleep(0.05)
+            watchdog.feed()
+            recorder.wait_for("resume")
+        finally:
+            watchdog.stop()
+
+        _, duration, _ = recorder.events[-1]
+        assert duration >= 0.1
+        assert watchdog.last_stall_duration == duration
+        assert not watchdog.is_stalled
+
+    def test_escalates_once(self, recorder):
+        watchdog = make_watchdog(recorder, escalate_after=0.15)
+        watchdog.start()
+        try:
+            watchdog.feed()
+            recorder.wait_for("escalate")
+            time.sleep(0.2)
+        finally:
+            watchdog.stop()
+
+        assert recorder.names() == ["stall", "escalate"]
+        assert recorder.events[1][1] >= 0.15
+        assert watchdog.get_stats()["escalations"] == 1
+
+    def test_reset_disarms(self, recorder):
+        watchdog = make_watchdog(recorder)
+        watchdog.start()
+        try:
+            watchdog.feed()
+            watchdog.reset()
+            time.sleep(0.15)
+        finally:
+            watchdog.stop()
+
+        assert recorder.events == []
+
+    def test_invalid_thresholds(self):
+        with pytest.raises(ValueError):
+            StallWatchdog(threshold=0)
+        with pytest.raises(ValueError):
+            StallWatchdog(threshold=1.0, escalate_after=0.5)
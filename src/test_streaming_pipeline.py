@@ -234,6 +234,7 @@ class TestStreamingPipeline:
         assert mock_adapter._path == "live/stream"
         mock_decoder.start.assert_called_once_with(mock_adapter)
         assert pipeline.is_running
+        await pipeline.stop()
     
     @pytest.mark.asyncio
     async def test_pipeline_stop_stops_all_components(self, mock_adapter, mock_decoder):
@@ -275,6 +276,7 @@ class TestStreamingPipeline:
         
         # Verify state change was forwarded
         assert ConnectionState.CONNECTED in state_changes
+        await pipeline.stop()
     
     @pytest.mark.asyncio
     async def test_pipeline_forwards_health_changes(self, mock_adapter, mock_decoder):
@@ -309,6 +311,7 @@ class TestStreamingPipeline:
         # Verify health changes were forwarded
         # (Health should improve as frames are received)
         assert len(health_changes) > 0
+        await pipeline.stop()
     
     @pytest.mark.asyncio
     async def test_pipeline_handles_reconnection_trigger(self, mock_adapter, mock_decoder):
@@ -331,6 +334,7 @@ class TestStreamingPipeline:
         # Note: In real scenario, ConnectionManager would trigger reconnection
         # after backoff delay, but we're testing the mechanism here
         assert pipeline.is_running
+        await pipeline.stop()
 
 
 class TestReconnectionIntegration:
@@ -0,0 +1,103 @@
+"""
+Unit tests for PipelineTracer and StageHistogram.
+"""
+import json
+import threading
+import time
+
+import pytest
+
+from src.tracing import PIPE_READ, SEND, PipelineTracer, StageHistogram
+
+
+class TestStageHistogram:
+    """Test bucketing and percentiles."""
+
+    def test_percentiles(self):
+        histogram = StageHistogram()
+        for _ in range(90):
+            histogram.record(0.001)
+        for _ in range(10):
+            histogram.record(0.1)
+
+        # Bucket bounds are within a quarter octave of the value
+        assert 0.001 <= histogram.percentile(50) < 0.001 * 2 ** 0.25
+        # Capped at the largest recorded duration
+        assert histogram.percentile(99) == pytest.approx(0.1)
+        stats = histogram.get_stats()
+        assert stats["count"] == 100
+        assert stats["mean_ms"] == pytest.approx(10.9)
+        assert stats["max_ms"] == pytest.approx(100)
+
+    def test_empty_and_reset(self):
+        histogram = StageHistogram()
+        assert histogram.percentile(50) == 0.0
+        histogram.record(1.0)
+        histogram.reset()
+        assert histogram.get_stats()["count"] == 0
+
+    def test_durations_above_the_last_bound(self):
+        histogram = StageHistogram()
+        histogram.record(100.0)
+        assert histogram.percentile(50) == 100.0
+
+
+class TestPipelineTracer:
+    """Test stage statistics and trace capture."""
+
+    def test_records_stages(self):
+        tracer = PipelineTracer()
+        tracer.record(PIPE_READ, 1.0, 1.002)
+        tracer.record(PIPE_READ, 2.0, 2.004)
+        tracer.record(SEND, 2.0, 2.001)
+
+        stats = tracer.get_stats()
+        assert set(stats["stages"]) == {PIPE_READ, SEND}
+        assert stats["stages"][PIPE_READ]["count"] == 2
+        assert stats["stages"][PIPE_READ]["max_ms"] == pytest.approx(4)
+        assert stats["capture"] is None
+
+    def test_capture_writes_chrome_trace(self, tmp_path):
+        tracer = PipelineTracer()
+        tracer.record(SEND, 0.0, 0.001)  # before the capture: not in the file
+        path = tracer.start_capture(10, str(tmp_path / "trace.json"))
+        assert tracer.capturing
+
+        now = time.perf_counter()
+        tracer.record(PIPE_READ, now, now + 0.002, sequence=7)
+        worker = threading.Thread(
+            target=tracer.record, args=(SEND, now + 0.003, now + 0.004), name="vcam-output"
+        )
+        worker.start()
+        worker.join()
+
+        assert tracer.finish_capture() == path
+        assert not tracer.capturing
+        trace = json.loads((tmp_path / "trace.json").read_text())
+        spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert [e["name"] for e in spans] == [PIPE_READ, SEND]
+        assert spans[0]["dur"] == pytest.approx(2000)
+        assert spans[0]["args"] == {"sequence": 7}
+        assert spans[0]["tid"] != spans[1]["tid"]
+        # Histograms keep counting outside captures
+        assert tracer.get_stats()["stages"][SEND]["count"] == 2
+
+    def test_capture_ends_by_itself(self, tmp_path):
+        tracer = PipelineTracer()
+        tracer.start_capture(0.01, str(tmp_path / "trace.json"))
+        tracer._capture_timer.join(timeout=1.0)
+
+        assert not tracer.capturing
+        assert (tmp_path / "trace.json").exists()
+
+    def test_one_capture_at_a_time(self, tmp_path):
+        tracer = PipelineTracer()
+        tracer.start_capture(10, str(tmp_path / "a.json"))
+        try:
+            with pytest.raises(RuntimeError):
+                tracer.start_capture(10, str(tmp_path / "b.json"))
+        finally:
+            tracer.finish_capture()
+        with pytest.raises(ValueError):
+            tracer.start_capture(0)
+        assert tracer.finish_capture() is None
@@ -65,6 +65,18 @@ class TestIconCreation:
         assert isinstance(icon, Image.Image)
         assert icon.size == (64, 64)
     
+    def test_resyncing_icon(self):
+        """Test icon creation for resyncing state."""
+        icon = _create_state_icon(state=ConnectionState.RESYNCING)
+        assert isinstance(icon, Image.Image)
+        assert icon.getpixel((8, 32))[:3] == (255, 193, 7)
+    
+    def test_stalled_icon(self):
+        """Test icon creation for stalled state."""
+        icon = _create_state_icon(state=ConnectionState.STALLED)
+        assert isinstance(icon, Image.Image)
+        assert icon.getpixel((8, 32))[:3] == (244, 67, 54)
+    
     def test_custom_size_icon(self):
         """Test icon creation with custom size."""
         icon = _create_state_icon(size=128, state=ConnectionState.CONNECTED)
@@ -0,0 +1,226 @@
+"""
+Unit tests for video transforms and their use in the FFmpeg adapters.
+"""
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+
+from src.frame_fitter import FitMode
+from src.protocols.rtmp import RTMPAdapter
+from src.protocols.srt import SRTAdapter
+from src.video_transform import (
+    ScalerProfile,
+    VideoTransform,
+    video_filter,
+    video_filter_args,
+)
+
+
+class TestVideoTransform:
+    """Test validation and serialization of the transform spec."""
+
+    def test_default_is_identity(self):
+        assert VideoTransform().is_identity
+        assert not VideoTransform(mirror=True).is_identity
+
+    @pytest.mark.parametrize("kwargs", [
+        {"rotation": 45},
+        {"crop": (0.5, 0, 0.5, 0)},
+        {"crop": (-0.1, 0, 0, 0)},
+        {"crop": (0, 0, 0)},
+    ])
+    def test_invalid_values_rejected(self, kwargs):
+        with pytest.raises(ValueError):
+            VideoTransform(**kwargs)
+
+    def test_from_dict_accepts_json_lists(self):
+        transform = VideoTransform.from_dict(
+            {"crop": [0.1, 0, 0.1, 0], "rotation": 90, "mirror": True}
+        )
+
+        assert transform == VideoTransform(crop=(0.1, 0, 0.1, 0), rotation=90, mirror=True)
+        assert VideoTransform.from_dict({}) == VideoTransform()
+
+
+class TestVideoFilter:
+    """Test the compiled FFmpeg filter chain."""
+
+    def test_letterbox_scales_and_pads(self):
+        chain = video_filter(VideoTransform(), 1280, 720, FitMode.LETTERBOX)
+
+        assert chain.split(",") == [
+            "scale=1280:720:force_original_aspect_ratio=decrease"
+            ":force_divisible_by=2:flags=bicubic",
+            "pad=1280:720:(ow-iw)/2:(oh-ih)/2",
+            "setsar=1",
+        ]
+
+    def test_crop_mode_scales_and_crops(self):
+        chain = video_filter(VideoTransform(), 1280, 720, FitMode.CROP)
+
+        assert "force_original_aspect_ratio=increase" in chain
+        assert "crop=1280:720" in chain
+        assert "pad=" not in chain
+
+    def test_transform_order(self):
+        """Source crop, then rotation, then mirror, then the fit."""
+        transform = VideoTransform(crop=(0.1, 0.0, 0.1, 0.25), rotation=90, mirror=True)
+        filters = video_filter(transform, 1280, 720).split(",")
+
+        assert filters[0] == "crop=w=iw*0.8:h=ih*0.75:x=iw*0.1:y=ih*0"
+        assert filters[1:3] == ["transpose=clock", "hflip"]
+        assert filters[3].startswith("scale=")
+
+    @pytest.mark.parametrize("rotation,mirror,expected", [
+        (180, False, ["hflip", "vflip"]),
+        (180, True, ["vflip"]),
+        (270, False, ["transpose=cclock"]),
+        (0, True, ["hflip"]),
+    ])
+    def test_rotation_filters(self, rotation, mirror, expected):
+        transform = VideoTransform(rotation=rotation, mirror=mirror)
+        filters = video_filter(transform, 640, 480).split(",")
+
+        assert filters[:len(expected)] == expected
+        assert filters[len(expected)].startswith("scale=")
+
+    @pytest.mark.parametrize("profile,flag", [
+        (ScalerProfile.FAST_BILINEAR, "fast_bilinear"),
+        (ScalerProfile.BILINEAR, "bilinear"),
+        (ScalerProfile.BICUBIC, "bicubic"),
+        (ScalerProfile.LANCZOS, "lanczos"),
+    ])
+    def test_scaler_profile(self, profile, flag):
+        """The profile picks the algorithm of the scale step."""
+        chain = video_filter(VideoTransform(), 640, 480, scaler=profile)
+
+        assert f":flags={flag}," in chain
+
+    def test_native_resolution_skips_fit(self):
+        """Without an output size only odd dimensions are rounded down."""
+        chain = video_filter(VideoTransform(rotation=90), None, None)
+
+        assert chain.split(",") == [
+            "transpose=clock",
+            "scale=trunc(iw/2)*2:trunc(ih/2)*2:flags=bicubic",
+            "setsar=1",
+        ]
+
+    def test_args(self):
+        args = video_filter_args(
+            VideoTransform(mirror=True), 640, 480, scaler=ScalerProfile.BILINEAR
+        )
+
+        assert args[0] == "-vf"
+        assert args[1].startswith("hflip,")
+        # Pixel format conversions FFmpeg inserts use the same algorithm
+        assert args[2:] == ["-sws_flags", "bilinear"]
+
+
+class TestAdapterTransform:
+    """Test the -vf option and restarts of the FFmpeg child."""
+
+    @pytest.fixture(autouse=True)
+    def ffmpeg_bin(self):
+        with patch('src.config.FFMPEG_BIN', '/usr/bin/ffmpeg'):
+            yield
+
+    @staticmethod
+    def make_adapter(adapter_class, **kwargs):
+        adapter = adapter_class(on_connect=Mock(), on_disconnect=Mock(), **kwargs)
+        adapter._port = 9000
+        adapter._path = "live/stream"
+        adapter._cmd = adapter._build_command()
+        active = MagicMock()
+        active.poll.return_value = None
+        adapter._proc = active
+        return adapter, active
+
+    @pytest.mark.parametrize("adapter_class", [RTMPAdapter, SRTAdapter])
+    def test_command_applies_filter_after_input(self, adapter_class):
+        transform = VideoTransform(rotation=90)
+        adapter, _ = self.make_adapter(
+            adapter_class, width=640, height=480, transform=transform
+        )
+        cmd = adapter._cmd
+
+        assert cmd.index('-vf') > cmd.index('-i')
+        assert cmd[cmd.index('-vf') + 1] == video_filter(transform, 640, 480)
+
+    @pytest.mark.parametrize("adapter_class", [RTMPAdapter, SRTAdapter])
+    def test_native_resolution_command(self, adapter_class):
+        adapter, _ = self.make_adapter(
+            adapter_class, width=640, height=480, native_resolution=True
+        )
+        cmd = adapter._cmd
+
+        assert adapter.native_resolution
+        assert cmd[cmd.index('-vf') + 1] == video_filter(VideoTransform(), None, None)
+
+    @pytest.mark.parametrize("adapter_class", [RTMPAdapter, SRTAdapter])
+    def test_change_restarts_only_ffmpeg_child(self, adapter_class):
+        adapter, active = self.make_adapter(adapter_class)
+        adapter._connected = True
+        restarted = MagicMock()
+        restarted.stderr = None  # no monitor thread
+
+        with patch('subprocess.Popen', return_value=restarted) as mock_popen:
+            assert adapter.set_video_transform(VideoTransform(mirror=True))
+
+        assert active.terminate.called
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[cmd.index('-vf') + 1].startswith("hflip,")
+        assert adapter.get_stdout() is restarted
+        assert adapter.wait_for_process(active, timeout=0) is restarted
+        assert adapter.video_transform == VideoTransform(mirror=True)
+        # The dropped sender is reported once
+        assert not adapter.is_connected
+        adapter._on_disconnect.assert_called_once()
+
+    def test_unchanged_transform_keeps_child(self):
+        adapter, active = self.make_adapter(RTMPAdapter)
+
+        with patch('subprocess.Popen') as mock_popen:
+            assert not adapter.set_video_transform(VideoTransform(), FitMode.LETTERBOX)
+
+        mock_popen.assert_not_called()
+        assert not active.terminate.called
+        assert adapter.get_stdout() is active
+
+    def test_fit_mode_change_restarts(self):
+        adapter, active = self.make_adapter(SRTAdapter)
+        restarted = MagicMock()
+        restarted.stderr = None
+
+        with patch('subprocess.Popen', return_value=restarted) as mock_popen:
+            assert adapter.set_video_transform(VideoTransform(), FitMode.CROP)
+
+        cmd = mock_popen.call_args[0][0]
+        assert "force_original_aspect_ratio=increase" in cmd[cmd.index('-vf') + 1]
+        adapter._on_disconnect.assert_not_called()
+
+    def test_scaler_change_restarts(self):
+        adapter, active = self.make_adapter(RTMPAdapter)
+        restarted = MagicMock()
+        restarted.stderr = None
+
+        with patch('subprocess.Popen', return_value=restarted) as mock_popen:
+            assert adapter.set_video_transform(
+                VideoTransform(), scaler=ScalerProfile.FAST_BILINEAR
+            )
+
+        cmd = mock_popen.call_args[0][0]
+        assert cmd[cmd.index('-sws_flags') + 1] == "fast_bilinear"
+        assert active.terminate.called
+
+    def test_change_before_start_only_stores(self):
+        adapter = RTMPAdapter()
+
+        with patch('subprocess.Popen') as mock_popen:
+            assert adapter.set_video_transform(VideoTransform(rotation=180))
+
+        mock_popen.assert_not_called()
+        assert adapter.video_transform.rotation == 180
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,319 @@
+"""
+Unit tests for VirtualCameraOutput.
+
+pyvirtualcam.Camera is replaced with an in-memory fake so the output loop
+can run without a camera driver.
+"""
+import threading
+import time
+import pytest
+import numpy as np
+from unittest.mock import patch
+
+from src.stall_watchdog import StallPolicy
+from src.virtual_camera import VirtualCameraOutput
+
+
+class FakeCamera:
+    """Records every frame sent to it."""
+
+    def __init__(self, width, height, fps, **kwargs):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.device = "fake"
+        self.sent = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def send(self, frame):
+        self.sent.append(frame)
+
+    def sleep_until_next_frame(self):
+        self.slept = True
+
+
+class FrameFeed:
+    """Minimal stand-in for FrameDecoder's generation/wait API."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.generation = 0
+        self.frame = None
+
+    def publish(self, frame, generations=1):
+        with self._cond:
+            self.frame = frame
+            self.generation += generations
+            self._cond.notify_all()
+
+    def wait_for_frame(self, after_generation, timeout):
+        with self._cond:
+            self._cond.wait_for(lambda: self.generation > after_generation, timeout)
+            return self.generation, self.frame
+
+
+@pytest.fixture
+def fake_camera():
+    cameras = []
+
+    def factory(**kwargs):
+        cam = FakeCamera(**kwargs)
+        cameras.append(cam)
+        return cam
+
+    with patch('src.virtual_camera.pyvirtualcam.Camera', side_effect=factory):
+        yield cameras
+
+
+class TestEventDrivenOutput:
+    """Test the wait_for_frame based handoff."""
+
+    def test_sends_each_new_frame(self, fake_camera):
+        """Every published frame should be sent exactly once."""
+        feed = FrameFeed()
+        vcam = VirtualCameraOutput(width=4, height=4, fps=10)
+        vcam.start(frame_source=lambda: feed.frame, wait_for_frame=feed.wait_for_frame)
+
+        frames = [np.full((4, 4, 3), i, dtype=np.uint8) for i in range(3)]
+        for frame in frames:
+            feed.publish(frame)
+            time.sleep(0.02)
+        vcam.stop()
+
+        sent = [f for f in fake_camera[0].sent if f.shape == (4, 4, 3) and f is not vcam._standby]
+        assert [int(f[0, 0, 0]) for f in sent[:3]] == [0, 1, 2]
+        assert vcam.skipped_frames == 0
+
+    def test_envelopes_report_frame_age(self, fake_camera):
+        """Envelope sources give the read-to-send age of live frames."""
+        from src.frame_envelope import FrameEnvelope
+        feed = FrameFeed()
+        vcam = VirtualCameraOutput(width=4, height=4, fps=10)
+        vcam.start(frame_source=lambda: feed.frame, wait_for_frame=feed.wait_for_frame)
+
+        frame = np.full((4, 4, 3), 7, dtype=np.uint8)
+        feed.publish(FrameEnvelope(frame, 1, time.monotonic() - 0.05, 1))
+        time.sleep(0.05)
+        vcam.stop()
+
+        assert any(f is frame for f in fake_camera[0].sent)
+        assert vcam.get_stats()["frame_age_ms"] >= 50
+
+    def test_tracer_records_output_stages(self, fake_camera):
+        from src.frame_envelope import FrameEnvelope
+        from src.tracing import PipelineTracer
+        feed = FrameFeed()
+        tracer = PipelineTracer()
+        vcam = VirtualCameraOutput(width=4, height=4, fps=50, tracer=tracer)
+        vcam.start(frame_source=lambda: feed.frame, wait_for_frame=feed.wait_for_frame)
+
+        frame = np.ones((4, 4, 3), dtype=np.uint8)
+        feed.publish(FrameEnvelope(frame, 1, time.monotonic(), 1))
+        time.sleep(0.1)
+        vcam.stop()
+
+        stages = tracer.get_stats()["stages"]
+        # Repeats of the same frame are sent, but handed off only once
+        assert stages["handoff"]["count"] == 1
+        assert stages["send"]["count"] == vcam.frames_sent
+
+    def test_repeats_last_frame_when_sender_stalls(self, fake_camera):
+        """A stalled sender should cause repeats, counted as duplicates."""
+        feed = FrameFeed()
+        vcam = VirtualCameraOutput(width=4, height=4, fps=50)
+        vcam.start(frame_source=lambda: feed.frame, wait_for_frame=feed.wait_for_frame)
+
+        frame = np.ones((4, 4, 3), dtype=np.uint8)
+        feed.publish(frame)
+        time.sleep(0.3)
+        vcam.stop()
+
+        assert vcam.duplicated_frames > 0
+        assert fake_camera[0].sent[-1] is frame
+
+    def test_counts_skipped_frames(self, fake_camera):
+        """Generations that jump by more than one should count as skipped."""
+        feed = FrameFeed()
+        vcam = VirtualCameraOutput(width=4, height=4, fps=10)
+        vcam.start(frame_source=lambda: feed.frame, wait_for_frame=feed.wait_for_frame)
+
+        feed.publish(np.zeros((4, 4, 3), dtype=np.uint8))
+        time.sleep(0.02)
+        feed.publish(np.ones((4, 4, 3), dtype=np.uint8), generations=4)
+        time.sleep(0.02)
+        vcam.stop()
+
+        assert vcam.skipped_frames == 3
+
+    def test_standby_before_first_frame(self, fake_camera):
+        """Without any frame the standby image should be shown."""
+        feed = FrameFeed()
+        vcam = VirtualCameraOutput(width=4, height=4, fps=50)
+        vcam.start(frame_source=lambda: feed.frame, wait_for_frame=feed.wait_for_frame)
+
+        time.sleep(0.1)
+        vcam.stop()
+
+        assert fake_camera[0].sent
+        assert all(f is vcam._standby for f in fake_camera[0].sent)
+        assert vcam.duplicated_frames == 0
+
+    @pytest.mark.parametrize("policy", list(StallPolicy))
+    def test_stall_policy(self, fake_camera, policy):
+        """A reported stall shows the standby frame only if asked to."""
+        feed = FrameFeed()
+        vcam = VirtualCameraOutput(width=4, height=4, fps=50, stall_policy=policy)
+        vcam.start(frame_source=lambda: feed.frame, wait_for_frame=feed.wait_for_frame)
+
+        frame = np.ones((4, 4, 3), dtype=np.uint8)
+        feed.publish(frame)
+        time.sleep(0.1)
+        vcam.set_stalled(True)
+        time.sleep(0.1)
+        stalled_frame = fake_camera[0].sent[-1]
+        vcam.set_stalled(False)
+        time.sleep(0.1)
+        vcam.stop()
+
+        expected = vcam._standby if policy is StallPolicy.STANDBY else frame
+        assert stalled_frame is expected
+        # The last frame is kept and shown again once the stall ends
+        assert fake_camera[0].sent[-1] is frame
+
+    def test_fits_frames_of_another_size(self, fake_camera):
+        """Frames that do not match the camera are sent at its size."""
+        feed = FrameFeed()
+        vcam = VirtualCameraOutput(width=8, height=4, fps=50)
+        vcam.start(frame_source=lambda: feed.frame, wait_for_frame=feed.wait_for_frame)
+
+        feed.publish(np.full((4, 4, 3), 200, dtype=np.uint8))
+        time.sleep(0.1)
+        vcam.stop()
+
+        sent = fake_camera[0].sent[-1]
+        assert sent.shape == (4, 8, 3)
+        # Letterboxed: black bars left and right of the square frame
+        assert (sent[:, 2:6] == 200).all()
+        assert (sent[:, :2] == 0).all() and (sent[:, 6:] == 0).all()
+
+
+class TestNativeResolution:
+    """Test reopening the camera at the size of the live frames."""
+
+    def test_reopens_camera_at_frame_size(self, fake_camera):
+        feed = FrameFeed()
+        vcam = VirtualCameraOutput(width=8, height=4, fps=50, native_resolution=True)
+        vcam.start(frame_source=lambda: feed.frame, wait_for_frame=feed.wait_for_frame)
+
+        frame = np.full((6, 10, 3), 200, dtype=np.uint8)
+        feed.publish(frame)
+        time.sleep(0.1)
+        stats = vcam.get_stats()
+        vcam.stop()
+
+        assert len(fake_camera) == 2
+        assert (fake_camera[1].width, fake_camera[1].height) == (10, 6)
+        # Sent unscaled, and straight after the reopen
+        assert fake_camera[1].sent[0] is frame
+        assert all(sent is not frame for sent in fake_camera[0].sent)
+        assert stats["size"] == "10x6"
+        assert stats["reopens"] == 1
+        assert stats["last_reopen_ms"] is not None
+
+    def test_timer_loop_reopens(self, fake_camera):
+        frame = np.ones((6, 10, 3), dtype=np.uint8)
+        vcam = VirtualCameraOutput(width=8, height=4, fps=50, native_resolution=True)
+        vcam.start(frame_source=lambda: frame)
+
+        time.sleep(0.1)
+        vcam.stop()
+
+        assert len(fake_camera) == 2
+        assert fake_camera[1].sent[-1] is frame
+
+    def test_reopen_uses_last_working_backend(self):
+        attempts = []
+
+        def factory(**kwargs):
+            attempts.append(kwargs["backend"])
+            if kwargs["backend"] == "unitycapture":
+                raise RuntimeError("no driver")
+            return FakeCamera(**kwargs)
+
+        frame = np.ones((6, 10, 3), dtype=np.uint8)
+        with patch('src.virtual_camera.pyvirtualcam.Camera', side_effect=factory):
+            vcam = VirtualCameraOutput(width=8, height=4, fps=50, native_resolution=True)
+            vcam.start(frame_source=lambda: frame)
+            time.sleep(0.1)
+            vcam.stop()
+
+        assert attempts == ["unitycapture", "obs", "obs"]
+
+    def test_fixed_size_without_native_resolution(self, fake_camera):
+        frame = np.ones((6, 10, 3), dtype=np.uint8)
+        vcam = VirtualCameraOutput(width=8, height=4, fps=50)
+        vcam.start(frame_source=lambda: frame)
+
+        time.sleep(0.1)
+        vcam.stop()
+
+        assert len(fake_camera) == 1
+        assert fake_camera[0].sent[-1].shape == (4, 8, 3)
+
+
+class TestTimerOutput:
+    """Test the legacy polling loop."""
+
+    def test_polls_frame_source(self, fake_camera):
+        frame = np.ones((4, 4, 3), dtype=np.uint8)
+        vcam = VirtualCameraOutput(width=4, height=4, fps=50)
+        vcam.start(frame_source=lambda: frame)
+
+        time.sleep(0.1)
+        vcam.stop()
+
+        assert vcam.frames_sent > 0
+        assert fake_camera[0].sent[-1] is frame
+
+    def test_paced_by_frame_pacer_only(self, fake_camera):
+        """The timer loop keeps its rate without the camera's own sleep."""
+        vcam = VirtualCameraOutput(width=4, height=4, fps=50)
+        vcam.start(frame_source=lambda: None)
+
+        time.sleep(0.5)
+        stats = vcam.get_stats()
+        vcam.stop()
+
+        assert not hasattr(fake_camera[0], "slept")
+        assert stats["mode"] == "timer"
+        assert stats["pacer"]["effective_fps"] == pytest.approx(50, rel=0.1)
+        assert vcam.frames_sent == pytest.approx(25, abs=3)
+
+
+class TestFileSink:
+    """Test writing to a file sink instead of a camera."""
+
+    def test_writes_frames_without_camera(self, tmp_path):
+        from src.file_sink import read_frames
+        path = str(tmp_path / "out.rgb")
+        feed = FrameFeed()
+        vcam = VirtualCameraOutput(width=8, height=4, fps=50, native_resolution=True,
+                                   sink_path=path)
+        with patch("src.virtual_camera.pyvirtualcam", None):
+            vcam.start(frame_source=lambda: feed.frame, wait_for_frame=feed.wait_for_frame)
+            feed.publish(np.full((4, 8, 3), 7, dtype=np.uint8))
+            time.sleep(0.05)
+            feed.publish(np.full((6, 10, 3), 9, dtype=np.uint8))
+            time.sleep(0.05)
+            vcam.stop()
+
+        frames = list(read_frames(path))
+        assert len(frames) == vcam.frames_sent
+        # Reopened at the new size, continuing the same file
+        assert {frame.shape for _, frame in frames} == {(4, 8, 3), (6, 10, 3)}
+        assert frames[-1][1][0, 0, 0] == 9
@@ -149,6 +149,16 @@ class TestWebRTCAdapter:
             mock_stop_mdns.assert_called_once()
             adapter._on_disconnect.assert_called_once()
             assert adapter._signaling_server is None
+            assert adapter.frame_slot.closed
+    
+    def test_frame_slot_delivers_latest_frame(self, adapter):
+        """Test that only the newest relayed frame is handed out."""
+        adapter.frame_slot.put('frame1')
+        adapter.frame_slot.put('frame2')
+        
+        assert adapter.get_frame() == 'frame2'
+        assert adapter.get_frame() is None
+        assert adapter.frame_slot.dropped_count == 1
     
     def test_get_connection_urls(self, adapter):
         """Test getting connection URLs."""
@@ -0,0 +1,307 @@
+"""
+Pipeline stage timing with Chrome trace export.
+
+When latency spikes, the time can go to FFmpeg (decoding, or waiting for
+the network), the pipe read, lock waits in the hand-off to the camera
+thread, ``cam.send`` or pacing sleeps. The decoder and the virtual camera
+record a span for every stage a frame goes through:
+
+- ``pipe_wait``: reader waiting for the first bytes of a frame (FFmpeg
+  decoding, or the sender not sending)
+- ``pipe_read``: first byte to complete frame
+- ``publish``: storing the frame, waking consumers, inline subscribers
+- ``handoff``: frame read to the camera thread picking it up (lock waits,
+  thread wake-up)
+- ``fit``: scaling into the camera size
+- ``send``: ``cam.send``
+- ``pace``: pacing sleep of the fixed-rate loop
+
+``PipelineTracer`` keeps a fixed-size histogram per stage, always on: a
+span costs two ``perf_counter()`` calls and a bisect. ``start_capture()``
+additionally keeps every span for a few seconds and then writes them as a
+Chrome trace JSON file, which opens in ``chrome://tracing`` and
+https://ui.perfetto.dev with one track per thread.
+
+Integration Notes
+-----------------
+- Every stage is recorded by one thread; ``get_stats()`` may be called from
+  any thread and may miss a span that races with it.
+- Times are ``time.perf_counter()`` seconds. ``handoff`` is measured from
+  the envelope's monotonic read time, which has a coarse clock on Windows
+  before Python 3.13.
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import config
+
+log = logging.getLogger(__name__)
+
+# Stage names
+PIPE_WAIT = "pipe_wait"
+PIPE_READ = "pipe_read"
+PUBLISH = "publish"
+HANDOFF = "handoff"
+FIT = "fit"
+SEND = "send"
+PACE = "pace"
+
+
+class StageHistogram:
+    """Fixed-size histogram of durations with quarter-octave buckets."""
+
+    # Bucket upper bounds in seconds: 1 µs to ~16 s, 4 buckets per doubling;
+    # the last bucket collects everything above
+    BOUNDS = tuple(1e-6 * 2 ** (i / 4) for i in range(97))
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self._counts = [0] * (len(self.BOUNDS) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    @property
+    def count(self) -> int:
+        """Durations recorded."""
+        return self._count
+
+    def record(self, seconds: float) -> None:
+        """
+        Add one duration.
+
+        Parameters
+        ----------
+        seconds : float
+            Duration; negative values land in the first bucket
+        """
+        self._counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self._count += 1
+        self._total += seconds
+        if seconds > self._max:
+            self._max = seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the ``q``-th percentile.
+
+        Parameters
+        ----------
+        q : float
+            Percentile between 0 and 100
+
+        Returns
+        -------
+        float
+            Seconds, at most the largest recorded duration; 0 when empty
+        """
+        counts = list(self._counts)
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = q / 100 * total
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank and count:
+                bound = self.BOUNDS[index] if index < len(self.BOUNDS) else self._max
+                return min(bound, self._max)
+        return self._max
+
+    def reset(self) -> None:
+        """Forget all durations."""
+        self._counts = [0] * (len(self.BOUNDS) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot for /health.
+
+        Returns
+        -------
+        dict
+            Count, and mean, p50, p95, p99 and max in milliseconds
+        """
+        count = self._count
+        return {
+            "count": count,
+            "mean_ms": self._total / count * 1000 if count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self._max * 1000,
+        }
+
+
+class PipelineTracer:
+    """Per-stage histograms plus on-demand capture of every span."""
+
+    def __init__(self):
+        """Initialize a tracer without stages; they appear when recorded."""
+        self._stages: Dict[str, StageHistogram] = {}
+        # (stage, start, end, thread id, sequence) while capturing
+        self._spans: Optional[List[Tuple[str, float, float, int, Optional[int]]]] = None
+        self._capture_lock = threading.Lock()
+        self._capture_started = 0.0
+        self._capture_path: Optional[str] = None
+        self._capture_timer: Optional[threading.Timer] = None
+
+    @property
+    def capturing(self) -> bool:
+        """True while spans are being kept for a trace file."""
+        return self._spans is not None
+
+    def record(
+        self, stage: str, start: float, end: float, sequence: Optional[int] = None
+    ) -> None:
+        """
+        Record one span of a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Stage name, e.g. ``PIPE_READ``
+        start : float
+            ``time.perf_counter()`` when the stage began
+        end : float
+            ``time.perf_counter()`` when it ended
+        sequence : int, optional
+            Frame sequence number, shown in the trace
+        """
+        histogram = self._stages.get(stage)
+        if histogram is None:
+            histogram = self._stages.setdefault(stage, StageHistogram())
+        histogram.record(end - start)
+        spans = self._spans
+        if spans is not None:
+            spans.append((stage, start, end, threading.get_ident(), sequence))
+
+    def start_capture(self, seconds: float, path: Optional[str] = None) -> str:
+        """
+        Keep every span for ``seconds``, then write a Chrome trace file.
+
+        Parameters
+        ----------
+        seconds : float
+            Capture length, at most ``config.TRACE_MAX_SECONDS``
+        path : str, optional
+            Trace file; defaults to a timestamped file in the app data
+            directory
+
+        Returns
+        -------
+        str
+            Path the trace will be written to
+
+        Raises
+        ------
+        ValueError
+            If ``seconds`` is not positive or above the limit
+        RuntimeError
+            If a capture is already running
+        """
+        if not 0 < seconds <= config.TRACE_MAX_SECONDS:
+            raise ValueError(
+                f"capture length must be in (0, {config.TRACE_MAX_SECONDS:g}] seconds"
+            )
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(config.APP_DATA_DIR, f"trace-{stamp}.json")
+        with self._capture_lock:
+            if self._spans is not None:
+                raise RuntimeError(f"capture already running ({self._capture_path})")
+            self._capture_path = path
+            self._capture_started = time.perf_counter()
+            self._spans = []
+            timer = threading.Timer(seconds, self.finish_capture)
+            timer.daemon = True
+            self._capture_timer = timer
+        timer.start()
+        log.info("Capturing pipeline trace for %g s to %s", seconds, path)
+        return path
+
+    def finish_capture(self) -> Optional[str]:
+        """
+        End a running capture now and write its trace file.
+
+        Returns
+        -------
+        str or None
+            Path of the written trace, None if no capture was running
+        """
+        with self._capture_lock:
+            spans, self._spans = self._spans, None
+            path = self._capture_path
+            timer, self._capture_timer = self._capture_timer, None
+        if spans is None:
+            return None
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self._chrome_trace(spans), f)
+        except OSError as e:
+            log.error("Cannot write pipeline trace %s: %s", path, e)
+            return None
+        log.info("Pipeline trace with %d spans written to %s", len(spans), path)
+        return path
+
+    def reset(self) -> None:
+        """Forget the histograms of all stages."""
+        for histogram in list(self._stages.values()):
+            histogram.reset()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot for /health.
+
+        Returns
+        -------
+        dict
+            Statistics per stage (see ``StageHistogram.get_stats``) and
+            the path of a running capture
+        """
+        return {
+            "stages": {
+                name: histogram.get_stats()
+                for name, histogram in list(self._stages.items())
+            },
+            "capture": self._capture_path if self.capturing else None,
+        }
+
+    # ── internal ─────────────────────────────────────────
+
+    def _chrome_trace(self, spans) -> Dict[str, Any]:
+        """Spans as Chrome trace complete events, times in µs from capture start."""
+        origin = self._capture_started
+        names = {t.ident: t.name for t in threading.enumerate()}
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        for tid in sorted({span[3] for span in spans}):
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": names.get(tid, str(tid))},
+            })
+        for stage, start, end, tid, sequence in spans:
+            event = {
+                "name": stage,
+                "cat": "pipeline",
+                "ph": "X",
+                "ts": round((start - origin) * 1e6, 3),
+                "dur": round((end - start) * 1e6, 3),
+                "pid": pid,
+                "tid": tid,
+            }
+            if sequence is not None:
+                event["args"] = {"sequence": sequence}
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
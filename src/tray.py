@@ -51,6 +51,8 @@ def _create_state_icon(
     - CONNECTING: Yellow
     - CONNECTED (excellent/good): Green
     - CONNECTED (poor/critical): Yellow with warning
+    - STALLED: Red with warning
+    - RESYNCING: Yellow
     - RECONNECTING: Orange
 
     Parameters
@@ -73,10 +75,12 @@ def _create_state_icon(
     # Determine background color based on state and health
     if state == ConnectionState.DISCONNECTED:
         bg_color = (128, 128, 128)  # Gray
-    elif state == ConnectionState.CONNECTING:
+    elif state in (ConnectionState.CONNECTING, ConnectionState.RESYNCING):
         bg_color = (255, 193, 7)  # Yellow
     elif state == ConnectionState.RECONNECTING:
         bg_color = (255, 152, 0)  # Orange
+    elif state == ConnectionState.STALLED:
+        bg_color = (244, 67, 54)  # Red
     elif state == ConnectionState.CONNECTED:
         # Green for excellent/good, yellow for poor/critical
         if health in (ConnectionHealth.EXCELLENT, ConnectionHealth.GOOD):
@@ -96,10 +100,10 @@ def _create_state_icon(
     sr = r // 2
     draw.ellipse([(cx - sr, cy - sr), (cx + sr, cy + sr)], fill=bg_color)
 
-    # Add warning indicator for poor health when connected
-    if state == ConnectionState.CONNECTED and health in (
-        ConnectionHealth.POOR,
-        ConnectionHealth.CRITICAL,
+    # Add warning indicator for poor health when connected or stalled
+    if state == ConnectionState.STALLED or (
+        state == ConnectionState.CONNECTED
+        and health in (ConnectionHealth.POOR, ConnectionHealth.CRITICAL)
     ):
         # Small warning badge in bottom-right corner
         badge_size = size // 4
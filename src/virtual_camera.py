@@ -1,17 +1,45 @@
 """
 Virtual camera bridge: sends decoded frames to a pyvirtualcam device.
 
-Runs in its own thread, polling the FrameDecoder for the latest frame
-and writing it to the virtual webcam at the configured FPS.
+Runs in its own thread and writes decoded frames to the virtual webcam.
+When the FrameDecoder's wait_for_frame() is available the thread blocks
+until a new frame arrives and sends it immediately, repeating the last
+frame only when the sender stalls; otherwise it polls the latest frame
+at the configured FPS, paced by a FramePacer. While the connection manager
+reports the sender as STALLED, the StallPolicy decides between the last
+frame and the standby frame.
+
+In native-resolution mode the camera follows the size of the live frames:
+a frame of another size closes the device and reopens it at that size,
+with the backend that worked last and without re-rendering the standby
+frame for sizes seen before.
+
+Sources may hand over ``FrameEnvelope``s instead of bare frames; the read
+time they carry gives the age of every live frame when it reaches the
+camera (``frame_age_ms`` in the stats). With a ``PipelineTracer`` the
+output thread records the ``handoff``, ``fit``, ``send`` and ``pace``
+stages of every frame.
+
+With a sink path the frames go to a ``FileFrameSink`` instead of a camera
+driver, for headless runs and measurements.
 """
 import threading
 import time
 import logging
+from functools import lru_cache
 
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 from . import config
+from .file_sink import FileFrameSink
+from .frame_envelope import FrameEnvelope
+from .frame_fitter import FitMode, FrameFitter
+from .frame_pacer import FramePacer
+from .metrics import Counter
+from .pixel_format import PixelFormat, frame_size, rgb_to_format
+from .stall_watchdog import StallPolicy
+from .tracing import FIT, HANDOFF, PACE, SEND, PipelineTracer
 
 log = logging.getLogger(__name__)
 
@@ -22,6 +50,13 @@ try:
 except ImportError:
     pyvirtualcam = None  # type: ignore[assignment]
 
+# pyvirtualcam camera format for each raw frame format
+_CAMERA_FORMATS = {
+    PixelFormat.RGB24: "RGB",
+    PixelFormat.NV12: "NV12",
+    PixelFormat.I420: "I420",
+}
+
 
 def _make_standby_frame(
     width: int = config.FRAME_WIDTH,
@@ -59,18 +94,30 @@ def _make_standby_frame(
     return np.array(img)
 
 
+@lru_cache(maxsize=4)
+def _standby_frame(width: int, height: int, pixel_format: PixelFormat) -> np.ndarray:
+    """Standby frame in camera layout, rendered once per resolution."""
+    frame = rgb_to_format(_make_standby_frame(width, height), pixel_format)
+    frame.flags.writeable = False  # shared between outputs
+    return frame
+
+
 class VirtualCameraOutput:
     """
     Bridges decoded frames → system virtual webcam.
 
     This class manages a background thread that polls a frame source
-    (typically a FrameDecoder instance) for the latest RGB frame and
+    (typically a FrameDecoder instance) for the latest frame and
     writes it to a pyvirtualcam virtual webcam device at a configurable
     frame rate.
 
     It handles:
     - Thread lifecycle management (start/stop)
+    - Event-driven frame handoff with duplicate/skip accounting
     - Standby frame generation when no frames are available
+    - Fitting frames of another size to the camera (letterbox or crop),
+      or reopening the camera at their size (native resolution)
+    - Last-frame or standby output while the sender is stalled
     - Backend selection (UnityCapture preferred, OBS fallback)
     - Error handling and logging
     """
@@ -80,30 +127,146 @@ class VirtualCameraOutput:
         width: int = config.FRAME_WIDTH,
         height: int = config.FRAME_HEIGHT,
         fps: int = config.FPS,
+        pixel_format: PixelFormat = PixelFormat.RGB24,
+        stall_policy: StallPolicy = StallPolicy.LAST_FRAME,
+        precise_pacing: bool | None = None,
+        fit_mode: FitMode = FitMode.LETTERBOX,
+        native_resolution: bool = False,
+        tracer: PipelineTracer | None = None,
+        sink_path: str | None = None,
     ):
         self.width = width
         self.height = height
         self.fps = fps
+        self.pixel_format = pixel_format
+        self.stall_policy = stall_policy
+        self._stalled = False  # set from the connection manager's thread
         self._thread: threading.Thread | None = None
         self._running = False
         self._frame_source = None  # callable returning np.ndarray | None
-        self._standby = _make_standby_frame(width, height)
+        self._wait_for_frame = None  # callable(generation, timeout) -> (int, frame)
+        # Written by the output thread, read by the tray and /health
+        self._frames_sent = Counter("frames_sent")
+        self._duplicated_frames = Counter("duplicated_frames")
+        self._skipped_frames = Counter("skipped_frames")
+        # Fixed-rate loop only; precise (spinning) by default above 30 fps
+        self._pacer = FramePacer(fps, precise=precise_pacing)
+        # Frames of another size are scaled into the camera size
+        self._fitter = FrameFitter(width, height, pixel_format, fit_mode)
+        # Native resolution: live frames of another size reopen the camera
+        self._native_resolution = native_resolution
+        self._pending_size: tuple[int, int] | None = None
+        self._backend: str | None = None  # last backend that opened
+        self._reopen_count = 0
+        self._last_reopen_ms: float | None = None
+        # Read-to-send time of the last live frame from an envelope
+        self._frame_age: float | None = None
+        self._last_sequence: int | None = None
+        self._tracer = tracer
+        # Raw video file written instead of the camera driver
+        self._sink_path = sink_path
+
+    @property
+    def frames_sent(self) -> int:
+        """Total frames written to the virtual camera, including standby."""
+        return self._frames_sent.value
+
+    @property
+    def duplicated_frames(self) -> int:
+        """Frames re-sent because no new frame arrived in time."""
+        return self._duplicated_frames.value
+
+    @property
+    def skipped_frames(self) -> int:
+        """Decoded frames that were replaced before they could be sent."""
+        return self._skipped_frames.value
+
+    @property
+    def _standby(self) -> np.ndarray:
+        """Standby frame at the camera resolution, rendered on first use."""
+        return _standby_frame(self.width, self.height, self.pixel_format)
 
-    def start(self, frame_source) -> None:
+    @property
+    def pacer(self) -> FramePacer:
+        """Pacer of the fixed-rate (polling) output loop."""
+        return self._pacer
+
+    def get_stats(self) -> dict:
+        """
+        Snapshot of the output statistics.
+
+        Returns
+        -------
+        dict
+            JSON-serializable output mode, camera size, frame counters,
+            stall flag, camera reopens for new frame sizes with the time
+            the last one took, the age of the last live frame when sent (for
+            envelope sources) and, for the fixed-rate loop, the pacer
+            statistics (else None)
+        """
+        timer_mode = self._wait_for_frame is None
+        return {
+            "running": self._running,
+            "mode": "timer" if timer_mode else "arrival",
+            "size": f"{self.width}x{self.height}",
+            "frames_sent": self._frames_sent.value,
+            "duplicated": self._duplicated_frames.value,
+            "skipped": self._skipped_frames.value,
+            "stalled": self._stalled,
+            "reopens": self._reopen_count,
+            "last_reopen_ms": self._last_reopen_ms,
+            "frame_age_ms": None if self._frame_age is None else self._frame_age * 1000,
+            "pacer": self._pacer.get_stats() if timer_mode else None,
+        }
+
+    @property
+    def is_stalled(self) -> bool:
+        """True while the sender is reported as stalled."""
+        return self._stalled
+
+    def set_stalled(self, stalled: bool) -> None:
+        """
+        Report whether the sender is stalled.
+
+        With ``StallPolicy.STANDBY`` the standby frame replaces the last
+        frame while no new frame arrives; new frames are always sent.
+
+        Parameters
+        ----------
+        stalled : bool
+            True when frames stopped arriving, False when they resume
+        """
+        if stalled != self._stalled:
+            log.info(
+                "Virtual camera %s",
+                f"showing {self.stall_policy.value} (sender stalled)"
+                if stalled
+                else "resumed live frames",
+            )
+        self._stalled = stalled
+
+    def start(self, frame_source, wait_for_frame=None) -> None:
         """
         Start writing frames to the virtual camera.
 
         Parameters
         ----------
         frame_source : callable
-            A zero-arg callable that returns the latest numpy RGB frame
-            (or None if no frame is available).
+            A zero-arg callable that returns the latest numpy frame in
+            ``pixel_format`` or its ``FrameEnvelope`` (or None if no frame
+            is available).
+        wait_for_frame : callable, optional
+            ``wait_for_frame(after_generation, timeout)`` returning
+            ``(generation, frame)``, typically ``FrameDecoder.wait_for_frame``
+            or, with envelopes, ``FrameDecoder.wait_for_envelope``.
+            When given, frames are sent as soon as they are decoded instead
+            of on a fixed timer.
 
         Returns
         -------
         None
         """
-        if pyvirtualcam is None:
+        if pyvirtualcam is None and self._sink_path is None:
             raise RuntimeError(
                 "pyvirtualcam is not installed. "
                 "Run: pip install pyvirtualcam"
@@ -111,6 +274,7 @@ class VirtualCameraOutput:
         if self._running:
             return
         self._frame_source = frame_source
+        self._wait_for_frame = wait_for_frame
         self._running = True
         self._thread = threading.Thread(
             target=self._loop, daemon=True, name="vcam-output"
@@ -136,14 +300,74 @@ class VirtualCameraOutput:
         sends them to the virtual camera at the configured frame rate.
 
         This method runs in a daemon thread and handles frame acquisition,
-        standby frame generation, and backend communication.
+        standby frame generation, and backend communication. In
+        native-resolution mode the send loops return on a frame of another
+        size and the camera is reopened at that size.
         """
-        interval = 1.0 / self.fps
-        cam = None
-        
-        # Try backends in order: UnityCapture (standalone), then OBS (if running)
-        backends = ['unitycapture', 'obs']
-        
+        reopen_started = None
+        while self._running:
+            cam = self._open_camera()
+            if cam is None:
+                log.error(
+                    "Failed to initialize any virtual camera.\n"
+                    "  - UnityCapture: Ensure driver is installed via setup_driver.py (or manually).\n"
+                    "  - OBS: Ensure OBS is installed. (Note: OBS 28+ might need legacy plugin?)\n"
+                )
+                self._running = False
+                return
+            if reopen_started is not None:
+                self._last_reopen_ms = (time.perf_counter() - reopen_started) * 1000
+                log.info(
+                    "Virtual camera reopened at %dx%d in %.1f ms",
+                    self.width, self.height, self._last_reopen_ms,
+                )
+
+            try:
+                with cam:
+                    if self._wait_for_frame is not None:
+                        self._send_on_arrival(cam, 1.0 / self.fps)
+                    else:
+                        self._send_on_timer(cam)
+            except Exception:
+                log.exception("Virtual camera loop crashed")
+                break
+
+            size = self._pending_size
+            if size is None:
+                break
+            reopen_started = time.perf_counter()
+            self._resize(*size)
+
+        log.debug(
+            "Virtual camera loop exited (sent %d frames, %d duplicated, "
+            "%d skipped)",
+            self._frames_sent.value,
+            self._duplicated_frames.value,
+            self._skipped_frames.value,
+        )
+
+    def _open_camera(self):
+        """
+        Open the camera at the current size, or return None.
+
+        Tries the backend that worked last first. With a sink path, opens
+        the file sink instead, continuing its files after a reopen.
+        """
+        if self._sink_path is not None:
+            try:
+                sink = FileFrameSink(
+                    self._sink_path,
+                    self.width,
+                    self.height,
+                    self.pixel_format,
+                    append=self._reopen_count > 0,
+                )
+            except OSError as e:
+                log.error("Cannot open file sink %s: %s", self._sink_path, e)
+                return None
+            log.info("Virtual camera writing to file sink %s", sink.device)
+            return sink
+
         # Try backends in order: UnityCapture (standalone), then OBS
         # For OBS, pyvirtualcam connects to the 'OBS Virtual Camera' device.
         # This requires OBS to be running and 'Start Virtual Camera' to be active?
@@ -154,47 +378,159 @@ class VirtualCameraOutput:
         # Current strategy: 
         # 1. UnityCapture (preferred, if installed)
         # 2. OBS (fallback, but might fail if OBS 28+ internal changes block it)
-        
         backends = ['unitycapture', 'obs']
-        
+        if self._backend in backends:
+            backends.remove(self._backend)
+            backends.insert(0, self._backend)
+
         for backend in backends:
             try:
                 cam = pyvirtualcam.Camera(
                     width=self.width,
                     height=self.height,
                     fps=self.fps,
+                    fmt=pyvirtualcam.PixelFormat[
+                        _CAMERA_FORMATS[self.pixel_format]
+                    ],
                     backend=backend,
                     print_fps=False,
                 )
                 log.info(f"Virtual camera started using backend: {backend} ({cam.device})")
-                break
+                self._backend = backend
+                return cam
             except Exception as e:
                 log.warning(f"Backend '{backend}' failed: {e}")
-        
-        if cam is None:
-            log.error(
-                "Failed to initialize any virtual camera.\n"
-                "  - UnityCapture: Ensure driver is installed via setup_driver.py (or manually).\n"
-                "  - OBS: Ensure OBS is installed. (Note: OBS 28+ might need legacy plugin?)\n"
-            )
-            self._running = False
-            return
+        return None
+
+    def _resize(self, width: int, height: int) -> None:
+        """Switch the camera size; the next ``_open_camera()`` uses it."""
+        log.info(
+            "Frame size changed from %dx%d to %dx%d, reopening virtual camera",
+            self.width, self.height, width, height,
+        )
+        self._pending_size = None
+        self.width = width
+        self.height = height
+        # Buffers are allocated on the first fit, so this is cheap
+        self._fitter = FrameFitter(width, height, self.pixel_format, self._fitter.mode)
+        self._reopen_count += 1
+
+    def _needs_resize(self, frame: np.ndarray) -> bool:
+        """
+        True if a live frame asks for a camera of another size.
+
+        Records the size for ``_loop``; always False unless in
+        native-resolution mode.
+        """
+        if not self._native_resolution:
+            return False
+        size = frame_size(self.pixel_format, frame.shape)
+        if size == (self.width, self.height):
+            return False
+        self._pending_size = size
+        return True
+
+    def _send_on_timer(self, cam) -> None:
+        """
+        Poll the frame source and send its latest frame at a fixed rate.
+
+        Returns when stopped or, in native-resolution mode, on a frame of
+        another size.
+
+        The pacer alone sets the rate; pyvirtualcam's own
+        ``sleep_until_next_frame()`` is not used on top of it.
+        """
+        pacer = self._pacer
+        pacer.reset()
+        tracer = self._tracer
+        while self._running:
+            frame, envelope = _unwrap(self._frame_source() if self._frame_source else None)
+            if frame is None or self._show_standby():
+                frame, envelope = self._standby, None
+            elif self._needs_resize(frame):
+                return
+            self._send(cam, frame, envelope)
+            if tracer is None:
+                pacer.wait()
+            else:
+                started = time.perf_counter()
+                pacer.wait()
+                tracer.record(PACE, started, time.perf_counter())
+
+    def _send_on_arrival(self, cam, interval: float) -> None:
+        """
+        Send each decoded frame as soon as the decoder publishes it.
+
+        Blocks on ``wait_for_frame`` instead of polling. If no new frame
+        arrives within two output intervals the sender is considered
+        stalled and the last frame (or the standby frame) is repeated so
+        the camera keeps delivering video; once the connection manager
+        reports the stall, the stall policy picks which. Returns when
+        stopped or, in native-resolution mode, on a frame of another size;
+        the restarted loop picks that frame up at generation 0.
+        """
+        stall_timeout = 2 * interval
+        generation = 0
+        last_frame = None
+
+        while self._running:
+            new_generation, item = self._wait_for_frame(generation, stall_timeout)
+            frame, envelope = _unwrap(item)
+
+            if new_generation == generation:
+                # Sender stalled - repeat what we showed last, unless the
+                # stall policy asks for the standby frame
+                frame = None if self._show_standby() else last_frame
+                envelope = None
+                if frame is not None:
+                    self._duplicated_frames.add()
+            else:
+                if generation and new_generation - generation > 1:
+                    self._skipped_frames.add(new_generation - generation - 1)
+                if frame is not None and self._needs_resize(frame):
+                    # Reopened, then the loop restarts with this frame
+                    return
+                generation = new_generation
+                last_frame = frame
+
+            self._send(cam, frame if frame is not None else self._standby, envelope)
+
+    def _send(self, cam, frame: np.ndarray, envelope: FrameEnvelope | None) -> None:
+        """
+        Fit and send one frame.
+
+        The envelope of a live frame, on its first send only, gives the
+        frame's age and the ``handoff`` stage.
+        """
+        if envelope is not None and envelope.sequence == self._last_sequence:
+            envelope = None  # repeated by the fixed-rate loop
+        tracer = self._tracer
+        if tracer is None:
+            # pyvirtualcam expects uint8 frames in the camera fmt and size
+            cam.send(self._fitter.fit(frame))
+        else:
+            started = time.perf_counter()
+            sequence = None
+            if envelope is not None:
+                sequence = envelope.sequence
+                tracer.record(HANDOFF, started - envelope.age(), started, sequence)
+            fitted = self._fitter.fit(frame)
+            fitted_at = time.perf_counter()
+            cam.send(fitted)
+            tracer.record(FIT, started, fitted_at, sequence)
+            tracer.record(SEND, fitted_at, time.perf_counter(), sequence)
+        self._frames_sent.add()
+        if envelope is not None:
+            self._last_sequence = envelope.sequence
+            self._frame_age = envelope.age()
+
+    def _show_standby(self) -> bool:
+        """True if the stall policy replaces old frames with the standby."""
+        return self._stalled and self.stall_policy is StallPolicy.STANDBY
+
 
-        try:
-            with cam:
-                while self._running:
-                    t0 = time.monotonic()
-                    frame = self._frame_source() if self._frame_source else None
-                    if frame is None:
-                        frame = self._standby
-                    # pyvirtualcam expects RGB uint8
-                    cam.send(frame)
-                    cam.sleep_until_next_frame()
-                    elapsed = time.monotonic() - t0
-                    sleep_remaining = interval - elapsed
-                    if sleep_remaining > 0:
-                        time.sleep(sleep_remaining)
-        except Exception:
-            log.exception("Virtual camera loop crashed")
-        finally:
-            log.debug("Virtual camera loop exited")
+def _unwrap(item) -> tuple[np.ndarray | None, FrameEnvelope | None]:
+    """Frame and envelope of a source item (frame, envelope or None)."""
+    if isinstance(item, FrameEnvelope):
+        return item.frame, item
+    return item, None